@@ -8,19 +8,24 @@ from pathlib import Path
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 import numpy as np
 from contextlib import asynccontextmanager
 import asyncio
 import threading
 
-from memory_service.config import API_HOST, API_PORT, EMBEDDING_MODEL, EMBEDDING_DIM, load_sources, create_dynamic_source, BASE_DIR, MEMORY_DASHBOARD_PATH, DYNAMIC_SOURCES_PATH, MEMORY_SOURCES_YAML, load_dynamic_sources, save_dynamic_sources, load_static_sources
+from memory_service.config import API_HOST, API_PORT, EMBEDDING_MODEL, EMBEDDING_DIM, NEAR_DUP_THRESHOLD, get_near_dup_thresholds, load_sources, create_dynamic_source, BASE_DIR, MEMORY_DASHBOARD_PATH, DYNAMIC_SOURCES_PATH, MEMORY_SOURCES_YAML, load_dynamic_sources, save_dynamic_sources, load_static_sources, invalidate_project_directory_cache
 from memory_service.memory_dashboard import db
+from memory_service.memory_dashboard.connection_pool import connection_pool
+from memory_service.memory_dashboard.db_writer import db_writer
 from memory_service.indexer import index_source, index_chat_message
 from memory_service.indexing_queue import get_indexing_queue
+from memory_service.scheduler import Lane, get_scheduler
 from memory_service.watcher import WatcherManager
 from memory_service.vector_cache import get_query_embedding
 from memory_service.ann_index import AnnIndexManager
+from memory_service.near_dup import NearDuplicateCollapser
+from memory_service.hybrid_search import SEARCH_MODES, build_fts_query, is_exact_term_query, reciprocal_rank_fusion
 from memory_service.models import SourceStatus, IndexJob, FileTreeResponse, FileReadResponse
 from memory_service.filetree import FileTreeManager
 from datetime import datetime
@@ -96,7 +101,11 @@ async def lifespan(app: FastAPI):
     # Note: Per-source databases are initialized on first use
     logger.info("Database system ready")
     
-    # Start indexing queue workers
+    # Start the indexing scheduler (owns all chat, watcher and bulk indexing work)
+    get_scheduler()
+    logger.info("Indexing scheduler started")
+    
+    # Start indexing queue (replays unfinished jobs into the scheduler)
     indexing_queue = get_indexing_queue()
     indexing_queue.start()
     logger.info("Indexing queue started")
@@ -125,6 +134,13 @@ async def lifespan(app: FastAPI):
     indexing_queue.stop()
     logger.info("Indexing queue stopped")
     
+    get_scheduler().stop()
+    logger.info("Indexing scheduler stopped")
+    
+    # Flush queued database writes
+    db_writer.stop()
+    logger.info("Database writers stopped")
+    
     # Clean up PID file and lock
     try:
         from memory_service.startup_check import remove_pid_file, release_lock
@@ -165,6 +181,7 @@ class SearchRequest(BaseModel):
     source_ids: Optional[List[str]] = None
     chat_id: Optional[str] = None  # DEPRECATED: No longer excludes chats. All chats are included.
     exclude_chat_ids: Optional[List[str]] = None  # List of chat_ids to exclude from search (e.g., trashed chats)
+    mode: str = "hybrid"  # "hybrid" (BM25 + vector, rank-fused), "vector" or "lexical"
 
 
 class SearchResult(BaseModel):
@@ -181,6 +198,7 @@ class SearchResult(BaseModel):
     chat_id: Optional[str] = None
     message_id: Optional[str] = None
     message_uuid: Optional[str] = None  # UUID for citations/deep-links
+    duplicate_count: int = 0  # Near-duplicate results collapsed into this one
 
 
 class IndexChatMessageRequest(BaseModel):
@@ -194,6 +212,10 @@ class IndexChatMessageRequest(BaseModel):
     message_uuid: Optional[str] = None  # Client-provided UUID to use
 
 
+class IndexChatMessagesRequest(BaseModel):
+    messages: List[IndexChatMessageRequest]
+
+
 class SearchResponse(BaseModel):
     results: List[SearchResult]
 
@@ -355,6 +377,34 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/watcher/stats")
+async def get_watcher_stats():
+    """Get filesystem watcher event queue depth and drop/merge counters per source."""
+    return watcher_manager.get_queue_stats()
+
+
+@app.post("/projects/changed")
+async def projects_changed():
+    """Notification from the server that projects.json changed (drops cached project directories/DB paths)."""
+    invalidate_project_directory_cache()
+    return {"status": "ok"}
+
+
+@app.get("/scheduler/stats")
+async def get_scheduler_stats():
+    """Get indexing scheduler queue depth, running tasks and wait times per lane (chat, watcher, bulk)."""
+    return get_scheduler().get_stats()
+
+
+@app.get("/db/stats")
+async def get_db_stats():
+    """Get per-database writer metrics (queue depth, queue wait, commit latency, batch size) and connection pool counters."""
+    return {
+        "writers": db_writer.get_stats(),
+        "connection_pool": connection_pool.get_stats(),
+    }
+
+
 @app.get("/sources")
 async def get_sources():
     """Get list of all sources with status and latest job."""
@@ -434,7 +484,7 @@ async def add_source(request: AddSourceRequest):
     # Start watching this path
     watcher_manager.add_source_watch(src)
     
-    # Kick off indexing in background thread
+    # Kick off indexing in the scheduler's bulk lane
     def run_indexing():
         try:
             index_source(src.id)
@@ -446,8 +496,10 @@ async def add_source(request: AddSourceRequest):
                 last_error=str(e)
             )
     
-    thread = threading.Thread(target=run_indexing, daemon=True)
-    thread.start()
+    get_scheduler().submit(
+        Lane.BULK, run_indexing,
+        source_id=src.id, fair_key=src.project_id, label=f"index-source:{src.id}"
+    )
     
     return {
         "status": "ok",
@@ -558,6 +610,7 @@ async def delete_source(source_id: str):
                 # Delete the index.sqlite file and related files
                 for file in index_dir.glob("index.sqlite*"):
                     file.unlink()
+                db.forget_schema(index_dir)
                 logger.info(f"Deleted project index directory for source: {source_id} (project: {project_dir_name})")
             except Exception as e:
                 logger.warning(f"Could not delete project index directory for {source_id}: {e}")
@@ -567,6 +620,7 @@ async def delete_source(source_id: str):
         if source_dir.exists():
             try:
                 shutil.rmtree(source_dir, ignore_errors=True)
+                db.forget_schema(source_dir)
                 logger.info(f"Deleted index directory for source: {source_id}")
             except Exception as e:
                 logger.warning(f"Could not delete index directory for {source_id}: {e}")
@@ -630,22 +684,21 @@ async def reindex(request: ReindexRequest):
         # Note: For project sources, the path is in projects/<project_name>/index/, but we don't need it here
         
         # Delete all files/chunks/embeddings for this source from the database
-        conn = db.get_db_connection(request.source_id)
-        cursor = conn.cursor()
-        try:
-            # Delete embeddings first (foreign key constraint)
-            cursor.execute("DELETE FROM embeddings")
+        def _clear_index(conn):
+            # Delete embeddings and near-duplicate signatures first (foreign key constraint)
+            conn.execute("DELETE FROM embeddings")
+            conn.execute("DELETE FROM chunk_lsh_bands")
+            conn.execute("DELETE FROM chunk_signatures")
             # Delete chunks
-            cursor.execute("DELETE FROM chunks")
+            conn.execute("DELETE FROM chunks")
             # Delete files
-            cursor.execute("DELETE FROM files")
-            conn.commit()
+            conn.execute("DELETE FROM files")
+        
+        try:
+            db.run_write(request.source_id, _clear_index, label="clear_index")
             logger.info(f"[MEMORY] Cleared old index data (files/chunks/embeddings) for source: {request.source_id}")
         except Exception as e:
             logger.warning(f"[MEMORY] Error clearing old index data: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
         
         # Update source status to "indexing" immediately
         db.update_source_stats(
@@ -655,13 +708,10 @@ async def reindex(request: ReindexRequest):
         )
         logger.info(f"[MEMORY] Set source {request.source_id} status to 'indexing'")
         
-        # Run indexing in background thread to avoid blocking the API
+        # Run indexing in the scheduler's bulk lane to avoid blocking the API
         def run_indexing():
             try:
                 logger.info(f"[MEMORY] Starting background indexing for {request.source_id}")
-                # Give the API response time to return before starting heavy work
-                import time
-                time.sleep(0.5)
                 result = index_source(request.source_id)
                 logger.info(f"[MEMORY] Background indexing completed for {request.source_id}: {result}")
             except Exception as e:
@@ -672,9 +722,11 @@ async def reindex(request: ReindexRequest):
                     last_error=str(e)
                 )
         
-        thread = threading.Thread(target=run_indexing, daemon=True)
-        thread.start()
-        logger.info(f"[MEMORY] Background thread started for {request.source_id}, thread ID: {thread.ident}")
+        get_scheduler().submit(
+            Lane.BULK, run_indexing,
+            source_id=request.source_id, fair_key=source_config.project_id, label=f"reindex:{request.source_id}"
+        )
+        logger.info(f"[MEMORY] Reindex of {request.source_id} queued in bulk lane")
         
         logger.info(f"[MEMORY] Reindex request accepted for {request.source_id}, background job started")
         
@@ -751,15 +803,160 @@ async def get_source_jobs(source_id: str, limit: int = 10):
     }
 
 
+def _vector_candidates(request: SearchRequest) -> List[dict]:
+    """
+    Vector search candidates for a search request, best first.
+    
+    Uses the ANN index when available and falls back to brute-force cosine similarity
+    over the sources' stored embeddings.
+    """
+    query_embedding = get_query_embedding(request.query)
+    
+    # Determine which sources to search
+    filter_source_ids = request.source_ids if request.source_ids else None
+    
+    # Try ANN search first
+    use_ann = ann_index_manager.is_available()
+    ann_results = []
+    
+    if use_ann:
+        try:
+            logger.info(f"[ANN] Using FAISS IndexFlatIP for vector search (k={request.limit * 2}, project_id={request.project_id})")
+            # Search for more results to account for filtering
+            ann_results = ann_index_manager.search(
+                query_embedding,
+                top_k=request.limit * 2,  # Get more candidates
+                filter_source_ids=filter_source_ids,
+                filter_project_id=request.project_id,  # CRITICAL: Filter by project_id for isolation
+                exclude_chat_ids=request.exclude_chat_ids  # CRITICAL: Exclude trashed chats
+            )
+        except Exception as e:
+            logger.warning(f"[ANN] ANN search failed, falling back to brute-force: {e}")
+            use_ann = False
+    
+    if use_ann and ann_results:
+        return ann_results
+    
+    # Fallback to brute-force if ANN unavailable or failed
+    logger.info("[ANN] ANN unavailable, falling back to brute-force")
+    
+    # Load all embeddings from specified sources
+    all_embeddings = []
+    if request.source_ids:  # Only search file sources if source_ids is provided
+        for source_id in request.source_ids:
+            try:
+                source_embeddings = db.get_all_embeddings_for_source(source_id, EMBEDDING_MODEL)
+                all_embeddings.extend(source_embeddings)
+            except Exception as e:
+                logger.warning(f"Error searching source {source_id}: {e}")
+                continue
+    
+    # Also search chat messages for this project (exclude trashed chats)
+    try:
+        chat_embeddings = db.get_chat_embeddings_for_project(
+            request.project_id, 
+            EMBEDDING_MODEL, 
+            exclude_chat_id=None,  # Backward compatibility
+            exclude_chat_ids=request.exclude_chat_ids  # Exclude trashed chats
+        )
+        all_embeddings.extend(chat_embeddings)
+    except Exception as e:
+        logger.debug(f"Error searching chat messages for project {request.project_id}: {e}")
+    
+    norm_query = np.linalg.norm(query_embedding)
+    ann_results = []
+    for chunk_id, embedding, file_id, file_path, chunk_text, source_id, project_id, filetype, chunk_index, start_char, end_char, chat_id, message_id, message_uuid in all_embeddings:
+        # PROJECT ISOLATION LOGIC:
+        # - Chat sources (source_id starts with "project-"): Strict project isolation - must match project_id
+        # - File sources: source_ids were already filtered when loading embeddings above,
+        #   so a file source here is allowed regardless of project_id (cross-project access)
+        is_chat_source = source_id and source_id.startswith("project-")
+        if is_chat_source and project_id != request.project_id:
+            continue
+        
+        # Vector similarity (cosine similarity), normalized to [0, 1] (cosine similarity is [-1, 1])
+        score = 0.0
+        norm_embedding = np.linalg.norm(embedding)
+        if norm_query > 0 and norm_embedding > 0:
+            similarity = np.dot(query_embedding, embedding) / (norm_query * norm_embedding)
+            score = (similarity + 1.0) / 2.0
+        
+        ann_results.append({
+            "embedding_id": chunk_id,
+            "score": score,
+            "chunk_id": chunk_id,
+            "file_id": file_id,
+            "file_path": file_path,
+            "chunk_text": chunk_text,
+            "source_id": source_id,
+            "project_id": project_id,
+            "filetype": filetype,
+            "chunk_index": chunk_index,
+            "start_char": start_char,
+            "end_char": end_char,
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "message_uuid": message_uuid,
+        })
+    
+    ann_results.sort(key=lambda r: r["score"], reverse=True)
+    return ann_results
+
+
+def _lexical_candidates(request: SearchRequest) -> List[dict]:
+    """
+    BM25 candidates from the chunks_fts full-text index of the requested file sources
+    and the project's chat source, best first.
+    """
+    fts_query = build_fts_query(request.query)
+    if fts_query is None:
+        return []
+    
+    source_ids = list(request.source_ids or [])
+    chat_source_id = f"project-{request.project_id}"
+    if chat_source_id not in source_ids:
+        source_ids.append(chat_source_id)
+    
+    results = []
+    for source_id in source_ids:
+        if not db.get_db_path_for_source(source_id).exists():
+            continue
+        try:
+            results.extend(db.search_chunks_fts(
+                source_id, fts_query, request.limit * 2, exclude_chat_ids=request.exclude_chat_ids
+            ))
+        except Exception as e:
+            logger.warning(f"Error in full-text search of source {source_id}: {e}")
+    
+    # BM25 scores are comparable across sources well enough for ranking candidates
+    results.sort(key=lambda r: r["score"], reverse=True)
+    return results[:request.limit * 2]
+
+
+def _near_dup_thresholds() -> Dict[str, float]:
+    """Per-source near-duplicate thresholds from the source config (chat sources use NEAR_DUP_THRESHOLD)."""
+    try:
+        return get_near_dup_thresholds()
+    except Exception as e:
+        logger.warning(f"[NEAR-DUP] Could not load source thresholds, using {NEAR_DUP_THRESHOLD}: {e}")
+        return {}
+
+
 @app.post("/search", response_model=SearchResponse)
 async def search(request: SearchRequest):
     """
     Search for relevant chunks by source_ids and query.
     
-    Returns top-N matches ordered by cosine similarity.
-    If source_ids is not provided, returns empty results.
+    Returns top-N matches. If source_ids is not provided, only chat messages are searched.
     
-    Uses query expansion to improve recall for table-heavy documents.
+    Modes (request.mode):
+    - hybrid (default): BM25 over the chunks_fts full-text index and vector search run in
+      parallel and are merged with reciprocal-rank fusion. Exact-term queries (quoted text,
+      IDs, code symbols, file names) are answered from the full-text index alone when it
+      has hits, without computing a query embedding.
+    - vector: cosine similarity only (scores in [0, 1])
+    - lexical: BM25 only
+    Fused scores are normalized to [0, 1] (1.0 = ranked first by every retriever).
     
     PROJECT ISOLATION:
     - Chat sources (source_id starts with "project-"): Strict project isolation - must match project_id
@@ -772,136 +969,43 @@ async def search(request: SearchRequest):
             logger.error(f"[ISOLATION] Search rejected: project_id is missing or empty")
             raise HTTPException(status_code=400, detail="project_id is required and cannot be empty")
         
+        if request.mode not in SEARCH_MODES:
+            raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(SEARCH_MODES)}")
+        
         # Debug logging for every memory query
         exclude_count = len(request.exclude_chat_ids) if request.exclude_chat_ids else 0
-        logger.info(f"[MEMORY-QUERY] project_id={request.project_id}, chat_id={request.chat_id}, limit={request.limit}, source_ids={request.source_ids}, exclude_chat_ids={exclude_count} chats")
-        # Query expansion: extract key terms and search for them individually
+        logger.info(f"[MEMORY-QUERY] project_id={request.project_id}, chat_id={request.chat_id}, limit={request.limit}, mode={request.mode}, source_ids={request.source_ids}, exclude_chat_ids={exclude_count} chats")
         # Note: We allow empty source_ids to enable chat-only searches
-        # This helps with table-heavy PDFs where the full query might not match well
-        query_terms = []
-        original_query = request.query.lower()
-        
-        # Extract potential key terms (words that look important)
-        words = original_query.split()
-        for word in words:
-            # Keep words that are likely meaningful (not common stop words)
-            if len(word) > 3 and word not in ['the', 'what', 'when', 'where', 'which', 'this', 'that', 'with', 'from']:
-                query_terms.append(word)
-        
-        # Also try the original query
-        all_queries = [request.query] + query_terms[:3]  # Limit to top 3 terms to avoid too many searches
-        
-        # Embed all query variations (using cached query embeddings)
-        query_embeddings = [get_query_embedding(q) for q in all_queries]
         
-        # Use primary query embedding for ANN search
-        primary_query_embedding = query_embeddings[0]
-        
-        # Determine which sources to search
-        filter_source_ids = request.source_ids if request.source_ids else None
-        
-        # Try ANN search first
-        use_ann = ann_index_manager.is_available()
-        ann_results = []
-        
-        if use_ann:
-            try:
-                logger.info(f"[ANN] Using FAISS IndexFlatIP for vector search (k={request.limit * 2}, project_id={request.project_id})")
-                # Search for more results to account for filtering
-                ann_results = ann_index_manager.search(
-                    primary_query_embedding,
-                    top_k=request.limit * 2,  # Get more candidates
-                    filter_source_ids=filter_source_ids,
-                    filter_project_id=request.project_id,  # CRITICAL: Filter by project_id for isolation
-                    exclude_chat_ids=request.exclude_chat_ids  # CRITICAL: Exclude trashed chats
-                )
-            except Exception as e:
-                logger.warning(f"[ANN] ANN search failed, falling back to brute-force: {e}")
-                use_ann = False
-        
-        # Fallback to brute-force if ANN unavailable or failed
-        if not use_ann or len(ann_results) == 0:
-            logger.info("[ANN] ANN unavailable, falling back to brute-force")
-            
-            # Load all embeddings from specified sources
-            all_embeddings = []
-            if request.source_ids:  # Only search file sources if source_ids is provided
-                for source_id in request.source_ids:
-                    try:
-                        source_embeddings = db.get_all_embeddings_for_source(source_id, EMBEDDING_MODEL)
-                        all_embeddings.extend(source_embeddings)
-                    except Exception as e:
-                        logger.warning(f"Error searching source {source_id}: {e}")
-                        continue
-            
-            # Also search chat messages for this project (exclude trashed chats)
-            try:
-                chat_embeddings = db.get_chat_embeddings_for_project(
-                    request.project_id, 
-                    EMBEDDING_MODEL, 
-                    exclude_chat_id=None,  # Backward compatibility
-                    exclude_chat_ids=request.exclude_chat_ids  # Exclude trashed chats
-                )
-                all_embeddings.extend(chat_embeddings)
-            except Exception as e:
-                logger.debug(f"Error searching chat messages for project {request.project_id}: {e}")
-            
-            if not all_embeddings:
-                return SearchResponse(results=[])
-            
-            # Compute vector scores using brute-force
-            ann_results = []
-            for chunk_id, embedding, file_id, file_path, chunk_text, source_id, project_id, filetype, chunk_index, start_char, end_char, chat_id, message_id, message_uuid in all_embeddings:
-                # PROJECT ISOLATION LOGIC:
-                # - Chat sources (source_id starts with "project-"): Strict project isolation - must match project_id
-                # - File sources: If source_id is in request.source_ids (connected to this project), allow cross-project access
-                #   This enables sharing file sources across projects without reindexing
-                is_chat_source = source_id and source_id.startswith("project-")
-                if is_chat_source:
-                    # Chat sources: strict isolation - must match project_id
-                    if project_id != request.project_id:
-                        continue
+        if request.mode == "vector":
+            candidates = await asyncio.to_thread(_vector_candidates, request)
+        elif request.mode == "lexical":
+            candidates = reciprocal_rank_fusion([await asyncio.to_thread(_lexical_candidates, request)])
+        else:
+            lexical_results = None
+            if is_exact_term_query(request.query):
+                # IDs, symbols, file names: answer from the full-text index without embedding the query
+                lexical_results = await asyncio.to_thread(_lexical_candidates, request)
+            if lexical_results:
+                logger.info(f"[MEMORY-QUERY] Exact-term query answered lexically ({len(lexical_results)} candidates)")
+                candidates = reciprocal_rank_fusion([lexical_results])
+            else:
+                if lexical_results is None:
+                    lexical_results, vector_results = await asyncio.gather(
+                        asyncio.to_thread(_lexical_candidates, request),
+                        asyncio.to_thread(_vector_candidates, request),
+                    )
                 else:
-                    # File sources: if source_id is in allowed list, allow it (cross-project access)
-                    # Note: source_ids were already filtered when loading embeddings above,
-                    # so if we get here with a file source, it's allowed regardless of project_id
-                    pass
-                
-                # Vector similarity (cosine similarity) - try all query variations and take best
-                best_vector_score = 0.0
-                for query_embedding in query_embeddings:
-                    dot_product = np.dot(query_embedding, embedding)
-                    norm_query = np.linalg.norm(query_embedding)
-                    norm_embedding = np.linalg.norm(embedding)
-                    
-                    if norm_query > 0 and norm_embedding > 0:
-                        similarity = dot_product / (norm_query * norm_embedding)
-                        # Normalize to [0, 1] range (cosine similarity is [-1, 1])
-                        normalized = (similarity + 1.0) / 2.0
-                        best_vector_score = max(best_vector_score, normalized)
-                
-                ann_results.append({
-                    "embedding_id": chunk_id,
-                    "score": best_vector_score,
-                    "chunk_id": chunk_id,
-                    "file_id": file_id,
-                    "file_path": file_path,
-                    "chunk_text": chunk_text,
-                    "source_id": source_id,
-                    "project_id": project_id,
-                    "filetype": filetype,
-                    "chunk_index": chunk_index,
-                    "start_char": start_char,
-                    "end_char": end_char,
-                    "chat_id": chat_id,
-                    "message_id": message_id,
-                    "message_uuid": message_uuid,
-                })
+                    vector_results = await asyncio.to_thread(_vector_candidates, request)
+                candidates = reciprocal_rank_fusion([lexical_results, vector_results])
         
         # Build results from ANN results, FILTERING BY PROJECT_ID AND EXCLUDED CHAT_IDS
         results = []
         excluded_chat_ids_set = set(request.exclude_chat_ids) if request.exclude_chat_ids else set()
-        for result in ann_results:
+        collapser = NearDuplicateCollapser(NEAR_DUP_THRESHOLD)
+        near_dup_thresholds = _near_dup_thresholds() if candidates else {}
+        collapsed_count = 0
+        for result in candidates:
             # CRITICAL: Filter by project_id to ensure strict isolation
             if result.get("project_id") != request.project_id:
                 logger.warning(f"[ISOLATION] Filtered out result with wrong project_id: {result.get('project_id')} (expected {request.project_id})")
@@ -913,6 +1017,15 @@ async def search(request: SearchRequest):
                 logger.debug(f"[TRASH-FILTER] Filtered out result from trashed chat_id: {chat_id}")
                 continue
             
+            # Collapse near-duplicates of a higher-ranked result (e.g. the same text in another source)
+            duplicate_of = collapser.find_duplicate(
+                len(results), result["chunk_text"] or "", near_dup_thresholds.get(result["source_id"])
+            )
+            if duplicate_of is not None:
+                results[duplicate_of].duplicate_count += 1
+                collapsed_count += 1
+                continue
+            
             source_type = "chat" if result.get("chat_id") is not None else "file"
             results.append(SearchResult(
                 score=float(result["score"]),
@@ -934,6 +1047,8 @@ async def search(request: SearchRequest):
             if len(results) >= request.limit:
                 break
         
+        if collapsed_count:
+            logger.info(f"[NEAR-DUP] Collapsed {collapsed_count} near-duplicate search results")
         logger.info(f"[MEMORY-QUERY] Returning {len(results)} results for project_id={request.project_id}")
         return SearchResponse(results=results)
         
@@ -949,6 +1064,10 @@ async def delete_chat_messages(project_id: str, chat_id: str):
     This is called when a chat is permanently deleted.
     """
     try:
+        # Stop pending indexing of the chat so it does not re-add chunks after the delete
+        cancelled_jobs = get_indexing_queue().cancel_chat_jobs(project_id, chat_id)
+        if cancelled_jobs:
+            logger.info(f"[INDEX-QUEUE] Cancelled {cancelled_jobs} indexing job(s) of deleted chat {chat_id}")
         deleted_count = db.delete_chat_messages_by_chat_id(project_id, chat_id)
         return {
             "status": "ok",
@@ -1031,6 +1150,65 @@ async def index_chat_message_endpoint(request: IndexChatMessageRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/index-chat-messages")
+async def index_chat_messages_endpoint(request: IndexChatMessagesRequest):
+    """
+    Enqueue many chat messages for async indexing in one request.
+    
+    Message records (and their message_uuids) are upserted with one transaction
+    per project; the jobs are then enqueued together so queue workers can index
+    them as grouped batches (one transaction, one embedding batch, one ANN add).
+    
+    Returns:
+        - results: One entry per message (same order) with job_id, message_uuid and status
+    """
+    try:
+        messages = []
+        for msg in request.messages:
+            messages.append({
+                "project_id": msg.project_id,
+                "chat_id": msg.chat_id,
+                "message_id": msg.message_id,
+                "role": msg.role,
+                "content": msg.content,
+                "timestamp": datetime.fromisoformat(msg.timestamp.replace('Z', '+00:00')),
+                "message_index": msg.message_index,
+                "message_uuid": msg.message_uuid,
+            })
+        
+        # Create message_uuids early (before enqueueing) for fact exclusion - one transaction per project
+        by_project = {}
+        for pos, msg in enumerate(messages):
+            by_project.setdefault(msg["project_id"], []).append(pos)
+        for project_id, positions in by_project.items():
+            source_id = f"project-{project_id}"
+            db.init_db(source_id, project_id=project_id)
+            upserted = db.upsert_chat_messages_bulk(source_id, project_id, [messages[pos] for pos in positions])
+            for pos, (_, message_uuid) in zip(positions, upserted):
+                messages[pos]["message_uuid"] = message_uuid
+        
+        indexing_queue = get_indexing_queue()
+        enqueued = indexing_queue.enqueue_many(messages)
+        
+        results = []
+        for msg, (job_id, success) in zip(messages, enqueued):
+            results.append({
+                "status": "queued" if success else "error",
+                "job_id": job_id if success else None,
+                "message_uuid": msg["message_uuid"],  # Available immediately for fact exclusion
+                "chat_id": msg["chat_id"],
+                "message_id": msg["message_id"],
+            })
+        
+        queued = sum(1 for r in results if r["status"] == "queued")
+        logger.info(f"[MEMORY] Enqueued {queued}/{len(results)} indexing jobs via bulk endpoint")
+        return {"status": "ok", "results": results}
+    
+    except Exception as e:
+        logger.error(f"Error enqueueing bulk indexing jobs: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/index-job-status/{job_id}")
 async def get_index_job_status(job_id: str):
     """
@@ -1128,6 +1306,52 @@ async def search_facts(request: SearchFactsRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class FactHistoryRequest(BaseModel):
+    project_id: str
+    fact_key: str
+    limit: int = 20
+
+
+@app.post("/fact-history", response_model=SearchFactsResponse)
+async def fact_history(request: FactHistoryRequest):
+    """
+    Get the versions of a fact, newest first: the current fact followed by
+    the values it superseded (project_facts_history).
+    
+    Facts DB contract: project_id must be UUID, never project name/slug.
+    """
+    try:
+        from server.services.projects.project_resolver import validate_project_uuid
+        validate_project_uuid(request.project_id)
+        
+        facts = db.get_fact_history(
+            project_id=request.project_id,
+            fact_key=request.fact_key,
+            limit=request.limit
+        )
+        logger.info(f"[FACTS-API] Found {len(facts)} versions of '{request.fact_key}' for project_id={request.project_id}")
+        
+        return SearchFactsResponse(facts=[
+            FactResponse(
+                fact_id=fact["fact_id"],
+                project_id=fact["project_id"],
+                fact_key=fact["fact_key"],
+                value_text=fact["value_text"],
+                value_type=fact["value_type"],
+                confidence=fact["confidence"],
+                source_message_uuid=fact["source_message_uuid"],
+                created_at=fact["created_at"].isoformat() if isinstance(fact["created_at"], datetime) else str(fact["created_at"]),
+                effective_at=fact["effective_at"].isoformat() if isinstance(fact["effective_at"], datetime) else str(fact["effective_at"]),
+                supersedes_fact_id=fact.get("supersedes_fact_id"),
+                is_current=fact["is_current"]
+            )
+            for fact in facts
+        ])
+    except Exception as e:
+        logger.error(f"Error getting fact history: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/sources/{source_id}/chunk-stats")
 async def get_chunk_stats(source_id: str):
     """
@@ -1177,6 +1401,10 @@ async def get_chunk_stats(source_id: str):
         """)
         size_dist = [{"range": row[0], "count": row[1]} for row in cursor.fetchall()]
         
+        # Near-duplicate chunks linked to a canonical chunk (not embedded)
+        cursor.execute("SELECT COUNT(*) FROM chunks WHERE canonical_chunk_id IS NOT NULL")
+        near_duplicate_chunks = cursor.fetchone()[0]
+        
         conn.close()
         
         return {
@@ -1184,6 +1412,8 @@ async def get_chunk_stats(source_id: str):
             "total_chunks": stats[0],
             "unique_chunks": stats[1],
             "duplicate_rate": round((1 - stats[1] / stats[0]) * 100, 2) if stats[0] > 0 else 0,
+            "near_duplicate_chunks": near_duplicate_chunks,
+            "near_duplicate_rate": round(near_duplicate_chunks / stats[0] * 100, 2) if stats[0] > 0 else 0,
             "avg_chunk_size": round(stats[2], 1) if stats[2] else 0,
             "min_chunk_size": stats[3] or 0,
             "max_chunk_size": stats[4] or 0,
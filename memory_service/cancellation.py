@@ -0,0 +1,80 @@
+"""
+Cooperative cancellation for indexing jobs.
+
+Python threads cannot be killed, so long-running indexing work checks a
+CancellationToken between its phases (chunk -> embed -> write) and stops
+cleanly once the token is cancelled or its deadline has passed. Work that
+stops at a checkpoint releases its SQLite connections and model time instead
+of running on in the background.
+"""
+import threading
+import time
+from typing import Optional, Sequence
+
+
+class JobCancelledError(Exception):
+    """Raised at a checkpoint when the job's CancellationToken is cancelled."""
+    pass
+
+
+class CancellationToken:
+    """
+    Cancellation flag with an optional deadline (time.monotonic() based).
+
+    A token can be linked to other tokens (e.g. a batch token to the tokens of
+    its jobs): it is cancelled as soon as any of them is, with reason "linked".
+    """
+
+    def __init__(self, timeout: Optional[float] = None, linked: Sequence["CancellationToken"] = ()):
+        self._event = threading.Event()
+        self.deadline: Optional[float] = time.monotonic() + timeout if timeout is not None else None
+        self.reason: Optional[str] = None
+        self.linked = list(linked)
+
+    def cancel(self, reason: str = "cancelled"):
+        """Cancel the job; it stops at its next checkpoint."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """True if cancelled explicitly, the deadline has passed or a linked token is cancelled."""
+        if not self._event.is_set():
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self.cancel("timeout")
+            elif any(token.is_cancelled for token in self.linked):
+                self.cancel("linked")
+        return self._event.is_set()
+
+    @property
+    def fired(self) -> bool:
+        """
+        True if the token has been cancelled so far: explicitly, or by a check that saw
+        the deadline pass. Unlike is_cancelled, reading it never cancels the token, so
+        it tells whether work stopped because of the token or for another reason.
+        """
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline (None if no deadline)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def raise_if_cancelled(self, phase: str = ""):
+        """
+        Checkpoint: raise JobCancelledError if the job should stop.
+
+        Args:
+            phase: Name of the phase about to start (for the error message)
+        """
+        if self.is_cancelled:
+            where = f" before {phase}" if phase else ""
+            raise JobCancelledError(f"Job {self.reason}{where}")
+
+
+def check_cancelled(token: Optional[CancellationToken], phase: str = ""):
+    """Checkpoint helper that accepts token=None (no cancellation)."""
+    if token is not None:
+        token.raise_if_cancelled(phase)
@@ -0,0 +1,245 @@
+"""
+Tokenizer-exact chunking for the Memory Service.
+
+The embedding model (BGE) silently truncates its input at max_seq_length
+tokens. The legacy character-based chunkers approximate tokens as ~4 chars,
+which breaks down for code, tables and non-English text: those chunks get
+embedded at full cost and their tails are cut off.
+
+This module splits text using the embedding model's own fast tokenizer:
+- One batched tokenizer call per list of texts, with offset mapping
+- Exact token budgets (max_seq_length minus special tokens) and exact overlap
+- Cuts snap back to a paragraph, line or sentence boundary when one is close
+
+The chunkers take the tokenizer as an argument so they stay independent of
+sentence-transformers; indexer.py passes get_tokenizer() from embeddings.py.
+"""
+import bisect
+import logging
+from typing import List, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+# Boundary markers in order of preference when snapping a cut
+BOUNDARY_MARKERS = ("\n\n", "\n", ". ")
+
+# A boundary is only used if the chunk keeps at least this fraction of its token budget
+MIN_BOUNDARY_FILL = 0.5
+
+# File chunks this short or shorter (after strip) are dropped, matching the legacy file chunker.
+# Chat messages pass min_chars=0: every non-empty message is indexed.
+MIN_CHUNK_CHARS = 10
+
+
+def get_token_budget(tokenizer: Any, max_tokens: int) -> int:
+    """
+    Number of content tokens that fit into one model input.
+
+    Args:
+        tokenizer: HuggingFace fast tokenizer
+        max_tokens: Model max sequence length (including special tokens)
+
+    Returns:
+        Token budget for chunk content (max_tokens minus [CLS]/[SEP] etc.)
+    """
+    try:
+        special = tokenizer.num_special_tokens_to_add(pair=False)
+    except Exception:
+        special = 2
+    return max(1, max_tokens - special)
+
+
+def tokenize_with_offsets(tokenizer: Any, texts: List[str]) -> List[List[Tuple[int, int]]]:
+    """
+    Tokenize texts in one batched call and return per-token character offsets.
+
+    Args:
+        tokenizer: HuggingFace fast tokenizer (must support return_offsets_mapping)
+        texts: Texts to tokenize
+
+    Returns:
+        List (one per text) of (start_char, end_char) tuples, one per token
+    """
+    if not texts:
+        return []
+    encoded = tokenizer(
+        texts,
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+        truncation=False,
+        verbose=False,
+    )
+    return [[(int(s), int(e)) for s, e in offsets] for offsets in encoded["offset_mapping"]]
+
+
+def _snap_to_boundary(text: str, offsets: List[Tuple[int, int]], starts: List[int],
+                      start_tok: int, end_tok: int, budget: int) -> int:
+    """
+    Move a hard token cut back to the nearest paragraph/line/sentence boundary.
+
+    Returns the new (exclusive) end token index, or end_tok if no boundary
+    keeps the chunk at least MIN_BOUNDARY_FILL of the budget.
+    """
+    min_end_tok = start_tok + max(1, int(budget * MIN_BOUNDARY_FILL))
+    if min_end_tok >= end_tok:
+        return end_tok
+
+    window_start = offsets[min_end_tok][0]
+    window_end = offsets[end_tok][0]  # First char of the first token that does not fit
+
+    for marker in BOUNDARY_MARKERS:
+        pos = text.rfind(marker, window_start, window_end)
+        if pos != -1:
+            # First token starting at/after the boundary becomes the exclusive end
+            boundary_tok = bisect.bisect_left(starts, pos + len(marker))
+            if min_end_tok <= boundary_tok <= end_tok:
+                return boundary_tok
+    return end_tok
+
+
+def _trimmed_span(text: str, start_char: int, end_char: int) -> Tuple[str, int, int]:
+    """text[start_char:end_char] stripped, with the offsets moved to the stripped text."""
+    span = text[start_char:end_char]
+    stripped = span.lstrip()
+    start_char += len(span) - len(stripped)
+    stripped = stripped.rstrip()
+    return stripped, start_char, start_char + len(stripped)
+
+
+def _chunk_from_offsets(text: str, offsets: List[Tuple[int, int]], budget: int,
+                        overlap_tokens: int, min_chars: int) -> List[Tuple[int, str, int, int]]:
+    """Split one text into chunks given its token offsets (chunks of min_chars or fewer are dropped)."""
+    n_tokens = len(offsets)
+    if n_tokens <= budget:
+        # Whole text in one chunk, filtered like the chunks below
+        chunk_text, start_char, end_char = _trimmed_span(text, 0, len(text))
+        return [(0, chunk_text, start_char, end_char)] if len(chunk_text) > min_chars else []
+
+    starts = [s for s, _ in offsets]
+    overlap_tokens = max(0, min(overlap_tokens, budget // 2))
+
+    chunks = []
+    chunk_index = 0
+    start_tok = 0
+
+    while start_tok < n_tokens:
+        end_tok = min(start_tok + budget, n_tokens)
+        if end_tok < n_tokens:
+            end_tok = _snap_to_boundary(text, offsets, starts, start_tok, end_tok, budget)
+
+        chunk_text, start_char, end_char = _trimmed_span(text, offsets[start_tok][0], offsets[end_tok - 1][1])
+
+        if len(chunk_text) > min_chars:
+            chunks.append((chunk_index, chunk_text, start_char, end_char))
+            chunk_index += 1
+
+        if end_tok >= n_tokens:
+            break
+
+        # Step back by the exact overlap, but always make progress
+        start_tok = max(start_tok + 1, end_tok - overlap_tokens)
+
+    return chunks
+
+
+def chunk_texts_by_tokens(
+    texts: List[str],
+    tokenizer: Any,
+    max_tokens: int,
+    overlap_tokens: int,
+    min_chars: int = MIN_CHUNK_CHARS,
+) -> List[List[Tuple[int, str, int, int]]]:
+    """
+    Chunk several texts with exact token budgets using one batched tokenizer call.
+
+    Args:
+        texts: Texts to chunk
+        tokenizer: HuggingFace fast tokenizer
+        max_tokens: Model max sequence length (including special tokens)
+        overlap_tokens: Number of tokens shared between consecutive chunks
+        min_chars: Chunks of this many characters or fewer (after strip) are dropped
+
+    Returns:
+        List (one per text) of (chunk_index, chunk_text, start_char, end_char) tuples
+    """
+    budget = get_token_budget(tokenizer, max_tokens)
+    all_offsets = tokenize_with_offsets(tokenizer, texts)
+    return [
+        _chunk_from_offsets(text, offsets, budget, overlap_tokens, min_chars)
+        for text, offsets in zip(texts, all_offsets)
+    ]
+
+
+def chunk_text_by_tokens(
+    text: str,
+    tokenizer: Any,
+    max_tokens: int,
+    overlap_tokens: int,
+    min_chars: int = MIN_CHUNK_CHARS,
+) -> List[Tuple[int, str, int, int]]:
+    """
+    Chunk a single text with exact token budgets.
+
+    Args:
+        text: Text to chunk
+        tokenizer: HuggingFace fast tokenizer
+        max_tokens: Model max sequence length (including special tokens)
+        overlap_tokens: Number of tokens shared between consecutive chunks
+        min_chars: Chunks of this many characters or fewer (after strip) are dropped
+
+    Returns:
+        List of (chunk_index, chunk_text, start_char, end_char) tuples
+    """
+    if not text:
+        return []
+    return chunk_texts_by_tokens([text], tokenizer, max_tokens, overlap_tokens, min_chars)[0]
+
+
+def count_tokens(texts: List[str], tokenizer: Any) -> List[int]:
+    """
+    Count tokens per text as the model sees them (including special tokens).
+
+    Args:
+        texts: Texts to measure
+        tokenizer: HuggingFace fast tokenizer
+
+    Returns:
+        List of token counts, one per text
+    """
+    if not texts:
+        return []
+    encoded = tokenizer(
+        texts,
+        add_special_tokens=True,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+        truncation=False,
+        verbose=False,
+    )
+    return [len(ids) for ids in encoded["input_ids"]]
+
+
+def truncation_stats(chunk_texts: List[str], tokenizer: Any, max_tokens: int) -> dict:
+    """
+    Measure how many chunks exceed the model's max sequence length.
+
+    Args:
+        chunk_texts: Chunk texts to measure
+        tokenizer: HuggingFace fast tokenizer
+        max_tokens: Model max sequence length (including special tokens)
+
+    Returns:
+        Dict with chunk_count, truncated_count, truncation_rate, total_tokens
+        and dropped_tokens (tokens past max_tokens that the model never sees)
+    """
+    counts = count_tokens(chunk_texts, tokenizer)
+    truncated = [c for c in counts if c > max_tokens]
+    return {
+        "chunk_count": len(counts),
+        "truncated_count": len(truncated),
+        "truncation_rate": (len(truncated) / len(counts)) if counts else 0.0,
+        "total_tokens": sum(counts),
+        "dropped_tokens": sum(c - max_tokens for c in truncated),
+    }
@@ -7,10 +7,12 @@ import yaml
 import json
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import os
 import tempfile
 import shutil
+import threading
+import time
 
 # Base directory for ChatDO
 BASE_DIR = Path(__file__).parent.parent
@@ -26,12 +28,92 @@ PROJECTS_PATH = BASE_DIR / "memory_service" / "projects"
 # Global tracking database for dashboard (tracks all sources)
 TRACKING_DB_PATH = MEMORY_DASHBOARD_PATH / "tracking.sqlite"
 
+# Durable journal for the chat indexing queue (survives restarts)
+INDEX_QUEUE_DB_PATH = MEMORY_DASHBOARD_PATH / "index_queue.sqlite"
+
 # Dynamic sources JSON file (for UI-created sources)
 DYNAMIC_SOURCES_PATH = MEMORY_DASHBOARD_PATH / "dynamic_sources.json"
 
 # Legacy alias for backward compatibility (will be removed)
 BASE_STORE_PATH = MEMORY_DASHBOARD_PATH
 
+# projects.json location and how often the project directory cache re-checks its mtime
+PROJECTS_JSON_PATH = BASE_DIR / "server" / "data" / "projects.json"
+PROJECTS_JSON_RECHECK_SECONDS = float(os.getenv("PROJECTS_JSON_RECHECK_SECONDS", "2.0"))
+
+# Resolver caches (project_id -> directory name, (source_id, project_id) -> DB path)
+_project_dir_names: Optional[Dict[str, str]] = None
+_project_dir_names_mtime_ns: Optional[int] = None
+_project_dir_names_checked_at = 0.0
+_db_path_cache: Dict[Tuple[str, Optional[str]], Path] = {}
+_resolver_lock = threading.Lock()
+
+# Per-source near-duplicate thresholds, keyed by the mtimes of the source config files
+_near_dup_thresholds: Optional[Dict[str, float]] = None
+_near_dup_thresholds_mtimes: Optional[Tuple[Optional[int], Optional[int]]] = None
+
+
+def _load_project_directory_names() -> Dict[str, str]:
+    """Parse projects.json into project_id -> directory name (slugified name, or project_id)."""
+    names = {}
+    try:
+        if PROJECTS_JSON_PATH.exists():
+            with open(PROJECTS_JSON_PATH, 'r') as f:
+                projects = json.load(f)
+                for project in projects:
+                    project_id = project.get("id")
+                    if not project_id or project_id in names:
+                        continue
+                    # Use slugified project name for directory, fallback to project_id if no name
+                    project_name = project.get("name", "")
+                    names[project_id] = slugify(project_name) if project_name else project_id
+    except Exception:
+        pass
+    return names
+
+
+def _get_project_directory_names() -> Dict[str, str]:
+    """
+    Cached project_id -> directory name map.
+    
+    projects.json is stat'ed at most every PROJECTS_JSON_RECHECK_SECONDS and only
+    re-parsed when its mtime changes; invalidate_project_directory_cache() forces
+    a reload. When the mapping changes, memoized DB paths are dropped.
+    """
+    global _project_dir_names, _project_dir_names_mtime_ns, _project_dir_names_checked_at
+    names = _project_dir_names
+    if names is not None and time.monotonic() - _project_dir_names_checked_at < PROJECTS_JSON_RECHECK_SECONDS:
+        return names
+    
+    with _resolver_lock:
+        try:
+            mtime_ns = PROJECTS_JSON_PATH.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if _project_dir_names is None or mtime_ns != _project_dir_names_mtime_ns:
+            names = _load_project_directory_names()
+            if names != _project_dir_names:
+                _db_path_cache.clear()
+            _project_dir_names = names
+            _project_dir_names_mtime_ns = mtime_ns
+        _project_dir_names_checked_at = time.monotonic()
+        return _project_dir_names
+
+
+def invalidate_project_directory_cache():
+    """
+    Drop cached project directory names and memoized DB paths.
+    
+    Called when projects.json is known to have changed (e.g. notified by the server),
+    so the change is visible without waiting for the mtime re-check.
+    """
+    global _project_dir_names, _project_dir_names_mtime_ns
+    with _resolver_lock:
+        _project_dir_names = None
+        _project_dir_names_mtime_ns = None
+        _db_path_cache.clear()
+
+
 def get_project_directory_name(project_id: str) -> str:
     """
     Get the directory name for a project in memory_service/projects/.
@@ -45,24 +127,7 @@ def get_project_directory_name(project_id: str) -> str:
     Returns:
         Directory name to use in projects/ folder (slugified name or project_id)
     """
-    try:
-        projects_path = BASE_DIR / "server" / "data" / "projects.json"
-        if projects_path.exists():
-            with open(projects_path, 'r') as f:
-                projects = json.load(f)
-                for project in projects:
-                    if project.get("id") == project_id:
-                        # Use slugified project name for directory
-                        project_name = project.get("name", "")
-                        if project_name:
-                            return slugify(project_name)
-                        # Fallback to project_id if no name
-                        return project_id
-    except Exception:
-        pass
-    
-    # Fallback to project_id
-    return project_id
+    return _get_project_directory_names().get(project_id, project_id)
 
 
 def get_db_path_for_source(source_id: str, project_id: Optional[str] = None) -> Path:
@@ -76,10 +141,21 @@ def get_db_path_for_source(source_id: str, project_id: Optional[str] = None) ->
     For file source indexes (all other source_ids):
     - Stores in memory_dashboard/<source_id>/index.sqlite
     
+    Resolved paths are memoized (the directory is created on first resolution),
+    so repeated lookups do no file I/O.
+    
     Args:
         source_id: Source ID (e.g., "project-{project_id}" for chat indexes, or "coin-dir" for file sources)
         project_id: Optional project_id (used to look up project directory name for project indexes)
     """
+    key = (source_id, project_id)
+    if source_id.startswith("project-"):
+        # Refreshes the directory names (and drops stale paths) when projects.json changed
+        _get_project_directory_names()
+    cached = _db_path_cache.get(key)
+    if cached is not None:
+        return cached
+    
     if source_id.startswith("project-"):
         # This is a project chat message index
         # Extract project_id from source_id (format: "project-<project_id>")
@@ -94,12 +170,15 @@ def get_db_path_for_source(source_id: str, project_id: Optional[str] = None) ->
         # Store in projects/<project_dir_name>/index/index.sqlite
         index_dir = PROJECTS_PATH / project_dir_name / "index"
         index_dir.mkdir(parents=True, exist_ok=True)
-        return index_dir / "index.sqlite"
+        db_path = index_dir / "index.sqlite"
     else:
         # This is a file source index - store in memory_dashboard
         source_dir = MEMORY_DASHBOARD_PATH / source_id
         source_dir.mkdir(parents=True, exist_ok=True)
-        return source_dir / "index.sqlite"
+        db_path = source_dir / "index.sqlite"
+    
+    _db_path_cache[key] = db_path
+    return db_path
 
 # Embedding model
 EMBEDDING_MODEL = "BAAI/bge-large-en-v1.5"
@@ -109,6 +188,14 @@ EMBEDDING_DIM = 1024
 CHUNK_SIZE_CHARS = 2500  # Target chunk size in characters
 CHUNK_OVERLAP_CHARS = 200  # Overlap between chunks
 
+# Token-exact chunking (uses the embedding model's tokenizer; char settings above are the fallback)
+CHUNK_SIZE_TOKENS = 512  # Must not exceed the model's max_seq_length (512 for BGE)
+CHUNK_OVERLAP_TOKENS = 64  # Overlap between chunks in tokens
+
+# Near-duplicate chunk suppression (MinHash/LSH, estimated Jaccard similarity)
+# Per-source override: "near_dup_threshold" in memory_sources.yaml / dynamic_sources.json (0 disables)
+NEAR_DUP_THRESHOLD = 0.9
+
 # API settings
 API_HOST = "127.0.0.1"
 API_PORT = 5858
@@ -123,6 +210,7 @@ class SourceConfig:
         self.include_glob = data.get("include_glob", "**/*")
         self.exclude_glob = data.get("exclude_glob", "")
         self.display_name = data.get("display_name", self.id)
+        self.near_dup_threshold = float(data.get("near_dup_threshold", NEAR_DUP_THRESHOLD))
     
     def __repr__(self):
         return f"SourceConfig(id={self.id}, project_id={self.project_id}, root_path={self.root_path})"
@@ -218,6 +306,7 @@ def save_dynamic_sources(sources: List[SourceConfig]) -> None:
             "include_glob": src.include_glob,
             "exclude_glob": src.exclude_glob,
             "display_name": src.display_name,
+            "near_dup_threshold": src.near_dup_threshold,
         }
         for src in sources
     ]
@@ -262,6 +351,34 @@ def load_sources() -> List[SourceConfig]:
     return merge_static_and_dynamic(static, dynamic)
 
 
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_near_dup_thresholds() -> Dict[str, float]:
+    """
+    Cached source_id -> near_dup_threshold map of all configured sources.
+    
+    memory_sources.yaml and dynamic_sources.json are stat'ed on each call and only
+    re-parsed when one of them changed (adding/removing a source rewrites
+    dynamic_sources.json). Sources not in the map use NEAR_DUP_THRESHOLD.
+    """
+    global _near_dup_thresholds, _near_dup_thresholds_mtimes
+    mtimes = (_mtime_ns(MEMORY_SOURCES_YAML), _mtime_ns(DYNAMIC_SOURCES_PATH))
+    thresholds = _near_dup_thresholds
+    if thresholds is not None and mtimes == _near_dup_thresholds_mtimes:
+        return thresholds
+    
+    with _resolver_lock:
+        if _near_dup_thresholds is None or mtimes != _near_dup_thresholds_mtimes:
+            _near_dup_thresholds = {source.id: source.near_dup_threshold for source in load_sources()}
+            _near_dup_thresholds_mtimes = mtimes
+        return _near_dup_thresholds
+
+
 def slugify(text: str) -> str:
     """Convert text to a URL-friendly slug."""
     # Convert to lowercase and replace spaces/special chars with hyphens
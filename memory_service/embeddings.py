@@ -26,6 +26,25 @@ def get_model() -> SentenceTransformer:
     return _model
 
 
+def get_tokenizer():
+    """
+    Get the embedding model's fast tokenizer (used for token-exact chunking).
+
+    Returns:
+        HuggingFace tokenizer, or None if the model has no fast tokenizer
+        (offset mapping requires a fast tokenizer)
+    """
+    tokenizer = getattr(get_model(), "tokenizer", None)
+    if tokenizer is None or not getattr(tokenizer, "is_fast", False):
+        return None
+    return tokenizer
+
+
+def get_max_seq_length() -> int:
+    """Get the model's max sequence length in tokens (inputs beyond this are truncated)."""
+    return int(getattr(get_model(), "max_seq_length", 512) or 512)
+
+
 def embed_texts(texts: List[str]) -> np.ndarray:
     """
     Generate embeddings for a list of texts.
@@ -46,6 +46,53 @@ EXPLICIT_FACT_PATTERNS = [
     r"(?:I|i)\s+(?:am|'m)\s+(.+?)(?:\.|$)",
     r"(?:I|i)\s+(?:have|got|own)\s+(?:a|an|the)?\s*(.+?)(?:\.|$)",
 ]
+_EXPLICIT_FACT_RES = [re.compile(pattern, re.IGNORECASE) for pattern in EXPLICIT_FACT_PATTERNS]
+
+# Trigger-word prefilter: for each cue kind, a regex for the literal prefix ("cue") the
+# extraction patterns of that kind need before they can match. Most chat messages contain
+# none of them and skip the extraction regexes. The cues are matched case-sensitively on
+# lowercased text; one small regex per kind scans faster than a single combined alternation
+# with IGNORECASE. Keep the cues in sync with the patterns: a cue may over-match, but must never miss.
+_FACT_CUE_RES = {
+    "statement": re.compile(r"(?:my|i)\s+(?:favorite|prefer|like|love|hate|dislike|am|'m|have|got|own|\w+\s+is\s)"),
+    "remember": re.compile(r"(?:remember|note|save)\s+that\s"),
+    "numbered": re.compile(r"\d\s*[).:]"),
+    "hash": re.compile(r"#\d"),
+    "ordinal": re.compile(r"(?:first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|eleventh|twelfth"
+                          r"|thirteenth|fourteenth|fifteenth)\s*:"),
+    "favorite": re.compile(r"favorite"),
+}
+
+
+def find_fact_cues(text: str) -> Dict[str, int]:
+    """
+    Find the fact cues in a message (see _FACT_CUE_RES).
+    
+    Args:
+        text: Message text
+        
+    Returns:
+        Dict of cue kind -> position of its first occurrence (empty if the message has no fact cues)
+    """
+    if not text.isascii():
+        # IGNORECASE folds some non-ASCII letters onto ASCII ones (e.g. "ſ" matches "s"), which
+        # str.lower() does not, so report every cue and let the patterns decide
+        return dict.fromkeys(_FACT_CUE_RES, 0)
+    text = text.lower()
+    cues: Dict[str, int] = {}
+    for kind, cue_re in _FACT_CUE_RES.items():
+        match = cue_re.search(text)
+        if match:
+            cues[kind] = match.start()
+    return cues
+
+
+# Topic keywords recognized without a "favorite X" phrase (_extract_topic_from_context), in priority order
+_TOPIC_KEYWORDS = ['crypto', 'cryptos', 'cryptocurrency', 'cryptocurrencies',
+                   'color', 'colors', 'candy', 'candies', 'pie', 'pies',
+                   'tv', 'show', 'television', 'food', 'textile', 'textiles',
+                   'cookie', 'cookies']
+_TOPIC_KEYWORD_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _TOPIC_KEYWORDS)) + r')\b')
 
 # Email pattern
 EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
@@ -59,6 +106,24 @@ CURRENCY_PATTERN = r'\$[\d,]+(?:\.\d{2})?'
 # Phone number pattern (US format)
 PHONE_PATTERN = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
 
+# Ranked-list patterns (FactExtractor._extract_ranked_lists), grouped by the fact cue they need
+# "numbered": "1) Blue, 2) Green" or "1. Blue, 2. Green"
+_RANK_NUMBERED_RE = re.compile(r'(\d+)\s*[\)\.\:]\s*([^,\n]+)', re.IGNORECASE)
+# "hash": "XMR is (actually) my #1 favorite", "Make X my #N", "My favorite #N is X",
+# "my #N favorite [topic] is X", "my #N is (actually) X", "#1 XMR"
+_RANK_VALUE_IS_MY_HASH_RE = re.compile(r'([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)\s+is\s+(?:actually\s+)?my\s+#(\d+)\s+favorite', re.IGNORECASE)
+_RANK_MAKE_VALUE_MY_HASH_RE = re.compile(r'make\s+([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)\s+my\s+#(\d+)(?:\s+favorite)?', re.IGNORECASE)
+_RANK_MY_FAVORITE_HASH_IS_RE = re.compile(r'my\s+favorite\s+#(\d+)\s+is\s+([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)', re.IGNORECASE)
+_RANK_MY_HASH_FAVORITE_IS_RE = re.compile(r'my\s+#(\d+)\s+favorite(?:\s+\w+)?\s+is\s+([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)(?:\s+and\s+my\s+#\d+)?', re.IGNORECASE)
+_RANK_MY_HASH_IS_RE = re.compile(r'my\s+#(\d+)\s+is\s+(?:actually\s+)?([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)', re.IGNORECASE)
+_RANK_HASH_VALUE_RE = re.compile(r'#(\d+)\s+([^,\n#]+)', re.IGNORECASE)
+# "ordinal": "first: Blue, second: Green"
+_RANK_ORDINAL_WORD_RE = re.compile(r'\b(first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|eleventh|twelfth|thirteenth|fourteenth|fifteenth)\s*[:]\s*([^,\n]+)', re.IGNORECASE)
+# "favorite": "LTC is my 9th favorite", "My favorite cryptos are XMR, BTC, and XLM", "My favorite crypto is SHIB, BCH"
+_RANK_ORDINAL_NUMBER_RE = re.compile(r'(\d+)(?:st|nd|rd|th)\s+(?:favorite|favorites)', re.IGNORECASE)
+_FAVORITE_LIST_ARE_RE = re.compile(r'(?:my\s+)?favorite\s+((?:\w+\s+)*\w+)\s+are\s+([^\.\?\!]+)', re.IGNORECASE)
+_FAVORITE_LIST_IS_RE = re.compile(r'(?:my\s+)?favorite\s+((?:\w+\s+)*\w+)\s+is\s+([^\.\?\!]+)', re.IGNORECASE)
+
 
 class FactExtractor:
     """Extracts structured facts from chat messages."""
@@ -117,8 +182,11 @@ class FactExtractor:
         content_lower = content.lower().strip()
         
         # 1. Check for explicit fact statements (high confidence)
-        for pattern in EXPLICIT_FACT_PATTERNS:
-            matches = re.finditer(pattern, content_lower, re.IGNORECASE)
+        # A match starts at a "statement"/"remember" cue, so the patterns only scan from the first one
+        cues = find_fact_cues(content_lower)
+        statement_cues = [cues[kind] for kind in ("statement", "remember") if kind in cues]
+        for pattern in (_EXPLICIT_FACT_RES if statement_cues else ()):
+            matches = pattern.finditer(content_lower, min(statement_cues))
             for match in matches:
                 if len(match.groups()) >= 2:
                     key_part = match.group(1).strip()
@@ -279,257 +347,247 @@ class FactExtractor:
         cleaned = re.sub(r'\[M\d+(?:,\s*M\d+)*\]', '', content)
         cleaned = re.sub(r'\bM\d+\b', '', cleaned)
         
-        # Pattern 1: Explicit ranks with numbers: "1) Blue, 2) Green" or "1. Blue, 2. Green"
-        pattern1 = re.compile(r'(\d+)\s*[\)\.\:]\s*([^,\n]+)', re.IGNORECASE)
-        for match in pattern1.finditer(cleaned):
-            rank_str, value = match.groups()
-            rank = int(rank_str)
-            value = value.strip().rstrip(',').strip()
-            if rank >= 1 and value and len(value) < 200:
-                # Extract topic from context (look for "favorite X" before the list)
-                topic = self._extract_topic_from_context(cleaned, match.start())
-                ranked_facts.append((rank, value, topic))
-        
-        # Pattern 2: Hash-prefixed: "#1 XMR, #2 BTC" or "#1 favorite" (value comes before/after)
-        # First, handle "XMR is my #1 favorite" or "XMR is actually my #1 favorite" pattern (value before)
-        pattern2a = re.compile(r'([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)\s+is\s+(?:actually\s+)?my\s+#(\d+)\s+favorite', re.IGNORECASE)
-        for match in pattern2a.finditer(cleaned):
-            value = match.group(1).strip()
-            rank = int(match.group(2))
-            if rank >= 1 and value and len(value) < 200:
-                if not any(r == rank for r, _, _ in ranked_facts):
-                    topic = self._extract_topic_from_context(cleaned, match.start())
-                    ranked_facts.append((rank, value, topic))
+        # Each pattern group below only runs if the cleaned text has its cue (see _FACT_CUE_RES)
+        cues = find_fact_cues(cleaned)
+        if not cues.keys() & {"numbered", "hash", "ordinal", "favorite"}:
+            return ranked_facts
         
-        # Pattern 2a-alt: "Make X my #N" or "Make X my #N favorite"
-        pattern2a_alt = re.compile(r'make\s+([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)\s+my\s+#(\d+)(?:\s+favorite)?', re.IGNORECASE)
-        for match in pattern2a_alt.finditer(cleaned):
-            value = match.group(1).strip()
-            rank = int(match.group(2))
-            if rank >= 1 and value and len(value) < 200:
-                if not any(r == rank for r, _, _ in ranked_facts):
-                    topic = self._extract_topic_from_context(cleaned, match.start())
-                    ranked_facts.append((rank, value, topic))
-        
-        # Pattern 2a-alt3: "My favorite #N is X" (alternative word order)
-        pattern2a_alt3 = re.compile(r'my\s+favorite\s+#(\d+)\s+is\s+([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)', re.IGNORECASE)
-        for match in pattern2a_alt3.finditer(cleaned):
-            rank = int(match.group(1))
-            value = match.group(2).strip()
-            if rank >= 1 and value and len(value) < 200:
-                if not any(r == rank for r, _, _ in ranked_facts):
+        if "numbered" in cues:
+            # Pattern 1: Explicit ranks with numbers: "1) Blue, 2) Green" or "1. Blue, 2. Green"
+            for match in _RANK_NUMBERED_RE.finditer(cleaned):
+                rank_str, value = match.groups()
+                rank = int(rank_str)
+                value = value.strip().rstrip(',').strip()
+                if rank >= 1 and value and len(value) < 200:
+                    # Extract topic from context (look for "favorite X" before the list)
                     topic = self._extract_topic_from_context(cleaned, match.start())
                     ranked_facts.append((rank, value, topic))
         
-        # Pattern 2a-alt2: "my #N favorite [topic] is X" (rank before value, with "is")
-        # Need to handle "my #1 favorite crypto is XMR and my #2 is BTC" - stop at "and" if followed by another rank
-        # Use a more restrictive pattern that stops at word boundaries
-        pattern2a_alt2 = re.compile(r'my\s+#(\d+)\s+favorite(?:\s+\w+)?\s+is\s+([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)(?:\s+and\s+my\s+#\d+)?', re.IGNORECASE)
-        for match in pattern2a_alt2.finditer(cleaned):
-            rank = int(match.group(1))
-            value = match.group(2).strip()
-            # Stop at "and" if it's followed by another rank statement
-            if ' and ' in value.lower():
-                # Check if "and" is followed by "my #" pattern - if so, truncate value
-                and_pos = value.lower().find(' and ')
-                if and_pos > 0:
-                    # Check if what follows "and" looks like another rank statement
-                    after_and = value[and_pos + 5:].strip().lower()
-                    if after_and.startswith('my #') or (after_and.startswith('is ') and len(after_and.split()) <= 3):
-                        value = value[:and_pos].strip()
-            if rank >= 1 and value and len(value) < 200:
-                if not any(r == rank for r, _, _ in ranked_facts):
-                    topic = self._extract_topic_from_context(cleaned, match.start())
-                    ranked_facts.append((rank, value, topic))
+        if "hash" in cues:
+            # Pattern 2: Hash-prefixed: "#1 XMR, #2 BTC" or "#1 favorite" (value comes before/after)
+            # First, handle "XMR is my #1 favorite" or "XMR is actually my #1 favorite" pattern (value before)
+            for match in _RANK_VALUE_IS_MY_HASH_RE.finditer(cleaned):
+                value = match.group(1).strip()
+                rank = int(match.group(2))
+                if rank >= 1 and value and len(value) < 200:
+                    if not any(r == rank for r, _, _ in ranked_facts):
+                        topic = self._extract_topic_from_context(cleaned, match.start())
+                        ranked_facts.append((rank, value, topic))
         
-        # Pattern 2a-alt4: "my #N is X" (simpler pattern for "my #2 is BTC")
-        # Also handle "my #N is actually X" - skip "actually" and capture the value
-        pattern2a_alt4 = re.compile(r'my\s+#(\d+)\s+is\s+(?:actually\s+)?([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)', re.IGNORECASE)
-        for match in pattern2a_alt4.finditer(cleaned):
-            rank = int(match.group(1))
-            value = match.group(2).strip()
-            if rank >= 1 and value and len(value) < 200:
-                if not any(r == rank for r, _, _ in ranked_facts):
-                    topic = self._extract_topic_from_context(cleaned, match.start())
-                    ranked_facts.append((rank, value, topic))
+            # Pattern 2a-alt: "Make X my #N" or "Make X my #N favorite"
+            for match in _RANK_MAKE_VALUE_MY_HASH_RE.finditer(cleaned):
+                value = match.group(1).strip()
+                rank = int(match.group(2))
+                if rank >= 1 and value and len(value) < 200:
+                    if not any(r == rank for r, _, _ in ranked_facts):
+                        topic = self._extract_topic_from_context(cleaned, match.start())
+                        ranked_facts.append((rank, value, topic))
         
-        # Then handle "#1 XMR" or "#1 favorite XMR" patterns (value after)
-        # But skip if it looks like "is actually" or other verb phrases
-        pattern2b = re.compile(r'#(\d+)\s+([^,\n#]+)', re.IGNORECASE)
-        for match in pattern2b.finditer(cleaned):
-            rank_str, value_part = match.groups()
-            rank = int(rank_str)
-            value_part = value_part.strip().rstrip(',').strip()
-            
-            # Skip if value_part starts with "is" or "are" (likely part of a sentence structure we've already handled)
-            if value_part.lower().startswith(('is ', 'are ', 'was ', 'were ')):
-                continue
-            
-            # If value_part is just "favorite", look ahead for the actual value
-            if value_part.lower() in ['favorite', 'favorites']:
-                lookahead = cleaned[match.end():match.end()+50]
-                value_match = re.search(r'(?:is\s+)?([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)', lookahead, re.IGNORECASE)
-                if value_match:
-                    value = value_match.group(1).strip()
-                else:
-                    continue  # Skip if we can't find the actual value
-            else:
-                # Only accept if value_part looks like a ticker/crypto symbol (starts with uppercase letter)
-                # This prevents capturing phrases like "is actually FIL" or "and FIL at"
-                if not re.match(r'^[A-Z][A-Z0-9]+(?:\s+\([^)]+\))?$', value_part.strip()):
-                    continue
-                value = value_part.strip()
-            
-            if rank >= 1 and value and len(value) < 200:
-                if not any(r == rank for r, _, _ in ranked_facts):
-                    topic = self._extract_topic_from_context(cleaned, match.start())
-                    ranked_facts.append((rank, value, topic))
+            # Pattern 2a-alt3: "My favorite #N is X" (alternative word order)
+            for match in _RANK_MY_FAVORITE_HASH_IS_RE.finditer(cleaned):
+                rank = int(match.group(1))
+                value = match.group(2).strip()
+                if rank >= 1 and value and len(value) < 200:
+                    if not any(r == rank for r, _, _ in ranked_facts):
+                        topic = self._extract_topic_from_context(cleaned, match.start())
+                        ranked_facts.append((rank, value, topic))
         
-        # Pattern 3: Ordinal words: "first: Blue, second: Green" or "9th favorite", "10th favorite"
-        ordinal_map = {'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'fifth': 5,
-                      'sixth': 6, 'seventh': 7, 'eighth': 8, 'ninth': 9, 'tenth': 10,
-                      'eleventh': 11, 'twelfth': 12, 'thirteenth': 13, 'fourteenth': 14, 'fifteenth': 15}
-        pattern3a = re.compile(r'\b(first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|eleventh|twelfth|thirteenth|fourteenth|fifteenth)\s*[:]\s*([^,\n]+)', re.IGNORECASE)
-        for match in pattern3a.finditer(cleaned):
-            ordinal_str, value = match.groups()
-            rank = ordinal_map.get(ordinal_str.lower())
-            if rank and value:
-                value = value.strip().rstrip(',').strip()
-                if value and len(value) < 200:
+            # Pattern 2a-alt2: "my #N favorite [topic] is X" (rank before value, with "is")
+            # Need to handle "my #1 favorite crypto is XMR and my #2 is BTC" - stop at "and" if followed by another rank
+            # Use a more restrictive pattern that stops at word boundaries
+            for match in _RANK_MY_HASH_FAVORITE_IS_RE.finditer(cleaned):
+                rank = int(match.group(1))
+                value = match.group(2).strip()
+                # Stop at "and" if it's followed by another rank statement
+                if ' and ' in value.lower():
+                    # Check if "and" is followed by "my #" pattern - if so, truncate value
+                    and_pos = value.lower().find(' and ')
+                    if and_pos > 0:
+                        # Check if what follows "and" looks like another rank statement
+                        after_and = value[and_pos + 5:].strip().lower()
+                        if after_and.startswith('my #') or (after_and.startswith('is ') and len(after_and.split()) <= 3):
+                            value = value[:and_pos].strip()
+                if rank >= 1 and value and len(value) < 200:
                     if not any(r == rank for r, _, _ in ranked_facts):
                         topic = self._extract_topic_from_context(cleaned, match.start())
                         ranked_facts.append((rank, value, topic))
         
-        # Pattern 3b: Numeric ordinals: "9th favorite", "10th favorite" (e.g., "LTC is my 9th favorite")
-        pattern3b = re.compile(r'(\d+)(?:st|nd|rd|th)\s+(?:favorite|favorites)', re.IGNORECASE)
-        for match in pattern3b.finditer(cleaned):
-            rank = int(match.group(1))
-            # Look back for the value: "LTC is my 9th favorite"
-            lookback = cleaned[max(0, match.start()-30):match.start()]
-            value_match = re.search(r'([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)\s+is\s+my\s+', lookback, re.IGNORECASE)
-            if value_match:
-                value = value_match.group(1).strip()
+            # Pattern 2a-alt4: "my #N is X" (simpler pattern for "my #2 is BTC")
+            # Also handle "my #N is actually X" - skip "actually" and capture the value
+            for match in _RANK_MY_HASH_IS_RE.finditer(cleaned):
+                rank = int(match.group(1))
+                value = match.group(2).strip()
                 if rank >= 1 and value and len(value) < 200:
                     if not any(r == rank for r, _, _ in ranked_facts):
                         topic = self._extract_topic_from_context(cleaned, match.start())
                         ranked_facts.append((rank, value, topic))
         
-        # Pattern 4: Comma-separated list after "favorite X are" (implicit ranks)
-        # "My favorite cryptocurrencies are XMR, BTC, and XLM"
-        # "My favorite states of water are liquid, steam and ice"
-        pattern4 = re.compile(
-            r'(?:my\s+)?favorite\s+((?:\w+\s+)*\w+)\s+are\s+([^\.\?\!]+)',
-            re.IGNORECASE
-        )
-        
-        # Pattern 4b: Comma-separated list after "favorite X is" (singular, implicit ranks)
-        # "My favorite crypto in order is SHIB, BCH, PEPE..."
-        pattern4b = re.compile(
-            r'(?:my\s+)?favorite\s+((?:\w+\s+)*\w+)\s+is\s+([^\.\?\!]+)',
-            re.IGNORECASE
-        )
-        for match in pattern4.finditer(cleaned):
-            topic_part = match.group(1).strip()
-            list_text = match.group(2).strip()
-            # Normalize topic (remove "favorite" prefix if present, as it's already in the schema)
-            topic_part_clean = topic_part.lower().strip()
-            # Remove "favorite" prefix if present (e.g., "favorite cryptos" -> "cryptos")
-            if topic_part_clean.startswith("favorite "):
-                topic_part_clean = topic_part_clean[9:].strip()  # Remove "favorite "
-            # Remove phrases like "in order" that don't affect the topic
-            topic_part_clean = re.sub(r'\s+in\s+order\s*$', '', topic_part_clean, flags=re.IGNORECASE)
-            topic = self._normalize_topic(topic_part_clean)
+            # Then handle "#1 XMR" or "#1 favorite XMR" patterns (value after)
+            # But skip if it looks like "is actually" or other verb phrases
+            for match in _RANK_HASH_VALUE_RE.finditer(cleaned):
+                rank_str, value_part = match.groups()
+                rank = int(rank_str)
+                value_part = value_part.strip().rstrip(',').strip()
             
-            # Split by comma and "and" - handle both "A, B, C and D" and "A, B, C, and D" (Oxford comma)
-            # First, normalize: replace " and " with ", " to make splitting consistent
-            # But preserve "and" that's part of item names (e.g., "rock and roll")
-            # Strategy: split on commas first, then check if last item contains " and " and split that too
-            items = re.split(r',\s*', list_text)
-            items = [item.strip() for item in items if item.strip()]
+                # Skip if value_part starts with "is" or "are" (likely part of a sentence structure we've already handled)
+                if value_part.lower().startswith(('is ', 'are ', 'was ', 'were ')):
+                    continue
             
-            # If the last item contains " and " or starts with "and ", split it
-            # Handle both "A, B, and C" and "A, B and C" patterns
-            if items and (' and ' in items[-1] or items[-1].strip().lower().startswith('and ')):
-                last_item = items[-1]
-                # Pattern 1: "and X" (when "and" is at the start, e.g., from comma-split like "and Twix")
-                and_match2 = re.search(r'^and\s+(\w+)$', last_item, re.IGNORECASE)
-                if and_match2:
-                    # Replace the last item with just the value (remove "and")
-                    items[-1] = and_match2.group(1).strip()
-                # Pattern 1b: "and then X" (when "and then" is at the start)
-                elif last_item.strip().lower().startswith('and then '):
-                    and_then_match = re.search(r'^and\s+then\s+(\w+)$', last_item, re.IGNORECASE)
-                    if and_then_match:
-                        items[-1] = and_then_match.group(1).strip()
-                # Pattern 2: "X and then Y" (handle "and then" as separator)
-                elif ' and then ' in last_item.lower():
-                    and_then_match = re.search(r'^(.+?)\s+and\s+then\s+(\w+)$', last_item, re.IGNORECASE)
-                    if and_then_match:
-                        # Split the last item (only once)
-                        items[-1] = and_then_match.group(1).strip()
-                        items.append(and_then_match.group(2).strip())
+                # If value_part is just "favorite", look ahead for the actual value
+                if value_part.lower() in ['favorite', 'favorites']:
+                    lookahead = cleaned[match.end():match.end()+50]
+                    value_match = re.search(r'(?:is\s+)?([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)', lookahead, re.IGNORECASE)
+                    if value_match:
+                        value = value_match.group(1).strip()
+                    else:
+                        continue  # Skip if we can't find the actual value
                 else:
-                    # Pattern 3: "X and Y" (normal case like "rock and roll" or "A and B")
-                    and_match = re.search(r'^(.+?)\s+and\s+(\w+)$', last_item, re.IGNORECASE)
-                    if and_match:
-                        # Split the last item (only once)
-                        items[-1] = and_match.group(1).strip()
-                        items.append(and_match.group(2).strip())
+                    # Only accept if value_part looks like a ticker/crypto symbol (starts with uppercase letter)
+                    # This prevents capturing phrases like "is actually FIL" or "and FIL at"
+                    if not re.match(r'^[A-Z][A-Z0-9]+(?:\s+\([^)]+\))?$', value_part.strip()):
+                        continue
+                    value = value_part.strip()
+            
+                if rank >= 1 and value and len(value) < 200:
+                    if not any(r == rank for r, _, _ in ranked_facts):
+                        topic = self._extract_topic_from_context(cleaned, match.start())
+                        ranked_facts.append((rank, value, topic))
+        
+        if "ordinal" in cues:
+            # Pattern 3: Ordinal words: "first: Blue, second: Green" or "9th favorite", "10th favorite"
+            ordinal_map = {'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'fifth': 5,
+                          'sixth': 6, 'seventh': 7, 'eighth': 8, 'ninth': 9, 'tenth': 10,
+                          'eleventh': 11, 'twelfth': 12, 'thirteenth': 13, 'fourteenth': 14, 'fifteenth': 15}
+            for match in _RANK_ORDINAL_WORD_RE.finditer(cleaned):
+                ordinal_str, value = match.groups()
+                rank = ordinal_map.get(ordinal_str.lower())
+                if rank and value:
+                    value = value.strip().rstrip(',').strip()
+                    if value and len(value) < 200:
+                        if not any(r == rank for r, _, _ in ranked_facts):
+                            topic = self._extract_topic_from_context(cleaned, match.start())
+                            ranked_facts.append((rank, value, topic))
+        
+        if "favorite" in cues:
+            # Pattern 3b: Numeric ordinals: "9th favorite", "10th favorite" (e.g., "LTC is my 9th favorite")
+            for match in _RANK_ORDINAL_NUMBER_RE.finditer(cleaned):
+                rank = int(match.group(1))
+                # Look back for the value: "LTC is my 9th favorite"
+                lookback = cleaned[max(0, match.start()-30):match.start()]
+                value_match = re.search(r'([A-Z][A-Z0-9]+(?:\s+\([^)]+\))?)\s+is\s+my\s+', lookback, re.IGNORECASE)
+                if value_match:
+                    value = value_match.group(1).strip()
+                    if rank >= 1 and value and len(value) < 200:
+                        if not any(r == rank for r, _, _ in ranked_facts):
+                            topic = self._extract_topic_from_context(cleaned, match.start())
+                            ranked_facts.append((rank, value, topic))
+        
+            # Pattern 4: Comma-separated list after "favorite X are" (implicit ranks)
+            # "My favorite cryptocurrencies are XMR, BTC, and XLM"
+            # "My favorite states of water are liquid, steam and ice"
+            for match in _FAVORITE_LIST_ARE_RE.finditer(cleaned):
+                topic_part = match.group(1).strip()
+                list_text = match.group(2).strip()
+                # Normalize topic (remove "favorite" prefix if present, as it's already in the schema)
+                topic_part_clean = topic_part.lower().strip()
+                # Remove "favorite" prefix if present (e.g., "favorite cryptos" -> "cryptos")
+                if topic_part_clean.startswith("favorite "):
+                    topic_part_clean = topic_part_clean[9:].strip()  # Remove "favorite "
+                # Remove phrases like "in order" that don't affect the topic
+                topic_part_clean = re.sub(r'\s+in\s+order\s*$', '', topic_part_clean, flags=re.IGNORECASE)
+                topic = self._normalize_topic(topic_part_clean)
             
-            # Clean up: remove any trailing "and" from items (shouldn't happen, but safety check)
-            items = [re.sub(r'\s+and\s*$', '', item, flags=re.IGNORECASE).strip() for item in items]
-            items = [item for item in items if item]  # Remove empty items
+                # Split by comma and "and" - handle both "A, B, C and D" and "A, B, C, and D" (Oxford comma)
+                # First, normalize: replace " and " with ", " to make splitting consistent
+                # But preserve "and" that's part of item names (e.g., "rock and roll")
+                # Strategy: split on commas first, then check if last item contains " and " and split that too
+                items = re.split(r',\s*', list_text)
+                items = [item.strip() for item in items if item.strip()]
             
-            # Only process if we have 2+ items and no explicit ranks found
-            if len(items) >= 2 and not ranked_facts:
-                for idx, item in enumerate(items, start=1):
-                    if item and len(item) < 200:
-                        ranked_facts.append((idx, item, topic))
-                break  # Only process first match
-        
-        # Process Pattern 4b: "favorite X is" (singular)
-        for match in pattern4b.finditer(cleaned):
-            topic_part = match.group(1).strip()
-            list_text = match.group(2).strip()
-            # Normalize topic (remove "favorite" prefix if present, as it's already in the schema)
-            topic_part_clean = topic_part.lower().strip()
-            # Remove "favorite" prefix if present (e.g., "favorite cryptos" -> "cryptos")
-            if topic_part_clean.startswith("favorite "):
-                topic_part_clean = topic_part_clean[9:].strip()  # Remove "favorite "
-            # Remove phrases like "in order" that don't affect the topic
-            topic_part_clean = re.sub(r'\s+in\s+order\s*$', '', topic_part_clean, flags=re.IGNORECASE)
-            topic = self._normalize_topic(topic_part_clean)
+                # If the last item contains " and " or starts with "and ", split it
+                # Handle both "A, B, and C" and "A, B and C" patterns
+                if items and (' and ' in items[-1] or items[-1].strip().lower().startswith('and ')):
+                    last_item = items[-1]
+                    # Pattern 1: "and X" (when "and" is at the start, e.g., from comma-split like "and Twix")
+                    and_match2 = re.search(r'^and\s+(\w+)$', last_item, re.IGNORECASE)
+                    if and_match2:
+                        # Replace the last item with just the value (remove "and")
+                        items[-1] = and_match2.group(1).strip()
+                    # Pattern 1b: "and then X" (when "and then" is at the start)
+                    elif last_item.strip().lower().startswith('and then '):
+                        and_then_match = re.search(r'^and\s+then\s+(\w+)$', last_item, re.IGNORECASE)
+                        if and_then_match:
+                            items[-1] = and_then_match.group(1).strip()
+                    # Pattern 2: "X and then Y" (handle "and then" as separator)
+                    elif ' and then ' in last_item.lower():
+                        and_then_match = re.search(r'^(.+?)\s+and\s+then\s+(\w+)$', last_item, re.IGNORECASE)
+                        if and_then_match:
+                            # Split the last item (only once)
+                            items[-1] = and_then_match.group(1).strip()
+                            items.append(and_then_match.group(2).strip())
+                    else:
+                        # Pattern 3: "X and Y" (normal case like "rock and roll" or "A and B")
+                        and_match = re.search(r'^(.+?)\s+and\s+(\w+)$', last_item, re.IGNORECASE)
+                        if and_match:
+                            # Split the last item (only once)
+                            items[-1] = and_match.group(1).strip()
+                            items.append(and_match.group(2).strip())
             
-            # Split by comma and "and" - same logic as Pattern 4
-            items = re.split(r',\s*', list_text)
-            items = [item.strip() for item in items if item.strip()]
+                # Clean up: remove any trailing "and" from items (shouldn't happen, but safety check)
+                items = [re.sub(r'\s+and\s*$', '', item, flags=re.IGNORECASE).strip() for item in items]
+                items = [item for item in items if item]  # Remove empty items
             
-            # If the last item contains " and " or starts with "and ", split it
-            if items and (' and ' in items[-1] or items[-1].strip().lower().startswith('and ')):
-                last_item = items[-1]
-                # Pattern 1: "and X" (when "and" is at the start, e.g., from comma-split like "and Twix")
-                and_match2 = re.search(r'^and\s+(\w+)$', last_item, re.IGNORECASE)
-                if and_match2:
-                    # Replace the last item with just the value (remove "and")
-                    items[-1] = and_match2.group(1).strip()
-                else:
-                    # Pattern 2: "X and Y" (normal case like "rock and roll" or "A and B")
-                    and_match = re.search(r'^(.+?)\s+and\s+(\w+)$', last_item, re.IGNORECASE)
-                    if and_match:
-                        # Split the last item (only once)
-                        items[-1] = and_match.group(1).strip()
-                        items.append(and_match.group(2).strip())
+                # Only process if we have 2+ items and no explicit ranks found
+                if len(items) >= 2 and not ranked_facts:
+                    for idx, item in enumerate(items, start=1):
+                        if item and len(item) < 200:
+                            ranked_facts.append((idx, item, topic))
+                    break  # Only process first match
+        
+            # Process Pattern 4b: Comma-separated list after "favorite X is" (singular, implicit ranks)
+            # "My favorite crypto in order is SHIB, BCH, PEPE..."
+            for match in _FAVORITE_LIST_IS_RE.finditer(cleaned):
+                topic_part = match.group(1).strip()
+                list_text = match.group(2).strip()
+                # Normalize topic (remove "favorite" prefix if present, as it's already in the schema)
+                topic_part_clean = topic_part.lower().strip()
+                # Remove "favorite" prefix if present (e.g., "favorite cryptos" -> "cryptos")
+                if topic_part_clean.startswith("favorite "):
+                    topic_part_clean = topic_part_clean[9:].strip()  # Remove "favorite "
+                # Remove phrases like "in order" that don't affect the topic
+                topic_part_clean = re.sub(r'\s+in\s+order\s*$', '', topic_part_clean, flags=re.IGNORECASE)
+                topic = self._normalize_topic(topic_part_clean)
+            
+                # Split by comma and "and" - same logic as Pattern 4
+                items = re.split(r',\s*', list_text)
+                items = [item.strip() for item in items if item.strip()]
+            
+                # If the last item contains " and " or starts with "and ", split it
+                if items and (' and ' in items[-1] or items[-1].strip().lower().startswith('and ')):
+                    last_item = items[-1]
+                    # Pattern 1: "and X" (when "and" is at the start, e.g., from comma-split like "and Twix")
+                    and_match2 = re.search(r'^and\s+(\w+)$', last_item, re.IGNORECASE)
+                    if and_match2:
+                        # Replace the last item with just the value (remove "and")
+                        items[-1] = and_match2.group(1).strip()
+                    else:
+                        # Pattern 2: "X and Y" (normal case like "rock and roll" or "A and B")
+                        and_match = re.search(r'^(.+?)\s+and\s+(\w+)$', last_item, re.IGNORECASE)
+                        if and_match:
+                            # Split the last item (only once)
+                            items[-1] = and_match.group(1).strip()
+                            items.append(and_match.group(2).strip())
             
-            # Clean up: remove any trailing "and" from items (shouldn't happen, but safety check)
-            items = [re.sub(r'\s+and\s*$', '', item, flags=re.IGNORECASE).strip() for item in items]
-            items = [item for item in items if item]  # Remove empty items
+                # Clean up: remove any trailing "and" from items (shouldn't happen, but safety check)
+                items = [re.sub(r'\s+and\s*$', '', item, flags=re.IGNORECASE).strip() for item in items]
+                items = [item for item in items if item]  # Remove empty items
             
-            # Only process if we have 2+ items and no explicit ranks found
-            if len(items) >= 2 and not ranked_facts:
-                for idx, item in enumerate(items, start=1):
-                    if item and len(item) < 200:
-                        ranked_facts.append((idx, item, topic))
-                break  # Only process first match
+                # Only process if we have 2+ items and no explicit ranks found
+                if len(items) >= 2 and not ranked_facts:
+                    for idx, item in enumerate(items, start=1):
+                        if item and len(item) < 200:
+                            ranked_facts.append((idx, item, topic))
+                    break  # Only process first match
         
         # Sort by rank and return
         ranked_facts.sort(key=lambda x: x[0])
@@ -553,13 +611,10 @@ class FactExtractor:
         
         # If no "favorite" found, look for topic keywords directly (e.g., "my #1 crypto")
         # This handles cases like "Wait, my #1 crypto is actually XMR"
-        topic_keywords = ['crypto', 'cryptos', 'cryptocurrency', 'cryptocurrencies', 
-                         'color', 'colors', 'candy', 'candies', 'pie', 'pies',
-                         'tv', 'show', 'television', 'food', 'textile', 'textiles',
-                         'cookie', 'cookies']
-        for keyword in topic_keywords:
-            # Look for the keyword in the context (with word boundaries)
-            if re.search(r'\b' + re.escape(keyword) + r'\b', context):
+        # One scan for all keywords; the first keyword in _TOPIC_KEYWORDS order wins
+        found = set(_TOPIC_KEYWORD_RE.findall(context))
+        for keyword in _TOPIC_KEYWORDS:
+            if keyword in found:
                 return self._normalize_topic(keyword)
         
         # No value-shape inference (no ticker-like guessing)
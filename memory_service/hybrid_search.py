@@ -0,0 +1,130 @@
+"""
+Lexical retrieval helpers and rank fusion for hybrid search.
+
+/search combines two retrievers:
+- lexical: BM25 over the chunks_fts FTS5 table of each source database, good
+  at IDs, code symbols, file names and table cells, and it needs no embedding
+- vector: ANN (or brute-force) cosine search over chunk embeddings
+
+The two ranked lists are merged with reciprocal-rank fusion (RRF): a chunk at
+rank r in a list contributes 1 / (k + r), and the contributions are summed.
+RRF works on ranks only, so BM25 and cosine scores never need to share a scale.
+"""
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Configuration
+RRF_K = int(os.getenv("SEARCH_RRF_K", "60"))  # Damping constant of reciprocal-rank fusion
+MAX_FTS_TERMS = int(os.getenv("SEARCH_MAX_FTS_TERMS", "16"))  # Query terms passed to FTS5
+
+SEARCH_MODES = ("hybrid", "vector", "lexical")
+
+# Word characters as FTS5's unicode61 tokenizer (with tokenchars '_') sees them
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Identifier-like terms: contain a digit, '_', '.', '/', ':', '#' or '-' between word characters
+_EXACT_TERM_RE = re.compile(r"^\S*(\w[\d_./:#-]|[\d_./:#-]\w)\S*$", re.UNICODE)
+
+
+def _is_quoted(text: str) -> bool:
+    return len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'`"
+
+
+def build_fts_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every whitespace-separated token becomes a quoted term; tokens that the
+    tokenizer splits into several words (e.g. "report-2024.pdf") become a
+    phrase so the parts must be adjacent. Terms are OR-ed and BM25 ranks
+    chunks that match more (and rarer) terms higher. Quoting also neutralizes
+    FTS5 operators and special characters in user input.
+
+    Args:
+        query: Raw search query
+
+    Returns:
+        MATCH expression, or None if the query has no searchable terms
+    """
+    stripped = query.strip()
+    if _is_quoted(stripped):
+        # Quoted query: one phrase
+        words = _TOKEN_RE.findall(stripped[1:-1].lower())[:MAX_FTS_TERMS]
+        return '"' + " ".join(words) + '"' if words else None
+
+    terms = []
+    seen = set()
+    for token in stripped.split():
+        words = _TOKEN_RE.findall(token.lower())
+        if not words:
+            continue
+        term = '"' + " ".join(words) + '"'
+        if term not in seen:
+            seen.add(term)
+            terms.append(term)
+        if len(terms) >= MAX_FTS_TERMS:
+            break
+    if not terms:
+        return None
+    return " OR ".join(terms)
+
+
+def is_exact_term_query(query: str) -> bool:
+    """
+    True for queries that look like an exact term rather than natural language.
+
+    Quoted queries and single tokens that look like identifiers (IDs, code
+    symbols, file names, version numbers) qualify; for those, lexical hits
+    are answered directly without computing a query embedding.
+    """
+    stripped = query.strip()
+    if _is_quoted(stripped):
+        return True
+    if not stripped or len(stripped.split()) != 1:
+        return False
+    return bool(_EXACT_TERM_RE.match(stripped))
+
+
+def _result_key(result: dict) -> Tuple[Optional[str], Optional[int]]:
+    # Chunk ids are only unique within one source database
+    return (result.get("source_id"), result.get("chunk_id"))
+
+
+def reciprocal_rank_fusion(ranked_lists: Iterable[List[dict]], k: int = RRF_K) -> List[dict]:
+    """
+    Merge ranked result lists with reciprocal-rank fusion.
+
+    The returned dicts are copies of the first occurrence of each chunk, with
+    "score" replaced by the fused score normalized to [0, 1] (1.0 = ranked
+    first in every list), so callers that expect similarity-like scores keep
+    working.
+
+    Args:
+        ranked_lists: Lists of result dicts (best first), each with source_id and chunk_id
+        k: RRF damping constant
+
+    Returns:
+        Fused results, best first
+    """
+    ranked_lists = [lst for lst in ranked_lists if lst]
+    if not ranked_lists:
+        return []
+
+    fused: Dict[Tuple[Optional[str], Optional[int]], dict] = {}
+    totals: Dict[Tuple[Optional[str], Optional[int]], float] = {}
+    for results in ranked_lists:
+        for rank, result in enumerate(results, 1):
+            key = _result_key(result)
+            if key not in fused:
+                fused[key] = dict(result)
+                totals[key] = 0.0
+            totals[key] += 1.0 / (k + rank)
+
+    best_possible = len(ranked_lists) / (k + 1)
+    ordered = sorted(fused, key=lambda key: totals[key], reverse=True)
+    merged = []
+    for key in ordered:
+        result = fused[key]
+        result["score"] = totals[key] / best_possible
+        merged.append(result)
+    return merged
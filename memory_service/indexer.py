@@ -16,10 +16,19 @@ from datetime import datetime
 from typing import List, Tuple, Optional
 import fnmatch
 
-from memory_service.config import CHUNK_SIZE_CHARS, CHUNK_OVERLAP_CHARS, EMBEDDING_MODEL
+from memory_service.config import (
+    CHUNK_SIZE_CHARS, CHUNK_OVERLAP_CHARS, CHUNK_SIZE_TOKENS, CHUNK_OVERLAP_TOKENS, EMBEDDING_MODEL,
+    NEAR_DUP_THRESHOLD
+)
 from memory_service import memory_dashboard
 from memory_service.memory_dashboard import db
-from memory_service.embeddings import embed_texts
+from memory_service.embeddings import embed_texts, get_tokenizer, get_max_seq_length
+from memory_service.chunking import chunk_text_by_tokens, chunk_texts_by_tokens
+from memory_service.cancellation import CancellationToken, JobCancelledError, check_cancelled
+from memory_service.scheduler import yield_to_higher_lanes
+from memory_service.near_dup import (
+    compute_minhash, lsh_band_hashes, find_best_match, signature_to_bytes, signature_from_bytes
+)
 
 logger = logging.getLogger(__name__)
 
@@ -165,9 +174,74 @@ def extract_text(path: Path) -> Optional[str]:
     return text
 
 
+def _get_chunk_tokenizer() -> Tuple[Optional[object], int]:
+    """
+    Get the tokenizer and token limit used for token-exact chunking.
+    
+    Returns:
+        Tuple of (tokenizer or None, max_tokens). tokenizer is None when the
+        embedding model's fast tokenizer is unavailable (callers fall back to
+        character-based chunking).
+    """
+    try:
+        tokenizer = get_tokenizer()
+        max_tokens = min(CHUNK_SIZE_TOKENS, get_max_seq_length())
+        return tokenizer, max_tokens
+    except Exception as e:
+        logger.warning(f"[MEMORY] Tokenizer unavailable, using character-based chunking: {e}")
+        return None, CHUNK_SIZE_TOKENS
+
+
 def chunk_chat_message(text: str) -> List[Tuple[int, str, int, int]]:
     """
-    Split chat message text into chunks with token-based logic.
+    Split chat message text into chunks using the embedding model's tokenizer.
+    
+    Rules:
+    - If content fits in the model's token limit → single chunk
+    - If longer → split into overlapping chunks (CHUNK_SIZE_TOKENS with CHUNK_OVERLAP_TOKENS overlap),
+      preferring paragraph/sentence boundaries
+    
+    Falls back to character approximation if the tokenizer is unavailable.
+    
+    Args:
+        text: Text to chunk
+        
+    Returns:
+        List of (chunk_index, chunk_text, start_char, end_char) tuples
+    """
+    if not text:
+        return []
+    
+    tokenizer, max_tokens = _get_chunk_tokenizer()
+    if tokenizer is None:
+        return _chunk_chat_message_chars(text)
+    # Short messages ("Yes please") are indexed too: no minimum chunk length for chat
+    return chunk_text_by_tokens(text, tokenizer, max_tokens, CHUNK_OVERLAP_TOKENS, min_chars=0)
+
+
+def chunk_chat_messages(texts: List[str]) -> List[List[Tuple[int, str, int, int]]]:
+    """
+    Chunk several chat messages with one batched tokenizer call.
+    
+    Args:
+        texts: Message contents
+        
+    Returns:
+        List (one per text) of (chunk_index, chunk_text, start_char, end_char) tuples
+    """
+    tokenizer, max_tokens = _get_chunk_tokenizer()
+    if tokenizer is None:
+        return [_chunk_chat_message_chars(text) if text else [] for text in texts]
+    non_empty = [text for text in texts if text]
+    chunked = iter(chunk_texts_by_tokens(non_empty, tokenizer, max_tokens, CHUNK_OVERLAP_TOKENS, min_chars=0))
+    return [next(chunked) if text else [] for text in texts]
+
+
+def _chunk_chat_message_chars(text: str) -> List[Tuple[int, str, int, int]]:
+    """
+    Split chat message text into chunks with character-approximated token logic.
+    
+    Legacy fallback for chunk_chat_message() when no tokenizer is available.
     
     Rules:
     - If content < ~1000 tokens → single chunk
@@ -242,13 +316,14 @@ def index_chat_message(
     role: str,
     content: str,
     timestamp: datetime,
-    message_index: int
+    message_index: int,
+    cancel_token: Optional[CancellationToken] = None
 ) -> Tuple[bool, Optional[str]]:
     """
     Index a chat message into the Memory Service.
     
     Uses a special source_id format: f"project-{project_id}" to store all chat messages
-    for a project in a single source.
+    for a project in a single source. Delegates to index_chat_messages_batch().
     
     Args:
         project_id: The project ID
@@ -258,121 +333,173 @@ def index_chat_message(
         content: Message content
         timestamp: Message timestamp
         message_index: Index of message in the conversation
+        cancel_token: Optional CancellationToken, checked between the chunk/embed/write phases
         
     Returns:
         Tuple of (success: bool, message_uuid: Optional[str])
         message_uuid is returned so callers can exclude facts from this message when searching
     """
-    try:
-        # Use a special source_id for chat messages: "project-{project_id}"
-        source_id = f"project-{project_id}"
-        
-        # Initialize DB for this source if needed (pass project_id for path lookup)
-        db.init_db(source_id, project_id=project_id)
-        
-        # Upsert source (chat messages don't have a root_path, use empty string)
-        source_db_id = db.upsert_source(source_id, project_id, "", None, None)
-        
-        # Upsert chat message (generates message_uuid if not provided)
-        chat_message_id = db.upsert_chat_message(
-            source_id=source_id,
-            project_id=project_id,
-            chat_id=chat_id,
-            message_id=message_id,
-            role=role,
-            content=content,
-            timestamp=timestamp,
-            message_index=message_index
-        )
-        
-        # Get the message_uuid (needed for embeddings metadata, but NOT for fact storage)
-        # Facts are now stored synchronously in the backend before indexing, so we skip fact extraction here
-        chat_message = db.get_chat_message_by_id(chat_message_id, source_id)
-        message_uuid = chat_message.message_uuid if chat_message else None
-        
-        # REMOVED: Fact extraction and storage from indexing path
-        # Facts are now persisted synchronously in chat_with_smart_search.py before indexing
-        # This prevents double-extraction, double-write, and ensures facts persist even if indexing fails
-        # Indexing job now only handles: chunking, embeddings, vector/ANN updates, chat_messages upsert
-        
-        # Chunk the content
-        chunks = chunk_chat_message(content)
-        if not chunks:
-            logger.warning(f"No chunks extracted from chat message {message_id}")
-            return False, None
-        
-        # Insert chunks
-        chunk_data = [(idx, txt, start, end) for idx, txt, start, end in chunks]
-        db.insert_chunks(None, chunk_data, source_id, chat_message_id=chat_message_id)
-        
-        # Get chunk IDs for embedding
-        chunk_records = db.get_chunks_by_chat_message_id(chat_message_id, source_id)
-        chunk_ids = [c.id for c in chunk_records]
-        chunk_texts = [c.text for c in chunk_records]
-        
-        # Generate embeddings
-        logger.debug(f"Generating embeddings for {len(chunk_texts)} chunks from chat message {message_id}")
-        embeddings = embed_texts(chunk_texts)
-        
-        # Store embeddings
-        db.insert_embeddings(chunk_ids, embeddings, EMBEDDING_MODEL, source_id)
+    return index_chat_messages_batch([{
+        "project_id": project_id,
+        "chat_id": chat_id,
+        "message_id": message_id,
+        "role": role,
+        "content": content,
+        "timestamp": timestamp,
+        "message_index": message_index,
+    }], cancel_token=cancel_token)[0]
+
+
+def index_chat_messages_batch(messages: List[dict],
+                              cancel_token: Optional[CancellationToken] = None) -> List[Tuple[bool, Optional[str]]]:
+    """
+    Index many chat messages with grouped DB writes, one embedding batch and one ANN add.
+    
+    Messages are grouped by project. Per project: one init_db/upsert_source, one
+    transaction for the chat_messages upserts, one tokenizer call for chunking, a
+    single embed_texts call, one transaction for all chunks and embeddings, and a
+    single ANN add.
+    
+    The cancel token is checked between the chunk, embed and write phases; once it
+    is cancelled (or its deadline passes) the batch stops and the remaining
+    messages are reported as not indexed.
+    
+    Args:
+        messages: List of dicts with project_id, chat_id, message_id, role, content,
+                  timestamp, message_index and optional message_uuid
+        cancel_token: Optional CancellationToken for cooperative cancellation
         
-        # Add to ANN index if available
+    Returns:
+        List of (success, message_uuid), in the same order as messages
+    """
+    results: List[Tuple[bool, Optional[str]]] = [(False, None)] * len(messages)
+    
+    by_project = {}
+    for pos, msg in enumerate(messages):
+        by_project.setdefault(msg["project_id"], []).append(pos)
+    
+    for project_id, positions in by_project.items():
+        source_id = f"project-{project_id}"
+        project_messages = [messages[pos] for pos in positions]
         try:
-            from memory_service.api import ann_index_manager
-            if ann_index_manager.is_available():
-                # Get source to get project_id
-                source = db.get_source_by_source_id(source_id)
-                project_id = source.project_id if source else "general"
-                
-                # Prepare metadata for ANN
-                metadata_list = []
-                for i, chunk_record in enumerate(chunk_records):
-                    metadata_list.append({
-                        "embedding_id": chunk_record.id,  # Use chunk_id as embedding_id
-                        "chunk_id": chunk_record.id,
-                        "file_id": None,
-                        "file_path": None,
-                        "chunk_text": chunk_record.text,
-                        "source_id": source_id,
-                        "project_id": project_id,
-                        "filetype": None,
-                        "chunk_index": chunk_record.chunk_index,
-                        "start_char": chunk_record.start_char,
-                        "end_char": chunk_record.end_char,
-                        "chat_id": chat_id,
-                        "message_id": message_id,
-                    })
-                
-                ann_index_manager.add_embeddings(embeddings, metadata_list)
-                logger.debug(f"[ANN] Added {len(embeddings)} chat embeddings to ANN index for message {message_id}")
+            db.init_db(source_id, project_id=project_id)
+            upserted = db.upsert_chat_messages_bulk(source_id, project_id, project_messages)
+            for pos, (_, message_uuid) in zip(positions, upserted):
+                results[pos] = (False, message_uuid)
+            
+            # Chunk all messages with one tokenizer call
+            check_cancelled(cancel_token, "chunking")
+            chunks_per_message = chunk_chat_messages([msg["content"] for msg in project_messages])
+            chunk_batches = []
+            chunk_positions = []
+            for pos, msg, (chat_message_id, _), chunks in zip(positions, project_messages, upserted, chunks_per_message):
+                if not chunks:
+                    logger.warning(f"No chunks extracted from chat message {msg['message_id']}")
+                    continue
+                chunk_batches.append((chat_message_id, chunks))
+                chunk_positions.append(pos)
+            
+            # Embed all chunks in one batch (before any chunk is written, so a cancelled
+            # job never leaves chunks without embeddings)
+            check_cancelled(cancel_token, "embedding")
+            flat_texts = [txt for _, chunks in chunk_batches for _, txt, _, _ in chunks]
+            embeddings = embed_texts(flat_texts) if flat_texts else None
+            
+            # Write chunks + embeddings in one transaction
+            check_cancelled(cancel_token, "writing chunks")
+            chunk_records_per_message = db.replace_chat_chunks_bulk(
+                source_id, chunk_batches, project_id=project_id,
+                embeddings=embeddings, model_name=EMBEDDING_MODEL
+            )
+            all_records = []
+            record_messages = []
+            for pos, records in zip(chunk_positions, chunk_records_per_message):
+                all_records.extend(records)
+                record_messages.extend([messages[pos]] * len(records))
+            
+            if all_records:
+                # Add to ANN index if available
+                try:
+                    from memory_service.api import ann_index_manager
+                    if ann_index_manager.is_available():
+                        metadata_list = []
+                        for chunk_record, msg in zip(all_records, record_messages):
+                            metadata_list.append({
+                                "embedding_id": chunk_record.id,  # Use chunk_id as embedding_id
+                                "chunk_id": chunk_record.id,
+                                "file_id": None,
+                                "file_path": None,
+                                "chunk_text": chunk_record.text,
+                                "source_id": source_id,
+                                "project_id": project_id,
+                                "filetype": None,
+                                "chunk_index": chunk_record.chunk_index,
+                                "start_char": chunk_record.start_char,
+                                "end_char": chunk_record.end_char,
+                                "chat_id": msg["chat_id"],
+                                "message_id": msg["message_id"],
+                            })
+                        ann_index_manager.add_embeddings(embeddings, metadata_list)
+                        logger.debug(f"[ANN] Added {len(embeddings)} chat embeddings to ANN index for {len(chunk_positions)} messages")
+                except Exception as e:
+                    logger.warning(f"[ANN] Failed to add chat embeddings to ANN index: {e}")
+            
+            for pos in chunk_positions:
+                results[pos] = (True, results[pos][1])
+            
+            logger.debug(f"Successfully indexed {len(chunk_positions)}/{len(positions)} chat messages for project {project_id}")
+        except JobCancelledError as e:
+            # Stop here: remaining projects are left unindexed (results stay False)
+            logger.warning(f"[INDEX-QUEUE] Chat message batch for project {project_id} stopped: {e}")
+            break
         except Exception as e:
-            logger.warning(f"[ANN] Failed to add chat embeddings to ANN index: {e}")
-        
-        logger.debug(f"Successfully indexed chat message {message_id} ({len(chunks)} chunks)")
-        return True, message_uuid
-        
-    except Exception as e:
-        logger.error(f"Error indexing chat message {message_id}: {e}", exc_info=True)
-        # Return message_uuid even if indexing failed - it was created early and is needed for fact exclusion
-        # Try to get it from the database if we have it
-        try:
-            if 'message_uuid' in locals() and message_uuid:
-                return False, message_uuid
-            # Fallback: try to look it up from the database
-            source_id = f"project-{project_id}"
-            chat_message = db.get_chat_message_by_id(chat_message_id, source_id) if 'chat_message_id' in locals() else None
-            if chat_message and chat_message.message_uuid:
-                return False, chat_message.message_uuid
-        except:
-            pass
-        return False, None
+            # message_uuids already assigned above (if the upsert succeeded) are kept for fact exclusion
+            logger.error(f"Error indexing chat message batch for project {project_id}: {e}", exc_info=True)
+    
+    return results
 
 
 def chunk_text(text: str) -> List[Tuple[int, str, int, int]]:
+    """
+    Split file text into chunks using the embedding model's tokenizer.
+    
+    Chunks are exactly bounded by the model's token limit (no silent truncation),
+    overlap by CHUNK_OVERLAP_TOKENS, and prefer paragraph/line/sentence boundaries.
+    Exact duplicate chunks within the text are skipped.
+    Falls back to character-based chunking if the tokenizer is unavailable.
+    
+    Args:
+        text: Text to chunk
+        
+    Returns:
+        List of (chunk_index, chunk_text, start_char, end_char) tuples
+    """
+    if not text:
+        return []
+    
+    tokenizer, max_tokens = _get_chunk_tokenizer()
+    if tokenizer is None:
+        return _chunk_text_chars(text)
+    
+    chunks = []
+    seen_chunks = set()  # Track unique chunks to avoid duplicates
+    for _, chunk_text_value, start, end in chunk_text_by_tokens(text, tokenizer, max_tokens, CHUNK_OVERLAP_TOKENS):
+        chunk_text_value = chunk_text_value.strip()
+        if len(chunk_text_value) <= 10:
+            continue
+        chunk_hash = hash(chunk_text_value)
+        if chunk_hash not in seen_chunks:
+            chunks.append((len(chunks), chunk_text_value, start, end))
+            seen_chunks.add(chunk_hash)
+    return chunks
+
+
+def _chunk_text_chars(text: str) -> List[Tuple[int, str, int, int]]:
     """
     Split text into chunks with improved logic to avoid huge single chunks.
     
+    Legacy character-based fallback for chunk_text() when no tokenizer is available.
+    
     Args:
         text: Text to chunk
         
@@ -475,16 +602,169 @@ def should_index_file(path: Path, include_glob: Optional[str], exclude_glob: Opt
     return True
 
 
-def index_file(path: Path, source_db_id: int, source_id: str) -> bool:
+def _suppress_near_duplicates(chunk_records: List, source_id: str, near_dup_threshold: Optional[float],
+                              exclude_file_id: Optional[int] = None) -> List:
+    """
+    Link near-duplicate chunks to a canonical chunk and return the chunks that still need embedding.
+    
+    Each chunk is compared (MinHash + LSH) against canonical chunks already in the source
+    and against earlier chunks of the same batch. Matches at or above the threshold are
+    linked via canonical_chunk_id and skipped; the rest get their signatures stored so
+    later chunks can match them.
+    
+    Args:
+        chunk_records: Chunk records (from the DB) to check
+        source_id: Source ID
+        near_dup_threshold: Estimated Jaccard threshold (None = NEAR_DUP_THRESHOLD, 0 = disabled)
+        exclude_file_id: File being re-indexed (its old chunks are not candidates)
+        
+    Returns:
+        Chunk records that are canonical and must be embedded
+    """
+    threshold = NEAR_DUP_THRESHOLD if near_dup_threshold is None else near_dup_threshold
+    if threshold <= 0 or not chunk_records:
+        return chunk_records
+    
+    canonical_records = []
+    links = []
+    signatures_to_store = []
+    batch_buckets = {}  # band_hash -> [(chunk_id, signature)] for canonical chunks in this batch
+    
+    for chunk_record in chunk_records:
+        signature = compute_minhash(chunk_record.text)
+        if signature is None:
+            # No words to compare (e.g. a separator line): never linked, never a link target
+            canonical_records.append(chunk_record)
+            continue
+        band_hashes = lsh_band_hashes(signature)
+        
+        candidates = [
+            (cid, signature_from_bytes(sig))
+            for cid, sig in db.find_near_duplicate_candidates(band_hashes, source_id, exclude_file_id=exclude_file_id)
+        ]
+        for band_hash in band_hashes:
+            candidates.extend(batch_buckets.get(band_hash, []))
+        
+        match = find_best_match(signature, candidates, threshold)
+        if match is not None:
+            links.append((chunk_record.id, match[0]))
+            continue
+        
+        canonical_records.append(chunk_record)
+        signatures_to_store.append((chunk_record.id, signature_to_bytes(signature), band_hashes))
+        for band_hash in band_hashes:
+            batch_buckets.setdefault(band_hash, []).append((chunk_record.id, signature))
+    
+    db.link_near_duplicate_chunks(links, source_id)
+    db.insert_chunk_signatures(signatures_to_store, source_id)
+    
+    if links:
+        logger.info(
+            f"[NEAR-DUP] Linked {len(links)}/{len(chunk_records)} near-duplicate chunks "
+            f"to canonical chunks (source={source_id}, threshold={threshold})"
+        )
+    return canonical_records
+
+
+def _embed_file_chunks(chunk_records: List, source_id: str, file_info: dict):
+    """
+    Embed file chunks, store the embeddings and add them to the ANN index.
+    
+    Args:
+        chunk_records: Chunk records to embed
+        source_id: Source ID
+        file_info: Dict of file_id -> (file_path, filetype) for ANN metadata
+    """
+    if not chunk_records:
+        return
+    
+    chunk_ids = [c.id for c in chunk_records]
+    chunk_texts = [c.text for c in chunk_records]
+    
+    # Generate embeddings
+    embeddings = embed_texts(chunk_texts)
+    
+    # Store embeddings
+    db.insert_embeddings(chunk_ids, embeddings, EMBEDDING_MODEL, source_id)
+    
+    _add_file_chunks_to_ann(chunk_records, embeddings, source_id, file_info)
+
+
+def _add_file_chunks_to_ann(chunk_records: List, embeddings, source_id: str, file_info: dict):
+    """
+    Add stored file chunk embeddings to the ANN index (if available).
+    
+    Args:
+        chunk_records: Embedded chunk records
+        embeddings: [N, D] embeddings, one row per chunk record
+        source_id: Source ID
+        file_info: Dict of file_id -> (file_path, filetype) for ANN metadata
+    """
+    # Add to ANN index if available
+    try:
+        from memory_service.api import ann_index_manager
+        if ann_index_manager.is_available():
+            # Get source to get project_id
+            source = db.get_source_by_source_id(source_id)
+            project_id = source.project_id if source else "general"
+            
+            # Prepare metadata for ANN
+            metadata_list = []
+            for chunk_record in chunk_records:
+                file_path, filetype = file_info.get(chunk_record.file_id, (None, None))
+                metadata_list.append({
+                    "embedding_id": chunk_record.id,  # Use chunk_id as embedding_id
+                    "chunk_id": chunk_record.id,
+                    "file_id": chunk_record.file_id,
+                    "file_path": file_path,
+                    "chunk_text": chunk_record.text,
+                    "source_id": source_id,
+                    "project_id": project_id,
+                    "filetype": filetype,
+                    "chunk_index": chunk_record.chunk_index,
+                    "start_char": chunk_record.start_char,
+                    "end_char": chunk_record.end_char,
+                    "chat_id": None,
+                    "message_id": None,
+                })
+            
+            ann_index_manager.add_embeddings(embeddings, metadata_list)
+            logger.debug(f"[ANN] Added {len(embeddings)} embeddings to ANN index for source {source_id}")
+    except Exception as e:
+        logger.warning(f"[ANN] Failed to add embeddings to ANN index: {e}")
+
+
+def _reindex_detached_chunks(chunk_ids: List[int], source_id: str, near_dup_threshold: Optional[float]):
+    """
+    Re-embed chunks whose canonical chunk was removed (or re-link them to another canonical chunk).
+    
+    Args:
+        chunk_ids: IDs returned by db.detach_near_duplicates()
+        source_id: Source ID
+        near_dup_threshold: Near-duplicate threshold for the source
+    """
+    chunk_records = db.get_chunks_by_ids(chunk_ids, source_id)
+    if not chunk_records:
+        return
+    chunk_records = _suppress_near_duplicates(chunk_records, source_id, near_dup_threshold)
+    files = db.get_files_by_ids(list({c.file_id for c in chunk_records if c.file_id is not None}), source_id)
+    file_info = {fid: (f.path, f.filetype) for fid, f in files.items()}
+    logger.info(f"[NEAR-DUP] Re-embedding {len(chunk_records)} chunks detached from a removed canonical chunk (source={source_id})")
+    _embed_file_chunks(chunk_records, source_id, file_info)
+
+
+def index_file(path: Path, source_db_id: int, source_id: str, near_dup_threshold: Optional[float] = None) -> bool:
     """
     Index a single file (idempotent).
     
     Checks modified_at and hash to avoid re-embedding when not needed.
+    Near-duplicate chunks (MinHash/LSH) are linked to a canonical chunk instead of embedded.
     
     Args:
         path: Path to the file
         source_db_id: Database ID of the source
         source_id: Source ID string (for database path)
+        near_dup_threshold: Per-source near-duplicate threshold (None = NEAR_DUP_THRESHOLD, 0 = disabled)
         
     Returns:
         True if file was indexed successfully, False otherwise
@@ -542,54 +822,33 @@ def index_file(path: Path, source_db_id: int, source_id: str) -> bool:
         # Upsert file record
         file_id = db.upsert_file(source_db_id, str(path), filetype, modified_at, size_bytes, source_id, content_hash)
         
-        # Insert chunks
-        chunk_data = [(idx, txt, start, end) for idx, txt, start, end in chunks]
-        db.insert_chunks(file_id, chunk_data, source_id)
-        
-        # Get chunk IDs for embedding
-        chunk_records = db.get_chunks_by_file_id(file_id, source_id)
-        chunk_ids = [c.id for c in chunk_records]
-        chunk_texts = [c.text for c in chunk_records]
+        # Chunks in other files linked to this file's old chunks lose their canonical chunk
+        detached_chunk_ids = db.detach_near_duplicates(file_id, source_id) if existing_file else []
         
-        # Generate embeddings
-        logger.info(f"Generating embeddings for {len(chunk_texts)} chunks from {path}")
-        embeddings = embed_texts(chunk_texts)
+        chunk_data = [(idx, txt, start, end) for idx, txt, start, end in chunks]
+        file_info = {file_id: (str(path), filetype)}
+        threshold = NEAR_DUP_THRESHOLD if near_dup_threshold is None else near_dup_threshold
+        if threshold <= 0:
+            # No near-duplicate pass: embed first, then write chunks and embeddings in one transaction
+            logger.info(f"Generating embeddings for {len(chunk_data)} chunks from {path}")
+            embeddings = embed_texts([txt for _, txt, _, _ in chunk_data])
+            chunk_records = db.replace_file_chunks_bulk(
+                source_id, file_id, chunk_data, embeddings=embeddings, model_name=EMBEDDING_MODEL
+            )
+            _add_file_chunks_to_ann(chunk_records, embeddings, source_id, file_info)
+        else:
+            # Insert chunks (ids come back from the insert)
+            chunk_records = db.replace_file_chunks_bulk(source_id, file_id, chunk_data)
+            
+            # Link near-duplicate chunks to existing canonical chunks instead of embedding them
+            chunk_records = _suppress_near_duplicates(chunk_records, source_id, near_dup_threshold, exclude_file_id=file_id)
+            
+            logger.info(f"Generating embeddings for {len(chunk_records)} chunks from {path}")
+            _embed_file_chunks(chunk_records, source_id, file_info)
         
-        # Store embeddings
-        from memory_service.config import EMBEDDING_MODEL
-        db.insert_embeddings(chunk_ids, embeddings, EMBEDDING_MODEL, source_id)
-        
-        # Add to ANN index if available
-        try:
-            from memory_service.api import ann_index_manager
-            if ann_index_manager.is_available():
-                # Get source to get project_id
-                source = db.get_source_by_source_id(source_id)
-                project_id = source.project_id if source else "general"
-                
-                # Prepare metadata for ANN
-                metadata_list = []
-                for i, chunk_record in enumerate(chunk_records):
-                    metadata_list.append({
-                        "embedding_id": chunk_record.id,  # Use chunk_id as embedding_id
-                        "chunk_id": chunk_record.id,
-                        "file_id": file_id,
-                        "file_path": str(path),
-                        "chunk_text": chunk_record.text,
-                        "source_id": source_id,
-                        "project_id": project_id,
-                        "filetype": filetype,
-                        "chunk_index": chunk_record.chunk_index,
-                        "start_char": chunk_record.start_char,
-                        "end_char": chunk_record.end_char,
-                        "chat_id": None,
-                        "message_id": None,
-                    })
-                
-                ann_index_manager.add_embeddings(embeddings, metadata_list)
-                logger.debug(f"[ANN] Added {len(embeddings)} embeddings to ANN index for {path}")
-        except Exception as e:
-            logger.warning(f"[ANN] Failed to add embeddings to ANN index: {e}")
+        # Re-embed (or re-link) chunks that were near-duplicates of this file's old chunks
+        if detached_chunk_ids:
+            _reindex_detached_chunks(detached_chunk_ids, source_id, near_dup_threshold)
         
         # Update source stats after successful indexing
         try:
@@ -776,6 +1035,8 @@ def index_source(source_id: str) -> Tuple[int, int, int]:
         # Walk the directory tree
         # If resuming, index_file's idempotent check will skip already-indexed files
         for path in files_to_index:
+            # Let queued chat/watcher work go first when running in the bulk lane
+            yield_to_higher_lanes()
             try:
                 # Log file being processed (especially for Downloads)
                 if "Downloads" in str(root_path) or "downloads" in source_id.lower():
@@ -786,7 +1047,10 @@ def index_source(source_id: str) -> Tuple[int, int, int]:
                 was_already_indexed = existing_file is not None
                 
                 # index_file is idempotent - it will skip files that are already indexed and unchanged
-                was_indexed = index_file(path, source.id, source_id)
+                was_indexed = index_file(
+                    path, source.id, source_id,
+                    near_dup_threshold=source_config.near_dup_threshold if source_config else None
+                )
                 
                 # Always increment total_processed to show we're still working
                 total_processed += 1
@@ -891,18 +1155,27 @@ def index_source(source_id: str) -> Tuple[int, int, int]:
         return 0, 0, job_id
 
 
-def delete_file(path: Path, source_db_id: int, source_id: str):
+def delete_file(path: Path, source_db_id: int, source_id: str, near_dup_threshold: Optional[float] = None):
     """Delete a file and all its chunks/embeddings from the index."""
     # Get chunk IDs before deletion so we can remove from ANN
     file = db.get_file_by_path(source_db_id, str(path), source_id)
     chunk_ids_to_remove = []
+    detached_chunk_ids = []
     if file:
         chunk_records = db.get_chunks_by_file_id(file.id, source_id)
         chunk_ids_to_remove = [c.id for c in chunk_records]
+        # Near-duplicates in other files that pointed at this file's chunks need their own embedding
+        detached_chunk_ids = db.detach_near_duplicates(file.id, source_id)
     
     # Delete from database
     db.delete_file_by_path(source_db_id, str(path), source_id)
     
+    if detached_chunk_ids:
+        try:
+            _reindex_detached_chunks(detached_chunk_ids, source_id, near_dup_threshold)
+        except Exception as e:
+            logger.warning(f"[NEAR-DUP] Failed to re-embed detached chunks after deleting {path}: {e}")
+    
     # Remove from ANN index
     if chunk_ids_to_remove:
         try:
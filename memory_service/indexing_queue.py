@@ -1,27 +1,42 @@
 """
-Async indexing job queue with parallel workers.
+Async indexing job queue for chat messages.
 
 Handles background indexing of chat messages without blocking chat responses.
+Pending jobs are kept per project; each project with pending jobs has one
+drain task in the scheduler's CHAT lane (see scheduler.py), which indexes up
+to INDEX_BATCH_SIZE jobs with one grouped write/embed/ANN pass and then
+requeues itself behind other projects, while keeping per-job status.
+Timeouts and cancellation are cooperative (CancellationToken checked between
+indexing phases), so no extra thread is spawned per job. Each job has its own
+token; jobs whose batch was stopped by another job are requeued, not failed.
+
+Jobs are journaled to SQLite (see job_journal.py) at enqueue, lease and ack,
+and unfinished jobs are replayed when the queue starts, so nothing enqueued
+is lost across restarts.
 """
 import logging
-import queue
 import threading
 import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import os
 
+from memory_service.cancellation import CancellationToken, JobCancelledError
+from memory_service.job_journal import JobJournal
+from memory_service.scheduler import IndexingScheduler, Lane, get_scheduler
+
 logger = logging.getLogger(__name__)
 
 # Configuration
-INDEX_WORKERS = int(os.getenv("INDEX_WORKERS", "2"))  # Default: 2 workers
 BASE_TIMEOUT = 8.0  # Base timeout in seconds
 PER_CHUNK_TIMEOUT = 3.5  # Timeout per chunk in seconds
 MIN_TIMEOUT = 15.0  # Minimum timeout in seconds
 MAX_TIMEOUT = 300.0  # Maximum timeout (5 minutes)
 HARD_CAP = 600.0  # Hard cap (10 minutes) - absolute safety limit
+INDEX_BATCH_SIZE = int(os.getenv("INDEX_BATCH_SIZE", "32"))  # Max jobs of one project indexed as one batch
 
 
 class JobState(Enum):
@@ -31,6 +46,10 @@ class JobState(Enum):
     SUCCESS = "success"
     TIMEOUT = "timeout"
     ERROR = "error"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATES = (JobState.SUCCESS, JobState.TIMEOUT, JobState.ERROR, JobState.CANCELLED)
 
 
 @dataclass
@@ -54,6 +73,9 @@ class IndexingJob:
     estimated_chunks: int = 1
     computed_timeout: float = MIN_TIMEOUT
     error_message: Optional[str] = None
+    cancel_requested: bool = False
+    cancel_token: Optional[CancellationToken] = field(default=None, repr=False)
+    run_alone: bool = False  # Set after a batch timeout: retried in a batch of its own
     
     def compute_timeout(self) -> float:
         """Compute dynamic timeout based on estimated chunks."""
@@ -70,39 +92,36 @@ class IndexingJob:
 
 
 class IndexingQueue:
-    """Job queue for async indexing with parallel workers."""
+    """Job queue for async chat indexing, executed by the indexing scheduler."""
     
-    def __init__(self, num_workers: int = INDEX_WORKERS):
-        self.queue: queue.Queue = queue.Queue()
+    def __init__(self, batch_size: int = INDEX_BATCH_SIZE, journal: Optional[JobJournal] = None,
+                 scheduler: Optional[IndexingScheduler] = None):
+        self.journal = journal
+        self.scheduler = scheduler
         self.jobs: Dict[str, IndexingJob] = {}  # job_id -> job
         self.jobs_lock = threading.Lock()
-        self.workers: list[threading.Thread] = []
-        self.num_workers = num_workers
+        self.pending: Dict[str, Deque[IndexingJob]] = {}  # project_id -> queued jobs
+        self.draining: set = set()  # project_ids with a drain task in the scheduler
+        self.batch_size = max(1, batch_size)
         self.running = False
         
     def start(self):
-        """Start worker threads."""
+        """Start scheduling jobs (replays unfinished jobs from the journal)."""
         if self.running:
             return
         
+        if self.scheduler is None:
+            self.scheduler = get_scheduler()
         self.running = True
-        for i in range(self.num_workers):
-            worker = threading.Thread(
-                target=self._worker_loop,
-                name=f"IndexWorker-{i+1}",
-                daemon=True
-            )
-            worker.start()
-            self.workers.append(worker)
-        logger.info(f"[INDEX-QUEUE] Started {self.num_workers} indexing workers")
+        self._replay_journal()
+        logger.info(f"[INDEX-QUEUE] Started (batch size {self.batch_size})")
     
     def stop(self):
-        """Stop worker threads (graceful shutdown)."""
+        """Stop scheduling new batches (queued jobs stay journaled and are replayed on restart)."""
         self.running = False
-        # Add sentinel values to wake up workers
-        for _ in range(self.num_workers):
-            self.queue.put(None)
-        logger.info(f"[INDEX-QUEUE] Stopping {self.num_workers} indexing workers")
+        with self.jobs_lock:
+            queued = sum(len(jobs) for jobs in self.pending.values())
+        logger.info(f"[INDEX-QUEUE] Stopping ({queued} queued job(s) left for replay)")
     
     def enqueue(
         self,
@@ -121,45 +140,125 @@ class IndexingQueue:
         Returns:
             Tuple of (job_id, success)
         """
-        try:
-            # Estimate chunks (rough approximation: ~1000 chars per chunk)
-            estimated_chunks = max(1, len(content) // 1000 + 1)
-            
-            job_id = f"{chat_id}:{message_id}:{int(time.time() * 1000)}"
-            job = IndexingJob(
-                job_id=job_id,
-                project_id=project_id,
-                chat_id=chat_id,
-                message_id=message_id,
-                message_uuid=message_uuid,
-                role=role,
-                content=content,
-                timestamp=timestamp,
-                message_index=message_index,
-                estimated_chunks=estimated_chunks
-            )
-            job.compute_timeout()
-            
-            with self.jobs_lock:
-                self.jobs[job_id] = job
+        return self.enqueue_many([{
+            "project_id": project_id,
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "role": role,
+            "content": content,
+            "timestamp": timestamp,
+            "message_index": message_index,
+            "message_uuid": message_uuid,
+        }])[0]
+    
+    def enqueue_many(self, messages: List[Dict]) -> List[Tuple[str, bool]]:
+        """
+        Enqueue several indexing jobs (e.g. from the bulk endpoint).
+        
+        All jobs are journaled in one transaction before they become visible to workers.
+        
+        Args:
+            messages: List of dicts with the enqueue() keyword arguments
             
-            self.queue.put(job)
+        Returns:
+            List of (job_id, success), in the same order as messages
+        """
+        results: List[Tuple[str, bool]] = []
+        jobs: List[IndexingJob] = []
+        for msg in messages:
+            try:
+                job = self._build_job(**msg)
+                jobs.append(job)
+                results.append((job.job_id, True))
+            except Exception as e:
+                logger.error(f"[INDEX-QUEUE] Failed to enqueue job: {e}", exc_info=True)
+                results.append(("", False))
+        
+        if self.journal is not None and jobs:
+            try:
+                self.journal.record_enqueued(jobs)
+            except Exception as e:
+                # Keep indexing in memory; only restart safety is lost for these jobs
+                logger.error(f"[INDEX-QUEUE] Failed to journal {len(jobs)} job(s): {e}", exc_info=True)
+        
+        self._schedule(jobs)
+        for job in jobs:
             logger.info(
-                f"[INDEX-QUEUE] Enqueued job {job_id} "
-                f"(project={project_id}, chunks≈{estimated_chunks}, timeout={job.computed_timeout:.1f}s)"
+                f"[INDEX-QUEUE] Enqueued job {job.job_id} "
+                f"(project={job.project_id}, chunks≈{job.estimated_chunks}, timeout={job.computed_timeout:.1f}s)"
             )
-            return job_id, True
-            
+        return results
+    
+    def _build_job(
+        self,
+        project_id: str,
+        chat_id: str,
+        message_id: str,
+        role: str,
+        content: str,
+        timestamp: datetime,
+        message_index: int,
+        message_uuid: Optional[str] = None
+    ) -> IndexingJob:
+        """Create a QUEUED job with its estimated size and timeout."""
+        # Estimate chunks (rough approximation: ~1000 chars per chunk)
+        estimated_chunks = max(1, len(content) // 1000 + 1)
+        
+        job_id = f"{chat_id}:{message_id}:{int(time.time() * 1000)}"
+        job = IndexingJob(
+            job_id=job_id,
+            project_id=project_id,
+            chat_id=chat_id,
+            message_id=message_id,
+            message_uuid=message_uuid,
+            role=role,
+            content=content,
+            timestamp=timestamp,
+            message_index=message_index,
+            estimated_chunks=estimated_chunks
+        )
+        job.compute_timeout()
+        return job
+    
+    def _replay_journal(self):
+        """Requeue jobs that were queued or running when the service last stopped."""
+        if self.journal is None:
+            return
+        try:
+            rows = self.journal.load_pending()
+            self.journal.prune()
         except Exception as e:
-            logger.error(f"[INDEX-QUEUE] Failed to enqueue job: {e}", exc_info=True)
-            return "", False
+            logger.error(f"[INDEX-QUEUE] Failed to replay journal: {e}", exc_info=True)
+            return
+        
+        replayed = []
+        for row in rows:
+            job = IndexingJob(
+                job_id=row["job_id"],
+                project_id=row["project_id"],
+                chat_id=row["chat_id"],
+                message_id=row["message_id"],
+                message_uuid=row["message_uuid"],
+                role=row["role"],
+                content=row["content"],
+                timestamp=datetime.fromisoformat(row["timestamp"]),
+                message_index=row["message_index"],
+                enqueue_time=datetime.fromisoformat(row["enqueue_time"]),
+                estimated_chunks=row["estimated_chunks"],
+                computed_timeout=row["computed_timeout"],
+            )
+            replayed.append(job)
+        
+        self._schedule(replayed)
+        if replayed:
+            logger.info(f"[INDEX-QUEUE] Replayed {len(replayed)} unfinished job(s) from journal")
     
     def get_job_status(self, job_id: str) -> Optional[Dict]:
         """Get job status for API response."""
         with self.jobs_lock:
             job = self.jobs.get(job_id)
             if not job:
-                return None
+                return self._get_journaled_job_status(job_id)
             
             return {
                 "job_id": job.job_id,
@@ -174,121 +273,287 @@ class IndexingQueue:
                 "message_uuid": job.message_uuid
             }
     
-    def _worker_loop(self):
-        """Worker thread main loop."""
-        from memory_service.indexer import index_chat_message
+    def _get_journaled_job_status(self, job_id: str) -> Optional[Dict]:
+        """Status of a job no longer held in memory (finished before a restart or pruned)."""
+        if self.journal is None:
+            return None
+        try:
+            row = self.journal.get_job(job_id)
+        except Exception as e:
+            logger.warning(f"[INDEX-QUEUE] Journal lookup failed for job {job_id}: {e}")
+            return None
+        if row is None:
+            return None
+        duration = None
+        if row["start_time"] and row["end_time"]:
+            duration = (datetime.fromisoformat(row["end_time"]) - datetime.fromisoformat(row["start_time"])).total_seconds()
+        return {
+            "job_id": row["job_id"],
+            "state": row["state"],
+            "enqueue_time": row["enqueue_time"],
+            "start_time": row["start_time"],
+            "end_time": row["end_time"],
+            "duration": duration,
+            "estimated_chunks": row["estimated_chunks"],
+            "computed_timeout": row["computed_timeout"],
+            "error_message": row["error_message"],
+            "message_uuid": row["message_uuid"]
+        }
+    
+    def _schedule(self, jobs: List[IndexingJob]):
+        """Register jobs and make sure each of their projects has a drain task."""
+        to_submit = []
+        with self.jobs_lock:
+            for job in jobs:
+                self.jobs[job.job_id] = job
+                self.pending.setdefault(job.project_id, deque()).append(job)
+                if self.running and job.project_id not in self.draining:
+                    self.draining.add(job.project_id)
+                    to_submit.append(job.project_id)
+        for project_id in to_submit:
+            self._submit_drain(project_id)
+    
+    def _submit_drain(self, project_id: str):
+        """Queue a drain task for a project in the CHAT lane (fair-shared by project)."""
+        try:
+            self.scheduler.submit(
+                Lane.CHAT, self._drain, project_id,
+                source_id=f"project-{project_id}", fair_key=project_id, label=f"chat-index:{project_id}"
+            )
+        except RuntimeError as e:
+            # Scheduler shut down; jobs stay journaled and are replayed on restart
+            logger.warning(f"[INDEX-QUEUE] Could not schedule jobs for project {project_id}: {e}")
+            with self.jobs_lock:
+                self.draining.discard(project_id)
+    
+    def _drain(self, project_id: str):
+        """Index up to batch_size pending jobs of a project, then requeue if more are pending."""
+        from memory_service.indexer import index_chat_messages_batch
         
-        while self.running:
-            try:
-                job = self.queue.get(timeout=1.0)
-                if job is None:  # Sentinel value for shutdown
+        with self.jobs_lock:
+            pending = self.pending.get(project_id)
+            batch = []
+            while pending and len(batch) < self.batch_size:
+                if batch and pending[0].run_alone:
                     break
-                
-                self._process_job(job, index_chat_message)
-                self.queue.task_done()
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error(f"[INDEX-QUEUE] Worker error: {e}", exc_info=True)
+                batch.append(pending.popleft())
+                if batch[0].run_alone:
+                    break
+        
+        try:
+            if batch:
+                self._process_batch(batch, index_chat_messages_batch)
+        finally:
+            with self.jobs_lock:
+                pending = self.pending.get(project_id)
+                more = bool(pending) and self.running
+                if not pending:
+                    self.pending.pop(project_id, None)
+                if not more:
+                    self.draining.discard(project_id)
+            if more:
+                # Go to the back of the lane so other projects get their turn
+                self._submit_drain(project_id)
     
-    def _process_job(self, job: IndexingJob, index_func):
-        """Process a single indexing job."""
-        job.state = JobState.RUNNING
-        job.start_time = datetime.now()
+    def cancel_job(self, job_id: str, reason: str = "cancelled") -> bool:
+        """
+        Cancel a queued or running job.
+        
+        Queued jobs are skipped when their project is drained. A running job stops
+        its batch at the next phase checkpoint and is finished as CANCELLED; its
+        unfinished batch-mates are requeued.
+        
+        Returns:
+            True if the job was found and not already finished
+        """
+        with self.jobs_lock:
+            job = self.jobs.get(job_id)
+            if not job or job.state not in (JobState.QUEUED, JobState.RUNNING):
+                return False
+            job.cancel_requested = True
+            if job.cancel_token is not None:
+                job.cancel_token.cancel(reason)
+        logger.info(f"[INDEX-QUEUE] Cancellation requested for job {job_id} ({reason})")
+        return True
+    
+    def cancel_chat_jobs(self, project_id: str, chat_id: str, reason: str = "chat deleted") -> int:
+        """
+        Cancel all queued or running jobs of a chat (called before its messages are deleted).
+        
+        Returns:
+            Number of jobs cancelled
+        """
+        with self.jobs_lock:
+            job_ids = [
+                job.job_id for job in self.jobs.values()
+                if job.project_id == project_id and job.chat_id == chat_id
+                and job.state in (JobState.QUEUED, JobState.RUNNING)
+            ]
+        return sum(1 for job_id in job_ids if self.cancel_job(job_id, reason))
+    
+    def _requeue(self, jobs: List[IndexingJob]):
+        """Put unfinished jobs back at the front of their project's queue (the drain picks them up next)."""
+        with self.jobs_lock:
+            for job in reversed(jobs):
+                job.state = JobState.QUEUED
+                job.start_time = None
+                job.cancel_token = None
+                self.pending.setdefault(job.project_id, deque()).appendleft(job)
+        self._journal_call("release", self.journal.release if self.journal else None, jobs)
+    
+    def _process_batch(self, jobs: List[IndexingJob], index_batch_func):
+        """
+        Process a batch of indexing jobs with one grouped write/embed/ANN pass.
+        
+        Runs on the calling scheduler worker thread, so the thread count stays
+        constant under any load. Timeouts and cancellation are enforced cooperatively:
+        the indexer checks the batch's CancellationToken between its chunk/embed/write
+        phases and stops there, releasing its connections instead of running on in
+        the background.
+        
+        Each job has its own token (cancelled by cancel_job()); the batch token is
+        linked to them and carries the batch deadline. A stopped batch only finishes
+        the job that stopped it:
+        - a cancelled job becomes CANCELLED; its unfinished batch-mates are requeued
+        - after a batch timeout the slow job is unknown, so the unfinished jobs are
+          requeued to run alone; a job that times out alone becomes TIMEOUT
+        Requeued jobs are released in the journal, not acked, so a restart replays them.
+        """
+        batch_start = datetime.now()
+        skipped = [job for job in jobs if job.cancel_requested]
+        jobs = [job for job in jobs if not job.cancel_requested]
+        for job in skipped:
+            job.state = JobState.CANCELLED
+            job.error_message = "Cancelled before start"
+            job.start_time = job.end_time = batch_start
+        if not jobs:
+            self._journal_call("ack", self.journal.ack if self.journal else None, skipped)
+            return
+        
+        # The batch gets the combined budget of its jobs, still bounded by the hard cap
+        batch_timeout = min(sum(job.computed_timeout for job in jobs), HARD_CAP)
+        with self.jobs_lock:
+            for job in jobs:
+                job.state = JobState.RUNNING
+                job.start_time = batch_start
+                job.cancel_token = CancellationToken()
+                if job.cancel_requested:
+                    # cancel_job() ran after the skip check above
+                    job.cancel_token.cancel("cancelled")
+        token = CancellationToken(timeout=batch_timeout, linked=[job.cancel_token for job in jobs])
+        self._journal_call("lease", self.journal.mark_leased if self.journal else None, jobs,
+                           f"{os.getpid()}:{threading.current_thread().name}", batch_timeout)
         
         logger.info(
-            f"[INDEX-QUEUE] Processing job {job.job_id} "
-            f"(project={job.project_id}, timeout={job.computed_timeout:.1f}s)"
+            f"[INDEX-QUEUE] Processing batch of {len(jobs)} job(s) "
+            f"(first={jobs[0].job_id}, timeout={batch_timeout:.1f}s)"
         )
         
+        requeued: List[IndexingJob] = []
         try:
-            # Run indexing with timeout
             start_time = time.time()
-            
-            # Use threading to enforce timeout
-            result = [None, None]  # [success, message_uuid]
-            exception = [None]
-            
-            def run_indexing():
-                try:
-                    success, message_uuid = index_func(
-                        project_id=job.project_id,
-                        chat_id=job.chat_id,
-                        message_id=job.message_id,
-                        role=job.role,
-                        content=job.content,
-                        timestamp=job.timestamp,
-                        message_index=job.message_index
-                    )
-                    result[0] = success
-                    result[1] = message_uuid
-                except Exception as e:
-                    exception[0] = e
-            
-            thread = threading.Thread(target=run_indexing, daemon=True)
-            thread.start()
-            thread.join(timeout=min(job.computed_timeout, HARD_CAP))
+            exception = None
+            results = None
+            try:
+                results = index_batch_func([
+                    {
+                        "project_id": job.project_id,
+                        "chat_id": job.chat_id,
+                        "message_id": job.message_id,
+                        "role": job.role,
+                        "content": job.content,
+                        "timestamp": job.timestamp,
+                        "message_index": job.message_index,
+                        "message_uuid": job.message_uuid,
+                    }
+                    for job in jobs
+                ], cancel_token=token)
+            except Exception as e:
+                exception = e
             
             elapsed = time.time() - start_time
+            # Stopped by the token only if it fired before the batch returned or raised
+            # (token.fired, unlike is_cancelled, does not fire a passed deadline now)
+            stopped = isinstance(exception, JobCancelledError) if exception else token.fired
+            
+            for i, job in enumerate(jobs):
+                success, message_uuid = results[i] if results else (False, None)
+                if message_uuid:
+                    job.message_uuid = message_uuid  # Update with actual message_uuid
+                if success:
+                    job.state = JobState.SUCCESS
+                elif stopped and job.cancel_token.fired:
+                    job.state = JobState.CANCELLED
+                    job.error_message = f"Job {job.cancel_token.reason}"
+                elif stopped and token.reason == "timeout" and len(jobs) == 1:
+                    job.state = JobState.TIMEOUT
+                    job.error_message = f"Job exceeded timeout ({batch_timeout:.1f}s)"
+                elif stopped:
+                    # Stopped because of a batch-mate or the shared batch deadline:
+                    # run it again (alone after a timeout, to find the slow job)
+                    job.run_alone = job.run_alone or token.reason == "timeout"
+                    requeued.append(job)
+                    continue
+                elif exception:
+                    # Batch raised exception
+                    job.state = JobState.ERROR
+                    job.error_message = str(exception)
+                else:
+                    # Job returned False (partial failure)
+                    job.state = JobState.ERROR
+                    job.error_message = "Indexing returned False"
+                job.end_time = datetime.now()
+                job.cancel_token = None
+                
+                # Log structured telemetry
+                logger.info(
+                    f"[INDEX-TELEMETRY] job_id={job.job_id} "
+                    f"chat_id={job.chat_id} message_uuid={job.message_uuid} "
+                    f"role={job.role} estimated_chunks={job.estimated_chunks} "
+                    f"computed_timeout={job.computed_timeout:.1f}s hard_cap={HARD_CAP:.1f}s "
+                    f"batch_size={len(jobs)} "
+                    f"start={job.start_time.isoformat()} end={job.end_time.isoformat()} "
+                    f"duration={job.get_duration():.1f}s status={job.state.value} "
+                    f"error={job.error_message or 'none'}"
+                )
             
-            if thread.is_alive():
-                # Job timed out
-                job.state = JobState.TIMEOUT
-                job.error_message = f"Job exceeded timeout ({job.computed_timeout:.1f}s)"
+            if requeued:
+                self._requeue(requeued)
+            if stopped:
                 logger.warning(
-                    f"[INDEX-QUEUE] Job {job.job_id} timed out after {elapsed:.1f}s "
-                    f"(limit: {job.computed_timeout:.1f}s)"
+                    f"[INDEX-QUEUE] Batch of {len(jobs)} job(s) stopped ({token.reason}) after {elapsed:.1f}s "
+                    f"(limit: {batch_timeout:.1f}s), {len(requeued)} job(s) requeued"
                 )
-            elif exception[0]:
-                # Job raised exception
-                job.state = JobState.ERROR
-                job.error_message = str(exception[0])
+            elif exception:
                 logger.error(
-                    f"[INDEX-QUEUE] Job {job.job_id} failed: {exception[0]}",
-                    exc_info=exception[0]
-                )
-            elif result[0]:
-                # Job succeeded
-                job.state = JobState.SUCCESS
-                job.message_uuid = result[1]  # Update with actual message_uuid
-                logger.info(
-                    f"[INDEX-QUEUE] Job {job.job_id} completed successfully "
-                    f"in {elapsed:.1f}s (message_uuid={result[1]})"
+                    f"[INDEX-QUEUE] Batch of {len(jobs)} job(s) failed: {exception}",
+                    exc_info=exception
                 )
             else:
-                # Job returned False (partial failure)
-                job.state = JobState.ERROR
-                job.error_message = "Indexing returned False"
-                job.message_uuid = result[1]  # Still capture message_uuid
-                logger.warning(
-                    f"[INDEX-QUEUE] Job {job.job_id} returned False "
-                    f"(message_uuid={result[1]})"
+                succeeded = sum(1 for job in jobs if job.state == JobState.SUCCESS)
+                logger.info(
+                    f"[INDEX-QUEUE] Batch of {len(jobs)} job(s) completed in {elapsed:.1f}s "
+                    f"({succeeded} succeeded)"
                 )
             
-            job.end_time = datetime.now()
-            
-            # Log structured telemetry
-            logger.info(
-                f"[INDEX-TELEMETRY] job_id={job.job_id} "
-                f"chat_id={job.chat_id} message_uuid={job.message_uuid} "
-                f"role={job.role} estimated_chunks={job.estimated_chunks} "
-                f"computed_timeout={job.computed_timeout:.1f}s hard_cap={HARD_CAP:.1f}s "
-                f"start={job.start_time.isoformat()} end={job.end_time.isoformat()} "
-                f"duration={job.get_duration():.1f}s status={job.state.value} "
-                f"error={job.error_message or 'none'}"
-            )
-            
         except Exception as e:
-            job.state = JobState.ERROR
-            job.error_message = str(e)
-            job.end_time = datetime.now()
+            requeued_ids = {job.job_id for job in requeued}
+            for job in jobs:
+                if job.job_id in requeued_ids:
+                    continue
+                job.state = JobState.ERROR
+                job.error_message = str(e)
+                job.end_time = datetime.now()
+                job.cancel_token = None
             logger.error(
-                f"[INDEX-QUEUE] Job {job.job_id} crashed: {e}",
+                f"[INDEX-QUEUE] Batch starting with job {jobs[0].job_id} crashed: {e}",
                 exc_info=True
             )
         
         finally:
+            requeued_ids = {job.job_id for job in requeued}
+            finished = [job for job in jobs if job.job_id not in requeued_ids]
+            self._journal_call("ack", self.journal.ack if self.journal else None, skipped + finished)
             # Clean up old jobs (keep last 1000)
             with self.jobs_lock:
                 if len(self.jobs) > 1000:
@@ -298,10 +563,20 @@ class IndexingQueue:
                         key=lambda x: x[1].enqueue_time
                     )
                     for old_job_id, _ in sorted_jobs[:len(self.jobs) - 1000]:
-                        if self.jobs[old_job_id].state in (JobState.SUCCESS, JobState.TIMEOUT, JobState.ERROR):
+                        if self.jobs[old_job_id].state in FINISHED_STATES:
                             del self.jobs[old_job_id]
 
 
+    def _journal_call(self, what: str, func, jobs: List[IndexingJob], *args):
+        """Write to the journal; failures are logged, never fail the batch."""
+        if func is None or not jobs:
+            return
+        try:
+            func(jobs, *args)
+        except Exception as e:
+            logger.error(f"[INDEX-QUEUE] Failed to journal {what} for {len(jobs)} job(s): {e}", exc_info=True)
+
+
 # Global queue instance
 _indexing_queue: Optional[IndexingQueue] = None
 
@@ -310,8 +585,13 @@ def get_indexing_queue() -> IndexingQueue:
     """Get or create the global indexing queue."""
     global _indexing_queue
     if _indexing_queue is None:
-        num_workers = INDEX_WORKERS
-        _indexing_queue = IndexingQueue(num_workers=num_workers)
+        from memory_service.config import INDEX_QUEUE_DB_PATH
+        journal = None
+        try:
+            journal = JobJournal(INDEX_QUEUE_DB_PATH)
+        except Exception as e:
+            logger.error(f"[INDEX-QUEUE] Could not open job journal at {INDEX_QUEUE_DB_PATH}, queue is not durable: {e}")
+        _indexing_queue = IndexingQueue(journal=journal)
         _indexing_queue.start()
     return _indexing_queue
 
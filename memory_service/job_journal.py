@@ -0,0 +1,255 @@
+"""
+Durable SQLite journal for the chat indexing queue.
+
+Every job is written to the journal when it is enqueued, marked as leased when
+a worker picks it up and acked (with its final state) when it finishes, or
+released back to 'queued' when its batch was stopped by another job. On
+startup, jobs that were still queued, or leased by a process that no longer
+runs, are replayed into the in-memory queue, so messages enqueued right before
+a restart still get embedded. Job status stays queryable after restarts.
+
+The journal uses one connection in WAL mode with synchronous=NORMAL: a commit
+is an append to the WAL without fsync, which keeps enqueue cheap during chat
+bursts while still surviving a process crash.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+JOURNAL_MAX_ATTEMPTS = int(os.getenv("INDEX_JOURNAL_MAX_ATTEMPTS", "3"))  # Replays before a job is abandoned
+JOURNAL_RETENTION_SECONDS = float(os.getenv("INDEX_JOURNAL_RETENTION_SECONDS", str(7 * 24 * 3600)))  # Keep finished jobs
+
+# States that still need work (mirror indexing_queue.JobState values)
+PENDING_STATES = ("queued", "running")
+
+
+class JobJournal:
+    """Append/update journal of indexing jobs (one SQLite file, thread-safe)."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        with self.lock:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS chat_index_jobs (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL UNIQUE,
+                    project_id TEXT NOT NULL,
+                    chat_id TEXT NOT NULL,
+                    message_id TEXT NOT NULL,
+                    message_uuid TEXT,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    message_index INTEGER NOT NULL,
+                    estimated_chunks INTEGER NOT NULL DEFAULT 1,
+                    computed_timeout REAL NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    enqueue_time TEXT NOT NULL,
+                    start_time TEXT,
+                    end_time TEXT,
+                    error_message TEXT
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_index_jobs_state ON chat_index_jobs(state, seq)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_index_jobs_end ON chat_index_jobs(end_time)")
+            self.conn.commit()
+
+    def close(self):
+        """Close the journal connection."""
+        with self.lock:
+            self.conn.close()
+
+    def record_enqueued(self, jobs: Iterable) -> None:
+        """
+        Journal newly enqueued jobs in one transaction.
+
+        Args:
+            jobs: IndexingJob instances (state QUEUED)
+        """
+        rows = [
+            (
+                job.job_id, job.project_id, job.chat_id, job.message_id, job.message_uuid,
+                job.role, job.content, job.timestamp.isoformat(), job.message_index,
+                job.estimated_chunks, job.computed_timeout, job.enqueue_time.isoformat(),
+            )
+            for job in jobs
+        ]
+        if not rows:
+            return
+        with self.lock:
+            try:
+                self.conn.executemany("""
+                    INSERT OR REPLACE INTO chat_index_jobs (
+                        job_id, project_id, chat_id, message_id, message_uuid,
+                        role, content, timestamp, message_index,
+                        estimated_chunks, computed_timeout, enqueue_time
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def mark_leased(self, jobs: Iterable, owner: str, lease_seconds: float) -> None:
+        """
+        Mark jobs as running under a lease.
+
+        A lease that expires (process died mid-batch) makes the job eligible for replay.
+
+        Args:
+            jobs: IndexingJob instances picked up by a worker
+            owner: Lease owner ("<pid>:<thread name>")
+            lease_seconds: Lease duration (the batch timeout)
+        """
+        lease_expires = time.time() + lease_seconds
+        rows = [(owner, lease_expires, job.start_time.isoformat(), job.job_id) for job in jobs]
+        with self.lock:
+            try:
+                self.conn.executemany("""
+                    UPDATE chat_index_jobs
+                    SET state = 'running', attempts = attempts + 1,
+                        lease_owner = ?, lease_expires = ?, start_time = ?
+                    WHERE job_id = ?
+                """, rows)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def ack(self, jobs: Iterable) -> None:
+        """
+        Record the final state of finished jobs and release their leases.
+
+        Args:
+            jobs: Finished IndexingJob instances
+        """
+        rows = [
+            (
+                job.state.value, job.message_uuid, job.error_message,
+                job.end_time.isoformat() if job.end_time else datetime.now().isoformat(),
+                job.job_id,
+            )
+            for job in jobs
+        ]
+        with self.lock:
+            try:
+                self.conn.executemany("""
+                    UPDATE chat_index_jobs
+                    SET state = ?, message_uuid = COALESCE(?, message_uuid), error_message = ?,
+                        end_time = ?, lease_owner = NULL, lease_expires = NULL
+                    WHERE job_id = ?
+                """, rows)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def release(self, jobs: Iterable) -> None:
+        """
+        Put leased jobs back in the queue without finishing them (their batch was
+        stopped because of another job, see IndexingQueue._process_batch).
+
+        Args:
+            jobs: Unfinished IndexingJob instances that were requeued
+        """
+        rows = [(job.job_id,) for job in jobs]
+        with self.lock:
+            try:
+                self.conn.executemany("""
+                    UPDATE chat_index_jobs
+                    SET state = 'queued', lease_owner = NULL, lease_expires = NULL
+                    WHERE job_id = ?
+                """, rows)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def load_pending(self, max_attempts: int = JOURNAL_MAX_ATTEMPTS) -> List[sqlite3.Row]:
+        """
+        Collect jobs to replay at startup, oldest first.
+
+        Called before any worker of this process has leased anything, so every
+        'running' job belongs to a previous process. Those are requeued unless
+        they already used max_attempts, in which case they are marked as errors
+        (a job that keeps crashing the service must not be replayed forever).
+
+        Returns:
+            Journal rows in state 'queued', in enqueue order
+        """
+        with self.lock:
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self.conn.execute("""
+                    UPDATE chat_index_jobs
+                    SET state = 'error', end_time = ?, lease_owner = NULL, lease_expires = NULL,
+                        error_message = 'Abandoned after ' || attempts || ' attempts (interrupted by restart)'
+                    WHERE state = 'running' AND attempts >= ?
+                """, (datetime.now().isoformat(), max_attempts))
+                self.conn.execute("""
+                    UPDATE chat_index_jobs
+                    SET state = 'queued', lease_owner = NULL, lease_expires = NULL
+                    WHERE state = 'running'
+                """)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            return self.conn.execute(
+                "SELECT * FROM chat_index_jobs WHERE state = 'queued' ORDER BY seq"
+            ).fetchall()
+
+    def get_job(self, job_id: str) -> Optional[sqlite3.Row]:
+        """Look up a journaled job (for status queries after a restart)."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT * FROM chat_index_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+
+    def get_counts(self) -> Dict[str, int]:
+        """Number of journaled jobs per state."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT state, COUNT(*) AS n FROM chat_index_jobs GROUP BY state"
+            ).fetchall()
+        return {row["state"]: row["n"] for row in rows}
+
+    def prune(self, retention_seconds: float = JOURNAL_RETENTION_SECONDS) -> int:
+        """
+        Delete finished jobs older than the retention period.
+
+        Returns:
+            Number of rows deleted
+        """
+        cutoff = datetime.fromtimestamp(time.time() - retention_seconds).isoformat()
+        with self.lock:
+            try:
+                cursor = self.conn.execute(
+                    "DELETE FROM chat_index_jobs WHERE end_time IS NOT NULL AND end_time < ? AND state NOT IN (?, ?)",
+                    (cutoff,) + PENDING_STATES
+                )
+                self.conn.commit()
+                return cursor.rowcount
+            except Exception:
+                self.conn.rollback()
+                raise
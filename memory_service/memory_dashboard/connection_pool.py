@@ -0,0 +1,253 @@
+"""
+Per-thread SQLite connection pool for the Memory Service databases.
+
+get_db_connection() used to open a new sqlite3 connection (and switch it to
+WAL) on every call, and almost every helper opens and closes one. The pool
+keeps one idle connection per (thread, database path) and hands it out again
+on the next call; close() on the returned handle releases it back to the pool.
+
+- Connections are opened with tuned pragmas (WAL, synchronous, cache_size,
+  mmap_size, temp_store).
+- A nested get_db_connection() for the same database while the pooled
+  connection is checked out gets a separate, unpooled connection, so callers
+  never share a transaction by accident (same behaviour as before pooling).
+- If the database file is replaced or deleted (e.g. a project directory is
+  removed and recreated), the pooled connection is reopened.
+- Each thread keeps at most POOL_MAX_PER_THREAD idle connections (LRU).
+- Readers can check out read-only connections (acquire(..., readonly=True));
+  writes go through the per-database writer (see db_writer).
+"""
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # NORMAL is durable in WAL mode except on power loss
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "16384"))  # Page cache per connection
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # Memory-mapped I/O limit
+SQLITE_BUSY_TIMEOUT = 30.0  # Seconds to wait on a locked database
+POOL_MAX_PER_THREAD = int(os.getenv("SQLITE_POOL_MAX_PER_THREAD", "16"))  # Idle connections kept per thread
+
+
+def file_identity(path: str) -> Optional[Tuple[int, int]]:
+    """(st_dev, st_ino) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+        return (st.st_dev, st.st_ino)
+    except OSError:
+        return None
+
+
+def open_connection(db_path: Path, readonly: bool = False) -> sqlite3.Connection:
+    """
+    Open a new connection with the standard pragmas (not pooled).
+
+    Args:
+        db_path: Database file path (parent directory must exist; the file too if readonly)
+        readonly: Open with mode=ro (writes fail with "attempt to write a readonly database")
+
+    Returns:
+        sqlite3.Connection with row_factory=sqlite3.Row
+    """
+    if readonly:
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(str(db_path), timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")  # Enable WAL mode for concurrent access
+        conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class _PoolEntry:
+    """A pooled connection owned by one thread."""
+    __slots__ = ("conn", "identity", "in_use")
+
+    def __init__(self, conn: sqlite3.Connection, identity: Optional[Tuple[int, int]]):
+        self.conn = conn
+        self.identity = identity
+        self.in_use = False
+
+
+class PooledConnection:
+    """
+    Checkout handle for a pooled connection.
+
+    Behaves like the sqlite3.Connection it wraps; close() rolls back any
+    transaction left open and returns the connection to the pool. Closing
+    twice is harmless, and a handle that is garbage-collected unclosed is
+    released the same way.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, entry: Optional[_PoolEntry]):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_entry", entry)
+
+    def close(self):
+        conn = self._conn
+        if conn is None:
+            return
+        object.__setattr__(self, "_conn", None)
+        entry = self._entry
+        if entry is None:
+            conn.close()
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error as e:
+            logger.warning(f"[DB-POOL] Dropping broken pooled connection: {e}")
+            entry.identity = None  # Forces a reopen on next checkout
+        entry.in_use = False
+
+    def __del__(self):
+        # A handle dropped without close() releases its connection (like closing an unpooled one)
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __getattr__(self, name):
+        conn = self._conn
+        if conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+
+class ConnectionPool:
+    """Thread-local pool of SQLite connections keyed by database path."""
+
+    def __init__(self, max_per_thread: int = POOL_MAX_PER_THREAD):
+        self.max_per_thread = max(1, max_per_thread)
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.opened = 0
+        self.nested = 0
+        self.reopened = 0
+
+    def _entries(self) -> "OrderedDict[str, _PoolEntry]":
+        entries = getattr(self._local, "entries", None)
+        if entries is None:
+            entries = OrderedDict()
+            self._local.entries = entries
+        return entries
+
+    def acquire(self, db_path: Path, readonly: bool = False) -> PooledConnection:
+        """
+        Check out a connection for db_path.
+
+        The parent directory is created when a new connection is opened (e.g. after
+        the directory was removed), so callers don't need to mkdir on every call.
+
+        Args:
+            db_path: Database file path
+            readonly: Check out a read-only connection. If the database file doesn't
+                      exist yet, a read-write connection is returned (it creates the file).
+
+        Returns:
+            PooledConnection; call close() to return it to the pool
+        """
+        path = str(db_path)
+        identity = file_identity(path)
+        if readonly and identity is None:
+            readonly = False
+        key = path + "?mode=ro" if readonly else path
+        entries = self._entries()
+        entry = entries.get(key)
+
+        if entry is not None and entry.in_use:
+            # Nested use in the same thread: separate connection, as before pooling
+            with self._stats_lock:
+                self.nested += 1
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            return PooledConnection(open_connection(db_path, readonly=readonly), None)
+
+        if entry is not None and entry.identity is not None and entry.identity == identity:
+            entries.move_to_end(key)
+            entry.in_use = True
+            with self._stats_lock:
+                self.hits += 1
+            return PooledConnection(entry.conn, entry)
+
+        if entry is not None:
+            # Database file was deleted/replaced (or the connection broke): reopen
+            self._close_entry(entry)
+            with self._stats_lock:
+                self.reopened += 1
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = open_connection(db_path, readonly=readonly)
+        entry = _PoolEntry(conn, file_identity(path))
+        entry.in_use = True
+        entries[key] = entry
+        entries.move_to_end(key)
+        with self._stats_lock:
+            self.opened += 1
+        self._evict_idle(entries)
+        return PooledConnection(conn, entry)
+
+    def _evict_idle(self, entries: "OrderedDict[str, _PoolEntry]"):
+        """Close least recently used idle connections above the per-thread limit."""
+        excess = len(entries) - self.max_per_thread
+        if excess <= 0:
+            return
+        for key in list(entries.keys()):
+            if excess <= 0:
+                break
+            entry = entries[key]
+            if not entry.in_use:
+                self._close_entry(entry)
+                del entries[key]
+                excess -= 1
+
+    @staticmethod
+    def _close_entry(entry: _PoolEntry):
+        try:
+            entry.conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close_thread_connections(self):
+        """Close this thread's idle pooled connections (e.g. before a thread exits)."""
+        entries = self._entries()
+        for key in list(entries.keys()):
+            if not entries[key].in_use:
+                self._close_entry(entries.pop(key))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Checkout counters (process-wide)."""
+        with self._stats_lock:
+            return {
+                "hits": self.hits,
+                "opened": self.opened,
+                "reopened": self.reopened,
+                "nested": self.nested,
+            }
+
+
+# Global pool instance
+connection_pool = ConnectionPool()
@@ -8,30 +8,99 @@ import json
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import hashlib
 import logging
+import os
+import re
+import threading
 import uuid
 
 from memory_service.config import MEMORY_DASHBOARD_PATH, PROJECTS_PATH, get_db_path_for_source, TRACKING_DB_PATH
 from memory_service.models import Source, File, Chunk, ChatMessage, Embedding, SearchResult, SourceStatus, IndexJob, Fact
+from memory_service.memory_dashboard.connection_pool import connection_pool, file_identity, open_connection
+from memory_service.memory_dashboard.db_writer import db_writer
 
 logger = logging.getLogger(__name__)
 
 
+# Databases whose schema/migrations already ran in this process: path -> file identity
+_initialized_schemas: Dict[str, Tuple[int, int]] = {}
+_schema_lock = threading.Lock()
+
+
 def get_db_connection(source_id: str, project_id: Optional[str] = None):
-    """Get a database connection for a specific source."""
+    """
+    Get a database connection for a specific source.
+    
+    The connection comes from the per-thread pool; close() returns it to the pool.
+    """
+    db_path = get_db_path_for_source(source_id, project_id=project_id)
+    return connection_pool.acquire(db_path)
+
+
+def get_db_read_connection(source_id: str, project_id: Optional[str] = None):
+    """
+    Get a read-only database connection for a specific source.
+    
+    Writes go through run_write(); readers use pooled read-only connections and
+    never take the write lock.
+    """
+    db_path = get_db_path_for_source(source_id, project_id=project_id)
+    return connection_pool.acquire(db_path, readonly=True)
+
+
+def run_write(source_id: str, func, project_id: Optional[str] = None, label: str = "write"):
+    """
+    Run a write on the source database's single writer and wait for it to commit.
+    
+    The writer groups queued writes into one transaction (see db_writer).
+    
+    Args:
+        source_id: Source ID
+        func: Callable taking the writer's sqlite3.Connection; runs inside the
+              writer's transaction and must not commit or roll back
+        project_id: Optional project_id for DB path lookup
+        label: Short name for writer logs
+        
+    Returns:
+        func's return value (its exception is re-raised here)
+    """
     db_path = get_db_path_for_source(source_id, project_id=project_id)
-    # Ensure the directory exists
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path), timeout=30.0)
-    conn.execute("PRAGMA journal_mode=WAL")  # Enable WAL mode for concurrent access
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_writer.run(db_path, func, label)
 
 
 def init_db(source_id: str, project_id: Optional[str] = None):
-    """Initialize the database schema for a specific source."""
+    """
+    Initialize the database schema for a specific source.
+    
+    Runs the CREATE TABLE statements and migrations once per database file per
+    process; later calls return immediately (unless the file was replaced).
+    """
+    db_path = str(get_db_path_for_source(source_id, project_id=project_id))
+    identity = _initialized_schemas.get(db_path)
+    if identity is not None and identity == file_identity(db_path):
+        return
+    with _schema_lock:
+        identity = _initialized_schemas.get(db_path)
+        if identity is not None and identity == file_identity(db_path):
+            return
+        _create_schema(source_id, project_id)
+        identity = file_identity(db_path)
+        if identity is not None:
+            _initialized_schemas[db_path] = identity
+
+
+def forget_schema(db_path: Path):
+    """Drop a database (or every database under a directory) from the initialized-schema registry."""
+    prefix = str(db_path)
+    with _schema_lock:
+        for key in [k for k in _initialized_schemas if k == prefix or k.startswith(prefix + os.sep)]:
+            del _initialized_schemas[key]
+
+
+def _create_schema(source_id: str, project_id: Optional[str] = None):
+    """Create tables and run migrations for a source database."""
     conn = get_db_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     
@@ -114,6 +183,7 @@ def init_db(source_id: str, project_id: Optional[str] = None):
             text TEXT NOT NULL,
             start_char INTEGER NOT NULL,
             end_char INTEGER NOT NULL,
+            canonical_chunk_id INTEGER,
             FOREIGN KEY (file_id) REFERENCES files(id),
             FOREIGN KEY (chat_message_id) REFERENCES chat_messages(id),
             CHECK ((file_id IS NOT NULL AND chat_message_id IS NULL) OR (file_id IS NULL AND chat_message_id IS NOT NULL))
@@ -132,6 +202,14 @@ def init_db(source_id: str, project_id: Optional[str] = None):
             # Column might have been added between check and alter
             logger.warning(f"Migration note (may be harmless): {e}")
     
+    # Migration: Add canonical_chunk_id column (near-duplicate link) if it doesn't exist
+    if 'canonical_chunk_id' not in columns:
+        logger.info(f"Migrating chunks table: adding canonical_chunk_id column for source {source_id}")
+        try:
+            cursor.execute("ALTER TABLE chunks ADD COLUMN canonical_chunk_id INTEGER")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Migration note (may be harmless): {e}")
+    
     # Create unique constraint for chunks (file-based or chat-based)
     cursor.execute("""
         CREATE UNIQUE INDEX IF NOT EXISTS idx_chunks_file_unique 
@@ -154,6 +232,22 @@ def init_db(source_id: str, project_id: Optional[str] = None):
         )
     """)
     
+    # Near-duplicate detection: MinHash signatures and LSH band keys of canonical (embedded) chunks
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chunk_signatures (
+            chunk_id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL,
+            FOREIGN KEY (chunk_id) REFERENCES chunks(id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chunk_lsh_bands (
+            band_hash INTEGER NOT NULL,
+            chunk_id INTEGER NOT NULL,
+            FOREIGN KEY (chunk_id) REFERENCES chunks(id)
+        )
+    """)
+    
     # Indexes for performance
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_source ON files(source_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_file ON chunks(file_id)")
@@ -163,33 +257,127 @@ def init_db(source_id: str, project_id: Optional[str] = None):
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_uuid ON chat_messages(message_uuid)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_chunk ON embeddings(chunk_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sources_project ON sources(project_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_canonical ON chunks(canonical_chunk_id) WHERE canonical_chunk_id IS NOT NULL")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunk_lsh_bands_hash ON chunk_lsh_bands(band_hash)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunk_lsh_bands_chunk ON chunk_lsh_bands(chunk_id)")
     
-    # Project Facts table (for typed facts with provenance and temporal "latest wins")
+    # Full-text index over chunk text (BM25 lexical search), kept in sync with chunks by triggers
+    _create_chunks_fts(cursor, source_id)
+    
+    conn.commit()
+    conn.close()
+
+
+# Ranked-list fact keys: user.favorites.<topic>.<rank>. rtrim() strips the trailing rank digits,
+# so a key is ranked if what remains is "user.favorites.<non-empty topic>." and shorter than the key.
+_RANKED_KEY_PREFIX_SQL = "rtrim(fact_key, '0123456789')"
+_IS_RANKED_KEY_SQL = (
+    f"substr(fact_key, 1, 15) = 'user.favorites.' AND length({_RANKED_KEY_PREFIX_SQL}) > 16 "
+    f"AND length({_RANKED_KEY_PREFIX_SQL}) < length(fact_key) AND substr({_RANKED_KEY_PREFIX_SQL}, -1) = '.'"
+)
+_RANKED_LIST_KEY_SQL = (
+    f"CASE WHEN {_IS_RANKED_KEY_SQL} "
+    f"THEN substr({_RANKED_KEY_PREFIX_SQL}, 1, length({_RANKED_KEY_PREFIX_SQL}) - 1) END"
+)
+_RANKED_RANK_SQL = (
+    f"CASE WHEN {_IS_RANKED_KEY_SQL} "
+    f"THEN CAST(substr(fact_key, length({_RANKED_KEY_PREFIX_SQL}) + 1) AS INTEGER) END"
+)
+
+
+def _create_chunks_fts(cursor, source_id: str):
+    """
+    Create the chunks_fts FTS5 table and its sync triggers.
+    
+    chunks_fts is an external-content table (the text lives only in chunks). Databases
+    created before the table existed are backfilled with a one-time rebuild.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chunks_fts'")
+    fts_exists = cursor.fetchone() is not None
+    
+    # tokenchars '_' keeps snake_case identifiers as one token
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS project_facts (
-            fact_id TEXT PRIMARY KEY,
-            project_id TEXT NOT NULL,
-            fact_key TEXT NOT NULL,
-            value_text TEXT NOT NULL,
-            value_type TEXT NOT NULL CHECK(value_type IN ('string', 'number', 'bool', 'date', 'json')),
-            confidence REAL NOT NULL DEFAULT 1.0,
-            source_message_uuid TEXT NOT NULL,
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            effective_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            supersedes_fact_id TEXT,
-            is_current INTEGER NOT NULL DEFAULT 1 CHECK(is_current IN (0, 1)),
-            FOREIGN KEY (supersedes_fact_id) REFERENCES project_facts(fact_id),
-            FOREIGN KEY (source_message_uuid) REFERENCES chat_messages(message_uuid)
+        CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+            text,
+            content='chunks',
+            content_rowid='id',
+            tokenize="unicode61 remove_diacritics 2 tokenchars '_'"
         )
     """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS chunks_fts_insert AFTER INSERT ON chunks BEGIN
+            INSERT INTO chunks_fts(rowid, text) VALUES (new.id, new.text);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS chunks_fts_delete AFTER DELETE ON chunks BEGIN
+            INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS chunks_fts_update AFTER UPDATE OF text ON chunks BEGIN
+            INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            INSERT INTO chunks_fts(rowid, text) VALUES (new.id, new.text);
+        END
+    """)
     
-    # Indexes for project_facts
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_facts_project_key ON project_facts(project_id, fact_key, is_current)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_facts_source_uuid ON project_facts(source_message_uuid)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_facts_current ON project_facts(project_id, is_current)")
+    if not fts_exists:
+        logger.info(f"Building full-text index (chunks_fts) for source {source_id}")
+        cursor.execute("INSERT INTO chunks_fts(chunks_fts) VALUES ('rebuild')")
+
+
+def _create_project_facts_fts(cursor, source_id: str):
+    """
+    Create the project_facts_fts FTS5 table and its sync triggers.
     
-    conn.commit()
-    conn.close()
+    Only current facts (is_current = 1) are indexed: superseding a fact (UPDATE
+    is_current = 0) removes it from the index. The table is external-content on
+    project_facts' rowid, so the text isn't stored twice. Databases created before
+    the table existed are backfilled once.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_facts_fts'")
+    fts_exists = cursor.fetchone() is not None
+    
+    # Default unicode61 splits fact keys on '.' and '_' (user.favorite_color -> user, favorite, color)
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS project_facts_fts USING fts5(
+            fact_key,
+            value_text,
+            content='project_facts',
+            tokenize="unicode61 remove_diacritics 2"
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS project_facts_fts_insert AFTER INSERT ON project_facts
+        WHEN new.is_current = 1 BEGIN
+            INSERT INTO project_facts_fts(rowid, fact_key, value_text)
+            VALUES (new.rowid, new.fact_key, new.value_text);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS project_facts_fts_delete AFTER DELETE ON project_facts
+        WHEN old.is_current = 1 BEGIN
+            INSERT INTO project_facts_fts(project_facts_fts, rowid, fact_key, value_text)
+            VALUES ('delete', old.rowid, old.fact_key, old.value_text);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS project_facts_fts_update
+        AFTER UPDATE OF fact_key, value_text, is_current ON project_facts BEGIN
+            INSERT INTO project_facts_fts(project_facts_fts, rowid, fact_key, value_text)
+            SELECT 'delete', old.rowid, old.fact_key, old.value_text WHERE old.is_current = 1;
+            INSERT INTO project_facts_fts(rowid, fact_key, value_text)
+            SELECT new.rowid, new.fact_key, new.value_text WHERE new.is_current = 1;
+        END
+    """)
+    
+    if not fts_exists:
+        cursor.execute("""
+            INSERT INTO project_facts_fts(rowid, fact_key, value_text)
+            SELECT rowid, fact_key, value_text FROM project_facts WHERE is_current = 1
+        """)
+        if cursor.rowcount:
+            logger.info(f"Indexed {cursor.rowcount} current facts in project_facts_fts for source {source_id}")
 
 
 def upsert_source(source_id: str, project_id: str, root_path: str, 
@@ -197,34 +385,28 @@ def upsert_source(source_id: str, project_id: str, root_path: str,
     """Insert or update a source. Returns the database ID."""
     # Initialize DB for this source if needed
     init_db(source_id)
-    conn = get_db_connection(source_id)
-    cursor = conn.cursor()
     
-    cursor.execute("""
-        INSERT INTO sources (source_id, project_id, root_path, include_glob, exclude_glob, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ON CONFLICT(source_id) DO UPDATE SET
-            project_id = excluded.project_id,
-            root_path = excluded.root_path,
-            include_glob = excluded.include_glob,
-            exclude_glob = excluded.exclude_glob,
-            updated_at = excluded.updated_at
-    """, (source_id, project_id, str(root_path), include_glob, exclude_glob, datetime.now()))
-    
-    db_id = cursor.lastrowid
-    if db_id == 0:
-        # Row already existed, get the ID
-        cursor.execute("SELECT id FROM sources WHERE source_id = ?", (source_id,))
-        db_id = cursor.fetchone()["id"]
+    def _write(conn):
+        # RETURNING gives the id for both the insert and the update case
+        row = conn.execute("""
+            INSERT INTO sources (source_id, project_id, root_path, include_glob, exclude_glob, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source_id) DO UPDATE SET
+                project_id = excluded.project_id,
+                root_path = excluded.root_path,
+                include_glob = excluded.include_glob,
+                exclude_glob = excluded.exclude_glob,
+                updated_at = excluded.updated_at
+            RETURNING id
+        """, (source_id, project_id, str(root_path), include_glob, exclude_glob, datetime.now())).fetchone()
+        return row["id"]
     
-    conn.commit()
-    conn.close()
-    return db_id
+    return run_write(source_id, _write, label="upsert_source")
 
 
 def get_source_by_source_id(source_id: str) -> Optional[Source]:
     """Get a source by its source_id."""
-    conn = get_db_connection(source_id)
+    conn = get_db_read_connection(source_id)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM sources WHERE source_id = ?", (source_id,))
     row = cursor.fetchone()
@@ -245,7 +427,7 @@ def get_source_by_source_id(source_id: str) -> Optional[Source]:
 
 def get_file_by_path(source_db_id: int, path: str, source_id: str) -> Optional[File]:
     """Get a file by source database ID and path."""
-    conn = get_db_connection(source_id)
+    conn = get_db_read_connection(source_id)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM files WHERE source_id = ? AND path = ?", (source_db_id, path))
     row = cursor.fetchone()
@@ -267,43 +449,57 @@ def get_file_by_path(source_db_id: int, path: str, source_id: str) -> Optional[F
 def upsert_file(source_db_id: int, path: str, filetype: str, 
                 modified_at: datetime, size_bytes: int, source_id: str, content_hash: Optional[str] = None) -> int:
     """Insert or update a file. Returns the database ID."""
-    conn = get_db_connection(source_id)
+    def _write(conn):
+        row = conn.execute("""
+            INSERT INTO files (source_id, path, filetype, modified_at, size_bytes, hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source_id, path) DO UPDATE SET
+                filetype = excluded.filetype,
+                modified_at = excluded.modified_at,
+                size_bytes = excluded.size_bytes,
+                hash = excluded.hash
+            RETURNING id
+        """, (source_db_id, path, filetype, modified_at, size_bytes, content_hash)).fetchone()
+        return row["id"]
+    
+    return run_write(source_id, _write, label="upsert_file")
+
+
+def get_files_by_ids(file_ids: List[int], source_id: str) -> dict:
+    """Get files by ID. Returns a dict of file_id -> File."""
+    if not file_ids:
+        return {}
+    conn = get_db_read_connection(source_id)
     cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO files (source_id, path, filetype, modified_at, size_bytes, hash)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ON CONFLICT(source_id, path) DO UPDATE SET
-            filetype = excluded.filetype,
-            modified_at = excluded.modified_at,
-            size_bytes = excluded.size_bytes,
-            hash = excluded.hash
-    """, (source_db_id, path, filetype, modified_at, size_bytes, content_hash))
-    
-    db_id = cursor.lastrowid
-    if db_id == 0:
-        cursor.execute("SELECT id FROM files WHERE source_id = ? AND path = ?", (source_db_id, path))
-        db_id = cursor.fetchone()["id"]
-    
-    conn.commit()
+    placeholders = ",".join("?" * len(file_ids))
+    cursor.execute(f"SELECT * FROM files WHERE id IN ({placeholders})", list(file_ids))
+    rows = cursor.fetchall()
     conn.close()
-    return db_id
+    
+    return {row["id"]: File(
+        id=row["id"],
+        source_id=row["source_id"],
+        path=row["path"],
+        filetype=row["filetype"],
+        modified_at=datetime.fromisoformat(row["modified_at"]),
+        size_bytes=row["size_bytes"],
+        hash=row["hash"]
+    ) for row in rows}
 
 
 def delete_file(file_id: int, source_id: str):
     """Delete a file and all its chunks and embeddings."""
-    conn = get_db_connection(source_id)
-    cursor = conn.cursor()
-    
-    # Delete embeddings first (foreign key constraint)
-    cursor.execute("DELETE FROM embeddings WHERE chunk_id IN (SELECT id FROM chunks WHERE file_id = ?)", (file_id,))
-    # Delete chunks
-    cursor.execute("DELETE FROM chunks WHERE file_id = ?", (file_id,))
-    # Delete file
-    cursor.execute("DELETE FROM files WHERE id = ?", (file_id,))
+    def _write(conn):
+        cursor = conn.cursor()
+        # Delete embeddings and near-duplicate signatures first (foreign key constraint)
+        cursor.execute("DELETE FROM embeddings WHERE chunk_id IN (SELECT id FROM chunks WHERE file_id = ?)", (file_id,))
+        _delete_chunk_signatures_for_file(cursor, file_id)
+        # Delete chunks
+        cursor.execute("DELETE FROM chunks WHERE file_id = ?", (file_id,))
+        # Delete file
+        cursor.execute("DELETE FROM files WHERE id = ?", (file_id,))
     
-    conn.commit()
-    conn.close()
+    run_write(source_id, _write, label="delete_file")
 
 
 def delete_file_by_path(source_db_id: int, path: str, source_id: str):
@@ -313,35 +509,251 @@ def delete_file_by_path(source_db_id: int, path: str, source_id: str):
         delete_file(file.id, source_id)
 
 
-def insert_chunks(file_id: int, chunks: List[Tuple[int, str, int, int]], source_id: str, chat_message_id: Optional[int] = None):
-    """Insert chunks for a file or chat message. chunks is a list of (chunk_index, text, start_char, end_char)."""
-    conn = get_db_connection(source_id)
-    cursor = conn.cursor()
+# Rows per multi-row INSERT ... RETURNING statement (5 bound parameters per chunk row)
+CHUNK_INSERT_BATCH_ROWS = 500
+
+
+def _insert_chunks_returning(cursor, owner_column: str, owner_id: int,
+                             chunks: List[Tuple[int, str, int, int]]) -> List[Chunk]:
+    """
+    Insert chunks for one file or chat message and return their records with ids.
+    
+    Uses multi-row INSERT ... RETURNING so ids come back from the insert itself
+    instead of a lastrowid per row or a re-select of the owner's chunks. The caller
+    owns the transaction.
+    
+    Args:
+        cursor: Cursor inside an open transaction
+        owner_column: "file_id" or "chat_message_id"
+        owner_id: ID of the file or chat message
+        chunks: List of (chunk_index, text, start_char, end_char)
+        
+    Returns:
+        Chunk records in the order of chunks
+    """
+    ids_by_index = {}
+    for offset in range(0, len(chunks), CHUNK_INSERT_BATCH_ROWS):
+        batch = chunks[offset:offset + CHUNK_INSERT_BATCH_ROWS]
+        params = []
+        for idx, text, start, end in batch:
+            params.extend((owner_id, idx, text, start, end))
+        cursor.execute(f"""
+            INSERT INTO chunks ({owner_column}, chunk_index, text, start_char, end_char)
+            VALUES {",".join(["(?, ?, ?, ?, ?)"] * len(batch))}
+            RETURNING id, chunk_index
+        """, params)
+        # RETURNING row order is unspecified; chunk_index is unique per owner
+        ids_by_index.update((row[1], row[0]) for row in cursor.fetchall())
+    
+    file_id = owner_id if owner_column == "file_id" else None
+    chat_message_id = owner_id if owner_column == "chat_message_id" else None
+    return [Chunk(
+        id=ids_by_index[idx],
+        file_id=file_id,
+        chat_message_id=chat_message_id,
+        chunk_index=idx,
+        text=text,
+        start_char=start,
+        end_char=end
+    ) for idx, text, start, end in chunks]
+
+
+def _insert_embedding_rows(cursor, chunk_ids: List[int], embeddings: np.ndarray, model_name: str):
+    """Write one embedding per chunk with a single executemany (replacing any existing one for the model)."""
+    cursor.executemany("""
+        INSERT OR REPLACE INTO embeddings (chunk_id, embedding, model_name)
+        VALUES (?, ?, ?)
+    """, [(chunk_id, embedding.tobytes(), model_name) for chunk_id, embedding in zip(chunk_ids, embeddings)])
+
+
+def insert_chunks(file_id: int, chunks: List[Tuple[int, str, int, int]], source_id: str, chat_message_id: Optional[int] = None) -> List[Chunk]:
+    """
+    Insert chunks for a file or chat message. chunks is a list of (chunk_index, text, start_char, end_char).
     
+    Returns:
+        Inserted Chunk records (with ids)
+    """
     if chat_message_id is not None:
-        # Delete existing chunks for chat message
-        cursor.execute("DELETE FROM chunks WHERE chat_message_id = ?", (chat_message_id,))
-        # Insert new chunks
-        cursor.executemany("""
-            INSERT INTO chunks (chat_message_id, chunk_index, text, start_char, end_char)
-            VALUES (?, ?, ?, ?, ?)
-        """, [(chat_message_id, idx, text, start, end) for idx, text, start, end in chunks])
-    else:
-        # Delete existing chunks for file
+        return replace_chat_chunks_bulk(source_id, [(chat_message_id, chunks)])[0]
+    return replace_file_chunks_bulk(source_id, file_id, chunks)
+
+
+def replace_file_chunks_bulk(source_id: str, file_id: int, chunks: List[Tuple[int, str, int, int]],
+                             embeddings: Optional[np.ndarray] = None,
+                             model_name: Optional[str] = None) -> List[Chunk]:
+    """
+    Replace a file's chunks (and optionally their embeddings) in a single transaction.
+    
+    The file's old chunks are removed together with their embeddings and
+    near-duplicate signatures; the new chunk ids are returned by the insert.
+    
+    Args:
+        source_id: Source ID
+        file_id: File ID
+        chunks: List of (chunk_index, text, start_char, end_char)
+        embeddings: Optional [N, D] array, one row per chunk; written in the same
+                    transaction so chunks never exist without embeddings
+        model_name: Embedding model name (required with embeddings)
+        
+    Returns:
+        Inserted Chunk records in the order of chunks
+    """
+    def _write(conn):
+        cursor = conn.cursor()
+        _delete_chunk_signatures_for_file(cursor, file_id)
+        # Old chunks' embeddings would otherwise be orphaned
+        cursor.execute("DELETE FROM embeddings WHERE chunk_id IN (SELECT id FROM chunks WHERE file_id = ?)", (file_id,))
         cursor.execute("DELETE FROM chunks WHERE file_id = ?", (file_id,))
-        # Insert new chunks
+        records = _insert_chunks_returning(cursor, "file_id", file_id, chunks)
+        if embeddings is not None:
+            _insert_embedding_rows(cursor, [record.id for record in records], embeddings, model_name)
+        return records
+    
+    return run_write(source_id, _write, label="replace_file_chunks")
+
+
+def _delete_chunk_signatures_for_file(cursor, file_id: int):
+    """Delete MinHash signatures and LSH band keys for a file's chunks."""
+    cursor.execute("DELETE FROM chunk_lsh_bands WHERE chunk_id IN (SELECT id FROM chunks WHERE file_id = ?)", (file_id,))
+    cursor.execute("DELETE FROM chunk_signatures WHERE chunk_id IN (SELECT id FROM chunks WHERE file_id = ?)", (file_id,))
+
+
+def insert_chunk_signatures(chunk_signatures: List[Tuple[int, bytes, List[int]]], source_id: str):
+    """
+    Store near-duplicate signatures for canonical chunks.
+    
+    Args:
+        chunk_signatures: List of (chunk_id, signature_bytes, lsh_band_hashes)
+        source_id: Source ID
+    """
+    if not chunk_signatures:
+        return
+    
+    def _write(conn):
+        cursor = conn.cursor()
+        chunk_ids = [(chunk_id,) for chunk_id, _, _ in chunk_signatures]
+        cursor.executemany("DELETE FROM chunk_lsh_bands WHERE chunk_id = ?", chunk_ids)
         cursor.executemany("""
-            INSERT INTO chunks (file_id, chunk_index, text, start_char, end_char)
-            VALUES (?, ?, ?, ?, ?)
-        """, [(file_id, idx, text, start, end) for idx, text, start, end in chunks])
+            INSERT OR REPLACE INTO chunk_signatures (chunk_id, signature)
+            VALUES (?, ?)
+        """, [(chunk_id, signature) for chunk_id, signature, _ in chunk_signatures])
+        cursor.executemany("""
+            INSERT INTO chunk_lsh_bands (band_hash, chunk_id)
+            VALUES (?, ?)
+        """, [(band_hash, chunk_id) for chunk_id, _, band_hashes in chunk_signatures for band_hash in band_hashes])
     
-    conn.commit()
+    run_write(source_id, _write, label="insert_chunk_signatures")
+
+
+def find_near_duplicate_candidates(band_hashes: List[int], source_id: str, exclude_file_id: Optional[int] = None) -> List[Tuple[int, bytes]]:
+    """
+    Find canonical chunks sharing at least one LSH band with a signature.
+    
+    Args:
+        band_hashes: LSH band keys of the new chunk
+        source_id: Source ID
+        exclude_file_id: Optional file whose chunks are being replaced (skipped as candidates)
+        
+    Returns:
+        List of (chunk_id, signature_bytes)
+    """
+    if not band_hashes:
+        return []
+    conn = get_db_read_connection(source_id)
+    cursor = conn.cursor()
+    placeholders = ",".join("?" * len(band_hashes))
+    query = f"""
+        SELECT DISTINCT s.chunk_id, s.signature
+        FROM chunk_lsh_bands b
+        JOIN chunk_signatures s ON s.chunk_id = b.chunk_id
+        JOIN chunks c ON c.id = s.chunk_id
+        WHERE b.band_hash IN ({placeholders})
+    """
+    params = list(band_hashes)
+    if exclude_file_id is not None:
+        query += " AND (c.file_id IS NULL OR c.file_id != ?)"
+        params.append(exclude_file_id)
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    conn.close()
+    return [(row["chunk_id"], row["signature"]) for row in rows]
+
+
+def link_near_duplicate_chunks(links: List[Tuple[int, int]], source_id: str):
+    """
+    Link near-duplicate chunks to their canonical chunk (they are not embedded).
+    
+    Args:
+        links: List of (chunk_id, canonical_chunk_id)
+        source_id: Source ID
+    """
+    if not links:
+        return
+    
+    def _write(conn):
+        conn.executemany("UPDATE chunks SET canonical_chunk_id = ? WHERE id = ?",
+                         [(canonical_id, chunk_id) for chunk_id, canonical_id in links])
+        # A linked chunk has no embedding of its own
+        conn.executemany("DELETE FROM embeddings WHERE chunk_id = ?", [(chunk_id,) for chunk_id, _ in links])
+    
+    run_write(source_id, _write, label="link_near_duplicates")
+
+
+def detach_near_duplicates(file_id: int, source_id: str) -> List[int]:
+    """
+    Unlink chunks in other files whose canonical chunk belongs to this file.
+    
+    Call before a file's chunks are replaced or deleted. The returned chunks
+    have no embedding and must be re-embedded (or re-linked) by the caller.
+    
+    Args:
+        file_id: File whose chunks are about to be removed
+        source_id: Source ID
+        
+    Returns:
+        IDs of the detached chunks
+    """
+    def _write(conn):
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id FROM chunks
+            WHERE canonical_chunk_id IN (SELECT id FROM chunks WHERE file_id = ?)
+              AND (file_id IS NULL OR file_id != ?)
+        """, (file_id, file_id))
+        orphan_ids = [row["id"] for row in cursor.fetchall()]
+        if orphan_ids:
+            cursor.executemany("UPDATE chunks SET canonical_chunk_id = NULL WHERE id = ?", [(cid,) for cid in orphan_ids])
+        return orphan_ids
+    
+    return run_write(source_id, _write, label="detach_near_duplicates")
+
+
+def get_chunks_by_ids(chunk_ids: List[int], source_id: str) -> List[Chunk]:
+    """Get chunks by ID (ordered by ID)."""
+    if not chunk_ids:
+        return []
+    conn = get_db_read_connection(source_id)
+    cursor = conn.cursor()
+    placeholders = ",".join("?" * len(chunk_ids))
+    cursor.execute(f"SELECT * FROM chunks WHERE id IN ({placeholders}) ORDER BY id", list(chunk_ids))
+    rows = cursor.fetchall()
     conn.close()
+    
+    return [Chunk(
+        id=row["id"],
+        file_id=row["file_id"],
+        chat_message_id=row["chat_message_id"],
+        chunk_index=row["chunk_index"],
+        text=row["text"],
+        start_char=row["start_char"],
+        end_char=row["end_char"],
+        canonical_chunk_id=row["canonical_chunk_id"]
+    ) for row in rows]
 
 
 def get_chunks_by_file_id(file_id: int, source_id: str) -> List[Chunk]:
     """Get all chunks for a file."""
-    conn = get_db_connection(source_id)
+    conn = get_db_read_connection(source_id)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM chunks WHERE file_id = ? ORDER BY chunk_index", (file_id,))
     rows = cursor.fetchall()
@@ -354,13 +766,14 @@ def get_chunks_by_file_id(file_id: int, source_id: str) -> List[Chunk]:
         chunk_index=row["chunk_index"],
         text=row["text"],
         start_char=row["start_char"],
-        end_char=row["end_char"]
+        end_char=row["end_char"],
+        canonical_chunk_id=row["canonical_chunk_id"]
     ) for row in rows]
 
 
 def get_chunks_by_chat_message_id(chat_message_id: int, source_id: str) -> List[Chunk]:
     """Get all chunks for a chat message."""
-    conn = get_db_connection(source_id)
+    conn = get_db_read_connection(source_id)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM chunks WHERE chat_message_id = ? ORDER BY chunk_index", (chat_message_id,))
     rows = cursor.fetchall()
@@ -373,30 +786,20 @@ def get_chunks_by_chat_message_id(chat_message_id: int, source_id: str) -> List[
         chunk_index=row["chunk_index"],
         text=row["text"],
         start_char=row["start_char"],
-        end_char=row["end_char"]
+        end_char=row["end_char"],
+        canonical_chunk_id=row["canonical_chunk_id"]
     ) for row in rows]
 
 
 def insert_embeddings(chunk_ids: List[int], embeddings: np.ndarray, model_name: str, source_id: str):
-    """Insert embeddings for chunks. embeddings should be shape [N, D]."""
-    conn = get_db_connection(source_id)
-    cursor = conn.cursor()
-    
-    # Delete existing embeddings for these chunks with this model
-    cursor.executemany("DELETE FROM embeddings WHERE chunk_id = ? AND model_name = ?", 
-                      [(cid, model_name) for cid in chunk_ids])
-    
-    # Insert new embeddings
-    for chunk_id, embedding in zip(chunk_ids, embeddings):
-        # Serialize numpy array to bytes
-        embedding_bytes = embedding.tobytes()
-        cursor.execute("""
-            INSERT INTO embeddings (chunk_id, embedding, model_name)
-            VALUES (?, ?, ?)
-        """, (chunk_id, embedding_bytes, model_name))
-    
-    conn.commit()
-    conn.close()
+    """Insert (or replace) embeddings for chunks in one transaction. embeddings should be shape [N, D]."""
+    if not chunk_ids:
+        return
+    run_write(
+        source_id,
+        lambda conn: _insert_embedding_rows(conn.cursor(), chunk_ids, embeddings, model_name),
+        label="insert_embeddings"
+    )
 
 
 def get_all_embeddings_for_source(source_id: str, model_name: str) -> List[Tuple[int, np.ndarray, Optional[int], Optional[str], str, str, str, Optional[str], int, int, int, Optional[str], Optional[str], Optional[str]]]:
@@ -413,7 +816,7 @@ def get_all_embeddings_for_source(source_id: str, model_name: str) -> List[Tuple
     if source_id.startswith("project-"):
         project_id = source_id.replace("project-", "")
     
-    conn = get_db_connection(source_id, project_id=project_id)
+    conn = get_db_read_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     
     # Get file-based embeddings
@@ -488,7 +891,7 @@ def get_chat_embeddings_for_project(project_id: str, model_name: str, exclude_ch
     
     try:
         # Pass project_id to route to projects/<project_name>/index/
-        conn = get_db_connection(source_id, project_id=project_id)
+        conn = get_db_read_connection(source_id, project_id=project_id)
         cursor = conn.cursor()
         
         if excluded_ids:
@@ -544,6 +947,79 @@ def get_chat_embeddings_for_project(project_id: str, model_name: str, exclude_ch
         return []
 
 
+def search_chunks_fts(source_id: str, fts_query: str, limit: int,
+                      exclude_chat_ids: Optional[List[str]] = None) -> List[dict]:
+    """
+    Lexical (BM25) search over a source's chunks.
+    
+    Near-duplicate chunks (linked to a canonical chunk) are skipped, as they are
+    in vector search.
+    
+    Args:
+        source_id: Source ID (project sources "project-{project_id}" hold chat chunks)
+        fts_query: FTS5 MATCH expression (see hybrid_search.build_fts_query)
+        limit: Maximum number of results
+        exclude_chat_ids: Chat IDs whose chunks are excluded (e.g. trashed chats)
+        
+    Returns:
+        Result dicts (best first) with the same keys as ANN search results; "score" is the
+        BM25 score (higher is better)
+    """
+    project_id = source_id[len("project-"):] if source_id.startswith("project-") else None
+    init_db(source_id, project_id=project_id)
+    
+    # Over-fetch from the FTS index: rows dropped by the filters below must not starve the limit
+    params = [fts_query, limit * 3]
+    exclude_clause = ""
+    if exclude_chat_ids:
+        exclude_clause = f"AND (cm.chat_id IS NULL OR cm.chat_id NOT IN ({','.join('?' * len(exclude_chat_ids))}))"
+        params.extend(exclude_chat_ids)
+    params.append(limit)
+    
+    conn = get_db_read_connection(source_id, project_id=project_id)
+    try:
+        rows = conn.execute(f"""
+            WITH hits AS (
+                SELECT rowid AS chunk_id, rank
+                FROM chunks_fts
+                WHERE chunks_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            )
+            SELECT c.id AS chunk_id, c.file_id, f.path, c.text, s.source_id, s.project_id, f.filetype,
+                   c.chunk_index, c.start_char, c.end_char, cm.chat_id, cm.message_id, cm.message_uuid,
+                   hits.rank
+            FROM hits
+            JOIN chunks c ON c.id = hits.chunk_id
+            LEFT JOIN files f ON c.file_id = f.id
+            LEFT JOIN chat_messages cm ON c.chat_message_id = cm.id
+            JOIN sources s ON s.id = COALESCE(f.source_id, cm.source_id)
+            WHERE c.canonical_chunk_id IS NULL {exclude_clause}
+            ORDER BY hits.rank
+            LIMIT ?
+        """, params).fetchall()
+    finally:
+        conn.close()
+    
+    return [{
+        "embedding_id": row["chunk_id"],
+        "score": -row["rank"],  # FTS5 rank is bm25(), where lower (more negative) is better
+        "chunk_id": row["chunk_id"],
+        "file_id": row["file_id"],
+        "file_path": row["path"],
+        "chunk_text": row["text"],
+        "source_id": row["source_id"],
+        "project_id": row["project_id"],
+        "filetype": row["filetype"],
+        "chunk_index": row["chunk_index"],
+        "start_char": row["start_char"],
+        "end_char": row["end_char"],
+        "chat_id": row["chat_id"],
+        "message_id": row["message_id"],
+        "message_uuid": row["message_uuid"],
+    } for row in rows]
+
+
 def compute_file_hash(path: Path) -> str:
     """Compute SHA256 hash of file contents."""
     hasher = hashlib.sha256()
@@ -561,11 +1037,17 @@ def get_tracking_db_connection():
     """Get a connection to the global tracking database."""
     # Tracking DB is in memory_dashboard, not projects
     from memory_service.config import TRACKING_DB_PATH
-    TRACKING_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(TRACKING_DB_PATH), timeout=30.0)
-    conn.execute("PRAGMA journal_mode=WAL")  # Enable WAL mode for concurrent access
-    conn.row_factory = sqlite3.Row
-    return conn
+    return connection_pool.acquire(TRACKING_DB_PATH)
+
+
+def get_tracking_db_read_connection():
+    """Get a read-only connection to the global tracking database."""
+    return connection_pool.acquire(TRACKING_DB_PATH, readonly=True)
+
+
+def run_tracking_write(func, label: str = "tracking_write"):
+    """Run a write on the tracking database's single writer and wait for it (see run_write)."""
+    return db_writer.run(TRACKING_DB_PATH, func, label)
 
 
 def init_tracking_db():
@@ -621,25 +1103,22 @@ def init_tracking_db():
 def get_or_create_source(source_id: str, root_path: str, display_name: Optional[str] = None, project_id: Optional[str] = None) -> SourceStatus:
     """Get or create a source status record."""
     init_tracking_db()
-    conn = get_tracking_db_connection()
-    cursor = conn.cursor()
     
     if display_name is None:
         display_name = source_id
     
-    cursor.execute("""
-        INSERT INTO source_status (id, display_name, root_path, project_id, updated_at)
-        VALUES (?, ?, ?, ?, ?)
-        ON CONFLICT(id) DO UPDATE SET
-            root_path = excluded.root_path,
-            project_id = excluded.project_id,
-            updated_at = excluded.updated_at
-    """, (source_id, display_name, str(root_path), project_id, datetime.now()))
+    def _write(conn):
+        return conn.execute("""
+            INSERT INTO source_status (id, display_name, root_path, project_id, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                root_path = excluded.root_path,
+                project_id = excluded.project_id,
+                updated_at = excluded.updated_at
+            RETURNING *
+        """, (source_id, display_name, str(root_path), project_id, datetime.now())).fetchone()
     
-    cursor.execute("SELECT * FROM source_status WHERE id = ?", (source_id,))
-    row = cursor.fetchone()
-    conn.commit()
-    conn.close()
+    row = run_tracking_write(_write, label="get_or_create_source")
     
     return SourceStatus(
         id=row["id"],
@@ -669,9 +1148,6 @@ def register_source_config(src) -> SourceStatus:
 
 def update_source_stats(source_id: str, **fields) -> None:
     """Update source status fields."""
-    conn = get_tracking_db_connection()
-    cursor = conn.cursor()
-    
     updates = []
     values = []
     for key, value in fields.items():
@@ -681,19 +1157,16 @@ def update_source_stats(source_id: str, **fields) -> None:
     values.append(datetime.now())  # updated_at
     values.append(source_id)
     
-    cursor.execute(f"""
+    run_tracking_write(lambda conn: conn.execute(f"""
         UPDATE source_status 
         SET {', '.join(updates)}, updated_at = ?
         WHERE id = ?
-    """, values)
-    
-    conn.commit()
-    conn.close()
+    """, values), label="update_source_stats")
 
 
 def get_source_status(source_id: str) -> Optional[SourceStatus]:
     """Get source status by source_id."""
-    conn = get_tracking_db_connection()
+    conn = get_tracking_db_read_connection()
     cursor = conn.cursor()
     
     cursor.execute("SELECT * FROM source_status WHERE id = ?", (source_id,))
@@ -718,39 +1191,29 @@ def get_source_status(source_id: str) -> Optional[SourceStatus]:
 
 def delete_source_from_tracking(source_id: str) -> None:
     """Delete a source from the tracking database (source_status and index_jobs)."""
-    conn = get_tracking_db_connection()
-    cursor = conn.cursor()
-    
-    # Delete index jobs first (foreign key constraint)
-    cursor.execute("DELETE FROM index_jobs WHERE source_id = ?", (source_id,))
-    # Delete source status
-    cursor.execute("DELETE FROM source_status WHERE id = ?", (source_id,))
+    def _write(conn):
+        # Delete index jobs first (foreign key constraint)
+        conn.execute("DELETE FROM index_jobs WHERE source_id = ?", (source_id,))
+        # Delete source status
+        conn.execute("DELETE FROM source_status WHERE id = ?", (source_id,))
     
-    conn.commit()
-    conn.close()
+    run_tracking_write(_write, label="delete_source_from_tracking")
 
 
 def create_index_job(source_id: str, files_total: Optional[int] = None) -> int:
     """Create a new index job and return its ID."""
-    conn = get_tracking_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO index_jobs (source_id, status, started_at, files_total, files_processed, bytes_processed)
-        VALUES (?, 'running', ?, ?, 0, 0)
-    """, (source_id, datetime.now(), files_total))
+    def _write(conn):
+        cursor = conn.execute("""
+            INSERT INTO index_jobs (source_id, status, started_at, files_total, files_processed, bytes_processed)
+            VALUES (?, 'running', ?, ?, 0, 0)
+        """, (source_id, datetime.now(), files_total))
+        return cursor.lastrowid
     
-    job_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return job_id
+    return run_tracking_write(_write, label="create_index_job")
 
 
 def update_index_job(job_id: int, **fields) -> None:
     """Update index job fields."""
-    conn = get_tracking_db_connection()
-    cursor = conn.cursor()
-    
     updates = []
     values = []
     for key, value in fields.items():
@@ -759,19 +1222,16 @@ def update_index_job(job_id: int, **fields) -> None:
     
     values.append(job_id)
     
-    cursor.execute(f"""
+    run_tracking_write(lambda conn: conn.execute(f"""
         UPDATE index_jobs 
         SET {', '.join(updates)}
         WHERE id = ?
-    """, values)
-    
-    conn.commit()
-    conn.close()
+    """, values), label="update_index_job")
 
 
 def get_latest_job(source_id: str) -> Optional[IndexJob]:
     """Get the latest job for a source."""
-    conn = get_tracking_db_connection()
+    conn = get_tracking_db_read_connection()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -801,7 +1261,7 @@ def get_latest_job(source_id: str) -> Optional[IndexJob]:
 
 def get_recent_jobs(source_id: str, limit: int = 10) -> List[IndexJob]:
     """Get recent jobs for a source."""
-    conn = get_tracking_db_connection()
+    conn = get_tracking_db_read_connection()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -846,58 +1306,58 @@ def cleanup_stale_jobs(max_age_hours: int = 4) -> int:
     """
     from datetime import timedelta
     
-    conn = get_tracking_db_connection()
-    cursor = conn.cursor()
-    
-    # Find all running jobs
-    cursor.execute("""
-        SELECT * FROM index_jobs 
-        WHERE status = 'running'
-    """)
-    
-    running_jobs = cursor.fetchall()
-    now = datetime.now()
-    cleaned_count = 0
-    
-    for job_row in running_jobs:
-        started_at = datetime.fromisoformat(job_row["started_at"])
-        job_age = now - started_at
+    def _write(conn):
+        cursor = conn.cursor()
         
-        # Mark as stale if job is older than max_age_hours
-        if job_age > timedelta(hours=max_age_hours):
-            job_id = job_row["id"]
-            source_id = job_row["source_id"]
-            
-            # Mark job as failed
-            cursor.execute("""
-                UPDATE index_jobs 
-                SET status = 'failed', 
-                    completed_at = ?,
-                    error = ?
-                WHERE id = ?
-            """, (
-                now.isoformat(),
-                f"Job was running for {job_age.total_seconds() / 3600:.1f} hours without completion - marked as stale",
-                job_id
-            ))
-            
-            # Update source status to error
-            cursor.execute("""
-                UPDATE source_status 
-                SET status = 'error',
-                    last_error = ?,
-                    updated_at = ?
-                WHERE id = ?
-            """, (
-                f"Indexing job timed out after {job_age.total_seconds() / 3600:.1f} hours",
-                now.isoformat(),
-                source_id
-            ))
+        # Find all running jobs
+        cursor.execute("""
+            SELECT * FROM index_jobs 
+            WHERE status = 'running'
+        """)
+        
+        running_jobs = cursor.fetchall()
+        now = datetime.now()
+        cleaned_count = 0
+        
+        for job_row in running_jobs:
+            started_at = datetime.fromisoformat(job_row["started_at"])
+            job_age = now - started_at
             
-            cleaned_count += 1
-    
-    conn.commit()
-    conn.close()
+            # Mark as stale if job is older than max_age_hours
+            if job_age > timedelta(hours=max_age_hours):
+                job_id = job_row["id"]
+                source_id = job_row["source_id"]
+                
+                # Mark job as failed
+                cursor.execute("""
+                    UPDATE index_jobs 
+                    SET status = 'failed', 
+                        completed_at = ?,
+                        error = ?
+                    WHERE id = ?
+                """, (
+                    now.isoformat(),
+                    f"Job was running for {job_age.total_seconds() / 3600:.1f} hours without completion - marked as stale",
+                    job_id
+                ))
+                
+                # Update source status to error
+                cursor.execute("""
+                    UPDATE source_status 
+                    SET status = 'error',
+                        last_error = ?,
+                        updated_at = ?
+                    WHERE id = ?
+                """, (
+                    f"Indexing job timed out after {job_age.total_seconds() / 3600:.1f} hours",
+                    now.isoformat(),
+                    source_id
+                ))
+                
+                cleaned_count += 1
+        return cleaned_count
+    
+    cleaned_count = run_tracking_write(_write, label="cleanup_stale_jobs")
     
     if cleaned_count > 0:
         logger.info(f"Cleaned up {cleaned_count} stale indexing job(s)")
@@ -911,7 +1371,7 @@ def get_all_sources_with_latest_job() -> List[Tuple[SourceStatus, Optional[Index
     cleanup_stale_jobs()
     
     init_tracking_db()
-    conn = get_tracking_db_connection()
+    conn = get_tracking_db_read_connection()
     cursor = conn.cursor()
     
     cursor.execute("SELECT * FROM source_status ORDER BY id")
@@ -964,41 +1424,129 @@ def upsert_chat_message(
     
     # Initialize DB for this source if needed
     init_db(source_id)
-    conn = get_db_connection(source_id)
-    cursor = conn.cursor()
     
-    # Check if message already exists
-    cursor.execute("""
-        SELECT id, message_uuid FROM chat_messages 
-        WHERE chat_id = ? AND message_id = ?
-    """, (chat_id, message_id))
-    existing = cursor.fetchone()
-    
-    if existing:
-        # Update existing message (preserve existing UUID - idempotent)
-        existing_uuid = existing["message_uuid"]
-        if not existing_uuid:
-            # If UUID is missing (migration case), use provided UUID or generate one
-            existing_uuid = message_uuid or str(uuid.uuid4())
+    def _write(conn):
+        cursor = conn.cursor()
+        # Check if message already exists
         cursor.execute("""
-            UPDATE chat_messages
-            SET role = ?, content = ?, timestamp = ?, message_index = ?, message_uuid = ?
-            WHERE id = ?
-        """, (role, content, timestamp, message_index, existing_uuid, existing["id"]))
-        chat_message_id = existing["id"]
-    else:
+            SELECT id, message_uuid FROM chat_messages 
+            WHERE chat_id = ? AND message_id = ?
+        """, (chat_id, message_id))
+        existing = cursor.fetchone()
+        
+        if existing:
+            # Update existing message (preserve existing UUID - idempotent)
+            existing_uuid = existing["message_uuid"]
+            if not existing_uuid:
+                # If UUID is missing (migration case), use provided UUID or generate one
+                existing_uuid = message_uuid or str(uuid.uuid4())
+            cursor.execute("""
+                UPDATE chat_messages
+                SET role = ?, content = ?, timestamp = ?, message_index = ?, message_uuid = ?
+                WHERE id = ?
+            """, (role, content, timestamp, message_index, existing_uuid, existing["id"]))
+            return existing["id"]
+        
         # Insert new message with UUID (use provided UUID if available)
-        if not message_uuid:
-            message_uuid = str(uuid.uuid4())
         cursor.execute("""
             INSERT INTO chat_messages (source_id, project_id, chat_id, message_id, message_uuid, role, content, timestamp, message_index)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (source_db_id, project_id, chat_id, message_id, message_uuid, role, content, timestamp, message_index))
-        chat_message_id = cursor.lastrowid
+        """, (source_db_id, project_id, chat_id, message_id, message_uuid or str(uuid.uuid4()),
+              role, content, timestamp, message_index))
+        return cursor.lastrowid
     
-    conn.commit()
-    conn.close()
-    return chat_message_id
+    return run_write(source_id, _write, label="upsert_chat_message")
+
+
+def upsert_chat_messages_bulk(source_id: str, project_id: str, messages: List[dict]) -> List[Tuple[int, str]]:
+    """
+    Insert or update many chat messages of one project in a single transaction.
+    
+    Same semantics as upsert_chat_message() (existing messages keep their UUID),
+    but with one source upsert and one write for the batch.
+    
+    Args:
+        source_id: Source ID ("project-{project_id}")
+        project_id: Project ID
+        messages: List of dicts with chat_id, message_id, role, content, timestamp,
+                  message_index and optional message_uuid
+        
+    Returns:
+        List of (chat_message_id, message_uuid), in the same order as messages
+    """
+    if not messages:
+        return []
+    
+    source_db_id = upsert_source(source_id, project_id, "", None, None)
+    
+    def _write(conn):
+        cursor = conn.cursor()
+        results = []
+        for msg in messages:
+            cursor.execute("""
+                SELECT id, message_uuid FROM chat_messages 
+                WHERE chat_id = ? AND message_id = ?
+            """, (msg["chat_id"], msg["message_id"]))
+            existing = cursor.fetchone()
+            
+            if existing:
+                message_uuid = existing["message_uuid"] or msg.get("message_uuid") or str(uuid.uuid4())
+                cursor.execute("""
+                    UPDATE chat_messages
+                    SET role = ?, content = ?, timestamp = ?, message_index = ?, message_uuid = ?
+                    WHERE id = ?
+                """, (msg["role"], msg["content"], msg["timestamp"], msg["message_index"], message_uuid, existing["id"]))
+                results.append((existing["id"], message_uuid))
+            else:
+                message_uuid = msg.get("message_uuid") or str(uuid.uuid4())
+                cursor.execute("""
+                    INSERT INTO chat_messages (source_id, project_id, chat_id, message_id, message_uuid, role, content, timestamp, message_index)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (source_db_id, project_id, msg["chat_id"], msg["message_id"], message_uuid,
+                      msg["role"], msg["content"], msg["timestamp"], msg["message_index"]))
+                results.append((cursor.lastrowid, message_uuid))
+        return results
+    
+    return run_write(source_id, _write, project_id=project_id, label="upsert_chat_messages")
+
+
+def replace_chat_chunks_bulk(source_id: str, chunks_by_message: List[Tuple[int, List[Tuple[int, str, int, int]]]],
+                             project_id: Optional[str] = None, embeddings: Optional[np.ndarray] = None,
+                             model_name: Optional[str] = None) -> List[List[Chunk]]:
+    """
+    Replace the chunks (and optionally their embeddings) of many chat messages in a single transaction.
+    
+    Args:
+        source_id: Source ID ("project-{project_id}")
+        chunks_by_message: List of (chat_message_id, chunks) where chunks is a list of
+                           (chunk_index, text, start_char, end_char)
+        project_id: Optional project_id for DB path lookup
+        embeddings: Optional [N, D] array, one row per chunk in flattened chunks_by_message order;
+                    written in the same transaction so chunks never exist without embeddings
+        model_name: Embedding model name (required with embeddings)
+        
+    Returns:
+        List (same order as chunks_by_message) of inserted Chunk records
+    """
+    if not chunks_by_message:
+        return []
+    
+    def _write(conn):
+        cursor = conn.cursor()
+        chat_message_ids = [(chat_message_id,) for chat_message_id, _ in chunks_by_message]
+        # Old chunks' embeddings would otherwise be orphaned
+        cursor.executemany("DELETE FROM embeddings WHERE chunk_id IN (SELECT id FROM chunks WHERE chat_message_id = ?)", chat_message_ids)
+        cursor.executemany("DELETE FROM chunks WHERE chat_message_id = ?", chat_message_ids)
+        results = [
+            _insert_chunks_returning(cursor, "chat_message_id", chat_message_id, chunks)
+            for chat_message_id, chunks in chunks_by_message
+        ]
+        if embeddings is not None:
+            flat_ids = [record.id for records in results for record in records]
+            _insert_embedding_rows(cursor, flat_ids, embeddings, model_name)
+        return results
+    
+    return run_write(source_id, _write, project_id=project_id, label="replace_chat_chunks")
 
 
 def delete_chat_messages_by_chat_id(project_id: str, chat_id: str) -> int:
@@ -1017,55 +1565,72 @@ def delete_chat_messages_by_chat_id(project_id: str, chat_id: str) -> int:
     
     try:
         init_db(source_id, project_id=project_id)
-        conn = get_db_connection(source_id, project_id=project_id)
-        cursor = conn.cursor()
-        
-        # Get all chat_message_ids and message_uuids for this chat_id
-        cursor.execute("SELECT id, message_uuid FROM chat_messages WHERE chat_id = ?", (chat_id,))
-        chat_message_rows = cursor.fetchall()
-        chat_message_ids = [row["id"] for row in chat_message_rows]
-        message_uuids = [row["message_uuid"] for row in chat_message_rows if row["message_uuid"]]
-        
-        if not chat_message_ids:
-            conn.close()
-            return 0
         
-        # Delete facts that reference messages from this chat
+        # Delete facts that reference messages from this chat first (facts database)
         # Facts store source_message_uuid which references chat_messages.message_uuid
+        conn = get_db_read_connection(source_id, project_id=project_id)
+        try:
+            message_uuids = [
+                row["message_uuid"] for row in conn.execute(
+                    "SELECT message_uuid FROM chat_messages WHERE chat_id = ? AND message_uuid IS NOT NULL", (chat_id,)
+                )
+            ]
+        finally:
+            conn.close()
         if message_uuids:
-            fact_placeholders = ",".join("?" * len(message_uuids))
-            cursor.execute(f"""
-                DELETE FROM project_facts 
-                WHERE project_id = ? AND source_message_uuid IN ({fact_placeholders})
-            """, [project_id] + message_uuids)
-            facts_deleted = cursor.rowcount
+            init_facts_db(source_id, project_id=project_id)
+            
+            def _delete_facts(conn):
+                fact_placeholders = ",".join("?" * len(message_uuids))
+                deleted = 0
+                for table in ("project_facts", "project_facts_history"):
+                    cursor = conn.execute(f"""
+                        DELETE FROM {table} 
+                        WHERE project_id = ? AND source_message_uuid IN ({fact_placeholders})
+                    """, [project_id] + message_uuids)
+                    deleted += cursor.rowcount
+                return deleted
+            
+            facts_deleted = run_facts_write(source_id, _delete_facts, project_id=project_id, label="delete_chat_facts")
             if facts_deleted > 0:
                 logger.info(f"Deleted {facts_deleted} facts for chat_id={chat_id} in project_id={project_id}")
         
-        # Get all chunk_ids for these chat messages (for ANN index removal)
-        placeholders = ",".join("?" * len(chat_message_ids))
-        cursor.execute(f"""
-            SELECT e.chunk_id 
-            FROM embeddings e
-            JOIN chunks c ON e.chunk_id = c.id
-            WHERE c.chat_message_id IN ({placeholders})
-        """, chat_message_ids)
-        chunk_rows = cursor.fetchall()
-        chunk_ids_to_remove = [row["chunk_id"] for row in chunk_rows]
-        
-        # Delete embeddings first (foreign key constraint)
-        if chunk_ids_to_remove:
-            chunk_placeholders = ",".join("?" * len(chunk_ids_to_remove))
-            cursor.execute(f"DELETE FROM embeddings WHERE chunk_id IN ({chunk_placeholders})", chunk_ids_to_remove)
-        
-        # Delete chunks
-        cursor.execute(f"DELETE FROM chunks WHERE chat_message_id IN ({placeholders})", chat_message_ids)
-        
-        # Delete chat messages
-        cursor.execute(f"DELETE FROM chat_messages WHERE id IN ({placeholders})", chat_message_ids)
+        def _write(conn):
+            cursor = conn.cursor()
+            # Get all chat_message_ids for this chat_id
+            cursor.execute("SELECT id FROM chat_messages WHERE chat_id = ?", (chat_id,))
+            chat_message_ids = [row["id"] for row in cursor.fetchall()]
+            
+            if not chat_message_ids:
+                return [], []
+            
+            # Get all chunk_ids for these chat messages (for ANN index removal)
+            placeholders = ",".join("?" * len(chat_message_ids))
+            cursor.execute(f"""
+                SELECT e.chunk_id 
+                FROM embeddings e
+                JOIN chunks c ON e.chunk_id = c.id
+                WHERE c.chat_message_id IN ({placeholders})
+            """, chat_message_ids)
+            chunk_ids_to_remove = [row["chunk_id"] for row in cursor.fetchall()]
+            
+            # Delete embeddings first (foreign key constraint)
+            if chunk_ids_to_remove:
+                chunk_placeholders = ",".join("?" * len(chunk_ids_to_remove))
+                cursor.execute(f"DELETE FROM embeddings WHERE chunk_id IN ({chunk_placeholders})", chunk_ids_to_remove)
+            
+            # Delete chunks
+            cursor.execute(f"DELETE FROM chunks WHERE chat_message_id IN ({placeholders})", chat_message_ids)
+            
+            # Delete chat messages
+            cursor.execute(f"DELETE FROM chat_messages WHERE id IN ({placeholders})", chat_message_ids)
+            return chat_message_ids, chunk_ids_to_remove
         
-        conn.commit()
-        conn.close()
+        chat_message_ids, chunk_ids_to_remove = run_write(
+            source_id, _write, project_id=project_id, label="delete_chat_messages"
+        )
+        if not chat_message_ids:
+            return 0
         
         # Remove from ANN index
         if chunk_ids_to_remove:
@@ -1086,7 +1651,7 @@ def delete_chat_messages_by_chat_id(project_id: str, chat_id: str) -> int:
 
 def get_chat_message_by_id(chat_message_id: int, source_id: str) -> Optional[ChatMessage]:
     """Get a chat message by its database ID."""
-    conn = get_db_connection(source_id)
+    conn = get_db_read_connection(source_id)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM chat_messages WHERE id = ?", (chat_message_id,))
     row = cursor.fetchone()
@@ -1101,11 +1666,11 @@ def get_chat_message_by_id(chat_message_id: int, source_id: str) -> Optional[Cha
         # Generate UUID for old records
         message_uuid = str(uuid.uuid4())
         # Update the record
-        conn = get_db_connection(source_id)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE chat_messages SET message_uuid = ? WHERE id = ?", (message_uuid, chat_message_id))
-        conn.commit()
-        conn.close()
+        run_write(
+            source_id,
+            lambda conn: conn.execute("UPDATE chat_messages SET message_uuid = ? WHERE id = ?", (message_uuid, chat_message_id)),
+            label="backfill_message_uuid"
+        )
     
     return ChatMessage(
         id=row["id"],
@@ -1136,7 +1701,7 @@ def get_message_uuid(project_id: str, chat_id: str, message_id: str) -> Optional
     try:
         source_id = f"project-{project_id}"
         init_db(source_id, project_id=project_id)
-        conn = get_db_connection(source_id)
+        conn = get_db_read_connection(source_id)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -1153,15 +1718,11 @@ def get_message_uuid(project_id: str, chat_id: str, message_id: str) -> Optional
             # If UUID is missing, generate one and update the record
             if not message_uuid:
                 message_uuid = str(uuid.uuid4())
-                conn = get_db_connection(source_id)
-                cursor = conn.cursor()
-                cursor.execute("""
+                run_write(source_id, lambda conn: conn.execute("""
                     UPDATE chat_messages 
                     SET message_uuid = ? 
                     WHERE project_id = ? AND chat_id = ? AND message_id = ?
-                """, (message_uuid, project_id, chat_id, message_id))
-                conn.commit()
-                conn.close()
+                """, (message_uuid, project_id, chat_id, message_id)), label="backfill_message_uuid")
             return message_uuid
         
         return None
@@ -1185,6 +1746,295 @@ def get_message_uuid(project_id: str, chat_id: str, message_id: str) -> Optional
 # ============================================================================
 # Project Facts Database (Typed facts with provenance and temporal "latest wins")
 # ============================================================================
+#
+# Facts live in their own database file next to the project's index database
+# (projects/<project>/index/facts.sqlite), so they have their own WAL, connection
+# pool entries and single writer: chunk/embedding writes from indexing never
+# queue facts writes behind them or grow the WAL facts reads go through.
+# Facts functions keep taking the project source_id ("project-<uuid>"); it
+# locates the project directory.
+
+FACTS_DB_FILENAME = "facts.sqlite"
+
+
+def get_facts_db_path(source_id: str, project_id: Optional[str] = None) -> Path:
+    """Path of the facts database of a project source (next to its index database)."""
+    return get_db_path_for_source(source_id, project_id=project_id).with_name(FACTS_DB_FILENAME)
+
+
+def get_facts_db_connection(source_id: str, project_id: Optional[str] = None):
+    """Get a pooled connection to a project's facts database (see get_db_connection)."""
+    return connection_pool.acquire(get_facts_db_path(source_id, project_id=project_id))
+
+
+def get_facts_db_read_connection(source_id: str, project_id: Optional[str] = None):
+    """Get a read-only connection to a project's facts database (see get_db_read_connection)."""
+    return connection_pool.acquire(get_facts_db_path(source_id, project_id=project_id), readonly=True)
+
+
+def run_facts_write(source_id: str, func, project_id: Optional[str] = None, label: str = "facts_write"):
+    """Run a write on the facts database's single writer and wait for it to commit (see run_write)."""
+    return db_writer.run(get_facts_db_path(source_id, project_id=project_id), func, label)
+
+
+def init_facts_db(source_id: str, project_id: Optional[str] = None):
+    """
+    Initialize a project's facts database.
+    
+    Creates the schema once per database file per process (like init_db) and
+    moves facts still stored in the project's index database into it.
+    """
+    db_path = str(get_facts_db_path(source_id, project_id=project_id))
+    identity = _initialized_schemas.get(db_path)
+    if identity is not None and identity == file_identity(db_path):
+        return
+    with _schema_lock:
+        identity = _initialized_schemas.get(db_path)
+        if identity is not None and identity == file_identity(db_path):
+            return
+        _create_facts_schema(source_id, project_id)
+        _migrate_facts_from_index(source_id, project_id)
+        identity = file_identity(db_path)
+        if identity is not None:
+            _initialized_schemas[db_path] = identity
+
+
+def _create_facts_schema(source_id: str, project_id: Optional[str] = None):
+    """Create tables and run migrations for a facts database."""
+    conn = get_facts_db_connection(source_id, project_id=project_id)
+    cursor = conn.cursor()
+    
+    # Project Facts table (for typed facts with provenance and temporal "latest wins")
+    # source_message_uuid refers to chat_messages.message_uuid in the project's index database,
+    # supersedes_fact_id to a row of project_facts_history (not enforced: neither is in this table)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS project_facts (
+            fact_id TEXT PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            fact_key TEXT NOT NULL,
+            value_text TEXT NOT NULL,
+            value_type TEXT NOT NULL CHECK(value_type IN ('string', 'number', 'bool', 'date', 'json')),
+            confidence REAL NOT NULL DEFAULT 1.0,
+            source_message_uuid TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            effective_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            supersedes_fact_id TEXT,
+            is_current INTEGER NOT NULL DEFAULT 1 CHECK(is_current IN (0, 1))
+        )
+    """)
+    
+    # Indexes for project_facts
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_facts_project_key ON project_facts(project_id, fact_key, is_current)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_facts_source_uuid ON project_facts(source_message_uuid)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_facts_current ON project_facts(project_id, is_current)")
+    
+    # Ranked-list columns (list_key, rank) derived from user.favorites.<topic>.<rank> keys.
+    # Virtual generated columns: every writer (and existing rows) gets them without code changes;
+    # the index below stores them, so list reads are range scans and max-rank is one index probe.
+    cursor.execute("PRAGMA table_xinfo(project_facts)")
+    columns = [row[1] for row in cursor.fetchall()]
+    for column, expression, column_type in (("list_key", _RANKED_LIST_KEY_SQL, "TEXT"),
+                                            ("rank", _RANKED_RANK_SQL, "INTEGER")):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE project_facts ADD COLUMN {column} {column_type} GENERATED ALWAYS AS ({expression}) VIRTUAL")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_project_facts_list_rank ON project_facts(project_id, list_key, rank)
+        WHERE is_current = 1 AND list_key IS NOT NULL
+    """)
+    
+    # Full-text index over current facts (search_current_facts), kept in sync by triggers
+    _create_project_facts_fts(cursor, source_id)
+    
+    # Superseded versions live in project_facts_history (get_fact_history)
+    _create_project_facts_history(cursor, source_id)
+    
+    # Write counter for caches of facts in other processes (get_facts_version)
+    _create_facts_version(cursor)
+    
+    conn.commit()
+    conn.close()
+
+
+# Stored (non-generated) project_facts columns, shared with project_facts_history
+_PROJECT_FACTS_COLUMNS = (
+    "fact_id, project_id, fact_key, value_text, value_type, confidence, source_message_uuid, "
+    "created_at, effective_at, supersedes_fact_id, is_current"
+)
+
+
+def _create_project_facts_history(cursor, source_id: str):
+    """
+    Create project_facts_history and the trigger that moves superseded facts into it.
+    
+    project_facts only holds current facts: superseding a fact (UPDATE
+    is_current = 0, as every writer does) moves the row to project_facts_history
+    in the same statement, so current-fact queries and indexes never scan old
+    versions. Superseded rows left in project_facts by older databases are
+    compacted into the history once.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS project_facts_history (
+            fact_id TEXT PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            fact_key TEXT NOT NULL,
+            value_text TEXT NOT NULL,
+            value_type TEXT NOT NULL CHECK(value_type IN ('string', 'number', 'bool', 'date', 'json')),
+            confidence REAL NOT NULL DEFAULT 1.0,
+            source_message_uuid TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            effective_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            supersedes_fact_id TEXT,
+            is_current INTEGER NOT NULL DEFAULT 0 CHECK(is_current = 0)
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_project_facts_history_key
+        ON project_facts_history(project_id, fact_key, effective_at)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_facts_history_source_uuid ON project_facts_history(source_message_uuid)")
+    # Deleting the updated row in its own AFTER UPDATE trigger is safe in SQLite, also for
+    # multi-row UPDATEs; project_facts_fts_update has already dropped it from the FTS index
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS project_facts_supersede
+        AFTER UPDATE OF is_current ON project_facts
+        WHEN old.is_current = 1 AND new.is_current = 0 BEGIN
+            INSERT OR REPLACE INTO project_facts_history ({_PROJECT_FACTS_COLUMNS})
+            VALUES (new.fact_id, new.project_id, new.fact_key, new.value_text, new.value_type, new.confidence,
+                    new.source_message_uuid, new.created_at, new.effective_at, new.supersedes_fact_id, 0);
+            DELETE FROM project_facts WHERE rowid = new.rowid;
+        END
+    """)
+    
+    cursor.execute(f"""
+        INSERT OR REPLACE INTO project_facts_history ({_PROJECT_FACTS_COLUMNS})
+        SELECT {_PROJECT_FACTS_COLUMNS} FROM project_facts WHERE is_current = 0
+    """)
+    if cursor.rowcount:
+        cursor.execute("DELETE FROM project_facts WHERE is_current = 0")
+        logger.info(f"Moved {cursor.rowcount} superseded facts to project_facts_history for source {source_id}")
+
+
+def _create_facts_version(cursor):
+    """
+    Create facts_version, a one-row counter bumped by triggers on every write to
+    project_facts and project_facts_history.
+    
+    Facts are written from more than one process (apply_facts_ops in the server,
+    chat deletes in the memory service), so in-process caches of facts compare
+    the counter with the value they were filled at instead of relying on
+    write-through alone.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS facts_version (
+            id INTEGER PRIMARY KEY CHECK(id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO facts_version (id, version) VALUES (1, 0)")
+    for table in ("project_facts", "project_facts_history"):
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} AFTER {event} ON {table} BEGIN
+                    UPDATE facts_version SET version = version + 1 WHERE id = 1;
+                END
+            """)
+
+
+def read_facts_version(conn) -> int:
+    """Current facts_version of a facts database, on a connection (e.g. inside a write transaction)."""
+    row = conn.execute("SELECT version FROM facts_version WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+
+def get_facts_version(project_id: str, source_id: Optional[str] = None) -> int:
+    """
+    Get the write counter of a project's facts database.
+    
+    Any committed change to the project's facts (from any process) changes it.
+    
+    Args:
+        project_id: Project ID
+        source_id: Optional source ID (uses project-based source if not provided)
+        
+    Returns:
+        Current facts_version
+    """
+    if source_id is None:
+        source_id = f"project-{project_id}"
+    
+    init_facts_db(source_id, project_id=project_id)
+    conn = get_facts_db_read_connection(source_id, project_id=project_id)
+    try:
+        return read_facts_version(conn)
+    finally:
+        conn.close()
+
+
+def _migrate_facts_from_index(source_id: str, project_id: Optional[str] = None):
+    """
+    One-shot migration: move project_facts out of the project's index database.
+    
+    Copies the rows into the facts database (superseded ones into
+    project_facts_history; INSERT OR IGNORE by fact_id, so an interrupted run
+    can simply run again), checks that every row arrived, then
+    drops project_facts and its FTS table/triggers from the index database.
+    Does nothing once the index database has no project_facts table.
+    """
+    index_path = get_db_path_for_source(source_id, project_id=project_id)
+    if not index_path.exists():
+        return
+    conn = connection_pool.acquire(index_path, readonly=True)
+    try:
+        has_facts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_facts'"
+        ).fetchone() is not None
+    finally:
+        conn.close()
+    if not has_facts:
+        return
+    
+    # ATTACH is not allowed inside a transaction, so this uses its own connection
+    facts_path = get_facts_db_path(source_id, project_id=project_id)
+    conn = open_connection(facts_path)
+    try:
+        conn.execute("ATTACH DATABASE ? AS legacy_index", (str(index_path),))
+        conn.execute("BEGIN IMMEDIATE")
+        for table, condition in (("project_facts", "is_current = 1"), ("project_facts_history", "is_current = 0")):
+            conn.execute(f"""
+                INSERT OR IGNORE INTO main.{table} ({_PROJECT_FACTS_COLUMNS})
+                SELECT {_PROJECT_FACTS_COLUMNS} FROM legacy_index.project_facts WHERE {condition}
+            """)
+        legacy_count = conn.execute("SELECT COUNT(*) FROM legacy_index.project_facts").fetchone()[0]
+        copied_count = conn.execute("""
+            SELECT (SELECT COUNT(*) FROM main.project_facts
+                    WHERE fact_id IN (SELECT fact_id FROM legacy_index.project_facts))
+                 + (SELECT COUNT(*) FROM main.project_facts_history
+                    WHERE fact_id IN (SELECT fact_id FROM legacy_index.project_facts))
+        """).fetchone()[0]
+        conn.commit()
+        conn.execute("DETACH DATABASE legacy_index")
+    except sqlite3.OperationalError as e:
+        # Another process migrated (and dropped the table) first
+        logger.warning(f"[FACTS-DB] Facts migration for source {source_id} skipped: {e}")
+        return
+    finally:
+        conn.close()
+    if copied_count != legacy_count:
+        logger.error(
+            f"[FACTS-DB] Facts migration for source {source_id} copied {copied_count} of {legacy_count} facts; "
+            f"keeping project_facts in the index database"
+        )
+        return
+    
+    def _drop_legacy_facts(conn):
+        for trigger in ("project_facts_fts_insert", "project_facts_fts_delete", "project_facts_fts_update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS project_facts_fts")
+        conn.execute("DROP TABLE IF EXISTS project_facts")
+    
+    run_write(source_id, _drop_legacy_facts, project_id=project_id, label="migrate_facts")
+    logger.info(f"[FACTS-DB] Moved {legacy_count} facts for source {source_id} from {index_path.name} to {facts_path.name}")
+
 
 def store_project_fact(
     project_id: str,
@@ -1201,8 +2051,9 @@ def store_project_fact(
     Store a project fact with "latest wins" semantics.
     
     When a new fact with the same fact_key is stored, all previous facts
-    with that key are marked as is_current=0, and the new fact references
-    the most recent one via supersedes_fact_id.
+    with that key are marked as is_current=0 (which moves them to
+    project_facts_history), and the new fact references the most recent
+    one via supersedes_fact_id.
     
     Args:
         project_id: Project ID
@@ -1223,9 +2074,7 @@ def store_project_fact(
         source_id = f"project-{project_id}"
     
     # Initialize DB for this source if needed
-    init_db(source_id, project_id=project_id)
-    conn = get_db_connection(source_id, project_id=project_id)
-    cursor = conn.cursor()
+    init_facts_db(source_id, project_id=project_id)
     
     fact_id = str(uuid.uuid4())
     if created_at is None:
@@ -1233,49 +2082,51 @@ def store_project_fact(
     if effective_at is None:
         effective_at = created_at
     
-    # Find the most recent current fact with this key
-    cursor.execute("""
-        SELECT fact_id, value_text FROM project_facts
-        WHERE project_id = ? AND fact_key = ? AND is_current = 1
-        ORDER BY effective_at DESC, created_at DESC
-        LIMIT 1
-    """, (project_id, fact_key))
-    previous_fact = cursor.fetchone()
-    supersedes_fact_id = previous_fact[0] if previous_fact else None
-    
-    # Determine if this is a Store (new) or Update (existing fact changed)
-    action_type = "store"  # Default: new fact
-    if previous_fact:
-        previous_value = previous_fact[1] if len(previous_fact) > 1 else None
-        if previous_value and previous_value != value_text:
-            # Same fact_key but different value = Update
-            action_type = "update"
-        # If same fact_key and same value, still counts as "store" (new fact row)
-    
-    # Mark ALL previous facts with this key as not current (always, not just if previous_fact exists)
-    # This ensures only one fact with is_current=1 exists per fact_key
-    cursor.execute("""
-        UPDATE project_facts
-        SET is_current = 0
-        WHERE project_id = ? AND fact_key = ? AND is_current = 1
-    """, (project_id, fact_key))
-    
-    # Insert the new fact
-    cursor.execute("""
-        INSERT INTO project_facts (
+    def _write(conn):
+        cursor = conn.cursor()
+        # Find the most recent current fact with this key
+        cursor.execute("""
+            SELECT fact_id, value_text FROM project_facts
+            WHERE project_id = ? AND fact_key = ? AND is_current = 1
+            ORDER BY effective_at DESC, created_at DESC
+            LIMIT 1
+        """, (project_id, fact_key))
+        previous_fact = cursor.fetchone()
+        supersedes_fact_id = previous_fact[0] if previous_fact else None
+        
+        # Determine if this is a Store (new) or Update (existing fact changed)
+        action_type = "store"  # Default: new fact
+        if previous_fact:
+            previous_value = previous_fact[1] if len(previous_fact) > 1 else None
+            if previous_value and previous_value != value_text:
+                # Same fact_key but different value = Update
+                action_type = "update"
+            # If same fact_key and same value, still counts as "store" (new fact row)
+        
+        # Mark ALL previous facts with this key as not current (always, not just if previous_fact exists)
+        # This ensures only one fact with is_current=1 exists per fact_key
+        cursor.execute("""
+            UPDATE project_facts
+            SET is_current = 0
+            WHERE project_id = ? AND fact_key = ? AND is_current = 1
+        """, (project_id, fact_key))
+        
+        # Insert the new fact
+        cursor.execute("""
+            INSERT INTO project_facts (
+                fact_id, project_id, fact_key, value_text, value_type,
+                confidence, source_message_uuid, created_at, effective_at,
+                supersedes_fact_id, is_current
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+        """, (
             fact_id, project_id, fact_key, value_text, value_type,
             confidence, source_message_uuid, created_at, effective_at,
-            supersedes_fact_id, is_current
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
-    """, (
-        fact_id, project_id, fact_key, value_text, value_type,
-        confidence, source_message_uuid, created_at, effective_at,
-        supersedes_fact_id
-    ))
+            supersedes_fact_id
+        ))
+        return action_type
     
-    conn.commit()
-    conn.close()
+    action_type = run_facts_write(source_id, _write, project_id=project_id, label="store_project_fact")
     return (fact_id, action_type)
 
 
@@ -1294,8 +2145,8 @@ def get_current_fact(project_id: str, fact_key: str, source_id: Optional[str] =
     if source_id is None:
         source_id = f"project-{project_id}"
     
-    init_db(source_id, project_id=project_id)
-    conn = get_db_connection(source_id, project_id=project_id)
+    init_facts_db(source_id, project_id=project_id)
+    conn = get_facts_db_read_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -1329,12 +2180,106 @@ def get_current_fact(project_id: str, fact_key: str, source_id: Optional[str] =
     }
 
 
+def get_fact_history(
+    project_id: str,
+    fact_key: str,
+    limit: Optional[int] = None,
+    source_id: Optional[str] = None
+) -> List[dict]:
+    """
+    Get all versions of a fact, newest first ("what did I say before").
+    
+    Args:
+        project_id: Project ID
+        fact_key: Fact key to look up
+        limit: Maximum number of versions (None = all)
+        source_id: Optional source ID (uses project-based source if not provided)
+        
+    Returns:
+        List of fact dicts (as get_current_fact); the current version, if any,
+        comes first with is_current=True, followed by superseded versions
+    """
+    if source_id is None:
+        source_id = f"project-{project_id}"
+    
+    init_facts_db(source_id, project_id=project_id)
+    conn = get_facts_db_read_connection(source_id, project_id=project_id)
+    cursor = conn.cursor()
+    
+    cursor.execute(f"""
+        SELECT {_PROJECT_FACTS_COLUMNS} FROM project_facts
+        WHERE project_id = ? AND fact_key = ?
+        UNION ALL
+        SELECT {_PROJECT_FACTS_COLUMNS} FROM project_facts_history
+        WHERE project_id = ? AND fact_key = ?
+        ORDER BY is_current DESC, effective_at DESC, created_at DESC
+        LIMIT ?
+    """, (project_id, fact_key, project_id, fact_key, limit if limit is not None else -1))
+    
+    rows = cursor.fetchall()
+    conn.close()
+    
+    return [
+        {
+            "fact_id": row["fact_id"],
+            "project_id": row["project_id"],
+            "fact_key": row["fact_key"],
+            "value_text": row["value_text"],
+            "value_type": row["value_type"],
+            "confidence": row["confidence"],
+            "source_message_uuid": row["source_message_uuid"],
+            "created_at": datetime.fromisoformat(row["created_at"]) if isinstance(row["created_at"], str) else row["created_at"],
+            "effective_at": datetime.fromisoformat(row["effective_at"]) if isinstance(row["effective_at"], str) else row["effective_at"],
+            "supersedes_fact_id": row["supersedes_fact_id"],
+            "is_current": bool(row["is_current"])
+        }
+        for row in rows
+    ]
+
+
+# Question and stop words ignored when searching facts
+_FACT_QUERY_STOP_WORDS = frozenset({'what', 'is', 'my', 'your', 'the', 'a', 'an', 'do', 'you', 'remember', 'know', 'tell', 'me', 'about'})
+# Fact key namespace words shared by (nearly) every fact key (user.*, user.favorites.*)
+_FACT_KEY_NAMESPACE_WORDS = frozenset({'user', 'favorite', 'favorites'})
+_FACT_QUERY_WORD_RE = re.compile(r'\b\w+\b')
+_FACT_QUERY_TOKEN_RE = re.compile(r'[^\W_]+')  # Word parts as the unicode61 tokenizer splits them
+
+
+def _fact_fts_query(query: str) -> Optional[str]:
+    """
+    Build the project_facts_fts MATCH expression for a fact search query.
+    
+    Keywords (words longer than two characters that aren't stop words; all words
+    if none qualify) become prefix terms ("color" matches "colors"), OR-ed so that
+    facts matching more keywords rank higher. Keywords the tokenizer splits, such
+    as "favorite_color", become a prefix phrase. Key namespace words ("user",
+    "favorites") are dropped when other keywords remain: they match almost every
+    fact, so they add nothing to the ranking but make every query touch the
+    whole index.
+    
+    Returns:
+        MATCH expression, or None if the query has no words
+    """
+    words = _FACT_QUERY_WORD_RE.findall(query.lower())
+    keywords = [w for w in words if w not in _FACT_QUERY_STOP_WORDS and len(w) > 2] or words
+    keywords = [w for w in keywords if w not in _FACT_KEY_NAMESPACE_WORDS] or keywords
+    terms = []
+    for keyword in keywords:
+        parts = _FACT_QUERY_TOKEN_RE.findall(keyword)
+        if parts:
+            term = '"' + " ".join(parts) + '"*'
+            if term not in terms:
+                terms.append(term)
+    return " OR ".join(terms) if terms else None
+
+
 def search_current_facts(project_id: str, query: str, limit: int = 10, source_id: Optional[str] = None, exclude_message_uuid: Optional[str] = None) -> List[dict]:
     """
     Search current facts by fact_key or value_text.
     
     Extracts keywords from the query to improve matching (e.g., "What is my favorite color?"
-    will match facts with "color" in the key or value).
+    will match facts with "color" in the key or value) and looks them up in the
+    project_facts_fts full-text index (prefix match, ranked by BM25).
     
     Args:
         project_id: Project ID
@@ -1350,55 +2295,33 @@ def search_current_facts(project_id: str, query: str, limit: int = 10, source_id
     if source_id is None:
         source_id = f"project-{project_id}"
     
-    init_db(source_id, project_id=project_id)
-    conn = get_db_connection(source_id, project_id=project_id)
+    init_facts_db(source_id, project_id=project_id)
+    conn = get_facts_db_read_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     
-    # Extract meaningful keywords from query (remove common question words)
-    import re
-    query_lower = query.lower()
-    # Remove common question words and stop words
-    stop_words = {'what', 'is', 'my', 'your', 'the', 'a', 'an', 'do', 'you', 'remember', 'know', 'tell', 'me', 'about'}
-    words = re.findall(r'\b\w+\b', query_lower)
-    keywords = [w for w in words if w not in stop_words and len(w) > 2]
-    
-    # If no keywords extracted, use the original query
-    if not keywords:
-        keywords = [query_lower]
-    
-    # Build search patterns for each keyword
-    search_patterns = [f"%{kw}%" for kw in keywords]
-    
-    # Build SQL with OR conditions for each keyword
-    conditions = []
-    params = [project_id]
-    for pattern in search_patterns:
-        conditions.append("(fact_key LIKE ? OR value_text LIKE ?)")
-        params.extend([pattern, pattern])
-    
-    # Combine all conditions with OR, then wrap in parentheses
-    if conditions:
-        search_condition = f"({' OR '.join(conditions)})"
-    else:
-        # Fallback: use original query if no keywords extracted
-        search_pattern = f"%{query}%"
-        search_condition = "(fact_key LIKE ? OR value_text LIKE ?)"
-        params.extend([search_pattern, search_pattern])
+    fts_query = _fact_fts_query(query)
+    if fts_query is None:
+        conn.close()
+        return []
+    
+    params = [fts_query, project_id]
     
     # Add exclusion filter if exclude_message_uuid is provided
     # This prevents Facts-R from counting facts that were just stored in the current message
     exclusion_condition = ""
     if exclude_message_uuid:
-        exclusion_condition = "AND source_message_uuid != ?"
+        exclusion_condition = "AND pf.source_message_uuid != ?"
         params.append(exclude_message_uuid)
     
+    # Best BM25 match first; ties (e.g. every fact matching only "user") newest first
     cursor.execute(f"""
-        SELECT fact_id, project_id, fact_key, value_text, value_type,
-               confidence, source_message_uuid, created_at, effective_at,
-               supersedes_fact_id, is_current
-        FROM project_facts
-        WHERE project_id = ? AND is_current = 1 AND {search_condition} {exclusion_condition}
-        ORDER BY effective_at DESC, created_at DESC
+        SELECT pf.fact_id, pf.project_id, pf.fact_key, pf.value_text, pf.value_type,
+               pf.confidence, pf.source_message_uuid, pf.created_at, pf.effective_at,
+               pf.supersedes_fact_id, pf.is_current
+        FROM project_facts_fts
+        JOIN project_facts pf ON pf.rowid = project_facts_fts.rowid
+        WHERE project_facts_fts MATCH ? AND pf.project_id = ? AND pf.is_current = 1 {exclusion_condition}
+        ORDER BY project_facts_fts.rank, pf.effective_at DESC, pf.created_at DESC
         LIMIT ?
     """, params + [limit])
     
@@ -1439,3 +2362,146 @@ def search_current_facts(project_id: str, query: str, limit: int = 10, source_id
         results.append(fact_dict)
     
     return results
+
+
+def get_ranked_list_keys(project_id: str, source_id: Optional[str] = None) -> List[str]:
+    """
+    Get the list keys (user.favorites.<topic>) of all ranked lists with current facts.
+    
+    Walks idx_project_facts_list_rank one distinct list_key at a time, so the cost
+    grows with the number of lists, not the number of ranked facts.
+    
+    Args:
+        project_id: Project ID
+        source_id: Optional source ID (uses project-based source if not provided)
+        
+    Returns:
+        Sorted list keys
+    """
+    if source_id is None:
+        source_id = f"project-{project_id}"
+    
+    init_facts_db(source_id, project_id=project_id)
+    conn = get_facts_db_read_connection(source_id, project_id=project_id)
+    cursor = conn.cursor()
+    
+    list_keys = []
+    last_key = ""
+    while True:
+        cursor.execute("""
+            SELECT list_key FROM project_facts
+            WHERE project_id = ? AND is_current = 1 AND list_key > ?
+            ORDER BY list_key
+            LIMIT 1
+        """, (project_id, last_key))
+        row = cursor.fetchone()
+        if row is None:
+            break
+        last_key = row["list_key"]
+        list_keys.append(last_key)
+    
+    conn.close()
+    return list_keys
+
+
+def get_ranked_list_facts(
+    project_id: str,
+    list_keys: List[str],
+    rank: Optional[int] = None,
+    limit: Optional[int] = None,
+    source_id: Optional[str] = None,
+    exclude_message_uuid: Optional[str] = None
+) -> List[dict]:
+    """
+    Get the current facts of one or more ranked lists, ordered by rank.
+    
+    Args:
+        project_id: Project ID
+        list_keys: List keys (e.g., ["user.favorites.crypto"])
+        rank: Only the fact at this rank (the "Nth item" lookup)
+        limit: Maximum number of facts (None = all)
+        source_id: Optional source ID (uses project-based source if not provided)
+        exclude_message_uuid: Optional message UUID to exclude from results
+        
+    Returns:
+        List of dicts with fact_id, fact_key, list_key, rank, value_text,
+        source_message_uuid, created_at and effective_at
+    """
+    if not list_keys:
+        return []
+    if source_id is None:
+        source_id = f"project-{project_id}"
+    
+    init_facts_db(source_id, project_id=project_id)
+    conn = get_facts_db_read_connection(source_id, project_id=project_id)
+    cursor = conn.cursor()
+    
+    conditions = [f"list_key IN ({','.join('?' * len(list_keys))})"]
+    params = [project_id] + list(list_keys)
+    if rank is not None:
+        conditions.append("rank = ?")
+        params.append(rank)
+    if exclude_message_uuid:
+        conditions.append("source_message_uuid != ?")
+        params.append(exclude_message_uuid)
+    params.append(limit if limit is not None else -1)
+    
+    cursor.execute(f"""
+        SELECT fact_id, fact_key, list_key, rank, value_text, source_message_uuid, created_at, effective_at
+        FROM project_facts
+        WHERE project_id = ? AND is_current = 1 AND {' AND '.join(conditions)}
+        ORDER BY rank, list_key
+        LIMIT ?
+    """, params)
+    
+    rows = cursor.fetchall()
+    conn.close()
+    
+    return [{
+        "fact_id": row["fact_id"],
+        "fact_key": row["fact_key"],
+        "list_key": row["list_key"],
+        "rank": row["rank"],
+        "value_text": row["value_text"],
+        "source_message_uuid": row["source_message_uuid"],
+        "created_at": datetime.fromisoformat(row["created_at"]) if isinstance(row["created_at"], str) else row["created_at"],
+        "effective_at": datetime.fromisoformat(row["effective_at"]) if isinstance(row["effective_at"], str) else row["effective_at"],
+    } for row in rows]
+
+
+def get_ranked_list_max_rank(
+    project_id: str,
+    list_keys: List[str],
+    source_id: Optional[str] = None,
+    exclude_message_uuid: Optional[str] = None
+) -> int:
+    """
+    Get the highest current rank across one or more ranked lists (0 if they are empty).
+    
+    Args:
+        project_id: Project ID
+        list_keys: List keys (e.g., ["user.favorites.crypto"])
+        source_id: Optional source ID (uses project-based source if not provided)
+        exclude_message_uuid: Optional message UUID whose facts are ignored
+    """
+    if not list_keys:
+        return 0
+    if source_id is None:
+        source_id = f"project-{project_id}"
+    
+    init_facts_db(source_id, project_id=project_id)
+    conn = get_facts_db_read_connection(source_id, project_id=project_id)
+    
+    exclusion_condition = ""
+    params = [project_id] + list(list_keys)
+    if exclude_message_uuid:
+        exclusion_condition = "AND source_message_uuid != ?"
+        params.append(exclude_message_uuid)
+    
+    row = conn.execute(f"""
+        SELECT MAX(rank) FROM project_facts
+        WHERE project_id = ? AND is_current = 1
+          AND list_key IN ({','.join('?' * len(list_keys))}) {exclusion_condition}
+    """, params).fetchone()
+    conn.close()
+    return row[0] or 0
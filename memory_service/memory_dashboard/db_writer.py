@@ -0,0 +1,348 @@
+"""
+Single-writer actor per SQLite database.
+
+Chat indexing, watcher callbacks, reindex threads and facts writes used to
+open their own write transactions on the same index.sqlite, so under load
+they queued up on SQLite's busy timeout and sometimes failed with "database
+is locked". Now every write for a database is a mutation, a callable that
+takes the writer's connection. Mutations are queued to a single writer thread
+for that database.
+
+- The writer takes all queued mutations (up to WRITER_MAX_BATCH) and runs them
+  in one BEGIN IMMEDIATE transaction with one commit. Each mutation runs under
+  its own SAVEPOINT, so a failing mutation is rolled back and reported to its
+  caller without affecting the rest of the batch.
+- Callers block on the mutation's result (db.run_write / WriterRegistry.run)
+  or get a Future (WriterRegistry.submit). Mutations must not commit or roll
+  back themselves.
+- A mutation that writes to the same database again (nested run_write on the
+  writer thread) runs inline inside the current transaction.
+- A writer thread exits after WRITER_IDLE_SECONDS without work and is started
+  again on the next write.
+- Queue wait, commit latency and batch sizes are kept per database (get_stats).
+
+Readers don't go through the writer; they use read-only pooled connections
+(see connection_pool).
+
+Writes that still commit on their own connection:
+
+- Schema creation and migrations (db._create_schema, init_tracking_db,
+  _create_facts_schema, the copy step of _migrate_facts_from_index). They run
+  once per database file before its first regular write; the facts migration
+  needs ATTACH, which SQLite doesn't allow inside the writer's transaction.
+- Databases that only have one writer to begin with: the job journal
+  (index_queue.db, one connection under its own lock), the alias table and
+  the local router's routing examples.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from memory_service.memory_dashboard.connection_pool import file_identity, open_connection
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+WRITER_MAX_BATCH = int(os.getenv("DB_WRITER_MAX_BATCH", "64"))  # Mutations grouped into one transaction
+WRITER_IDLE_SECONDS = float(os.getenv("DB_WRITER_IDLE_SECONDS", "60"))  # Idle writer threads exit after this
+WRITER_SLOW_COMMIT_MS = float(os.getenv("DB_WRITER_SLOW_COMMIT_MS", "1000"))  # Log batches slower than this
+METRIC_SAMPLES = 1000  # Recent samples kept per metric for percentiles
+
+# Set on writer threads: (db key, connection) of the transaction in progress
+_local = threading.local()
+
+
+class _Mutation:
+    """A queued write: func(conn) plus its result future."""
+    __slots__ = ("func", "label", "future", "enqueued_at")
+
+    def __init__(self, func: Callable[[sqlite3.Connection], Any], label: str):
+        self.func = func
+        self.label = label
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+class DatabaseWriter:
+    """Writer thread and mutation queue for one database file."""
+
+    def __init__(self, db_path: Path, registry: "WriterRegistry"):
+        self.db_path = Path(db_path)
+        self.key = str(db_path)
+        self.registry = registry
+        self.queue: deque = deque()
+        self.cond = threading.Condition()
+        self.conn: Optional[sqlite3.Connection] = None
+        self.identity = None
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = False
+        self.retired = False
+
+        # Metrics
+        self.mutations = 0
+        self.batches = 0
+        self.failed_mutations = 0
+        self.failed_batches = 0
+        self.queue_wait_ms: deque = deque(maxlen=METRIC_SAMPLES)
+        self.commit_ms: deque = deque(maxlen=METRIC_SAMPLES)
+        self.batch_sizes: deque = deque(maxlen=METRIC_SAMPLES)
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self._run, name=f"DBWriter-{self.db_path.parent.name}", daemon=True
+        )
+        self.thread.start()
+
+    def _take_batch(self) -> List[_Mutation]:
+        """Wait for work and take up to WRITER_MAX_BATCH mutations (empty list = exit)."""
+        with self.cond:
+            deadline = time.monotonic() + WRITER_IDLE_SECONDS
+            while not self.queue and not self.stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+            if not self.queue:
+                # Idle (or stopped): deregister while holding the condition, so submit() can't
+                # add to this queue anymore and starts a new writer instead
+                self.registry.retire(self)
+                return []
+            batch = []
+            while self.queue and len(batch) < WRITER_MAX_BATCH:
+                batch.append(self.queue.popleft())
+            return batch
+
+    def _connection(self) -> sqlite3.Connection:
+        """Writer connection, reopened if the database file was replaced or deleted."""
+        identity = file_identity(self.key)
+        if self.conn is None or identity is None or identity != self.identity:
+            self._close_connection()
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = open_connection(self.db_path)
+            self.identity = file_identity(self.key)
+        return self.conn
+
+    def _close_connection(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+            self.conn = None
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                break
+            self._execute_batch(batch)
+        self._close_connection()
+
+    def _execute_batch(self, batch: List[_Mutation]):
+        started = time.monotonic()
+        outcomes = []
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+        except Exception as e:
+            logger.error(f"[DB-WRITER] Could not start transaction on {self.key}: {e}")
+            self._close_connection()
+            self._fail_batch(batch, e)
+            return
+
+        _local.active = (self.key, conn)
+        try:
+            for mutation in batch:
+                outcomes.append(self._run_mutation(conn, mutation))
+        finally:
+            _local.active = None
+
+        commit_started = time.monotonic()
+        try:
+            conn.commit()
+        except Exception as e:
+            logger.error(f"[DB-WRITER] Commit failed on {self.key}, batch of {len(batch)} rolled back: {e}")
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                self._close_connection()
+            self._fail_batch(batch, e)
+            return
+        finished = time.monotonic()
+
+        for mutation, (ok, value) in zip(batch, outcomes):
+            if ok:
+                mutation.future.set_result(value)
+            else:
+                mutation.future.set_exception(value)
+
+        with self.cond:
+            self.batches += 1
+            self.mutations += len(batch)
+            self.failed_mutations += sum(1 for ok, _ in outcomes if not ok)
+            self.batch_sizes.append(len(batch))
+            self.commit_ms.append(1000.0 * (finished - commit_started))
+            self.queue_wait_ms.extend(1000.0 * (started - m.enqueued_at) for m in batch)
+
+        elapsed_ms = 1000.0 * (finished - started)
+        if elapsed_ms >= WRITER_SLOW_COMMIT_MS:
+            labels = sorted({m.label for m in batch})
+            logger.warning(
+                f"[DB-WRITER] Slow batch on {self.key}: {len(batch)} mutations ({', '.join(labels)}) "
+                f"took {elapsed_ms:.0f}ms"
+            )
+
+    @staticmethod
+    def _run_mutation(conn: sqlite3.Connection, mutation: _Mutation):
+        """Run one mutation under a savepoint. Returns (ok, result_or_exception)."""
+        conn.execute("SAVEPOINT mutation")
+        try:
+            value = mutation.func(conn)
+        except Exception as e:
+            try:
+                conn.execute("ROLLBACK TO mutation")
+                conn.execute("RELEASE mutation")
+            except sqlite3.Error:
+                pass
+            return False, e
+        conn.execute("RELEASE mutation")
+        return True, value
+
+    def _fail_batch(self, batch: List[_Mutation], error: Exception):
+        for mutation in batch:
+            if not mutation.future.done():
+                mutation.future.set_exception(error)
+        with self.cond:
+            self.failed_batches += 1
+            self.failed_mutations += len(batch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.cond:
+            queue_wait = list(self.queue_wait_ms)
+            commit = list(self.commit_ms)
+            sizes = list(self.batch_sizes)
+            oldest = self.queue[0].enqueued_at if self.queue else None
+            return {
+                "queue_depth": len(self.queue),
+                "oldest_queued_ms": round(1000.0 * (time.monotonic() - oldest), 1) if oldest is not None else 0.0,
+                "mutations": self.mutations,
+                "batches": self.batches,
+                "failed_mutations": self.failed_mutations,
+                "failed_batches": self.failed_batches,
+                "avg_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else 0.0,
+                "queue_wait_ms_p50": round(_percentile(queue_wait, 0.50), 2),
+                "queue_wait_ms_p95": round(_percentile(queue_wait, 0.95), 2),
+                "queue_wait_ms_max": round(max(queue_wait), 2) if queue_wait else 0.0,
+                "commit_ms_p50": round(_percentile(commit, 0.50), 2),
+                "commit_ms_p95": round(_percentile(commit, 0.95), 2),
+                "commit_ms_max": round(max(commit), 2) if commit else 0.0,
+            }
+
+
+class WriterRegistry:
+    """Creates one DatabaseWriter per database path on demand."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.writers: Dict[str, DatabaseWriter] = {}
+        # Metrics of writers that exited while idle, so totals survive restarts of the thread
+        self.retired_totals: Dict[str, Dict[str, int]] = {}
+
+    def _writer_for(self, db_path: Path) -> DatabaseWriter:
+        key = str(db_path)
+        with self.lock:
+            writer = self.writers.get(key)
+            if writer is None:
+                writer = DatabaseWriter(db_path, self)
+                self.writers[key] = writer
+                writer.start()
+            return writer
+
+    def retire(self, writer: DatabaseWriter):
+        """Remove an idle writer (called by the writer with its condition held)."""
+        writer.retired = True
+        with self.lock:
+            if self.writers.get(writer.key) is writer:
+                del self.writers[writer.key]
+            totals = self.retired_totals.setdefault(writer.key, {})
+            for name in ("mutations", "batches", "failed_mutations", "failed_batches"):
+                totals[name] = totals.get(name, 0) + getattr(writer, name)
+
+    def submit(self, db_path: Path, func: Callable[[sqlite3.Connection], Any], label: str = "write") -> Future:
+        """
+        Queue a mutation for db_path.
+
+        Args:
+            db_path: Database file
+            func: Callable taking the writer's sqlite3.Connection; must not commit
+            label: Short name for logs and slow-batch warnings
+
+        Returns:
+            Future resolved with func's return value once the batch has committed
+        """
+        mutation = _Mutation(func, label)
+        active = getattr(_local, "active", None)
+        if active is not None and active[0] == str(db_path):
+            # Nested write from inside a mutation on the same database: run in the current transaction
+            ok, value = DatabaseWriter._run_mutation(active[1], mutation)
+            if ok:
+                mutation.future.set_result(value)
+            else:
+                mutation.future.set_exception(value)
+            return mutation.future
+        while True:
+            writer = self._writer_for(db_path)
+            with writer.cond:
+                # A writer that already retired won't look at its queue again
+                if not writer.retired:
+                    writer.queue.append(mutation)
+                    writer.cond.notify()
+                    return mutation.future
+
+    def run(self, db_path: Path, func: Callable[[sqlite3.Connection], Any], label: str = "write") -> Any:
+        """Queue a mutation and wait for it to commit. Returns func's result or raises its exception."""
+        return self.submit(db_path, func, label).result()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop all writers after their queued mutations have been written."""
+        with self.lock:
+            writers = list(self.writers.values())
+        for writer in writers:
+            with writer.cond:
+                writer.stopped = True
+                writer.cond.notify()
+        for writer in writers:
+            if writer.thread is not None:
+                writer.thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-database writer metrics (active writers plus totals of retired ones)."""
+        with self.lock:
+            writers = dict(self.writers)
+            retired = {key: dict(totals) for key, totals in self.retired_totals.items()}
+        stats = {}
+        for key, writer in writers.items():
+            stats[key] = writer.get_stats()
+            stats[key]["active"] = True
+        for key, totals in retired.items():
+            entry = stats.setdefault(key, {"active": False})
+            for name, value in totals.items():
+                entry[name] = entry.get(name, 0) + value
+        return stats
+
+
+# Global registry instance
+db_writer = WriterRegistry()
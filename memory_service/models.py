@@ -57,6 +57,7 @@ class Chunk:
     text: str
     start_char: int
     end_char: int
+    canonical_chunk_id: Optional[int] = None  # Set when this chunk is a near-duplicate of another (not embedded)
 
 
 @dataclass
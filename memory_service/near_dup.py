@@ -0,0 +1,180 @@
+"""
+Near-duplicate chunk detection with MinHash + LSH.
+
+Versioned docs, exported reports and email threads contain large amounts of
+near-identical text. Embedding every copy inflates the ANN index and crowds
+search results with clones. At index time each chunk gets a MinHash signature;
+LSH band hashes (stored per source DB) find candidate matches among already
+indexed canonical chunks, and the estimated Jaccard similarity decides whether
+the new chunk is linked to an existing canonical chunk instead of embedded.
+
+Signatures are deterministic (fixed seed) so they stay comparable across
+process restarts.
+"""
+import hashlib
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# MinHash parameters: 64 permutations split into 16 bands of 4 rows.
+# Candidate pairs are found down to ~0.5 Jaccard ((1/16)^(1/4)); the
+# per-source threshold is then applied to the estimated similarity.
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+# Word n-gram size used for shingling
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _shingles(text: str) -> List[str]:
+    """Lowercased word n-grams (falls back to single words for very short text)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return words
+    return [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+
+def compute_minhash(text: str) -> Optional[np.ndarray]:
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        uint32 array of shape [NUM_PERM], or None if the text has no words
+        (such texts have no shingles to compare and are never near-duplicates)
+    """
+    shingles = set(_shingles(text))
+    if not shingles:
+        return None
+
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    # (a * x + b) mod p for every permutation/shingle pair, then min per permutation.
+    # a, b < 2^31 and x < 2^32, so a * x + b fits in uint64.
+    permuted = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) % _MERSENNE_PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def lsh_band_hashes(signature: np.ndarray) -> List[int]:
+    """
+    Compute one LSH bucket key per band.
+
+    The band number is mixed into the hash, so keys from different bands never
+    collide and a single indexed column is enough for lookups.
+
+    Args:
+        signature: MinHash signature from compute_minhash()
+
+    Returns:
+        List of LSH_BANDS signed 64-bit ints (SQLite INTEGER range)
+    """
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimate Jaccard similarity from two MinHash signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    """Serialize a signature for storage."""
+    return signature.astype(np.uint32).tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    """Deserialize a stored signature."""
+    return np.frombuffer(data, dtype=np.uint32)
+
+
+def find_best_match(
+    signature: np.ndarray,
+    candidates: Sequence[Tuple[int, np.ndarray]],
+    threshold: float,
+) -> Optional[Tuple[int, float]]:
+    """
+    Pick the most similar candidate at or above threshold.
+
+    Args:
+        signature: Signature of the new chunk
+        candidates: (chunk_id, signature) pairs sharing at least one LSH band
+        threshold: Minimum estimated Jaccard similarity
+
+    Returns:
+        (chunk_id, similarity) of the best match, or None
+    """
+    best = None
+    for chunk_id, candidate_sig in candidates:
+        similarity = estimate_jaccard(signature, candidate_sig)
+        if similarity >= threshold and (best is None or similarity > best[1]):
+            best = (chunk_id, similarity)
+    return best
+
+
+class NearDuplicateCollapser:
+    """
+    Incrementally collapse near-duplicate texts, keeping the first copy.
+
+    Used at search time to collapse clones that survived indexing (e.g. across
+    sources, or indexed before near-dup suppression existed). Texts are fed in
+    rank order, so the highest-ranked copy is kept.
+
+    Each text carries the threshold of its source. Two texts are duplicates
+    if their similarity reaches both thresholds; a text with threshold 0
+    (suppression disabled for its source) is never collapsed or collapsed into.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold  # Used for texts added without their own threshold
+        self._kept = {}  # key -> (signature, threshold)
+        self._buckets = {}  # band_hash -> [key]
+
+    def find_duplicate(self, key, text: str, threshold: Optional[float] = None):
+        """
+        Check a text against the texts kept so far.
+
+        Args:
+            key: Identifier for this text (e.g. result position)
+            text: Text to check
+            threshold: Threshold of the text's source (None = the collapser's threshold, 0 = disabled)
+
+        Returns:
+            Key of the kept text this one duplicates, or None (the text is then kept)
+        """
+        threshold = self.threshold if threshold is None else threshold
+        if threshold <= 0:
+            return None
+        signature = compute_minhash(text)
+        if signature is None:
+            return None
+        band_hashes = lsh_band_hashes(signature)
+        best = None
+        for k in {k for band_hash in band_hashes for k in self._buckets.get(band_hash, ())}:
+            kept_signature, kept_threshold = self._kept[k]
+            similarity = estimate_jaccard(signature, kept_signature)
+            if similarity >= max(threshold, kept_threshold) and (best is None or similarity > best[1]):
+                best = (k, similarity)
+        if best is not None:
+            return best[0]
+        self._kept[key] = (signature, threshold)
+        for band_hash in band_hashes:
+            self._buckets.setdefault(band_hash, []).append(key)
+        return None
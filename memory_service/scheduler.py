@@ -0,0 +1,351 @@
+"""
+Single scheduler for all indexing work in the Memory Service.
+
+Live chat indexing, watcher deltas and bulk source (re)indexing used to run on
+separate thread pools and ad-hoc threads, contending blindly for CPU, the
+embedding model and SQLite. All of them now submit tasks to one fixed pool of
+worker threads:
+
+- Priority lanes: CHAT > WATCHER > BULK. A free worker always takes the
+  highest-priority runnable task.
+- Lane caps: WATCHER and BULK may only use part of the pool, so there is
+  always a worker left for chat indexing.
+- Per-source caps: at most INDEX_MAX_PER_SOURCE tasks of one source run at
+  the same time (across all lanes).
+- Fair sharing: within a lane, tasks are queued per fair key (the project, or
+  the source) and keys are served round-robin, so one busy project cannot
+  starve the others.
+
+Long bulk tasks call yield_to_higher_lanes() between files so that chat work
+queued behind them gets the model first.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from memory_service.watch_queue import WATCH_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SCHEDULER_WORKERS = int(os.getenv("INDEX_SCHEDULER_WORKERS", "4"))  # Total worker threads (all lanes)
+BULK_WORKERS = int(os.getenv("INDEX_BULK_WORKERS", "1"))  # Max concurrent bulk (re)index tasks
+MAX_PER_SOURCE = int(os.getenv("INDEX_MAX_PER_SOURCE", "2"))  # Max concurrent tasks per source
+BULK_YIELD_MAX_WAIT = float(os.getenv("INDEX_BULK_YIELD_MAX_WAIT", "5.0"))  # Max pause per yield point (seconds)
+WAIT_SAMPLES = 1000  # Recent wait times kept per lane for percentiles
+
+
+class Lane(IntEnum):
+    """Priority lanes (lower value = higher priority)."""
+    CHAT = 0
+    WATCHER = 1
+    BULK = 2
+
+
+@dataclass
+class ScheduledTask:
+    """A unit of work queued in a lane."""
+    lane: Lane
+    func: Callable
+    args: tuple
+    kwargs: dict
+    fair_key: str
+    source_id: Optional[str]
+    label: str
+    future: Future = field(default_factory=Future)
+    submit_time: float = field(default_factory=time.monotonic)
+
+
+class _LaneState:
+    """Queues and counters for one lane."""
+
+    def __init__(self, lane: Lane, max_workers: int):
+        self.lane = lane
+        self.max_workers = max(1, max_workers)
+        # fair_key -> tasks; key order is the round-robin order
+        self.queues: "OrderedDict[str, Deque[ScheduledTask]]" = OrderedDict()
+        self.depth = 0
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+
+class LaneExecutor(Executor):
+    """concurrent.futures.Executor view of one lane (used by the watcher queue)."""
+
+    def __init__(self, scheduler: "IndexingScheduler", lane: Lane, source_id: Optional[str] = None,
+                 fair_key: Optional[str] = None, label: Optional[str] = None):
+        self.scheduler = scheduler
+        self.lane = lane
+        self.source_id = source_id
+        self.fair_key = fair_key
+        self.label = label
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return self.scheduler.submit(
+            self.lane, fn, *args,
+            source_id=self.source_id, fair_key=self.fair_key, label=self.label, **kwargs
+        )
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        # The scheduler is shared; it is stopped on service shutdown, not per lane view
+        pass
+
+
+class IndexingScheduler:
+    """Fixed worker pool with priority lanes, per-source caps and fair sharing."""
+
+    def __init__(
+        self,
+        num_workers: int = SCHEDULER_WORKERS,
+        lane_limits: Optional[Dict[Lane, int]] = None,
+        max_per_source: int = MAX_PER_SOURCE,
+    ):
+        self.num_workers = max(1, num_workers)
+        limits = {
+            Lane.CHAT: self.num_workers,
+            # Lower lanes never take the whole pool, so chat work always has a worker
+            Lane.WATCHER: min(WATCH_WORKERS, max(1, self.num_workers - 1)),
+            Lane.BULK: min(BULK_WORKERS, max(1, self.num_workers - 1)),
+        }
+        limits.update(lane_limits or {})
+        self.lanes: Dict[Lane, _LaneState] = {lane: _LaneState(lane, limits[lane]) for lane in Lane}
+        self.max_per_source = max(1, max_per_source)
+        self.running_per_source: Dict[str, int] = {}
+        self.cond = threading.Condition()
+        self.workers: List[threading.Thread] = []
+        self.running = False
+
+    def start(self):
+        """Start the worker threads."""
+        with self.cond:
+            if self.running:
+                return
+            self.running = True
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"IndexScheduler-{i+1}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        limits = ", ".join(f"{s.lane.name.lower()}={s.max_workers}" for s in self.lanes.values())
+        logger.info(f"[SCHEDULER] Started {self.num_workers} workers (lane caps: {limits}, per-source cap: {self.max_per_source})")
+
+    def stop(self):
+        """Stop the workers. Queued tasks are cancelled; running tasks finish in the background."""
+        with self.cond:
+            self.running = False
+            cancelled = 0
+            for state in self.lanes.values():
+                for tasks in state.queues.values():
+                    for task in tasks:
+                        task.future.cancel()
+                        cancelled += 1
+                state.queues.clear()
+                state.depth = 0
+            self.cond.notify_all()
+        self.workers = []
+        logger.info(f"[SCHEDULER] Stopped ({cancelled} queued tasks cancelled)")
+
+    def submit(self, lane: Lane, func: Callable, *args, source_id: Optional[str] = None,
+               fair_key: Optional[str] = None, label: Optional[str] = None, **kwargs) -> Future:
+        """
+        Queue a task.
+
+        Args:
+            lane: Priority lane
+            func: Callable to run on a worker thread
+            source_id: Source the task touches (for the per-source cap)
+            fair_key: Round-robin key within the lane (defaults to source_id)
+            label: Short description for logs
+
+        Returns:
+            Future with the task's result
+
+        Raises:
+            RuntimeError: If the scheduler is not running
+        """
+        task = ScheduledTask(
+            lane=lane,
+            func=func,
+            args=args,
+            kwargs=kwargs,
+            fair_key=fair_key or source_id or "default",
+            source_id=source_id,
+            label=label or getattr(func, "__name__", "task"),
+        )
+        with self.cond:
+            if not self.running:
+                raise RuntimeError("Indexing scheduler is not running")
+            state = self.lanes[lane]
+            state.queues.setdefault(task.fair_key, deque()).append(task)
+            state.depth += 1
+            state.submitted += 1
+            self.cond.notify()
+        return task.future
+
+    def executor(self, lane: Lane, source_id: Optional[str] = None, fair_key: Optional[str] = None,
+                 label: Optional[str] = None) -> LaneExecutor:
+        """Get an Executor that submits into a lane."""
+        return LaneExecutor(self, lane, source_id=source_id, fair_key=fair_key, label=label)
+
+    def yield_if_busy(self, lane: Lane, max_wait: float = BULK_YIELD_MAX_WAIT) -> float:
+        """
+        Pause a long-running task while higher-priority lanes have queued work.
+
+        Called between units of work (e.g. files of a bulk reindex). Returns as
+        soon as the higher lanes have no runnable queued task, or after max_wait
+        seconds. Tasks blocked by their source cap (possibly held by the caller)
+        are not waited for.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        deadline = start + max_wait
+        with self.cond:
+            while self.running and any(self._has_runnable(higher) for higher in Lane if higher < lane):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.cond.wait(timeout=min(remaining, 0.1))
+        return time.monotonic() - start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-lane queue depth, running count and wait times."""
+        now = time.monotonic()
+        with self.cond:
+            lanes = {}
+            for state in self.lanes.values():
+                waits = sorted(state.waits)
+                oldest = min((tasks[0].submit_time for tasks in state.queues.values() if tasks), default=None)
+                lanes[state.lane.name.lower()] = {
+                    "depth": state.depth,
+                    "running": state.running,
+                    "max_workers": state.max_workers,
+                    "submitted": state.submitted,
+                    "completed": state.completed,
+                    "failed": state.failed,
+                    "queued_keys": len(state.queues),
+                    "avg_wait_ms": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                    "p95_wait_ms": round(1000 * waits[int(0.95 * (len(waits) - 1))], 1) if waits else 0.0,
+                    "max_wait_ms": round(1000 * waits[-1], 1) if waits else 0.0,
+                    "oldest_queued_ms": round(1000 * (now - oldest), 1) if oldest is not None else 0.0,
+                }
+            return {
+                "workers": self.num_workers,
+                "max_per_source": self.max_per_source,
+                "running_per_source": dict(self.running_per_source),
+                "lanes": lanes,
+            }
+
+    def _has_runnable(self, lane: Lane) -> bool:
+        """True if the lane has a queued task not blocked by its source cap (caller holds self.cond)."""
+        for tasks in self.lanes[lane].queues.values():
+            source_id = tasks[0].source_id
+            if not source_id or self.running_per_source.get(source_id, 0) < self.max_per_source:
+                return True
+        return False
+
+    def _next_task(self) -> Optional[ScheduledTask]:
+        """Pick the next runnable task (caller holds self.cond)."""
+        for lane in Lane:
+            state = self.lanes[lane]
+            if state.depth == 0 or state.running >= state.max_workers:
+                continue
+            for key in list(state.queues.keys()):
+                tasks = state.queues[key]
+                task = tasks[0]
+                if task.source_id and self.running_per_source.get(task.source_id, 0) >= self.max_per_source:
+                    continue
+                tasks.popleft()
+                # Served keys go to the back of the round-robin order
+                del state.queues[key]
+                if tasks:
+                    state.queues[key] = tasks
+                state.depth -= 1
+                return task
+        return None
+
+    def _worker_loop(self):
+        """Worker thread main loop."""
+        while True:
+            with self.cond:
+                task = None
+                while self.running:
+                    task = self._next_task()
+                    if task is not None:
+                        break
+                    self.cond.wait()
+                if task is None:
+                    return
+                state = self.lanes[task.lane]
+                state.running += 1
+                state.waits.append(time.monotonic() - task.submit_time)
+                if task.source_id:
+                    self.running_per_source[task.source_id] = self.running_per_source.get(task.source_id, 0) + 1
+
+            failed = False
+            if task.future.set_running_or_notify_cancel():
+                _current.scheduler, _current.lane = self, task.lane
+                try:
+                    task.future.set_result(task.func(*task.args, **task.kwargs))
+                except BaseException as e:
+                    failed = True
+                    logger.error(f"[SCHEDULER] {task.lane.name.lower()} task {task.label} failed: {e}", exc_info=True)
+                    task.future.set_exception(e)
+                finally:
+                    _current.scheduler, _current.lane = None, None
+
+            with self.cond:
+                state.running -= 1
+                state.completed += 1
+                if failed:
+                    state.failed += 1
+                if task.source_id:
+                    remaining = self.running_per_source.get(task.source_id, 1) - 1
+                    if remaining > 0:
+                        self.running_per_source[task.source_id] = remaining
+                    else:
+                        self.running_per_source.pop(task.source_id, None)
+                self.cond.notify_all()
+
+
+# Global scheduler instance
+_scheduler: Optional[IndexingScheduler] = None
+_scheduler_lock = threading.Lock()
+
+# Lane of the task running on the current worker thread
+_current = threading.local()
+
+
+def get_scheduler() -> IndexingScheduler:
+    """Get or create (and start) the global indexing scheduler."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = IndexingScheduler()
+            _scheduler.start()
+        return _scheduler
+
+
+def yield_to_higher_lanes(max_wait: float = BULK_YIELD_MAX_WAIT) -> float:
+    """
+    Yield point for long tasks: pause while higher-priority lanes have queued work.
+
+    No-op when not called from a scheduler worker (e.g. scripts calling index_source directly).
+
+    Returns:
+        Seconds spent waiting
+    """
+    scheduler = getattr(_current, "scheduler", None)
+    lane = getattr(_current, "lane", None)
+    if scheduler is None or lane is None or lane == Lane.CHAT:
+        return 0.0
+    return scheduler.yield_if_busy(lane, max_wait=max_wait)
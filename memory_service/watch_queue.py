@@ -0,0 +1,218 @@
+"""
+Debounced, coalescing event queue for the filesystem watcher.
+
+An editor save emits several events and a `git checkout` emits thousands.
+Instead of indexing inside the watchdog observer thread for every event,
+events are recorded per path and only dispatched once the path has been
+quiet for the debounce period. Repeated create/modify/delete events for the
+same path collapse into a single pending action (last event wins), and
+dispatched actions run on the given executor (the indexing scheduler's
+WATCHER lane).
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+WATCH_DEBOUNCE_SECONDS = float(os.getenv("WATCH_DEBOUNCE_SECONDS", "1.5"))  # Quiet period per path
+WATCH_WORKERS = int(os.getenv("WATCH_WORKERS", "2"))  # Max concurrent watcher tasks (scheduler WATCHER lane cap)
+WATCH_MAX_PENDING = int(os.getenv("WATCH_MAX_PENDING", "50000"))  # Pending paths per source before dropping
+
+
+class FileAction(Enum):
+    """Action to take for a path once it is quiet."""
+    INDEX = "index"
+    DELETE = "delete"
+
+
+@dataclass
+class PendingEvent:
+    """Coalesced state for one path."""
+    path: Path
+    action: FileAction
+    first_seen: float
+    last_seen: float
+    event_count: int = 1
+
+
+class CoalescingEventQueue:
+    """Per-source queue that debounces and coalesces watcher events by path."""
+
+    def __init__(
+        self,
+        source_id: str,
+        process_func: Callable[[Path, FileAction], None],
+        executor: Executor,
+        debounce_seconds: float = WATCH_DEBOUNCE_SECONDS,
+        max_in_flight: int = WATCH_WORKERS,
+        max_pending: int = WATCH_MAX_PENDING,
+    ):
+        self.source_id = source_id
+        self.process_func = process_func
+        self.executor = executor
+        self.debounce_seconds = debounce_seconds
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_pending = max_pending
+
+        # path -> PendingEvent, ordered by last_seen (oldest first)
+        self.pending: "OrderedDict[Path, PendingEvent]" = OrderedDict()
+        self.in_flight: set = set()
+        self.cond = threading.Condition()
+        self.running = False
+        self.dispatcher: Optional[threading.Thread] = None
+
+        # Counters
+        self.events_received = 0
+        self.events_merged = 0
+        self.events_dropped = 0
+        self.dispatched = 0
+        self.completed = 0
+        self.errors = 0
+
+    def start(self):
+        """Start the dispatcher thread."""
+        with self.cond:
+            if self.running:
+                return
+            self.running = True
+        self.dispatcher = threading.Thread(
+            target=self._dispatch_loop,
+            name=f"WatchDispatcher-{self.source_id}",
+            daemon=True
+        )
+        self.dispatcher.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the dispatcher thread. Pending (not yet dispatched) events are discarded."""
+        with self.cond:
+            self.running = False
+            discarded = len(self.pending)
+            self.pending.clear()
+            self.cond.notify_all()
+        if self.dispatcher:
+            self.dispatcher.join(timeout=timeout)
+        if discarded:
+            logger.info(f"[WATCH-QUEUE] Discarded {discarded} pending events for {self.source_id} on stop")
+
+    def push(self, path: Path, action: FileAction):
+        """
+        Record a watcher event for a path (called from the observer thread; never blocks on indexing).
+
+        Args:
+            path: File path
+            action: FileAction.INDEX for create/modify, FileAction.DELETE for delete
+        """
+        now = time.monotonic()
+        with self.cond:
+            self.events_received += 1
+            existing = self.pending.get(path)
+            if existing is not None:
+                # Collapse: the latest event decides the action, the quiet period restarts
+                existing.action = action
+                existing.last_seen = now
+                existing.event_count += 1
+                self.pending.move_to_end(path)
+                self.events_merged += 1
+                return
+
+            if len(self.pending) >= self.max_pending:
+                self.events_dropped += 1
+                if self.events_dropped == 1 or self.events_dropped % 1000 == 0:
+                    logger.warning(
+                        f"[WATCH-QUEUE] Pending queue full for {self.source_id} "
+                        f"({self.max_pending} paths), dropped {self.events_dropped} events; reindex the source to catch up"
+                    )
+                return
+
+            self.pending[path] = PendingEvent(path=path, action=action, first_seen=now, last_seen=now)
+            self.cond.notify()
+
+    def note_dropped(self):
+        """Count an event ignored before queueing (directory, ignored path, filtered out)."""
+        with self.cond:
+            self.events_received += 1
+            self.events_dropped += 1
+
+    def get_stats(self) -> Dict:
+        """Get queue depth and counters."""
+        with self.cond:
+            return {
+                "source_id": self.source_id,
+                "depth": len(self.pending),
+                "in_flight": len(self.in_flight),
+                "events_received": self.events_received,
+                "events_merged": self.events_merged,
+                "events_dropped": self.events_dropped,
+                "dispatched": self.dispatched,
+                "completed": self.completed,
+                "errors": self.errors,
+                "debounce_seconds": self.debounce_seconds,
+            }
+
+    def _dispatch_loop(self):
+        """Dispatch paths that have been quiet for debounce_seconds to the worker pool."""
+        while True:
+            with self.cond:
+                if not self.running:
+                    return
+                ready = []
+                wait_for = None
+                now = time.monotonic()
+                for path, event in self.pending.items():
+                    due = event.last_seen + self.debounce_seconds
+                    if due > now:
+                        # Ordered by last_seen: everything after this is also not due yet
+                        wait_for = due - now
+                        break
+                    if len(self.in_flight) + len(ready) >= self.max_in_flight:
+                        break
+                    if path in self.in_flight:
+                        # Keep coalescing; dispatch after the running action finishes
+                        continue
+                    ready.append(event)
+
+                for event in ready:
+                    del self.pending[event.path]
+                    self.in_flight.add(event.path)
+                    self.dispatched += 1
+
+                if not ready:
+                    self.cond.wait(timeout=wait_for if wait_for is not None else self.debounce_seconds)
+                    continue
+
+            for event in ready:
+                try:
+                    self.executor.submit(self._run, event)
+                except RuntimeError as e:
+                    # Executor shut down
+                    logger.warning(f"[WATCH-QUEUE] Could not dispatch {event.path}: {e}")
+                    with self.cond:
+                        self.in_flight.discard(event.path)
+
+    def _run(self, event: PendingEvent):
+        """Run one coalesced action on a worker thread."""
+        try:
+            if event.event_count > 1:
+                logger.debug(
+                    f"[WATCH-QUEUE] Coalesced {event.event_count} events into {event.action.value}: {event.path}"
+                )
+            self.process_func(event.path, event.action)
+            with self.cond:
+                self.completed += 1
+        except Exception as e:
+            with self.cond:
+                self.errors += 1
+            logger.error(f"[WATCH-QUEUE] Failed to {event.action.value} {event.path}: {e}", exc_info=True)
+        finally:
+            with self.cond:
+                self.in_flight.discard(event.path)
+                self.cond.notify()
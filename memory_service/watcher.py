@@ -7,11 +7,14 @@ import logging
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
-from typing import Dict
+from typing import Dict, Optional
+from concurrent.futures import Executor
 
 from memory_service.config import load_sources
 from memory_service.memory_dashboard import db
 from memory_service.indexer import index_file, delete_file, should_index_file
+from memory_service.watch_queue import CoalescingEventQueue, FileAction, WATCH_WORKERS
+from memory_service.scheduler import Lane, get_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -51,52 +54,72 @@ def _should_ignore_path(path: str) -> bool:
 
 
 class IndexingHandler(FileSystemEventHandler):
-    """Handler for file system events that triggers indexing."""
+    """
+    Handler for file system events that triggers indexing.
     
-    def __init__(self, source_db_id: int, source_id: str, root_path: Path, include_glob: str, exclude_glob: str):
+    Events are pushed into a per-source CoalescingEventQueue (debounced by path)
+    instead of indexing inside the observer thread; the queue feeds the WATCHER
+    lane of the indexing scheduler.
+    """
+    
+    def __init__(self, source_db_id: int, source_id: str, root_path: Path, include_glob: str, exclude_glob: str,
+                 near_dup_threshold: Optional[float] = None, executor: Optional[Executor] = None):
         self.source_db_id = source_db_id
         self.source_id = source_id
         self.root_path = root_path
         self.include_glob = include_glob
         self.exclude_glob = exclude_glob
+        self.near_dup_threshold = near_dup_threshold
+        if executor is None:
+            executor = get_scheduler().executor(Lane.WATCHER, source_id=source_id, label=f"watch:{source_id}")
+        self.event_queue = CoalescingEventQueue(source_id, self._process, executor)
     
-    def on_created(self, event: FileSystemEvent):
-        """Handle file creation."""
-        if event.is_directory:
+    def _push(self, src_path: str, action: FileAction):
+        """Queue an event for a path (or count it as dropped if it is filtered out)."""
+        if _should_ignore_path(src_path):
+            self.event_queue.note_dropped()
             return
         
-        if _should_ignore_path(event.src_path):
+        path = Path(src_path)
+        if action == FileAction.INDEX and not should_index_file(path, self.include_glob, self.exclude_glob):
+            self.event_queue.note_dropped()
             return
         
-        path = Path(event.src_path)
-        if should_index_file(path, self.include_glob, self.exclude_glob):
-            logger.info(f"File created, indexing: {path}")
-            index_file(path, self.source_db_id, self.source_id)
+        self.event_queue.push(path, action)
+    
+    def _process(self, path: Path, action: FileAction):
+        """Apply a coalesced action on a worker thread."""
+        if action == FileAction.INDEX and path.exists():
+            logger.info(f"File changed, indexing: {path}")
+            index_file(path, self.source_db_id, self.source_id, near_dup_threshold=self.near_dup_threshold)
+        else:
+            logger.info(f"File deleted, removing from index: {path}")
+            delete_file(path, self.source_db_id, self.source_id, near_dup_threshold=self.near_dup_threshold)
+    
+    def on_created(self, event: FileSystemEvent):
+        """Handle file creation."""
+        if event.is_directory:
+            return
+        self._push(event.src_path, FileAction.INDEX)
     
     def on_modified(self, event: FileSystemEvent):
         """Handle file modification."""
         if event.is_directory:
             return
-        
-        if _should_ignore_path(event.src_path):
-            return
-        
-        path = Path(event.src_path)
-        if should_index_file(path, self.include_glob, self.exclude_glob):
-            logger.info(f"File modified, re-indexing: {path}")
-            index_file(path, self.source_db_id, self.source_id)
+        self._push(event.src_path, FileAction.INDEX)
     
     def on_deleted(self, event: FileSystemEvent):
         """Handle file deletion."""
         if event.is_directory:
             return
-        
-        if _should_ignore_path(event.src_path):
+        self._push(event.src_path, FileAction.DELETE)
+    
+    def on_moved(self, event: FileSystemEvent):
+        """Handle file rename/move (delete old path, index new path)."""
+        if event.is_directory:
             return
-        
-        path = Path(event.src_path)
-        logger.info(f"File deleted, removing from index: {path}")
-        delete_file(path, self.source_db_id, self.source_id)
+        self._push(event.src_path, FileAction.DELETE)
+        self._push(event.dest_path, FileAction.INDEX)
 
 
 class WatcherManager:
@@ -104,6 +127,7 @@ class WatcherManager:
     
     def __init__(self):
         self.observers: Dict[str, Observer] = {}
+        self.handlers: Dict[str, IndexingHandler] = {}
     
     def start_all(self):
         """Start watching all configured sources."""
@@ -121,10 +145,11 @@ class WatcherManager:
             
             # Start watching
             self.start_watching(source_config.id, db_id, source_config.root_path, 
-                              source_config.include_glob, source_config.exclude_glob)
+                              source_config.include_glob, source_config.exclude_glob,
+                              near_dup_threshold=source_config.near_dup_threshold)
     
     def start_watching(self, source_id: str, db_id: int, root_path: Path, 
-                      include_glob: str, exclude_glob: str):
+                      include_glob: str, exclude_glob: str, near_dup_threshold: Optional[float] = None):
         """Start watching a specific source."""
         if not root_path.exists():
             logger.warning(f"Source root path does not exist, skipping watch: {root_path}")
@@ -135,11 +160,14 @@ class WatcherManager:
             return
         
         observer = Observer()
-        handler = IndexingHandler(db_id, source_id, root_path, include_glob, exclude_glob)
+        handler = IndexingHandler(db_id, source_id, root_path, include_glob, exclude_glob,
+                                  near_dup_threshold)
+        handler.event_queue.start()
         observer.schedule(handler, str(root_path), recursive=True)
         observer.start()
         
         self.observers[source_id] = observer
+        self.handlers[source_id] = handler
         logger.info(f"Started watching source: {source_id} at {root_path}")
     
     def add_source_watch(self, source):
@@ -162,7 +190,8 @@ class WatcherManager:
             db_id,
             source.root_path,
             source.include_glob,
-            source.exclude_glob
+            source.exclude_glob,
+            near_dup_threshold=getattr(source, "near_dup_threshold", None)
         )
     
     def stop_watching(self, source_id: str):
@@ -175,6 +204,9 @@ class WatcherManager:
         observer.stop()
         observer.join()
         del self.observers[source_id]
+        handler = self.handlers.pop(source_id, None)
+        if handler:
+            handler.event_queue.stop()
         logger.info(f"Stopped watching source: {source_id}")
     
     def stop_all(self):
@@ -182,7 +214,20 @@ class WatcherManager:
         for source_id, observer in self.observers.items():
             observer.stop()
             observer.join()
+            handler = self.handlers.get(source_id)
+            if handler:
+                handler.event_queue.stop()
             logger.info(f"Stopped watching source: {source_id}")
         
         self.observers.clear()
+        self.handlers.clear()
+    
+    def get_queue_stats(self) -> Dict:
+        """Get per-source event queue depth and drop/merge counters."""
+        sources = [handler.event_queue.get_stats() for handler in self.handlers.values()]
+        return {
+            "workers": WATCH_WORKERS,
+            "total_depth": sum(s["depth"] for s in sources),
+            "sources": sources,
+        }
 
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: write-lock hold time of apply_facts_ops for bulk ranked-list messages.
+
+Times the mutation apply_facts_ops runs on the project facts database's writer, i.e.
+the time spent inside BEGIN IMMEDIATE (commit excluded), for:
+
+- append:  N unranked appends (rank=None), "my favorite X are a, b, c, ..."
+- ranked:  N explicit ranks 1..N, "my top N X are ...", on top of an existing list
+           (every insert shifts the items below it)
+
+Each scenario also blocks a handful of duplicates. Uses a temporary project facts database.
+
+Usage:
+    python scripts/bench_apply_facts_ops.py --sizes 50 500 --existing 20
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_service.memory_dashboard import db
+from server.contracts.facts_ops import FactsOp, FactsOpsResponse
+from server.services import facts_apply
+
+LIST_KEY = "user.favorites.movie"
+
+
+def timed_run_write(timings):
+    """Wrap db.run_facts_write so the time spent inside each mutation is recorded."""
+    run_write = db.run_facts_write
+
+    def _run_write(source_id, func, project_id=None, label="write"):
+        def _timed(conn):
+            start = time.perf_counter()
+            try:
+                return func(conn)
+            finally:
+                if label == "apply_facts_ops":
+                    timings.append(1000.0 * (time.perf_counter() - start))
+        return run_write(source_id, _timed, project_id=project_id, label=label)
+    return _run_write
+
+
+def apply(project_id, values, ranked):
+    ops = [
+        FactsOp(op="ranked_list_set", list_key=LIST_KEY, value=value, rank=(rank if ranked else None))
+        for rank, value in enumerate(values, 1)
+    ]
+    result = facts_apply.apply_facts_ops(project_id, str(uuid.uuid4()), FactsOpsResponse(ops=ops))
+    assert not result.errors, result.errors
+    return result
+
+
+def run_scenario(size, existing, ranked, repeats, timings):
+    samples = []
+    for _ in range(repeats):
+        project_id = str(uuid.uuid4())
+        db.init_facts_db(f"project-{project_id}", project_id=project_id)
+        if existing:
+            apply(project_id, [f"Classic {i:04d}" for i in range(existing)], ranked=False)
+        values = [f"Film {i:04d}" for i in range(size)]
+        values += values[:5]  # Duplicates within the message
+        timings.clear()
+        apply(project_id, values, ranked)
+        samples.append(timings[-1])
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure apply_facts_ops lock hold time for bulk ranked lists")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500], help="Items per message (default: 50 500)")
+    parser.add_argument("--existing", type=int, default=20, help="Items already in the list (default: 20)")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per measurement, median reported (default: 5)")
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="bench_apply_"))
+    db.get_db_path_for_source = lambda source_id, project_id=None: tmp_dir / source_id / "index.sqlite"
+    timings = []
+    db.run_facts_write = timed_run_write(timings)
+
+    print(f"{'items':>6} {'append ms':>10} {'ranked ms':>10}")
+    for size in args.sizes:
+        append_ms = run_scenario(size, args.existing, False, args.repeats, timings)
+        ranked_ms = run_scenario(size, args.existing, True, args.repeats, timings)
+        print(f"{size:>6} {append_ms:10.1f} {ranked_ms:10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
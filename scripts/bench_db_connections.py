@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-call overhead of get_db_connection() and init_db().
+
+Compares a fresh connection per call (the old behaviour) against the pooled
+connection, and a full schema/migration pass against the cached init_db().
+Runs against a temporary database, so no real index is touched.
+
+Usage:
+    python scripts/bench_db_connections.py --iterations 2000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_service.memory_dashboard import db
+from memory_service.memory_dashboard.connection_pool import open_connection
+
+
+def timed(label: str, iterations: int, func):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {1e6 * elapsed / iterations:9.1f} µs/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure SQLite connection and schema-init overhead per call")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per measurement (default: 2000)")
+    args = parser.parse_args()
+    n = args.iterations
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="bench_db_"))
+    db_path = tmp_dir / "index.sqlite"
+    db.get_db_path_for_source = lambda source_id, project_id=None: db_path
+    source_id = "project-bench"
+
+    db.init_db(source_id, project_id="bench")
+
+    def fresh_connection():
+        conn = open_connection(db_path)
+        conn.execute("SELECT 1").fetchone()
+        conn.close()
+
+    def pooled_connection():
+        conn = db.get_db_connection(source_id, project_id="bench")
+        conn.execute("SELECT 1").fetchone()
+        conn.close()
+
+    def full_schema_pass():
+        db._create_schema(source_id, project_id="bench")
+
+    def cached_init_db():
+        db.init_db(source_id, project_id="bench")
+
+    print(f"Database: {db_path}")
+    timed("connection: fresh per call", n, fresh_connection)
+    timed("connection: pooled", n, pooled_connection)
+    timed("init_db: full schema/migrations", max(1, n // 10), full_schema_pass)
+    timed("init_db: cached", n, cached_init_db)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: current-fact queries on a project with a long update history.
+
+Fills a temporary project with --keys facts, each updated --versions times
+(every update supersedes the previous version the way store_project_fact
+does), then times the current-state reads: get_current_fact(),
+search_current_facts() and get_ranked_list_keys(), plus the project_facts
+row count and facts.sqlite size.
+
+Usage:
+    python scripts/bench_fact_history.py --keys 2000 --versions 1 20
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_service.memory_dashboard import db
+
+
+def populate(project_id: str, keys: int, versions: int):
+    source_id = f"project-{project_id}"
+    base = datetime(2024, 1, 1)
+
+    def _write(conn):
+        for version in range(versions):
+            conn.execute("UPDATE project_facts SET is_current = 0 WHERE project_id = ? AND is_current = 1",
+                         (project_id,))
+            at = base + timedelta(minutes=version)
+            conn.executemany("""
+                INSERT INTO project_facts (fact_id, project_id, fact_key, value_text, value_type,
+                                           source_message_uuid, created_at, effective_at, is_current)
+                VALUES (?, ?, ?, ?, 'string', ?, ?, ?, 1)
+            """, [
+                (str(uuid.uuid4()), project_id,
+                 f"user.favorites.topic{i % 50}.{i // 50 + 1}" if i % 2 else f"user.setting_{i}",
+                 f"value {i} version {version}", str(uuid.uuid4()), at, at)
+                for i in range(keys)
+            ])
+    db.run_facts_write(source_id, _write, project_id=project_id, label="bench_history")
+
+
+def timed(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return 1000.0 * (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure current-fact reads against update history size")
+    parser.add_argument("--keys", type=int, default=2000, help="Distinct fact keys (default: 2000)")
+    parser.add_argument("--versions", type=int, nargs="+", default=[1, 20], help="Versions per key (default: 1 20)")
+    parser.add_argument("--iterations", type=int, default=200, help="Iterations per measurement (default: 200)")
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="bench_history_"))
+    db.get_db_path_for_source = lambda source_id, project_id=None: tmp_dir / source_id / "index.sqlite"
+    rng = random.Random(0)
+
+    print(f"{'versions':>8} {'rows':>8} {'MB':>6} {'current ms':>11} {'search ms':>10} {'list keys ms':>13}")
+    for versions in args.versions:
+        project_id = f"bench{versions}"
+        source_id = f"project-{project_id}"
+        (tmp_dir / source_id).mkdir()
+        db.init_facts_db(source_id, project_id=project_id)
+        populate(project_id, args.keys, versions)
+
+        conn = db.get_facts_db_read_connection(source_id, project_id=project_id)
+        rows = conn.execute("SELECT COUNT(*) FROM project_facts").fetchone()[0]
+        conn.close()
+        size_mb = db.get_facts_db_path(source_id, project_id=project_id).stat().st_size / 1e6
+
+        current_ms = timed(lambda: db.get_current_fact(project_id, f"user.setting_{2 * rng.randrange(args.keys // 2)}"),
+                           args.iterations)
+        search_ms = timed(lambda: db.search_current_facts(project_id, "value version", limit=10), args.iterations)
+        keys_ms = timed(lambda: db.get_ranked_list_keys(project_id), args.iterations)
+        print(f"{versions:>8} {rows:>8} {size_mb:6.1f} {current_ms:11.3f} {search_ms:10.3f} {keys_ms:13.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
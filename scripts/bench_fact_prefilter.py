@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: regex fact-extraction paths over a realistic chat message corpus.
+
+Builds a seeded corpus of user messages, mostly ordinary chat (coding
+questions, planning, small talk, pasted logs), plus about 10% with fact
+cues (favorites, ranked lists, "remember that", ordinal questions). Then
+times each path per message:
+
+- FactExtractor.extract_facts (regex part; spaCy/dateparser/quantulum3 are
+  timed too if installed)
+- FactExtractor._extract_ranked_lists
+- ranked_lists.extract_ranked_lists
+- ordinal_detection.detect_ordinal_or_slice
+
+It also reports how many messages the trigger-word prefilter rejects.
+
+Usage:
+    python scripts/bench_fact_prefilter.py --messages 5000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_service import fact_extractor
+from server.services import ordinal_detection, ranked_lists
+
+PLAIN_TEMPLATES = [
+    "How do I fix this error in {lang}? {error}",
+    "Can you refactor the {thing} so it handles {case}?",
+    "Why does the build fail after upgrading {lib} to {version}?",
+    "Summarize the article about {topic} in three bullet points",
+    "What's the difference between {lib} and {lib2} for {case}?",
+    "Write a unit test for the {thing} that covers {case}",
+    "Thanks, that worked. Now the {thing} returns {error}",
+    "Draft an email to the team about the {topic} schedule for next week",
+    "Is there a faster way to parse {thing} files in {lang}?",
+    "Here is the log:\n{log}\nWhat went wrong?",
+    "Explain how {topic} works like I'm new to it",
+    "Plan a {days} day trip to {place} with a budget of ${budget}",
+    "Translate this paragraph into Spanish: {sentence}",
+    "The deploy at 10:30 failed with exit code {code}, any idea?",
+    "Compare python 3.11 and 3.12 performance for {case}",
+    "ok", "sounds good", "can you continue?", "hmm, that doesn't look right",
+]
+FACT_TEMPLATES = [
+    "My favorite {topic} are {a}, {b}, and {c}",
+    "My #{n} favorite {topic} is {a}",
+    "Remember that my {thing} is {a}",
+    "I love {a}.",
+    "My favorite {topic} is {a}",
+    "What is my second favorite {topic}?",
+    "What are my top {n} favorite {topic}?",
+    "1) {a}, 2) {b}, 3) {c}",
+    "Make {ticker} my #{n} favorite",
+    "I am a {job}.",
+]
+WORDS = {
+    "lang": ["Python", "TypeScript", "Rust", "Go", "SQL"],
+    "error": ["KeyError: 'id'", "TypeError: undefined is not a function", "a 502 from nginx",
+              "segfault in the worker", "None instead of the list"],
+    "thing": ["parser", "upload handler", "cache layer", "config loader", "search endpoint"],
+    "case": ["empty input", "unicode filenames", "concurrent writes", "large files", "timeouts"],
+    "lib": ["FastAPI", "React", "SQLAlchemy", "numpy", "pydantic"],
+    "lib2": ["Flask", "Vue", "Django ORM", "pandas", "attrs"],
+    "version": ["2.0", "18.3", "1.26.4", "3.1"],
+    "topic": ["vector search", "WAL mode", "cryptos", "board games", "vacation spots", "colors"],
+    "place": ["Lisbon", "Kyoto", "Denver", "Oaxaca"],
+    "sentence": ["The meeting moved to Thursday because the room was booked.",
+                 "Please send the report before the end of the day."],
+    "a": ["Azul", "Catan", "blue", "XMR", "Japan", "pizza"],
+    "b": ["Chess", "green", "BTC", "Italy", "tacos"],
+    "c": ["Go", "red", "XLM", "Spain", "sushi"],
+    "ticker": ["XMR", "BTC", "ETH", "SOL"],
+    "job": ["software engineer", "teacher", "nurse"],
+}
+
+
+def build_corpus(n: int, fact_ratio: float, seed: int):
+    rng = random.Random(seed)
+
+    def fill(template):
+        values = {key: rng.choice(options) for key, options in WORDS.items()}
+        values.update(n=rng.randint(1, 5), days=rng.randint(2, 9), budget=rng.randint(5, 40) * 100,
+                      code=rng.choice([1, 2, 137, 143]),
+                      log="\n".join(f"2024-05-0{i} INFO worker-{i} processed {rng.randint(10, 999)} items"
+                                    for i in range(1, 6)))
+        return template.format(**values)
+
+    return [fill(rng.choice(FACT_TEMPLATES if rng.random() < fact_ratio else PLAIN_TEMPLATES)) for _ in range(n)]
+
+
+def timed_us(func, corpus, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for message in corpus:
+            func(message)
+        best = min(best, time.perf_counter() - start)
+    return 1e6 * best / len(corpus)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure regex fact extraction over a chat corpus")
+    parser.add_argument("--messages", type=int, default=5000, help="Corpus size (default: 5000)")
+    parser.add_argument("--fact-ratio", type=float, default=0.1, help="Share of messages with fact cues (default: 0.1)")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per measurement, best reported (default: 5)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages, args.fact_ratio, args.seed)
+    extractor = fact_extractor.FactExtractor()
+    paths = [
+        ("extract_facts", lambda m: extractor.extract_facts(m, role="user")),
+        ("_extract_ranked_lists", extractor._extract_ranked_lists),
+        ("extract_ranked_lists", ranked_lists.extract_ranked_lists),
+        ("detect_ordinal_or_slice", ordinal_detection.detect_ordinal_or_slice),
+    ]
+    print(f"{'path':<26} {'us/message':>10}")
+    for name, func in paths:
+        print(f"{name:<26} {timed_us(func, corpus, args.repeats):10.2f}")
+
+    find_cues = getattr(fact_extractor, "find_fact_cues", None)
+    if find_cues is not None:
+        rejected = sum(1 for message in corpus if not find_cues(message.lower().strip()))
+        print(f"prefilter rejects {rejected}/{len(corpus)} messages ({100.0 * rejected / len(corpus):.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: search_current_facts() latency, LIKE scan vs FTS5 index.
+
+Fills a temporary project database with synthetic facts (ranked lists under
+user.favorites.<topic>.<rank> plus scalar facts, each with superseded history
+rows) and times typical fact queries two ways:
+
+- like: the previous query, (fact_key LIKE ? OR value_text LIKE ?) per keyword
+  over project_facts
+- fts:  search_current_facts(), a MATCH on project_facts_fts
+
+Usage:
+    python scripts/bench_fact_search.py --facts 10000 100000
+"""
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_service.memory_dashboard import db
+
+TOPICS = ("colors", "movies", "books", "cities", "foods", "games", "bands", "cars",
+          "languages", "sports", "artists", "podcasts", "teams", "drinks", "authors", "shows")
+WORDS = ("blue", "green", "red", "paris", "tokyo", "lisbon", "dune", "alien", "pizza", "sushi",
+         "chess", "tennis", "python", "rust", "jazz", "coffee", "tea", "volvo", "tesla", "bach")
+QUERIES = ("What are my favorite colors?", "user.favorites.movies", "tokyo",
+           "Do you remember my favorite podcast?", "favorite_drink")
+STOP_WORDS = {'what', 'is', 'my', 'your', 'the', 'a', 'an', 'do', 'you', 'remember', 'know', 'tell', 'me', 'about'}
+
+
+def populate(project_id: str, n_facts: int, history: int, seed: int):
+    """Insert n_facts current facts, each with `history` superseded versions."""
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1)
+    rows = []
+    for i in range(n_facts):
+        if i % 4:
+            topic = TOPICS[i % len(TOPICS)] + (f"_{i // 4000}" if i >= 4000 else "")
+            fact_key = f"user.favorites.{topic}.{i % 250 + 1}"
+        else:
+            fact_key = f"user.fact_{i}"
+        previous = None
+        for version in range(history + 1):
+            fact_id = str(uuid.uuid4())
+            value = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+            created = now + timedelta(seconds=i * (history + 1) + version)
+            rows.append((fact_id, project_id, fact_key, value, "string", 1.0, str(uuid.uuid4()),
+                         created.isoformat(), created.isoformat(), previous, int(version == history)))
+            previous = fact_id
+
+    def _write(conn):
+        conn.executemany("""
+            INSERT INTO project_facts (fact_id, project_id, fact_key, value_text, value_type, confidence,
+                                       source_message_uuid, created_at, effective_at, supersedes_fact_id, is_current)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+    db.run_facts_write(f"project-{project_id}", _write, project_id=project_id, label="bench_facts")
+
+
+def like_search(project_id: str, query: str, limit: int):
+    """The previous search_current_facts() query (LIKE per keyword)."""
+    source_id = f"project-{project_id}"
+    keywords = [w for w in re.findall(r'\b\w+\b', query.lower()) if w not in STOP_WORDS and len(w) > 2]
+    keywords = keywords or [query.lower()]
+    conditions = " OR ".join("(fact_key LIKE ? OR value_text LIKE ?)" for _ in keywords)
+    params = [project_id]
+    for kw in keywords:
+        params.extend([f"%{kw}%", f"%{kw}%"])
+    conn = db.get_facts_db_read_connection(source_id, project_id=project_id)
+    rows = conn.execute(f"""
+        SELECT fact_id, project_id, fact_key, value_text, value_type,
+               confidence, source_message_uuid, created_at, effective_at,
+               supersedes_fact_id, is_current
+        FROM project_facts
+        WHERE project_id = ? AND is_current = 1 AND ({conditions})
+        ORDER BY effective_at DESC, created_at DESC
+        LIMIT ?
+    """, params + [limit]).fetchall()
+    conn.close()
+    return rows
+
+
+def fts_search(project_id: str, query: str, limit: int):
+    return db.search_current_facts(project_id, query, limit=limit)
+
+
+def timed(func, project_id: str, limit: int, iterations: int) -> float:
+    for query in QUERIES:
+        func(project_id, query, limit)  # Warm the page cache
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in QUERIES:
+            func(project_id, query, limit)
+    return 1000.0 * (time.perf_counter() - start) / (iterations * len(QUERIES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure fact search latency (LIKE scan vs FTS5)")
+    parser.add_argument("--facts", type=int, nargs="+", default=[10000, 100000],
+                        help="Current facts per project (default: 10000 100000)")
+    parser.add_argument("--history", type=int, default=1, help="Superseded versions per fact (default: 1)")
+    parser.add_argument("--iterations", type=int, default=20, help="Passes over the query set (default: 20)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="bench_facts_"))
+    db.get_db_path_for_source = lambda source_id, project_id=None: tmp_dir / source_id / "index.sqlite"
+
+    print(f"{'facts':>8} {'limit':>6} {'like ms':>9} {'fts ms':>9} {'speedup':>8}")
+    for n_facts in args.facts:
+        project_id = f"bench{n_facts}"
+        db.init_facts_db(f"project-{project_id}", project_id=project_id)
+        populate(project_id, n_facts, args.history, args.seed)
+        for limit in (10, 10000):
+            like_ms = timed(like_search, project_id, limit, args.iterations)
+            fts_ms = timed(fts_search, project_id, limit, args.iterations)
+            print(f"{n_facts:>8} {limit:>6} {like_ms:9.2f} {fts_ms:9.2f} {like_ms / fts_ms:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
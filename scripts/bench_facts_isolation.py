@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: facts read/write latency while chat indexing writes the project index.
+
+Fills a temporary project with facts, then measures get_current_fact() and
+store_project_fact() latency (p50/p99) twice: idle, and while a background
+thread keeps replacing file chunks + embeddings in the project's index
+database (the write pattern of chat/file indexing).
+
+Usage:
+    python scripts/bench_facts_isolation.py --facts 2000 --samples 300
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_service.config import EMBEDDING_DIM
+from memory_service.memory_dashboard import db
+
+MODEL_NAME = "bench-model"
+
+
+def indexing_load(source_id: str, source_db_id: int, chunks_per_file: int, stop: threading.Event):
+    """Replace the chunks and embeddings of synthetic files until stopped."""
+    rng = np.random.default_rng(0)
+    text = "memory index chunk vector search " * 80
+    chunks = [(idx, text, 0, len(text)) for idx in range(chunks_per_file)]
+    file_number = 0
+    while not stop.is_set():
+        file_number += 1
+        file_id = db.upsert_file(source_db_id, f"/bench/file_{file_number % 200}.md", "md",
+                                 datetime.now(), len(text), source_id)
+        embeddings = rng.random((chunks_per_file, EMBEDDING_DIM), dtype=np.float32)
+        db.replace_file_chunks_bulk(source_id, file_id, chunks, embeddings, MODEL_NAME)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+
+
+def measure(project_id: str, facts: int, samples: int):
+    rng = random.Random(1)
+    reads, writes = [], []
+    for i in range(samples):
+        key = f"user.bench_fact_{rng.randrange(facts)}"
+        start = time.perf_counter()
+        assert db.get_current_fact(project_id, key) is not None
+        reads.append(1000.0 * (time.perf_counter() - start))
+
+        start = time.perf_counter()
+        db.store_project_fact(project_id, key, f"updated {i}", "string", str(uuid.uuid4()))
+        writes.append(1000.0 * (time.perf_counter() - start))
+    return percentiles(reads), percentiles(writes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure facts latency with and without indexing load")
+    parser.add_argument("--facts", type=int, default=2000, help="Facts in the project (default: 2000)")
+    parser.add_argument("--samples", type=int, default=300, help="Reads and writes measured per run (default: 300)")
+    parser.add_argument("--chunks-per-file", type=int, default=64, help="Chunks per indexed file (default: 64)")
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="bench_facts_isolation_"))
+    db.get_db_path_for_source = lambda source_id, project_id=None: tmp_dir / source_id / "index.sqlite"
+    (tmp_dir / "project-bench").mkdir()
+
+    project_id = "bench"
+    source_id = f"project-{project_id}"
+    db.init_db(source_id, project_id=project_id)
+    source_db_id = db.upsert_source(source_id, project_id, "")
+    for i in range(args.facts):
+        db.store_project_fact(project_id, f"user.bench_fact_{i}", f"value {i}", "string", str(uuid.uuid4()))
+
+    print(f"{'load':>9} {'read p50':>9} {'read p99':>9} {'write p50':>10} {'write p99':>10}  (ms)")
+    for label in ("idle", "indexing"):
+        stop = threading.Event()
+        loader = None
+        if label == "indexing":
+            loader = threading.Thread(target=indexing_load,
+                                      args=(source_id, source_db_id, args.chunks_per_file, stop), daemon=True)
+            loader.start()
+            time.sleep(1.0)
+        (read_p50, read_p99), (write_p50, write_p99) = measure(project_id, args.facts, args.samples)
+        stop.set()
+        if loader is not None:
+            loader.join()
+        print(f"{label:>9} {read_p50:9.2f} {read_p99:9.2f} {write_p50:10.2f} {write_p99:10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
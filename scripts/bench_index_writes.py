@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chunk + embedding write throughput when indexing files.
+
+Indexes a synthetic corpus (random text chunks, random embeddings) into a
+temporary database twice:
+
+- legacy: insert_chunks() (executemany, no ids), get_chunks_by_file_id() to
+  re-select the ids, then insert_embeddings() with a DELETE executemany and a
+  single-row INSERT per embedding, each step in its own transaction
+- bulk:   replace_file_chunks_bulk() writing chunks (INSERT ... RETURNING ids)
+  and embeddings (one executemany) in a single transaction
+
+Embedding computation is excluded; only the database writes are measured.
+
+Usage:
+    python scripts/bench_index_writes.py --files 10000 --chunks-per-file 8
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_service.config import EMBEDDING_DIM
+from memory_service.memory_dashboard import db
+
+WORDS = ("index", "memory", "chunk", "vector", "project", "search", "query", "fact",
+         "source", "embedding", "latency", "sqlite", "batch", "write", "thread", "cache")
+
+
+def make_chunks(rng: random.Random, n: int, chunk_chars: int):
+    chunks = []
+    pos = 0
+    for idx in range(n):
+        words = []
+        length = 0
+        while length < chunk_chars:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        text = " ".join(words)
+        chunks.append((idx, text, pos, pos + len(text)))
+        pos += len(text)
+    return chunks
+
+
+def legacy_write(source_id: str, file_id: int, chunks, embeddings, model_name: str):
+    """The pre-bulk write path (insert, re-select ids, per-row embedding INSERTs)."""
+    conn = db.get_db_connection(source_id)
+    cursor = conn.cursor()
+    db._delete_chunk_signatures_for_file(cursor, file_id)
+    cursor.execute("DELETE FROM chunks WHERE file_id = ?", (file_id,))
+    cursor.executemany("""
+        INSERT INTO chunks (file_id, chunk_index, text, start_char, end_char)
+        VALUES (?, ?, ?, ?, ?)
+    """, [(file_id, idx, text, start, end) for idx, text, start, end in chunks])
+    conn.commit()
+    conn.close()
+
+    chunk_ids = [c.id for c in db.get_chunks_by_file_id(file_id, source_id)]
+
+    conn = db.get_db_connection(source_id)
+    cursor = conn.cursor()
+    cursor.executemany("DELETE FROM embeddings WHERE chunk_id = ? AND model_name = ?",
+                       [(cid, model_name) for cid in chunk_ids])
+    for chunk_id, embedding in zip(chunk_ids, embeddings):
+        cursor.execute("""
+            INSERT INTO embeddings (chunk_id, embedding, model_name)
+            VALUES (?, ?, ?)
+        """, (chunk_id, embedding.tobytes(), model_name))
+    conn.commit()
+    conn.close()
+
+
+def bulk_write(source_id: str, file_id: int, chunks, embeddings, model_name: str):
+    db.replace_file_chunks_bulk(source_id, file_id, chunks, embeddings=embeddings, model_name=model_name)
+
+
+def run(label: str, write, args, corpus, embeddings):
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f"bench_writes_{label}_"))
+    db_path = tmp_dir / "index.sqlite"
+    db.get_db_path_for_source = lambda source_id, project_id=None: db_path
+    source_id = f"bench-{label}"
+    source_db_id = db.upsert_source(source_id, "bench", str(tmp_dir))
+    now = datetime.now()
+    file_ids = [
+        db.upsert_file(source_db_id, f"/corpus/file_{i:05d}.txt", "txt", now, 1000, source_id)
+        for i in range(args.files)
+    ]
+
+    start = time.perf_counter()
+    for file_id, chunks in zip(file_ids, corpus):
+        write(source_id, file_id, chunks, embeddings[:len(chunks)], "bench-model")
+    elapsed = time.perf_counter() - start
+
+    conn = db.get_db_connection(source_id)
+    n_chunks = conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+    n_embeddings = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    conn.close()
+    print(f"{label:<8} {elapsed:8.2f} s  {args.files / elapsed:9.1f} files/s  "
+          f"{n_chunks / elapsed:10.1f} chunks/s  ({n_chunks} chunks, {n_embeddings} embeddings)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure chunk/embedding write throughput on a synthetic corpus")
+    parser.add_argument("--files", type=int, default=10000, help="Number of synthetic files (default: 10000)")
+    parser.add_argument("--chunks-per-file", type=int, default=8, help="Average chunks per file (default: 8)")
+    parser.add_argument("--chunk-chars", type=int, default=1200, help="Characters per chunk (default: 1200)")
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM, help=f"Embedding dimension (default: {EMBEDDING_DIM})")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    max_chunks = 2 * args.chunks_per_file
+    corpus = [make_chunks(rng, rng.randint(1, max_chunks - 1), args.chunk_chars) for _ in range(args.files)]
+    embeddings = np.random.default_rng(args.seed).random((max_chunks, args.dim), dtype=np.float32)
+
+    print(f"Corpus: {args.files} files, {sum(len(c) for c in corpus)} chunks, dim={args.dim}")
+    legacy = run("legacy", legacy_write, args, corpus, embeddings)
+    bulk = run("bulk", bulk_write, args, corpus, embeddings)
+    print(f"speedup  {legacy / bulk:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
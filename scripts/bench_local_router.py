@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost and coverage of the local routing tier.
+
+Replays the chat corpus of bench_fact_prefilter.py (plus greetings and
+acknowledgements) through LocalRouter.decide_by_rules() and reports the rule
+bypass rate and per-message cost. Then times a kNN decision against a full
+example store (--examples random unit vectors of the embedding dimension);
+message embedding time is not included.
+
+Usage:
+    python scripts/bench_local_router.py --messages 5000 --examples 5000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_fact_prefilter import build_corpus
+from memory_service.config import EMBEDDING_DIM
+from server.contracts.routing_plan import RoutingPlan
+from server.services.local_router import LocalRouter, RoutingExampleStore
+
+SHORT_REPLIES = ["thanks!", "Thank you so much", "ok", "Sounds good.", "hi", "Good morning", "cool", "got it"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure local router rule coverage and kNN cost")
+    parser.add_argument("--messages", type=int, default=5000, help="Corpus size (default: 5000)")
+    parser.add_argument("--short-ratio", type=float, default=0.15, help="Share of greetings/acknowledgements (default: 0.15)")
+    parser.add_argument("--examples", type=int, default=5000, help="kNN examples (default: 5000)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [rng.choice(SHORT_REPLIES) if rng.random() < args.short_ratio else message
+              for message in build_corpus(args.messages, 0.1, args.seed)]
+    router = LocalRouter()
+
+    sources = {}
+    start = time.perf_counter()
+    for message in corpus:
+        decision = router.decide_by_rules(message)
+        source = decision.source if decision else "nano"
+        sources[source] = sources.get(source, 0) + 1
+    rules_us = 1e6 * (time.perf_counter() - start) / len(corpus)
+    print(f"rules: {rules_us:.1f} us/message")
+    for source, count in sorted(sources.items()):
+        print(f"  {source:<18} {count:6d} ({100.0 * count / len(corpus):.0f}%)")
+
+    np_rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = RoutingExampleStore(db_path=Path(tmp_dir) / "routing_examples.db", max_examples=args.examples)
+        vectors = np_rng.standard_normal((args.examples, EMBEDDING_DIM)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        plan = RoutingPlan(content_plane="chat", operation="none", reasoning_required=True)
+        start = time.perf_counter()
+        for vector in vectors:
+            store.add(vector, plan)
+        add_ms = 1000.0 * (time.perf_counter() - start) / args.examples
+        router = LocalRouter(examples=store)
+        queries = vectors[:200] + 0.05 * np_rng.standard_normal((200, EMBEDDING_DIM)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        start = time.perf_counter()
+        for query in queries:
+            router.decide_by_knn("bench message", query)
+        knn_ms = 1000.0 * (time.perf_counter() - start) / len(queries)
+    print(f"knn over {args.examples} examples (dim {EMBEDDING_DIM}): {knn_ms:.2f} ms/decision, "
+          f"{add_ms:.2f} ms/recorded example")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
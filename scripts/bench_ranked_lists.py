@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ranked-list reads on project_facts, key LIKE scan vs list_key/rank index.
+
+Fills a temporary project database with one large ranked list
+(user.favorites.<topic>.<rank>) next to other facts, then times:
+
+- max rank:  the previous _get_max_rank_atomic (LIKE 'list_key.%' + parse ranks
+             in Python) vs SELECT MAX(rank)
+- Nth item:  the previous path (read the whole list, parse, pick rank N) vs a
+             (list_key, rank) index lookup
+
+Usage:
+    python scripts/bench_ranked_lists.py --sizes 1000 10000 100000
+"""
+import argparse
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_service.memory_dashboard import db
+
+LIST_KEY = "user.favorites.movies"
+
+
+def populate(project_id: str, list_size: int, other_facts: int):
+    now = datetime(2025, 1, 1)
+    rows = []
+    for i in range(list_size + other_facts):
+        fact_key = f"{LIST_KEY}.{i + 1}" if i < list_size else f"user.favorites.topic_{i % 500}.{i // 500 + 1}"
+        created = (now + timedelta(seconds=i)).isoformat()
+        rows.append((str(uuid.uuid4()), project_id, fact_key, f"value {i}", "string", 1.0,
+                     str(uuid.uuid4()), created, created, None, 1))
+
+    def _write(conn):
+        conn.executemany("""
+            INSERT INTO project_facts (fact_id, project_id, fact_key, value_text, value_type, confidence,
+                                       source_message_uuid, created_at, effective_at, supersedes_fact_id, is_current)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+    db.run_facts_write(f"project-{project_id}", _write, project_id=project_id, label="bench_ranked")
+
+
+def like_ranked_items(conn, project_id: str):
+    rows = conn.execute("""
+        SELECT fact_key, value_text FROM project_facts
+        WHERE project_id = ? AND fact_key LIKE ? AND is_current = 1
+        ORDER BY fact_key
+    """, (project_id, f"{LIST_KEY}.%")).fetchall()
+    items = []
+    for fact_key, value_text in rows:
+        try:
+            items.append((int(fact_key.rsplit(".", 1)[1]), value_text))
+        except (ValueError, IndexError):
+            continue
+    return items
+
+
+def like_max_rank(conn, project_id: str, rank: int):
+    return max((r for r, _ in like_ranked_items(conn, project_id)), default=0)
+
+
+def like_nth(conn, project_id: str, rank: int):
+    return next((v for r, v in like_ranked_items(conn, project_id) if r == rank), None)
+
+
+def index_max_rank(conn, project_id: str, rank: int):
+    return conn.execute("""
+        SELECT MAX(rank) FROM project_facts WHERE project_id = ? AND list_key = ? AND is_current = 1
+    """, (project_id, LIST_KEY)).fetchone()[0] or 0
+
+
+def index_nth(conn, project_id: str, rank: int):
+    row = conn.execute("""
+        SELECT value_text FROM project_facts
+        WHERE project_id = ? AND list_key = ? AND rank = ? AND is_current = 1
+    """, (project_id, LIST_KEY, rank)).fetchone()
+    return row[0] if row else None
+
+
+def timed(func, conn, project_id: str, rank: int, iterations: int) -> float:
+    func(conn, project_id, rank)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(conn, project_id, rank)
+    return 1000.0 * (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ranked-list reads (LIKE scan vs list_key/rank index)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Items in the benchmarked list (default: 1000 10000 100000)")
+    parser.add_argument("--other-facts", type=int, default=20000, help="Facts in other lists (default: 20000)")
+    parser.add_argument("--iterations", type=int, default=20, help="Calls per measurement (default: 20)")
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="bench_ranked_"))
+    db.get_db_path_for_source = lambda source_id, project_id=None: tmp_dir / source_id / "index.sqlite"
+
+    print(f"{'items':>8} {'max like ms':>12} {'max idx ms':>11} {'nth like ms':>12} {'nth idx ms':>11}")
+    for size in args.sizes:
+        project_id = f"bench{size}"
+        source_id = f"project-{project_id}"
+        db.init_facts_db(source_id, project_id=project_id)
+        populate(project_id, size, args.other_facts)
+        conn = db.get_facts_db_read_connection(source_id, project_id=project_id)
+        rank = size // 2
+        assert like_max_rank(conn, project_id, rank) == index_max_rank(conn, project_id, rank) == size
+        assert like_nth(conn, project_id, rank) == index_nth(conn, project_id, rank)
+        results = [timed(func, conn, project_id, rank, args.iterations)
+                   for func in (like_max_rank, index_max_rank, like_nth, index_nth)]
+        conn.close()
+        print(f"{size:>8} {results[0]:12.2f} {results[1]:11.3f} {results[2]:12.2f} {results[3]:11.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Chunking report: character-based vs tokenizer-exact chunking.
+
+Runs both chunkers over a sample of files from a memory source (or any
+directory) and reports chunk counts and truncation rate, i.e. the share of
+chunks longer than the embedding model's max_seq_length whose tails are
+silently cut off at embed time.
+
+Usage:
+    python scripts/chunking_report.py --source-id coin-dir --limit 200
+    python scripts/chunking_report.py --path ~/Documents/notes --limit 50
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_service.config import load_sources, CHUNK_OVERLAP_TOKENS
+from memory_service.indexer import (
+    extract_text, should_index_file, chunk_text, _chunk_text_chars, _get_chunk_tokenizer
+)
+from memory_service.chunking import truncation_stats
+
+
+def iter_sample_files(root: Path, include_glob, exclude_glob, limit: int):
+    """Yield up to `limit` indexable files under root."""
+    count = 0
+    for path in sorted(root.rglob("*")):
+        if count >= limit:
+            return
+        if path.is_file() and should_index_file(path, include_glob, exclude_glob):
+            count += 1
+            yield path
+
+
+def print_stats(label: str, stats: dict):
+    print(
+        f"{label:<12} chunks={stats['chunk_count']:<7} "
+        f"truncated={stats['truncated_count']:<6} "
+        f"truncation_rate={stats['truncation_rate']:.1%}  "
+        f"tokens={stats['total_tokens']:<9} dropped_tokens={stats['dropped_tokens']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare char-based and token-exact chunking on a sample source")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--source-id", help="Memory source ID from memory_sources.yaml / dynamic sources")
+    group.add_argument("--path", help="Directory to sample instead of a configured source")
+    parser.add_argument("--limit", type=int, default=100, help="Maximum number of files to sample (default: 100)")
+    args = parser.parse_args()
+
+    if args.source_id:
+        source = next((s for s in load_sources() if s.id == args.source_id), None)
+        if source is None:
+            print(f"Source not found: {args.source_id}")
+            return 1
+        root, include_glob, exclude_glob = source.root_path, source.include_glob, source.exclude_glob
+    else:
+        root, include_glob, exclude_glob = Path(args.path).expanduser().resolve(), None, None
+
+    tokenizer, max_tokens = _get_chunk_tokenizer()
+    if tokenizer is None:
+        print("Embedding model has no fast tokenizer; cannot measure token counts.")
+        return 1
+
+    before_texts = []
+    after_texts = []
+    files = 0
+    for path in iter_sample_files(root, include_glob, exclude_glob, args.limit):
+        text = extract_text(path)
+        if not text:
+            continue
+        files += 1
+        before_texts.extend(c[1] for c in _chunk_text_chars(text))
+        after_texts.extend(c[1] for c in chunk_text(text))
+
+    print(f"Sampled {files} files from {root}")
+    print(f"max_seq_length={max_tokens} overlap_tokens={CHUNK_OVERLAP_TOKENS}")
+    print_stats("before", truncation_stats(before_texts, tokenizer, max_tokens))
+    print_stats("after", truncation_stats(after_texts, tokenizer, max_tokens))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
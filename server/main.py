@@ -38,6 +38,7 @@ from chatdo.agents.ai_router import run_agent
 from chatdo.memory.store import delete_thread_history, load_thread_history, save_thread_history, load_thread_sources, add_thread_source, memory_root
 from chatdo.executor import parse_tasks_block, apply_tasks
 from memory_service.config import PROJECTS_PATH, get_project_directory_name
+from memory_service.memory_dashboard import db as memory_db
 from server.uploads import handle_file_upload
 from server.scraper import scrape_url
 from server.ws import websocket_endpoint
@@ -335,6 +336,7 @@ def purge_trashed_projects() -> int:
             try:
                 import shutil
                 shutil.rmtree(memory_project_dir)
+                memory_db.forget_schema(memory_project_dir)
                 logger.info(f"Deleted memory_service/projects/{project_dir_name}/ for project {project_id}")
             except Exception as e:
                 logger.warning(f"Failed to delete memory_service/projects folder for project {project_id}: {e}")
@@ -864,6 +866,7 @@ async def purge_project(project_id: str):
     if memory_project_dir.exists():
         try:
             shutil.rmtree(memory_project_dir)
+            memory_db.forget_schema(memory_project_dir)
             logger.info(f"Deleted memory_service/projects/{project_dir_name}/ for project {project_id}")
         except Exception as e:
             logger.warning(f"Failed to delete memory_service/projects folder for project {project_id}: {e}")
@@ -1377,37 +1380,23 @@ async def chat(request: ChatRequest):
                     memory_client = get_memory_client()
                     now = datetime.now(timezone.utc).isoformat()
                     
-                    # Index user message
-                    if user_msg_idx is not None:
-                        user_msg = history[user_msg_idx]
-                        user_content = user_msg.get("content", "")
-                        if user_content:
-                            user_message_id = f"{thread_id}-user-{user_msg_idx}"
-                            memory_client.index_chat_message(
-                                project_id=request.project_id,
-                                chat_id=thread_id,
-                                message_id=user_message_id,
-                                role="user",
-                                content=user_content,
-                                timestamp=now,
-                                message_index=user_msg_idx
-                            )
-                    
-                    # Index assistant message
-                    if assistant_msg_idx is not None:
-                        assistant_msg = history[assistant_msg_idx]
-                        assistant_content = assistant_msg.get("content", "")
-                        if assistant_content:
-                            assistant_message_id = f"{thread_id}-assistant-{assistant_msg_idx}"
-                            memory_client.index_chat_message(
-                                project_id=request.project_id,
-                                chat_id=thread_id,
-                                message_id=assistant_message_id,
-                                role="assistant",
-                                content=assistant_content,
-                                timestamp=now,
-                                message_index=assistant_msg_idx
-                            )
+                    # Index user + assistant messages with one bulk request
+                    messages_to_index = []
+                    for msg_idx, msg_role in ((user_msg_idx, "user"), (assistant_msg_idx, "assistant")):
+                        if msg_idx is None:
+                            continue
+                        msg_content = history[msg_idx].get("content", "")
+                        if msg_content:
+                            messages_to_index.append({
+                                "project_id": request.project_id,
+                                "chat_id": thread_id,
+                                "message_id": f"{thread_id}-{msg_role}-{msg_idx}",
+                                "role": msg_role,
+                                "content": msg_content,
+                                "timestamp": now,
+                                "message_index": msg_idx
+                            })
+                    memory_client.index_chat_messages(messages_to_index)
             except Exception as e:
                 print(f"[MEMORY] Warning: Failed to index messages for cross-chat search: {e}", exc_info=True)
         
@@ -13,9 +13,16 @@ Schema:
   "confidence": 1.0,
   "created_at": timestamp
 }
+
+Lookups go through an in-memory index (normalized alias -> canonical topic),
+loaded from the alias_mappings table at startup and updated by add_entry().
+Canonical-topic embeddings are kept as a unit-normalized [T, D] matrix for
+similarity matching (see get_embedding_matrix()).
 """
+import itertools
 import logging
 import json
+import threading
 import numpy as np
 from typing import List, Optional, Tuple, Dict, Any
 from dataclasses import dataclass, asdict
@@ -28,6 +35,9 @@ logger = logging.getLogger(__name__)
 # Alias table database path (global, not project-specific)
 ALIAS_TABLE_DB_PATH = Path(__file__).parent.parent.parent / "data" / "alias_table.db"
 
+# Version numbers are unique across AliasTable instances, so results cached for one table never match another
+_versions = itertools.count(1)
+
 
 @dataclass
 class AliasEntry:
@@ -73,7 +83,32 @@ class AliasTable:
         """
         self.db_path = db_path or ALIAS_TABLE_DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()  # Serializes add_entry (DB write + index update)
+        self._index: Dict[str, Tuple[str, str]] = {}  # normalized alias -> (canonical_topic, alias)
+        self._version = 0
+        # Unit-normalized canonical embeddings: rows [0, len(topics)) of a buffer with spare capacity
+        self._embedding_topics: Optional[List[str]] = None  # None until loaded
+        self._embedding_rows: Dict[str, int] = {}  # canonical_topic -> row
+        self._embedding_buffer: Optional[np.ndarray] = None
+        self._embedding_snapshot: Tuple[Tuple[str, ...], Optional[np.ndarray]] = ((), None)
         self._init_db()
+        self._load_index()
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped by every add_entry(); results derived from the table are valid for one version."""
+        return self._version
+    
+    @staticmethod
+    def _normalize_alias(alias: str) -> str:
+        return alias.lower().strip()
+    
+    @classmethod
+    def _mapping_rows(cls, canonical_topic: str, aliases: List[str]) -> List[Tuple[str, str, str]]:
+        """(normalized_alias, canonical_topic, alias) rows for an entry; the canonical topic maps to itself."""
+        rows = [(cls._normalize_alias(alias), canonical_topic, alias) for alias in aliases]
+        rows.append((cls._normalize_alias(canonical_topic), canonical_topic, canonical_topic))
+        return rows
     
     def _init_db(self):
         """Initialize the alias table database schema."""
@@ -91,16 +126,47 @@ class AliasTable:
             )
         """)
         
-        # Index for faster alias lookups
+        # alias -> canonical mapping used for lookups (aliases_json is kept for get_entry).
+        # An alias belongs to the first entry that claimed it.
+        cursor.execute("DROP INDEX IF EXISTS idx_aliases_json")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS alias_mappings (
+                normalized_alias TEXT PRIMARY KEY,
+                canonical_topic TEXT NOT NULL,
+                alias TEXT NOT NULL
+            )
+        """)
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_aliases_json 
-            ON alias_entries(aliases_json)
+            CREATE INDEX IF NOT EXISTS idx_alias_mappings_canonical
+            ON alias_mappings(canonical_topic)
         """)
         
+        # Backfill mappings for databases created before alias_mappings existed
+        cursor.execute("SELECT 1 FROM alias_mappings LIMIT 1")
+        if cursor.fetchone() is None:
+            cursor.execute("SELECT canonical_topic, aliases_json FROM alias_entries ORDER BY rowid")
+            for canonical_topic, aliases_json in cursor.fetchall():
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO alias_mappings (normalized_alias, canonical_topic, alias)
+                    VALUES (?, ?, ?)
+                """, self._mapping_rows(canonical_topic, json.loads(aliases_json)))
+        
         conn.commit()
         conn.close()
         logger.debug(f"[ALIAS-TABLE] Initialized database at {self.db_path}")
     
+    def _load_index(self):
+        """Load alias_mappings into the in-memory lookup index."""
+        conn = sqlite3.connect(str(self.db_path))
+        rows = conn.execute("""
+            SELECT normalized_alias, canonical_topic, alias FROM alias_mappings
+        """).fetchall()
+        conn.close()
+        
+        self._index = {normalized_alias: (canonical_topic, alias) for normalized_alias, canonical_topic, alias in rows}
+        self._version = next(_versions)
+        logger.debug(f"[ALIAS-TABLE] Loaded {len(self._index)} alias mappings")
+    
     def add_entry(
         self,
         canonical_topic: str,
@@ -123,9 +189,6 @@ class AliasTable:
             True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
             # Prepare embedding blob
             embedding_blob = None
             if embedding is not None:
@@ -133,23 +196,44 @@ class AliasTable:
             
             # Serialize aliases
             aliases_json = json.dumps(aliases)
+            mapping_rows = self._mapping_rows(canonical_topic, aliases)
             
-            # Insert or replace
-            cursor.execute("""
-                INSERT OR REPLACE INTO alias_entries
-                (canonical_topic, aliases_json, embedding_blob, created_by, confidence, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                canonical_topic,
-                aliases_json,
-                embedding_blob,
-                created_by,
-                confidence,
-                datetime.now(timezone.utc).isoformat()
-            ))
-            
-            conn.commit()
-            conn.close()
+            with self._lock:
+                conn = sqlite3.connect(str(self.db_path))
+                cursor = conn.cursor()
+                
+                # Insert or replace
+                cursor.execute("""
+                    INSERT OR REPLACE INTO alias_entries
+                    (canonical_topic, aliases_json, embedding_blob, created_by, confidence, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (
+                    canonical_topic,
+                    aliases_json,
+                    embedding_blob,
+                    created_by,
+                    confidence,
+                    datetime.now(timezone.utc).isoformat()
+                ))
+                
+                # Replace this entry's mappings; aliases claimed by other entries keep their mapping
+                cursor.execute("DELETE FROM alias_mappings WHERE canonical_topic = ?", (canonical_topic,))
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO alias_mappings (normalized_alias, canonical_topic, alias)
+                    VALUES (?, ?, ?)
+                """, mapping_rows)
+                
+                conn.commit()
+                conn.close()
+                
+                # Apply the same change to the in-memory index (copy-on-write: lookups never see a partial update)
+                index = {k: v for k, v in self._index.items() if v[0] != canonical_topic}
+                for normalized_alias, topic, alias in mapping_rows:
+                    index.setdefault(normalized_alias, (topic, alias))
+                self._index = index
+                if self._embedding_topics is not None:
+                    self._set_embedding(canonical_topic, embedding)
+                self._version = next(_versions)
             
             logger.info(
                 f"[ALIAS-TABLE] Added entry: '{canonical_topic}' with {len(aliases)} aliases"
@@ -171,65 +255,108 @@ class AliasTable:
         Args:
             alias: The alias to look up
             exact_match: If True, only exact matches. If False, also check normalized.
+                         (Lookups always compare lowercased, stripped strings.)
             
         Returns:
             AliasMatchResult if found, None otherwise
         """
-        try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            # Normalize alias for lookup
-            normalized_alias = alias.lower().strip()
-            
-            # Query all entries
-            cursor.execute("""
-                SELECT canonical_topic, aliases_json
-                FROM alias_entries
-            """)
-            
-            for row in cursor.fetchall():
-                canonical_topic, aliases_json = row
-                aliases = json.loads(aliases_json)
-                
-                # Check if alias matches (exact or normalized)
-                for entry_alias in aliases:
-                    entry_alias_normalized = entry_alias.lower().strip()
-                    
-                    if exact_match:
-                        if entry_alias_normalized == normalized_alias:
-                            conn.close()
-                            return AliasMatchResult(
-                                canonical_topic=canonical_topic,
-                                matched_alias=entry_alias,
-                                confidence=1.0
-                            )
-                    else:
-                        # Also check if normalized versions match
-                        if entry_alias_normalized == normalized_alias:
-                            conn.close()
-                            return AliasMatchResult(
-                                canonical_topic=canonical_topic,
-                                matched_alias=entry_alias,
-                                confidence=1.0
-                            )
-                
-                # Also check if the canonical topic itself matches
-                canonical_normalized = canonical_topic.lower().strip()
-                if canonical_normalized == normalized_alias:
-                    conn.close()
-                    return AliasMatchResult(
-                        canonical_topic=canonical_topic,
-                        matched_alias=canonical_topic,
-                        confidence=1.0
-                    )
-            
-            conn.close()
+        match = self._index.get(self._normalize_alias(alias))
+        if match is None:
             return None
-            
-        except Exception as e:
-            logger.error(f"[ALIAS-TABLE] Error finding canonical: {e}", exc_info=True)
+        canonical_topic, matched_alias = match
+        return AliasMatchResult(
+            canonical_topic=canonical_topic,
+            matched_alias=matched_alias,
+            confidence=1.0
+        )
+    
+    @staticmethod
+    def _unit_vector(embedding: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Embedding as a float32 unit vector (None if missing, zero or not finite)."""
+        if embedding is None:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if not np.isfinite(norm) or norm == 0:
             return None
+        return vector / norm
+    
+    def _load_embeddings(self):
+        """Load canonical embeddings from the database into the matrix; caller holds the lock."""
+        self._embedding_topics = []
+        self._embedding_rows = {}
+        self._embedding_buffer = None
+        for canonical_topic, embedding in self.get_all_canonical_topics():
+            self._set_embedding(canonical_topic, embedding)
+        self._publish_embeddings()
+        logger.debug(f"[ALIAS-TABLE] Loaded {len(self._embedding_topics)} canonical embeddings")
+    
+    def _set_embedding(self, canonical_topic: str, embedding: Optional[np.ndarray]):
+        """
+        Add, replace or remove a topic's row in the embedding matrix; caller holds the lock.
+        
+        Appends go into spare buffer capacity, which published snapshots don't cover;
+        replacements and removals copy the buffer so a snapshot never changes under a reader.
+        """
+        vector = self._unit_vector(embedding)
+        if vector is not None and self._embedding_buffer is not None and vector.shape[0] != self._embedding_buffer.shape[1]:
+            logger.warning(
+                f"[ALIAS-TABLE] Ignoring embedding for '{canonical_topic}': dimension {vector.shape[0]} "
+                f"!= {self._embedding_buffer.shape[1]}"
+            )
+            vector = None
+        
+        count = len(self._embedding_topics)
+        row = self._embedding_rows.get(canonical_topic)
+        if row is not None:
+            buffer = self._embedding_buffer.copy()
+            if vector is not None:
+                buffer[row] = vector
+            else:
+                # Move the last row into the freed slot
+                last_topic = self._embedding_topics[count - 1]
+                buffer[row] = buffer[count - 1]
+                self._embedding_topics[row] = last_topic
+                self._embedding_rows[last_topic] = row
+                self._embedding_topics.pop()
+                del self._embedding_rows[canonical_topic]
+            self._embedding_buffer = buffer
+        elif vector is not None:
+            if self._embedding_buffer is None:
+                self._embedding_buffer = np.empty((16, vector.shape[0]), dtype=np.float32)
+            elif count == self._embedding_buffer.shape[0]:
+                buffer = np.empty((2 * count, self._embedding_buffer.shape[1]), dtype=np.float32)
+                buffer[:count] = self._embedding_buffer[:count]
+                self._embedding_buffer = buffer
+            self._embedding_buffer[count] = vector
+            self._embedding_rows[canonical_topic] = count
+            self._embedding_topics.append(canonical_topic)
+        self._publish_embeddings()
+    
+    def _publish_embeddings(self):
+        count = len(self._embedding_topics)
+        matrix = None
+        if self._embedding_buffer is not None and count:
+            matrix = self._embedding_buffer[:count]
+            matrix.flags.writeable = False
+        self._embedding_snapshot = (tuple(self._embedding_topics), matrix)
+    
+    def get_embedding_matrix(self) -> Tuple[Tuple[str, ...], Optional[np.ndarray]]:
+        """
+        Get the canonical topics that have embeddings, with their embeddings as one matrix.
+        
+        Loaded from the database on first use and updated incrementally by add_entry(),
+        so similarity against all topics is a single matmul (matrix @ unit query vector).
+        
+        Returns:
+            (topics, matrix) where matrix is a read-only float32 [T, D] array of unit-normalized
+            embeddings, row i belonging to topics[i] (None if no topic has an embedding)
+        """
+        if self._embedding_topics is None:
+            with self._lock:
+                if self._embedding_topics is None:
+                    self._load_embeddings()
+        return self._embedding_snapshot
     
     def get_all_canonical_topics(
         self
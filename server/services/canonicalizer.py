@@ -5,20 +5,30 @@ This is the authoritative canonicalization layer that converts raw topics
 from Nano router into canonical topics using:
 1. Alias Table (authoritative mappings)
 2. Embedding similarity (BGE model)
-3. Teacher Model (GPT-5 for low-confidence cases)
+3. Teacher Model (GPT-5 for low-confidence cases), by default deferred to a
+   background queue (see TEACHER_MODE)
 
 The canonicalizer is used on both Facts write and Facts read paths.
+Results are memoized process-wide in an LRU keyed by the alias table version,
+so teacher additions invalidate them.
 """
 import logging
+import os
+import threading
 import numpy as np
+from collections import OrderedDict
 from typing import Optional, Tuple, Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
 # Confidence threshold for embedding similarity
 EMBEDDING_SIMILARITY_THRESHOLD = 0.92
+# "deferred": low-confidence topics are stored under their normalized form and queued for the
+# teacher (server/services/teacher_queue.py); "sync": the write waits for the teacher
+TEACHER_MODE = os.getenv("CANONICALIZER_TEACHER_MODE", "deferred")
+CANONICALIZATION_CACHE_SIZE = int(os.getenv("CANONICALIZATION_CACHE_SIZE", "2048"))  # Memoized results (LRU)
 
 # Import embedding utilities (reuse Memory Service embedding model)
 try:
@@ -52,6 +62,7 @@ class CanonicalizationResult:
     teacher_invoked: bool
     raw_topic: str
     aliases_used: Optional[list] = None  # List of aliases that matched
+    teacher_deferred: bool = False  # Teacher queued to canonicalize this topic later (deferred mode)
 
 
 class Canonicalizer:
@@ -69,6 +80,13 @@ class Canonicalizer:
         self.alias_table = AliasTable()
         self._embedding_model_available = _EMBEDDING_AVAILABLE and embed_query is not None
         
+        # (normalized topic, invoke_teacher, alias table version) -> CanonicalizationResult
+        self._cache: "OrderedDict[Tuple[str, bool, int], CanonicalizationResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_version = self.alias_table.version
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         if not self._embedding_model_available:
             logger.warning("[CANONICALIZER] Embedding model not available - will use alias table only")
     
@@ -137,6 +155,66 @@ class Canonicalizer:
                 raw_topic=raw_topic
             )
         
+        cache_key = (normalized, invoke_teacher, self.alias_table.version)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        if cached is not None:
+            return self._copy_result(cached, raw_topic)
+        
+        result = self._canonicalize_normalized(raw_topic, normalized, invoke_teacher)
+        # Don't memoize a fallback the teacher was asked to resolve: the teacher may succeed next time
+        if not (invoke_teacher and result.source == "fallback"):
+            self._cache_put(cache_key, result)
+        return self._copy_result(result, raw_topic)
+    
+    @staticmethod
+    def _copy_result(result: CanonicalizationResult, raw_topic: str) -> CanonicalizationResult:
+        """Copy of a memoized result for a caller (raw topics sharing a normalized form share results)."""
+        return replace(
+            result,
+            raw_topic=raw_topic,
+            aliases_used=list(result.aliases_used) if result.aliases_used is not None else None
+        )
+    
+    def _cache_put(self, cache_key: Tuple[str, bool, int], result: CanonicalizationResult):
+        with self._cache_lock:
+            version = self.alias_table.version
+            if version != self._cache_version:
+                # Alias table changed (e.g. teacher added mappings): every memoized result is stale
+                self._cache.clear()
+                self._cache_version = version
+            if cache_key[2] != version:
+                return  # Computed against an older alias table
+            self._cache[cache_key] = result
+            while len(self._cache) > CANONICALIZATION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counts of the canonicalization memo cache."""
+        with self._cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "size": len(self._cache),
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+                "alias_version": self._cache_version,
+            }
+    
+    def _canonicalize_normalized(
+        self,
+        raw_topic: str,
+        normalized: str,
+        invoke_teacher: bool
+    ) -> CanonicalizationResult:
+        """Steps 2-4 of canonicalize() for a normalized, non-empty topic."""
+        teacher_deferred = False
+        
         # Step 2: Check Alias Table (authoritative)
         alias_result = self.alias_table.find_canonical(normalized)
         if alias_result:
@@ -165,9 +243,15 @@ class Canonicalizer:
             
             # Step 4: Low confidence - invoke Teacher if enabled
             if invoke_teacher and embedding_result and embedding_result.confidence < EMBEDDING_SIMILARITY_THRESHOLD:
-                teacher_result = self._canonicalize_via_teacher(raw_topic, normalized)
-                if teacher_result:
-                    return teacher_result
+                if TEACHER_MODE == "deferred":
+                    # Don't block the write on the teacher: use the normalized topic provisionally,
+                    # the teacher queue adds aliases and re-keys provisional facts later
+                    from server.services.teacher_queue import get_teacher_queue
+                    teacher_deferred = get_teacher_queue().submit(raw_topic, normalized)
+                else:
+                    teacher_result = self._canonicalize_via_teacher(raw_topic, normalized)
+                    if teacher_result:
+                        return teacher_result
         
         # Fallback: use normalized string as canonical (low confidence)
         logger.warning(
@@ -178,7 +262,8 @@ class Canonicalizer:
             confidence=0.5,  # Low confidence fallback
             source="fallback",
             teacher_invoked=False,
-            raw_topic=raw_topic
+            raw_topic=raw_topic,
+            teacher_deferred=teacher_deferred
         )
     
     def _canonicalize_via_embedding(
@@ -201,34 +286,24 @@ class Canonicalizer:
             # Embed the normalized topic
             topic_embedding = embed_query(normalized_topic)
             
-            # Get all canonical topics with their embeddings from alias table
-            canonical_topics = self.alias_table.get_all_canonical_topics()
+            # Unit-normalized canonical embeddings [T, D], cached by the alias table
+            canonical_topics, canonical_matrix = self.alias_table.get_embedding_matrix()
             
-            if not canonical_topics:
+            if canonical_matrix is None:
                 # No canonical topics exist yet - cannot match
                 return None
             
-            # Find best match via cosine similarity
-            best_match = None
-            best_similarity = 0.0
+            topic_vector = np.asarray(topic_embedding, dtype=np.float32).ravel()
+            norm_topic = np.linalg.norm(topic_vector)
+            if norm_topic == 0 or topic_vector.shape[0] != canonical_matrix.shape[1]:
+                return None
             
-            for canonical_topic, canonical_embedding in canonical_topics:
-                if canonical_embedding is None:
-                    continue
-                
-                # Compute cosine similarity
-                dot_product = np.dot(topic_embedding, canonical_embedding)
-                norm_topic = np.linalg.norm(topic_embedding)
-                norm_canonical = np.linalg.norm(canonical_embedding)
-                
-                if norm_topic > 0 and norm_canonical > 0:
-                    similarity = dot_product / (norm_topic * norm_canonical)
-                    # Normalize to [0, 1] range (cosine similarity is [-1, 1])
-                    normalized_similarity = (similarity + 1.0) / 2.0
-                    
-                    if normalized_similarity > best_similarity:
-                        best_similarity = normalized_similarity
-                        best_match = canonical_topic
+            # Cosine similarity against every canonical topic in one matmul
+            similarities = canonical_matrix @ (topic_vector / norm_topic)
+            best_index = int(np.argmax(similarities))
+            best_match = canonical_topics[best_index]
+            # Normalize to [0, 1] range (cosine similarity is [-1, 1])
+            best_similarity = (float(similarities[best_index]) + 1.0) / 2.0
             
             if best_match and best_similarity >= EMBEDDING_SIMILARITY_THRESHOLD:
                 return CanonicalizationResult(
@@ -255,6 +330,45 @@ class Canonicalizer:
             logger.error(f"[CANONICALIZER] Error in embedding canonicalization: {e}", exc_info=True)
             return None
     
+    def learn_from_teacher(self, teacher_result, extra_aliases: Tuple[str, ...] = ()) -> bool:
+        """
+        Store a teacher decision in the alias table.
+        
+        Aliases are merged with those of an existing entry for the canonical topic,
+        so a second teacher call for the same topic doesn't drop earlier aliases.
+        
+        Args:
+            teacher_result: TeacherCanonicalizationResult
+            extra_aliases: Additional aliases to map (e.g. provisional topics used meanwhile)
+            
+        Returns:
+            True if the alias table was updated
+        """
+        # Generate embedding for canonical topic if embedding model is available
+        canonical_embedding = None
+        if self._embedding_model_available:
+            try:
+                canonical_embedding = embed_query(teacher_result.canonical_topic)
+            except Exception as e:
+                logger.warning(f"[CANONICALIZER] Failed to generate embedding for canonical topic: {e}")
+        
+        aliases = []
+        existing = self.alias_table.get_entry(teacher_result.canonical_topic)
+        for alias in (existing.aliases if existing else []) + list(teacher_result.aliases) + list(extra_aliases):
+            if alias and alias not in aliases:
+                aliases.append(alias)
+        if canonical_embedding is None and existing is not None:
+            canonical_embedding = existing.embedding
+        
+        # Update alias table with teacher's mappings
+        return self.alias_table.add_entry(
+            canonical_topic=teacher_result.canonical_topic,
+            aliases=aliases,
+            embedding=canonical_embedding,
+            created_by="teacher",
+            confidence=1.0
+        )
+    
     def _canonicalize_via_teacher(
         self,
         raw_topic: str,
@@ -274,33 +388,18 @@ class Canonicalizer:
         Returns:
             CanonicalizationResult with teacher's decision
         """
-        from server.services.teacher_model import invoke_teacher_for_canonicalization
+        from server.services.teacher_model import run_teacher_canonicalization
         
         try:
             logger.info(
                 f"[CANONICALIZER] Invoking Teacher Model for low-confidence topic: '{raw_topic}'"
             )
             
-            teacher_result = invoke_teacher_for_canonicalization(raw_topic, normalized_topic)
+            teacher_result = run_teacher_canonicalization(raw_topic, normalized_topic)
             
             if teacher_result:
                 # Teacher has decided canonical topic and aliases
-                # Generate embedding for canonical topic if embedding model is available
-                canonical_embedding = None
-                if self._embedding_model_available:
-                    try:
-                        canonical_embedding = embed_query(teacher_result.canonical_topic)
-                    except Exception as e:
-                        logger.warning(f"[CANONICALIZER] Failed to generate embedding for canonical topic: {e}")
-                
-                # Update alias table with teacher's mappings
-                self.alias_table.add_entry(
-                    canonical_topic=teacher_result.canonical_topic,
-                    aliases=teacher_result.aliases,
-                    embedding=canonical_embedding,
-                    created_by="teacher",
-                    confidence=1.0
-                )
+                self.learn_from_teacher(teacher_result)
                 
                 logger.info(
                     f"[CANONICALIZER] Teacher canonicalized '{raw_topic}' → '{teacher_result.canonical_topic}' "
@@ -354,3 +453,8 @@ def canonicalize_topic(
     canonicalizer = get_canonicalizer()
     return canonicalizer.canonicalize(raw_topic, invoke_teacher=invoke_teacher)
 
+
+def get_canonicalization_cache_stats() -> Dict[str, Any]:
+    """Hit/miss stats of the canonicalization memo cache (for facts telemetry)."""
+    return get_canonicalizer().get_cache_stats()
+
@@ -15,6 +15,7 @@ from chatdo.memory import store as memory_store
 from .smart_search_classifier import decide_web_search
 from .memory_service_client import get_project_memory_context, get_memory_client
 from . import librarian
+from .canonicalizer import get_canonicalization_cache_stats
 
 logger = logging.getLogger(__name__)
 
@@ -536,6 +537,7 @@ def build_model_label(
     index_status: str = "P",
     escalated: bool = True,
     nano_router_used: bool = False,
+    router_source: str = "nano",
     reasoning_required: bool = True,
     canonicalizer_used: bool = False,
     teacher_invoked: bool = False,
@@ -553,13 +555,16 @@ def build_model_label(
     - "GPT-5 Nano → Canonicalizer → Facts-R(2) → GPT-5" (read with reasoning)
     - "GPT-5 Nano → Canonicalizer → Facts-R(1)" (strong Facts-R enforcement, no Index-P search)
     - "GPT-5 Nano → GPT-5" (chat only, no canonicalizer)
+    - "Local Router → Canonicalizer → Facts-R(1)" (routed without Nano by the local router)
+    - "GPT-5 Nano (cached) → GPT-5" (Nano plan reused from the routing plan cache)
     
     Args:
         facts_actions: Dict with keys S, U, R, F (all integers >= 0, F is bool)
         files_actions: Dict with key R (integer >= 0)
         index_status: "P" (passed) or "F" (failed)
         escalated: Always True (kept for compatibility)
-        nano_router_used: Whether Nano router was used (always True now)
+        nano_router_used: Whether Nano router was used
+        router_source: "nano", "local" (local router decided without Nano) or "cache" (cached Nano plan)
         reasoning_required: Whether GPT-5 reasoning is required
         canonicalizer_used: Whether canonicalizer was invoked
         teacher_invoked: Whether teacher model was invoked
@@ -568,7 +573,8 @@ def build_model_label(
     Returns:
         Model label string (e.g., "GPT-5 Nano → Canonicalizer → Teacher → Facts-S(3)")
     """
-    parts = ["GPT-5 Nano"]  # Always start with Nano router
+    # Always start with the router
+    parts = [{"local": "Local Router", "cache": "GPT-5 Nano (cached)"}.get(router_source, "GPT-5 Nano")]
     
     # Add Canonicalizer if used (only for Facts operations)
     if canonicalizer_used:
@@ -717,13 +723,15 @@ async def chat_with_smart_search(
             f"last_rank={strong_facts_read_candidate['last_rank']}"
         )
     
-    # Call Nano router - MANDATORY FIRST STEP
+    # Route the message - MANDATORY FIRST STEP (local router, GPT-5 Nano when it is not confident)
     routing_plan = None
     nano_router_used = False
+    router_source = "nano"  # "local" / "cache" when the plan came from the local router / routing plan cache
     try:
-        from server.services.nano_router import route_with_nano, NanoRouterError
+        from server.services.local_router import route_message
         from server.contracts.routing_plan import RoutingPlan, FactsReadCandidate
-        routing_plan = await route_with_nano(user_message, conversation_history)
+        # Cached plan or local tier first; GPT-5 Nano decides when neither applies
+        routing_plan, router_source = await route_message(user_message, conversation_history, project_id=project_id)
         
         # Override routing plan if strong Facts read pattern detected
         if strong_facts_read_candidate:
@@ -773,7 +781,7 @@ async def chat_with_smart_search(
                 f"operation={routing_plan.operation}, "
                 f"facts_read_candidate={routing_plan.facts_read_candidate}"
             )
-        nano_router_used = True
+        nano_router_used = router_source == "nano"
         logger.info(
             f"[NANO-ROUTER] ✅ Routing plan: content_plane={routing_plan.content_plane}, "
             f"operation={routing_plan.operation}, reasoning_required={routing_plan.reasoning_required}, "
@@ -1392,6 +1400,7 @@ async def chat_with_smart_search(
                                 index_status=index_status,
                                 escalated=False,
                                 nano_router_used=nano_router_used,
+                                router_source=router_source,
                                 reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                                 canonicalizer_used=canonicalizer_used_hist,
                                 teacher_invoked=teacher_invoked_hist,
@@ -1424,6 +1433,7 @@ async def chat_with_smart_search(
                         index_status=index_status,
                         escalated=False,
                         nano_router_used=nano_router_used,
+                        router_source=router_source,
                         reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                         canonicalizer_used=canonicalizer_used,
                         teacher_invoked=teacher_invoked
@@ -1448,6 +1458,7 @@ async def chat_with_smart_search(
                             "canonical_confidence": canonicalization_result.confidence if canonicalization_result else None,
                             "teacher_invoked": teacher_invoked,
                             "alias_source": canonicalization_result.source if canonicalization_result else None,
+                            "canonicalization_cache": get_canonicalization_cache_stats(),
                             "rank_assignment_source": rank_assignment_source,  # Dict: fact_key -> "explicit" | "atomic_append"
                             "duplicate_blocked": duplicate_blocked,  # Dict: value -> {"value": str, "existing_rank": int, "topic": str, "list_key": str}
                             "rank_mutations": rank_mutations,  # Dict: fact_key -> {"action": str, "old_rank": int|None, "new_rank": int, "value": str, "topic": str}
@@ -1457,6 +1468,7 @@ async def chat_with_smart_search(
                                 "reasoning_required": routing_plan.reasoning_required if routing_plan else None,
                                 "confidence": routing_plan.confidence if routing_plan else None
                             },
+                            "router_source": router_source,
                             "nano_router_used": nano_router_used
                         },
                         "sources": [],
@@ -1511,6 +1523,7 @@ async def chat_with_smart_search(
                             index_status=index_status,
                             escalated=False,
                             nano_router_used=nano_router_used,
+                            router_source=router_source,
                             reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                             canonicalizer_used=canonicalizer_used_hist,
                             teacher_invoked=teacher_invoked_hist
@@ -1538,6 +1551,7 @@ async def chat_with_smart_search(
                         index_status=index_status,
                         escalated=False,
                         nano_router_used=nano_router_used,
+                        router_source=router_source,
                         reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                         canonicalizer_used=canonicalizer_used,
                         teacher_invoked=teacher_invoked
@@ -1562,6 +1576,7 @@ async def chat_with_smart_search(
                             "canonical_confidence": canonicalization_result.confidence if canonicalization_result else None,
                             "teacher_invoked": teacher_invoked,
                             "alias_source": canonicalization_result.source if canonicalization_result else None,
+                            "canonicalization_cache": get_canonicalization_cache_stats(),
                             "rank_assignment_source": rank_assignment_source,
                             "duplicate_blocked": duplicate_blocked,
                             "nano_routing_plan": {
@@ -1570,6 +1585,7 @@ async def chat_with_smart_search(
                                 "reasoning_required": routing_plan.reasoning_required if routing_plan else None,
                                 "confidence": routing_plan.confidence if routing_plan else None
                             },
+                            "router_source": router_source,
                             "nano_router_used": nano_router_used
                         },
                         "sources": [],
@@ -1633,6 +1649,7 @@ async def chat_with_smart_search(
                         index_status=index_status,
                         escalated=False,
                         nano_router_used=nano_router_used,
+                        router_source=router_source,
                         reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                         canonicalizer_used=canonicalizer_used_f,
                         teacher_invoked=teacher_invoked_f
@@ -1656,12 +1673,14 @@ async def chat_with_smart_search(
                                 "reasoning_required": routing_plan.reasoning_required if routing_plan else None,
                                 "confidence": routing_plan.confidence if routing_plan else None
                             },
+                            "router_source": router_source,
                             "nano_router_used": nano_router_used,
                             # Canonicalization telemetry (may be None on failure)
                             "canonical_topic": canonicalization_result.canonical_topic if canonicalization_result else None,
                             "canonical_confidence": canonicalization_result.confidence if canonicalization_result else None,
                             "teacher_invoked": teacher_invoked_f,
                             "alias_source": canonicalization_result.source if canonicalization_result else None,
+                            "canonicalization_cache": get_canonicalization_cache_stats(),
                             "rank_assignment_source": None  # No facts stored, so no rank assignment
                         },
                         "sources": [],
@@ -1687,6 +1706,7 @@ async def chat_with_smart_search(
                     index_status=index_status,
                     escalated=False,
                     nano_router_used=nano_router_used,
+                    router_source=router_source,
                     reasoning_required=routing_plan.reasoning_required if routing_plan else True
                 )
                 return {
@@ -1708,6 +1728,7 @@ async def chat_with_smart_search(
                             "reasoning_required": routing_plan.reasoning_required if routing_plan else None,
                             "confidence": routing_plan.confidence if routing_plan else None
                         },
+                        "router_source": router_source,
                         "nano_router_used": nano_router_used
                     },
                     "sources": [],
@@ -2104,6 +2125,7 @@ async def chat_with_smart_search(
                         index_status=index_status,
                         escalated=False,
                         nano_router_used=nano_router_used,
+                        router_source=router_source,
                         reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                         canonicalizer_used=canonicalizer_used_read,
                         teacher_invoked=teacher_invoked_read,
@@ -2143,6 +2165,7 @@ async def chat_with_smart_search(
                                 index_status=index_status,
                                 escalated=False,
                                 nano_router_used=nano_router_used,
+                                router_source=router_source,
                                 reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                                 canonicalizer_used=canonicalizer_used_hist,
                                 teacher_invoked=teacher_invoked_hist,
@@ -2185,6 +2208,7 @@ async def chat_with_smart_search(
                             "canonical_confidence": canonicalization_result.confidence if canonicalization_result else None,
                             "teacher_invoked": teacher_invoked_read,
                             "alias_source": canonicalization_result.source if canonicalization_result else None,
+                            "canonicalization_cache": get_canonicalization_cache_stats(),
                             # Rank telemetry
                             "requested_rank": query_plan.rank if query_plan else None,
                             "detected_rank": query_plan.rank if query_plan else None,
@@ -2284,6 +2308,7 @@ async def chat_with_smart_search(
                                 index_status=index_status,
                                 escalated=False,
                                 nano_router_used=nano_router_used,
+                                router_source=router_source,
                                 reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                                 canonicalizer_used=canonicalizer_used_empty,
                                 teacher_invoked=teacher_invoked_empty,
@@ -2376,6 +2401,7 @@ async def chat_with_smart_search(
                         index_status=index_status,
                         escalated=False,
                         nano_router_used=nano_router_used,
+                        router_source=router_source,
                         reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                         canonicalizer_used=canonicalizer_used_empty_resp,
                         teacher_invoked=teacher_invoked_empty_resp,
@@ -2404,6 +2430,7 @@ async def chat_with_smart_search(
                             "canonical_confidence": canonicalization_result.confidence if canonicalization_result else None,
                             "teacher_invoked": teacher_invoked_empty_resp,
                             "alias_source": canonicalization_result.source if canonicalization_result else None,
+                            "canonicalization_cache": get_canonicalization_cache_stats(),
                             # Rank telemetry (from FactsAnswer)
                             "requested_rank": query_plan.rank if query_plan else None,
                             "detected_rank": query_plan.rank if query_plan else None,
@@ -2439,6 +2466,7 @@ async def chat_with_smart_search(
                     index_status=index_status,
                     escalated=False,
                     nano_router_used=nano_router_used,
+                    router_source=router_source,
                     reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                     canonicalizer_used=canonicalizer_used_guard,
                     teacher_invoked=teacher_invoked_guard,
@@ -2546,6 +2574,7 @@ async def chat_with_smart_search(
                     index_status=index_status,
                     escalated=False,
                     nano_router_used=nano_router_used,
+                    router_source=router_source,
                     reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                     canonicalizer_used=canonicalizer_used_guard,
                     teacher_invoked=teacher_invoked_guard
@@ -2664,6 +2693,7 @@ async def chat_with_smart_search(
                     index_status=index_status,
                     escalated=False,
                     nano_router_used=nano_router_used,
+                    router_source=router_source,
                     reasoning_required=routing_plan.reasoning_required if routing_plan else True,
                     canonicalizer_used=False,
                     teacher_invoked=False,
@@ -2980,6 +3010,7 @@ async def chat_with_smart_search(
             index_status=index_status,
             escalated=True,
             nano_router_used=nano_router_used,
+            router_source=router_source,
             reasoning_required=routing_plan.reasoning_required if routing_plan else True
         )
         logger.info(f"[MODEL] model label = {model_display}")
@@ -3117,6 +3148,7 @@ async def chat_with_smart_search(
                     "reasoning_required": routing_plan.reasoning_required if routing_plan else None,
                     "confidence": routing_plan.confidence if routing_plan else None
                 },
+                "router_source": router_source,
                 "nano_router_used": nano_router_used,
                 "message_uuid": current_message_uuid if current_message_uuid else None,  # Echo back persisted user message UUID for reconciliation
                 "client_message_uuid": client_message_uuid if client_message_uuid else None  # Echo back client UUID for reconciliation
@@ -3298,6 +3330,7 @@ async def chat_with_smart_search(
                     "reasoning_required": routing_plan.reasoning_required if routing_plan else None,
                     "confidence": routing_plan.confidence if routing_plan else None
                 },
+                "router_source": router_source,
                 "nano_router_used": nano_router_used,
                 "message_uuid": current_message_uuid if current_message_uuid else None,  # Echo back persisted user message UUID for reconciliation
                 "client_message_uuid": client_message_uuid if client_message_uuid else None  # Echo back client UUID for reconciliation
@@ -3457,6 +3490,7 @@ async def chat_with_smart_search(
                 index_status=index_status,
                 escalated=True,
                 nano_router_used=nano_router_used,
+                router_source=router_source,
                 reasoning_required=routing_plan.reasoning_required if routing_plan else True
             )
             # Use constructed message_id to match indexing (enables UUID lookup)
@@ -3531,6 +3565,7 @@ async def chat_with_smart_search(
         index_status=index_status,
         escalated=True,
         nano_router_used=nano_router_used,
+        router_source=router_source,
                             reasoning_required=routing_plan.reasoning_required if routing_plan else True
     )
     if thread_id:
@@ -3603,6 +3638,7 @@ async def chat_with_smart_search(
                 "reasoning_required": routing_plan.reasoning_required if routing_plan else None,
                 "confidence": routing_plan.confidence if routing_plan else None
             },
+            "router_source": router_source,
             "nano_router_used": nano_router_used
         },
         "model": model_label.replace("Model: ", ""),  # Return without "Model: " prefix for backward compatibility
@@ -21,6 +21,9 @@ from server.services.facts_normalize import (
     extract_topic_from_list_key
 )
 from server.services.projects.project_resolver import validate_project_uuid
+from server.services.ranked_list_cache import get_ranked_list_cache, ranked_list_item
+from server.services.routing_plan_cache import get_routing_plan_cache
+from server.services.teacher_queue import get_teacher_queue
 from memory_service.memory_dashboard import db
 
 logger = logging.getLogger(__name__)
@@ -49,32 +52,16 @@ def _get_max_rank_atomic(
     """
     cursor = conn.cursor()
     
-    # Query all ranked facts for this topic (using list_key prefix)
-    # Pattern: user.favorites.<topic>.<rank>
+    # One probe of idx_project_facts_list_rank (list_key/rank are derived from
+    # user.favorites.<topic>.<rank> keys, see db._create_schema)
     cursor.execute("""
-        SELECT fact_key, value_text
+        SELECT MAX(rank)
         FROM project_facts
-        WHERE project_id = ? AND fact_key LIKE ? AND is_current = 1
-        ORDER BY fact_key
-    """, (project_uuid, f"{list_key}.%"))
+        WHERE project_id = ? AND list_key = ? AND is_current = 1
+    """, (project_uuid, list_key))
     
-    rows = cursor.fetchall()
-    max_rank = 0
-    
-    for row in rows:
-        fact_key = row[0]
-        # Extract rank from fact_key (e.g., "user.favorites.crypto.5" -> 5)
-        if "." in fact_key:
-            try:
-                rank_str = fact_key.rsplit(".", 1)[1]
-                rank = int(rank_str)
-                if rank > max_rank:
-                    max_rank = rank
-            except (ValueError, IndexError):
-                # Skip invalid rank format
-                continue
-    
-    return max_rank
+    row = cursor.fetchone()
+    return row[0] or 0
 
 
 def normalize_rank_item(s: str) -> str:
@@ -122,10 +109,51 @@ def _tokenize_normalized(s: str) -> set:
     return set(tokens)
 
 
+# Minimum token subset score for alias/fuzzy matching of ranked items
+FUZZY_MATCH_THRESHOLD = 0.85
+
+
+def _fuzzy_match_score(tokens_new: set, tokens_existing: set, threshold: float) -> Optional[float]:
+    """
+    Score an existing ranked item against a new value for alias/fuzzy matching.
+    
+    Args:
+        tokens_new: Tokens of the new value (_tokenize_normalized)
+        tokens_existing: Tokens of the existing item
+        threshold: Minimum subset score to consider a match
+        
+    Returns:
+        Match score (higher is better), or None if the item does not match
+    """
+    if not tokens_new or not tokens_existing:
+        return None
+    
+    # Compute subset score: how many of new_value's tokens are in existing?
+    # This handles cases like "rogue one" matching "Star Wars: Rogue One"
+    intersection = tokens_new.intersection(tokens_existing)
+    subset_score = len(intersection) / len(tokens_new)
+    
+    # Compute Jaccard similarity as tie-breaker
+    union = tokens_new.union(tokens_existing)
+    jaccard = len(intersection) / len(union) if union else 0.0
+    
+    # Combined score: prioritize subset score (all tokens found = perfect match)
+    # Use Jaccard as tie-breaker when subset scores are equal
+    if subset_score == 1.0:
+        # Perfect subset match - all tokens from new_value are in existing
+        # This is the ideal case (e.g., "rogue one" → "Star Wars: Rogue One")
+        return 1.0 + jaccard  # Boost perfect subset matches
+    if subset_score >= threshold:
+        # Good enough match
+        return subset_score + (jaccard * 0.1)  # Jaccard as minor tie-breaker
+    # Below threshold
+    return None
+
+
 def resolve_ranked_item_target(
     new_value: str,
     existing_items: List[Dict[str, Any]],
-    threshold: float = 0.85
+    threshold: float = FUZZY_MATCH_THRESHOLD
 ) -> Optional[Dict[str, Any]]:
     """
     Resolve a new value to an existing ranked item using exact or fuzzy/alias matching.
@@ -179,29 +207,8 @@ def resolve_ranked_item_target(
         normalized_existing = normalize_rank_item(item["value_text"])
         tokens_existing = _tokenize_normalized(normalized_existing)
         
-        if not tokens_existing:
-            continue
-        
-        # Compute subset score: how many of new_value's tokens are in existing?
-        # This handles cases like "rogue one" matching "Star Wars: Rogue One"
-        intersection = tokens_new.intersection(tokens_existing)
-        subset_score = len(intersection) / len(tokens_new) if tokens_new else 0.0
-        
-        # Compute Jaccard similarity as tie-breaker
-        union = tokens_new.union(tokens_existing)
-        jaccard = len(intersection) / len(union) if union else 0.0
-        
-        # Combined score: prioritize subset score (all tokens found = perfect match)
-        # Use Jaccard as tie-breaker when subset scores are equal
-        if subset_score == 1.0:
-            # Perfect subset match - all tokens from new_value are in existing
-            # This is the ideal case (e.g., "rogue one" → "Star Wars: Rogue One")
-            score = 1.0 + jaccard  # Boost perfect subset matches
-        elif subset_score >= threshold:
-            # Good enough match
-            score = subset_score + (jaccard * 0.1)  # Jaccard as minor tie-breaker
-        else:
-            # Below threshold
+        score = _fuzzy_match_score(tokens_new, tokens_existing, threshold)
+        if score is None:
             continue
         
         if score > best_score:
@@ -310,16 +317,14 @@ def _check_ranked_list_exists(
     """
     cursor = conn.cursor()
     
-    # Query for any ranked facts for this topic (using list_key prefix)
-    # Pattern: user.favorites.<topic>.<rank>
     cursor.execute("""
-        SELECT COUNT(*) 
+        SELECT 1
         FROM project_facts
-        WHERE project_id = ? AND fact_key LIKE ? AND is_current = 1
-    """, (project_uuid, f"{list_key}.%"))
+        WHERE project_id = ? AND list_key = ? AND is_current = 1
+        LIMIT 1
+    """, (project_uuid, list_key))
     
-    count = cursor.fetchone()[0]
-    return count > 0
+    return cursor.fetchone() is not None
 
 
 def _get_ranked_list_items(
@@ -343,33 +348,50 @@ def _get_ranked_list_items(
     cursor = conn.cursor()
     
     cursor.execute("""
-        SELECT fact_key, value_text
+        SELECT fact_key, rank, value_text
         FROM project_facts
-        WHERE project_id = ? AND fact_key LIKE ? AND is_current = 1
-        ORDER BY fact_key
-    """, (project_uuid, f"{list_key}.%"))
-    
-    rows = cursor.fetchall()
-    items = []
-    
-    for row in rows:
-        fact_key = row[0]
-        value_text = row[1] if len(row) > 1 else ""
-        
-        # Extract rank from fact_key (e.g., "user.favorites.crypto.2" -> 2)
-        if "." in fact_key:
-            try:
-                rank_str = fact_key.rsplit(".", 1)[1]
-                rank = int(rank_str)
-                items.append({
-                    "fact_key": fact_key,
-                    "rank": rank,
-                    "value_text": value_text
-                })
-            except (ValueError, IndexError):
-                continue
+        WHERE project_id = ? AND list_key = ? AND is_current = 1
+        ORDER BY rank
+    """, (project_uuid, list_key))
+    
+    return [
+        {"fact_key": row[0], "rank": row[1], "value_text": row[2]}
+        for row in cursor.fetchall()
+    ]
+
+
+def _warn_on_topic_drift(conn, project_uuid: str, list_key: str):
+    """
+    Warn when a ranked list is empty but its singular/plural variant has items.
     
-    return items
+    RUNTIME GUARDRAIL (dev/test only): detects topic canonicalization drift when
+    the first item of a list is written. Never merges lists.
+    """
+    # Check for similar lists (same topic but different singular/plural form)
+    current_topic = extract_topic_from_list_key(list_key)
+    if not current_topic:
+        return
+    # Try to find similar topics by checking if singular/plural variants exist
+    # Extract base topic (remove trailing 's' if present)
+    base_topic = current_topic.rstrip('s') if current_topic.endswith('s') else current_topic
+    # Check for plural variant
+    plural_variant_key = f"user.favorites.{base_topic}s" if not current_topic.endswith('s') else None
+    # Check for singular variant
+    singular_variant_key = f"user.favorites.{base_topic}" if current_topic.endswith('s') else None
+    
+    # Check if variant lists exist
+    variant_keys_to_check = [k for k in [plural_variant_key, singular_variant_key] if k and k != list_key]
+    for variant_key in variant_keys_to_check:
+        variant_items = _get_ranked_list_items(conn, project_uuid, variant_key)
+        if len(variant_items) > 0:
+            logger.warning(
+                f"[FACTS-APPLY] TOPIC DRIFT DETECTED: Target list {list_key!r} is empty, "
+                f"but similar list {variant_key!r} exists with {len(variant_items)} items. "
+                f"This may indicate topic canonicalization drift (singular/plural mismatch). "
+                f"Current topic: {current_topic!r}, Variant topic: {extract_topic_from_list_key(variant_key)!r}. "
+                f"DO NOT auto-merge; this is a warning only."
+            )
+            break
 
 
 def _apply_ranked_mutation(
@@ -422,34 +444,8 @@ def _apply_ranked_mutation(
     current_max_rank = len(items)
     
     # RUNTIME GUARDRAIL (dev/test only): Detect topic canonicalization drift
-    # If target list is empty but a very similar list exists (same tokens except plural/singular), log a WARNING
     if len(items) == 0:
-        # Check for similar lists (same topic but different singular/plural form)
-        from server.services.facts_normalize import extract_topic_from_list_key
-        from server.services.facts_topic import canonicalize_topic
-        current_topic = extract_topic_from_list_key(list_key)
-        if current_topic:
-            # Try to find similar topics by checking if singular/plural variants exist
-            # Extract base topic (remove trailing 's' if present)
-            base_topic = current_topic.rstrip('s') if current_topic.endswith('s') else current_topic
-            # Check for plural variant
-            plural_variant_key = f"user.favorites.{base_topic}s" if not current_topic.endswith('s') else None
-            # Check for singular variant
-            singular_variant_key = f"user.favorites.{base_topic}" if current_topic.endswith('s') else None
-            
-            # Check if variant lists exist
-            variant_keys_to_check = [k for k in [plural_variant_key, singular_variant_key] if k and k != list_key]
-            for variant_key in variant_keys_to_check:
-                variant_items = _get_ranked_list_items(conn, project_uuid, variant_key)
-                if len(variant_items) > 0:
-                    logger.warning(
-                        f"[FACTS-APPLY] TOPIC DRIFT DETECTED: Target list {list_key!r} is empty, "
-                        f"but similar list {variant_key!r} exists with {len(variant_items)} items. "
-                        f"This may indicate topic canonicalization drift (singular/plural mismatch). "
-                        f"Current topic: {current_topic!r}, Variant topic: {extract_topic_from_list_key(variant_key)!r}. "
-                        f"DO NOT auto-merge; this is a warning only."
-                    )
-                    break
+        _warn_on_topic_drift(conn, project_uuid, list_key)
     
     # DEBUG LOGGING: Log before state
     logger.info(
@@ -932,14 +928,12 @@ def _check_value_exists_in_ranked_list(
     """
     cursor = conn.cursor()
     
-    # Query all ranked facts for this topic (using list_key prefix)
-    # Pattern: user.favorites.<topic>.<rank>
     cursor.execute("""
-        SELECT fact_key, value_text
+        SELECT rank, value_text
         FROM project_facts
-        WHERE project_id = ? AND fact_key LIKE ? AND is_current = 1
-        ORDER BY fact_key
-    """, (project_uuid, f"{list_key}.%"))
+        WHERE project_id = ? AND list_key = ? AND is_current = 1
+        ORDER BY rank
+    """, (project_uuid, list_key))
     
     rows = cursor.fetchall()
     
@@ -956,7 +950,7 @@ def _check_value_exists_in_ranked_list(
     normalized_cache: Dict[str, str] = {}
     
     for row in rows:
-        fact_key = row[0]
+        rank = row[0]
         existing_value = row[1] if len(row) > 1 else ""
         
         # Use cached normalized value if available, otherwise normalize and cache
@@ -972,18 +966,287 @@ def _check_value_exists_in_ranked_list(
         
         # Compare normalized values (both are already lowercased and normalized)
         if normalized_existing and normalized_existing == normalized_input:
-            # Extract rank from fact_key (e.g., "user.favorites.crypto.2" -> 2)
-            if "." in fact_key:
-                try:
-                    rank_str = fact_key.rsplit(".", 1)[1]
-                    rank = int(rank_str)
-                    return rank
-                except (ValueError, IndexError):
-                    continue
+            return rank
     
     return None
 
 
+# Rows per multi-row statement when a ranked list plan is written (10 bound parameters per inserted row)
+RANKED_LIST_WRITE_BATCH_ROWS = 500
+
+
+class _RankedListPlan:
+    """
+    Working copy of one ranked list for the ops of a single apply transaction.
+    
+    The list is read once; duplicate checks, appends, moves and inserts run against
+    the in-memory items (rank = position + 1) with the same semantics as the
+    per-op path (_check_value_exists_in_ranked_list, _apply_ranked_mutation).
+    write() then stores only the difference against the rows that were read:
+    rows whose item changed rank or value are marked not current and the new
+    rows are inserted, with multi-row statements.
+    """
+    
+    def __init__(self, project_uuid: str, list_key: str, rows: List[tuple]):
+        """
+        Args:
+            project_uuid: Project UUID
+            list_key: Canonical list key (e.g., "user.favorites.crypto")
+            rows: Current (fact_id, rank, value_text) rows of the list, ranks 1..N in order
+        """
+        self.project_uuid = project_uuid
+        self.list_key = list_key
+        self.loaded_fact_ids = [row[0] for row in rows]
+        self.items: List[Dict[str, Any]] = []
+        self.by_normalized: Dict[str, Dict[str, Any]] = {}  # normalize_rank_item(value) -> item
+        self.by_token: Dict[str, Dict[int, Dict[str, Any]]] = {}  # token -> {id(item): item}
+        for fact_id, rank, value_text in rows:
+            self._add_item(value_text, fact_id=fact_id, rank=rank)
+    
+    def _add_item(
+        self,
+        value_text: str,
+        fact_id: Optional[str] = None,
+        rank: Optional[int] = None,
+        confidence: float = 1.0,
+        position: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Add an item (fact_id/rank of the row it was read from, None for new items)."""
+        normalized = normalize_rank_item(value_text)
+        item = {
+            "value_text": value_text,
+            "normalized": normalized,
+            "tokens": _tokenize_normalized(normalized),
+            "fact_id": fact_id,
+            "rank": rank,
+            "confidence": confidence,
+        }
+        if position is None:
+            self.items.append(item)
+        else:
+            self.items.insert(position, item)
+        self.by_normalized.setdefault(normalized, item)
+        for token in item["tokens"]:
+            self.by_token.setdefault(token, {})[id(item)] = item
+        return item
+    
+    def _remove_item(self, position: int) -> Dict[str, Any]:
+        item = self.items.pop(position)
+        if self.by_normalized.get(item["normalized"]) is item:
+            del self.by_normalized[item["normalized"]]
+        for token in item["tokens"]:
+            del self.by_token[token][id(item)]
+        return item
+    
+    def _position(self, item: Dict[str, Any]) -> int:
+        return next(i for i, candidate in enumerate(self.items) if candidate is item)
+    
+    def find_rank(self, value: str) -> Optional[int]:
+        """Rank of the item equal to value after normalize_favorite_value, None if absent."""
+        normalized = normalize_favorite_value(value)
+        item = self.by_normalized.get(normalized) if normalized else None
+        return self._position(item) + 1 if item is not None else None
+    
+    def append(self, value_text: str, confidence: float) -> int:
+        """Append an item and return its rank."""
+        self._add_item(value_text, confidence=confidence)
+        return len(self.items)
+    
+    def _resolve_target(self, value: str) -> tuple:
+        """
+        Resolve value to an existing item like resolve_ranked_item_target.
+        
+        Returns:
+            (existing_item, matched): the item value refers to (or None), and whether it
+            was matched by resolve_ranked_item_target (its stored value is then used)
+        """
+        normalized_input = normalize_rank_item(value)
+        tokens_new = _tokenize_normalized(normalized_input)
+        existing = self.by_normalized.get(normalized_input)
+        if not tokens_new:
+            # resolve_ranked_item_target gives up; only an exact normalized match counts
+            return existing, False
+        if existing is not None:
+            return existing, True
+        
+        # An item reaching the threshold misses at most max_missing of the new tokens, so it
+        # contains at least one of the (max_missing + 1) rarest ones: only those items are scored
+        token_count = len(tokens_new)
+        max_missing = 0
+        while max_missing < token_count - 1 and (token_count - max_missing - 1) / token_count >= FUZZY_MATCH_THRESHOLD:
+            max_missing += 1
+        rarest_tokens = sorted(tokens_new, key=lambda token: len(self.by_token.get(token, ())))[:max_missing + 1]
+        candidates: Dict[int, Dict[str, Any]] = {}
+        for token in rarest_tokens:
+            candidates.update(self.by_token.get(token, {}))
+        
+        scored = []
+        for item in candidates.values():
+            score = _fuzzy_match_score(tokens_new, item["tokens"], FUZZY_MATCH_THRESHOLD)
+            if score is not None:
+                scored.append((score, item))
+        if not scored:
+            return None, False
+        
+        # Highest score wins; ties go to the lowest rank (resolve_ranked_item_target's scan order)
+        positions = {id(item): position for position, item in enumerate(self.items)} if len(scored) > 1 else {}
+        best_score, best_match = max(scored, key=lambda entry: (entry[0], -positions.get(id(entry[1]), 0)))
+        logger.info(
+            f"[FACTS-APPLY] Alias/fuzzy match: '{value}' → '{best_match['value_text']}' "
+            f"(rank {self._position(best_match) + 1}, score={best_score:.3f})"
+        )
+        return best_match, True
+    
+    def mutate(self, value: str, desired_rank: int, normalized_value: str) -> Dict[str, Any]:
+        """
+        Apply an explicit-rank op: MOVE, INSERT, or NO-OP (see _apply_ranked_mutation).
+        
+        Args:
+            value: Raw value string (user-provided)
+            desired_rank: Desired rank (1-based)
+            normalized_value: Normalized value (for storage)
+            
+        Returns:
+            Dict with keys action, old_rank, new_rank, shifted_items (as _apply_ranked_mutation)
+        """
+        existing, matched = self._resolve_target(value)
+        if matched:
+            # Store the matched item's canonical value (e.g. "rogue one" → "Star Wars: Rogue One")
+            normalized_value, _ = normalize_fact_value(existing["value_text"], is_ranked_list=True)
+        old_rank = self._position(existing) + 1 if existing is not None else None
+        
+        # Rank beyond the end: insert appends, a move goes to the last rank
+        max_rank = len(self.items) if existing is not None else len(self.items) + 1
+        if desired_rank > max_rank:
+            logger.info(
+                f"[FACTS-APPLY] Rank {desired_rank} beyond list length ({len(self.items)}), "
+                f"using rank {max_rank}"
+            )
+            desired_rank = max_rank
+        
+        result = {
+            "action": None,
+            "old_rank": None,
+            "new_rank": desired_rank,
+            "shifted_items": []
+        }
+        
+        if old_rank == desired_rank:
+            result["action"] = "noop"
+            result["old_rank"] = desired_rank
+            return result
+        
+        if old_rank is not None:
+            result["action"] = "move"
+            result["old_rank"] = old_rank
+            if old_rank > desired_rank:
+                # Moving earlier: items at desired_rank..(old_rank-1) shift down by 1 (reported from the end)
+                shifted = [(rank, rank + 1) for rank in range(old_rank - 1, desired_rank - 1, -1)]
+            else:
+                # Moving later: items at (old_rank+1)..desired_rank shift up by 1
+                shifted = [(rank, rank - 1) for rank in range(old_rank + 1, desired_rank + 1)]
+        else:
+            result["action"] = "insert"
+            # Items at desired_rank..end shift down by 1 (reported from the end)
+            shifted = [(rank, rank + 1) for rank in range(len(self.items), desired_rank - 1, -1)]
+        
+        result["shifted_items"] = [
+            (rank, new_rank, self.items[rank - 1]["value_text"]) for rank, new_rank in shifted
+        ]
+        if old_rank is not None:
+            self._remove_item(old_rank - 1)
+        # Moved and inserted values are stored as new rows (confidence 1.0, like explicit ranks before)
+        self._add_item(normalized_value, position=desired_rank - 1)
+        
+        logger.info(
+            f"[FACTS-APPLY] Rank mutation {result['action'].upper()}: '{value}' "
+            f"from rank {old_rank} to {desired_rank} for list_key={self.list_key}, "
+            f"shifted {len(result['shifted_items'])} items"
+        )
+        return result
+    
+    def write(self, cursor, message_uuid: str) -> Dict[str, int]:
+        """
+        Store the planned list: supersede changed rows and insert their new versions.
+        
+        Args:
+            cursor: Cursor inside the apply transaction
+            message_uuid: Message UUID recorded on the inserted rows
+            
+        Returns:
+            Dict with inserted and superseded row counts
+        """
+        kept = set()
+        new_rows = []
+        created_at = datetime.now()
+        for rank, item in enumerate(self.items, 1):
+            if item["fact_id"] is not None and item["rank"] == rank:
+                kept.add(item["fact_id"])
+                continue
+            new_rows.append((
+                str(uuid.uuid4()), self.project_uuid, f"{self.list_key}.{rank}", item["value_text"], "string",
+                item["confidence"], message_uuid, created_at, created_at, None
+            ))
+        superseded = [fact_id for fact_id in self.loaded_fact_ids if fact_id not in kept]
+        
+        for offset in range(0, len(superseded), RANKED_LIST_WRITE_BATCH_ROWS):
+            batch = superseded[offset:offset + RANKED_LIST_WRITE_BATCH_ROWS]
+            cursor.execute(f"""
+                UPDATE project_facts
+                SET is_current = 0
+                WHERE fact_id IN ({','.join('?' * len(batch))})
+            """, batch)
+        for offset in range(0, len(new_rows), RANKED_LIST_WRITE_BATCH_ROWS):
+            batch = new_rows[offset:offset + RANKED_LIST_WRITE_BATCH_ROWS]
+            cursor.execute(f"""
+                INSERT INTO project_facts (
+                    fact_id, project_id, fact_key, value_text, value_type,
+                    confidence, source_message_uuid, created_at, effective_at,
+                    supersedes_fact_id, is_current
+                )
+                VALUES {','.join(['(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)'] * len(batch))}
+            """, [param for row in batch for param in row])
+        
+        logger.info(
+            f"[FACTS-APPLY] Wrote ranked list {self.list_key}: {len(self.items)} items, "
+            f"inserted={len(new_rows)} superseded={len(superseded)}"
+        )
+        return {"inserted": len(new_rows), "superseded": len(superseded)}
+
+
+def _load_ranked_list_plan(conn, project_uuid: str, list_key: str) -> Optional[_RankedListPlan]:
+    """
+    Read a ranked list once for planning the transaction's ops on it.
+    
+    Args:
+        conn: Active database connection (must be in a transaction)
+        project_uuid: Project UUID
+        list_key: Canonical list key (e.g., "user.favorites.crypto")
+        
+    Returns:
+        _RankedListPlan, or None if the stored list breaks the ranked-list invariants
+        (its ops then run one by one against the database)
+    """
+    rows = conn.execute("""
+        SELECT fact_id, rank, value_text
+        FROM project_facts
+        WHERE project_id = ? AND list_key = ? AND is_current = 1
+        ORDER BY rank
+    """, (project_uuid, list_key)).fetchall()
+    
+    if not rows:
+        _warn_on_topic_drift(conn, project_uuid, list_key)
+    
+    is_valid, error_msg = validate_ranked_list_invariants(
+        [{"fact_key": f"{list_key}.{rank}", "rank": rank, "value_text": value_text} for _, rank, value_text in rows],
+        list_key
+    )
+    if not is_valid:
+        logger.warning(f"[FACTS-APPLY] Applying ops on {list_key} one by one: {error_msg}")
+        return None
+    return _RankedListPlan(project_uuid, list_key, rows)
+
+
 @dataclass
 class ApplyResult:
     """Result of applying facts operations."""
@@ -1012,6 +1275,55 @@ class ApplyResult:
             self.rank_mutations = {}
 
 
+class _RankedListInvariantError(Exception):
+    """Raised inside the apply transaction to roll it back after an invariant violation."""
+    pass
+
+
+def _materialize_ranked_lists(
+    conn,
+    project_uuid: str,
+    list_keys: set,
+    fact_keys: List[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Read the current items of the ranked lists a transaction wrote, inside that transaction.
+    
+    Args:
+        conn: Database connection of the write transaction
+        project_uuid: Project UUID
+        list_keys: List keys written by ranked-list ops
+        fact_keys: Fact keys written by the transaction ("set" ops may write ranked keys too)
+        
+    Returns:
+        Dict of list_key -> items (ranked_list_cache.ranked_list_item dicts, empty if the list has none)
+    """
+    cursor = conn.cursor()
+    list_keys = set(list_keys)
+    if fact_keys:
+        unique_fact_keys = list(set(fact_keys))
+        cursor.execute(f"""
+            SELECT DISTINCT list_key FROM project_facts
+            WHERE project_id = ? AND fact_key IN ({','.join('?' * len(unique_fact_keys))})
+              AND list_key IS NOT NULL
+        """, [project_uuid] + unique_fact_keys)
+        list_keys.update(row[0] for row in cursor.fetchall())
+    
+    lists: Dict[str, List[Dict[str, Any]]] = {list_key: [] for list_key in list_keys}
+    if not list_keys:
+        return lists
+    
+    cursor.execute(f"""
+        SELECT fact_key, list_key, rank, value_text, source_message_uuid
+        FROM project_facts
+        WHERE project_id = ? AND is_current = 1 AND list_key IN ({','.join('?' * len(list_keys))})
+        ORDER BY rank
+    """, [project_uuid] + list(list_keys))
+    for fact_key, list_key, rank, value_text, source_message_uuid in cursor.fetchall():
+        lists[list_key].append(ranked_list_item(fact_key, list_key, rank, value_text, source_message_uuid))
+    return lists
+
+
 def apply_facts_ops(
     project_uuid: str,
     message_uuid: str,
@@ -1067,31 +1379,34 @@ def apply_facts_ops(
         f"message_uuid={message_uuid}"
     )
     
-    # Initialize DB connection for atomic operations
-    db.init_db(source_id, project_id=project_uuid)
-    conn = db.get_db_connection(source_id, project_id=project_uuid)
-    cursor = conn.cursor()
-    
-    # Start transaction for atomic unranked writes
-    # CRITICAL: Use BEGIN IMMEDIATE to acquire reserved lock BEFORE reading max_rank
-    # This prevents race conditions where two concurrent transactions both read the same
-    # max_rank value before either writes, leading to duplicate rank assignments.
-    # 
-    # SQLite transaction modes:
-    # - BEGIN (DEFERRED): Lock acquired on first write (too late for our use case)
-    # - BEGIN IMMEDIATE: Reserved lock acquired immediately, prevents other writers
-    # - BEGIN EXCLUSIVE: Exclusive lock, prevents all access (too restrictive)
-    #
-    # With BEGIN IMMEDIATE:
-    # - Transaction 1: BEGIN IMMEDIATE (acquires lock) → SELECT max_rank → INSERT
-    # - Transaction 2: BEGIN IMMEDIATE (waits for lock) → SELECT max_rank (sees updated value) → INSERT
-    # This ensures the "read max_rank → calculate new_rank → insert" sequence is atomic.
-    try:
-        cursor.execute("BEGIN IMMEDIATE")
+    db.init_facts_db(source_id, project_id=project_uuid)
+    
+    # All ops run as one mutation on the project facts database's single writer, inside its
+    # BEGIN IMMEDIATE transaction (see memory_dashboard.db_writer). The reserved lock is
+    # held BEFORE max_rank is read, so the "read max_rank → calculate new_rank → insert"
+    # sequence is atomic: writes from this process are serialized by the writer, and a
+    # writer in another process has to wait for the lock and then sees the updated value.
+    # If the mutation raises, all of its writes are rolled back.
+    def _apply_ops(conn):
+        cursor = conn.cursor()
+        facts_version = db.read_facts_version(conn)
+        
+        # Ranked-list ops are planned per list_key: each list is read once, ops run against
+        # the in-memory copy, and the result is written with multi-row statements (see
+        # _RankedListPlan). None marks a list that is applied op by op (invariants broken).
+        plans: Dict[str, Optional[_RankedListPlan]] = {}
+        
+        def _write_plans():
+            for list_key in list(plans):
+                plan = plans.pop(list_key)
+                if plan is not None:
+                    plan.write(cursor, message_uuid)
         
-        # Track max rank per list_key within the transaction for unranked appends
+        # Track max rank per list_key within the transaction for op-by-op unranked appends
         # This ensures sequential rank assignment when appending multiple items
         max_rank_cache: Dict[str, int] = {}  # list_key -> current_max_rank
+        # Ranked lists written by this transaction (written through to the ranked list cache)
+        touched_list_keys = set()
         
         # Process each operation
         for idx, op in enumerate(ops_response.ops, 1):
@@ -1118,10 +1433,20 @@ def apply_facts_ops(
                     canonicalization_result = canonicalize_topic(topic, invoke_teacher=False)  # Don't invoke teacher here - should already be canonical
                     canonical_topic = canonicalization_result.canonical_topic
                     list_key_for_check = canonical_list_key(canonical_topic)
+                    # Rank fact keys below are f"{list_key_for_check}.{rank}", i.e. canonical_rank_key()
+                    # without canonicalizing the topic again for every (shifted) item
+                    touched_list_keys.add(list_key_for_check)
+                    if canonicalization_result.source == "fallback":
+                        # Provisional topic: the teacher queue re-keys this list once the topic is canonicalized
+                        get_teacher_queue().note_provisional_list(project_uuid, list_key_for_check)
                     
                     # Normalize value for duplicate checking (must happen before duplicate check)
                     normalized_value, _ = normalize_fact_value(op.value, is_ranked_list=True)
                     
+                    if list_key_for_check not in plans:
+                        plans[list_key_for_check] = _load_ranked_list_plan(conn, project_uuid, list_key_for_check)
+                    plan = plans[list_key_for_check]
+                    
                     # RANK ASSIGNMENT: This is the SINGLE SOURCE OF TRUTH for rank assignment
                     # - If rank is None: This is an unranked append, assign rank atomically
                     # - If rank is provided: Use it as-is (explicit user intent)
@@ -1144,9 +1469,12 @@ def apply_facts_ops(
                         if is_favorites_topic:
                             # For duplicate checking, use the raw value (not normalized_value from normalize_fact_value)
                             # normalize_favorite_value will handle the normalization for comparison
-                            existing_rank = _check_value_exists_in_ranked_list(
-                                conn, project_uuid, list_key_for_check, op.value
-                            )
+                            if plan is not None:
+                                existing_rank = plan.find_rank(op.value)
+                            else:
+                                existing_rank = _check_value_exists_in_ranked_list(
+                                    conn, project_uuid, list_key_for_check, op.value
+                                )
                             
                             logger.debug(
                                 f"[FACTS-APPLY] Duplicate check result: existing_rank={existing_rank} "
@@ -1169,51 +1497,60 @@ def apply_facts_ops(
                                 # Skip this operation (don't append)
                                 continue
                         
-                        # Unranked append: assign rank atomically
-                        # For multiple appends in the same transaction, track max_rank within the transaction
-                        # to ensure sequential assignment (1, 2, 3, ...) instead of all getting the same rank
-                        if list_key_for_check not in max_rank_cache:
-                            # First op for this list_key: get initial max_rank from DB
-                            max_rank_cache[list_key_for_check] = _get_max_rank_atomic(
-                                conn, project_uuid, canonical_topic, list_key_for_check
-                            )
-                        
-                        # Increment max_rank for this op
-                        max_rank_cache[list_key_for_check] += 1
-                        assigned_rank = max_rank_cache[list_key_for_check]
-                        fact_key = canonical_rank_key(canonical_topic, assigned_rank)
-                        rank_assignment_source = "atomic_append"
-                        logger.info(
-                            f"[FACTS-APPLY] Unranked append: assigned rank {assigned_rank} atomically "
-                            f"(topic={canonical_topic}, list_key={list_key_for_check})"
-                        )
-                        
                         # Normalize value for storage
                         normalized_value, warning = normalize_fact_value(op.value, is_ranked_list=True)
                         if warning:
                             result.warnings.append(f"Operation {idx}: {warning}")
+                        rank_assignment_source = "atomic_append"
                         
-                        # Mark previous facts with same fact_key as not current (before inserting new one)
-                        cursor.execute("""
-                            UPDATE project_facts
-                            SET is_current = 0
-                            WHERE project_id = ? AND fact_key = ? AND is_current = 1
-                        """, (project_uuid, fact_key))
-                        
-                        # Insert new fact with assigned rank
-                        fact_id = str(uuid.uuid4())
-                        created_at = datetime.now()
-                        cursor.execute("""
-                            INSERT INTO project_facts (
-                                fact_id, project_id, fact_key, value_text, value_type,
-                                confidence, source_message_uuid, created_at, effective_at,
-                                supersedes_fact_id, is_current
+                        if plan is not None:
+                            # Rank follows the list as planned so far in this transaction
+                            assigned_rank = plan.append(normalized_value, op.confidence or 1.0)
+                            fact_key = f"{list_key_for_check}.{assigned_rank}"
+                            logger.debug(
+                                f"[FACTS-APPLY] Unranked append: planned rank {assigned_rank} "
+                                f"(topic={canonical_topic}, list_key={list_key_for_check})"
+                            )
+                        else:
+                            # Unranked append: assign rank atomically
+                            # For multiple appends in the same transaction, track max_rank within the transaction
+                            # to ensure sequential assignment (1, 2, 3, ...) instead of all getting the same rank
+                            if list_key_for_check not in max_rank_cache:
+                                # First op for this list_key: get initial max_rank from DB
+                                max_rank_cache[list_key_for_check] = _get_max_rank_atomic(
+                                    conn, project_uuid, canonical_topic, list_key_for_check
+                                )
+                            
+                            # Increment max_rank for this op
+                            max_rank_cache[list_key_for_check] += 1
+                            assigned_rank = max_rank_cache[list_key_for_check]
+                            fact_key = canonical_rank_key(canonical_topic, assigned_rank)
+                            logger.info(
+                                f"[FACTS-APPLY] Unranked append: assigned rank {assigned_rank} atomically "
+                                f"(topic={canonical_topic}, list_key={list_key_for_check})"
                             )
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
-                        """, (
-                            fact_id, project_uuid, fact_key, normalized_value, "string",
-                            op.confidence or 1.0, message_uuid, created_at, created_at, None
-                        ))
+                            
+                            # Mark previous facts with same fact_key as not current (before inserting new one)
+                            cursor.execute("""
+                                UPDATE project_facts
+                                SET is_current = 0
+                                WHERE project_id = ? AND fact_key = ? AND is_current = 1
+                            """, (project_uuid, fact_key))
+                            
+                            # Insert new fact with assigned rank
+                            fact_id = str(uuid.uuid4())
+                            created_at = datetime.now()
+                            cursor.execute("""
+                                INSERT INTO project_facts (
+                                    fact_id, project_id, fact_key, value_text, value_type,
+                                    confidence, source_message_uuid, created_at, effective_at,
+                                    supersedes_fact_id, is_current
+                                )
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+                            """, (
+                                fact_id, project_uuid, fact_key, normalized_value, "string",
+                                op.confidence or 1.0, message_uuid, created_at, created_at, None
+                            ))
                         
                         # Track rank assignment source
                         result.rank_assignment_source[fact_key] = rank_assignment_source
@@ -1252,20 +1589,23 @@ def apply_facts_ops(
                             result.warnings.append(f"Operation {idx}: {warning}")
                         
                         # Apply ranked mutation (MOVE, INSERT, or NO-OP)
-                        mutation_result = _apply_ranked_mutation(
-                            conn=conn,
-                            cursor=cursor,
-                            project_uuid=project_uuid,
-                            canonical_topic=canonical_topic,
-                            list_key=list_key_for_check,
-                            desired_rank=desired_rank,
-                            value=op.value,  # Raw value for logging/comparison
-                            message_uuid=message_uuid,
-                            normalized_value=normalized_value  # Normalized value for storage
-                        )
+                        if plan is not None:
+                            mutation_result = plan.mutate(op.value, desired_rank, normalized_value)
+                        else:
+                            mutation_result = _apply_ranked_mutation(
+                                conn=conn,
+                                cursor=cursor,
+                                project_uuid=project_uuid,
+                                canonical_topic=canonical_topic,
+                                list_key=list_key_for_check,
+                                desired_rank=desired_rank,
+                                value=op.value,  # Raw value for logging/comparison
+                                message_uuid=message_uuid,
+                                normalized_value=normalized_value  # Normalized value for storage
+                            )
                         
                         # Handle mutation result
-                        fact_key = canonical_rank_key(canonical_topic, mutation_result["new_rank"])
+                        fact_key = f"{list_key_for_check}.{mutation_result['new_rank']}"
                         result.rank_assignment_source[fact_key] = rank_assignment_source
                         
                         # Store mutation info for UI messaging
@@ -1313,7 +1653,7 @@ def apply_facts_ops(
                             
                             # Add shifted fact keys to stored_fact_keys
                             for old_rank, new_rank, shifted_value in mutation_result["shifted_items"]:
-                                shifted_fact_key = canonical_rank_key(canonical_topic, new_rank)
+                                shifted_fact_key = f"{list_key_for_check}.{new_rank}"
                                 result.stored_fact_keys.append(shifted_fact_key)
                 
                 elif op.op == "set":
@@ -1333,6 +1673,10 @@ def apply_facts_ops(
                     if value_warning:
                         result.warnings.append(f"Operation {idx}: {value_warning}")
                     
+                    if normalized_key.startswith("user.favorites."):
+                        # May write a ranked key: store the planned lists first, re-read them on the next op
+                        _write_plans()
+                    
                     # Store fact atomically within the transaction
                     fact_id = str(uuid.uuid4())
                     created_at = datetime.now()
@@ -1418,6 +1762,9 @@ def apply_facts_ops(
                 result.errors.append(error_msg)
                 logger.error(f"[FACTS-APPLY] {error_msg}", exc_info=True)
         
+        # Store the planned ranked lists (multi-row writes)
+        _write_plans()
+        
         # RANKED-LIST INVARIANT VALIDATION: Run after all ops but before commit
         # Group operations by list_key to validate each ranked list
         ranked_lists_to_validate: Dict[str, str] = {}  # list_key -> canonical_topic
@@ -1445,27 +1792,24 @@ def apply_facts_ops(
                     result.errors.append(
                         f"Ranked list invariant violation for {canonical_topic}: {error_msg}"
                     )
-                    # Rollback transaction
-                    cursor.execute("ROLLBACK")
-                    conn.rollback()
-                    conn.close()
-                    return result
+                    # Roll back this transaction (errors are already recorded)
+                    raise _RankedListInvariantError(error_msg)
         
-        # Commit transaction
-        cursor.execute("COMMIT")
-        conn.commit()
+        written_lists = _materialize_ranked_lists(conn, project_uuid, touched_list_keys, result.stored_fact_keys)
+        return written_lists, (facts_version, db.read_facts_version(conn))
         
+    try:
+        written_lists, facts_versions = db.run_facts_write(source_id, _apply_ops, project_id=project_uuid, label="apply_facts_ops")
+        if source_id == f"project-{project_uuid}":
+            # The transaction has committed: serve the new lists from the cache right away
+            get_ranked_list_cache().apply_write(project_uuid, written_lists, facts_versions)
+        # Routing plans cached for this project were made against the old facts
+        get_routing_plan_cache().invalidate_project(project_uuid)
+    except _RankedListInvariantError:
+        pass
     except Exception as e:
-        # Rollback on error
-        try:
-            cursor.execute("ROLLBACK")
-            conn.rollback()
-        except:
-            pass
         logger.error(f"[FACTS-APPLY] Transaction failed, rolled back: {e}", exc_info=True)
         result.errors.append(f"Transaction failed: {e}")
-    finally:
-        conn.close()
     
     logger.info(
         f"[FACTS-E2E] APPLY: store_count={result.store_count} update_count={result.update_count} "
@@ -1480,3 +1824,100 @@ def apply_facts_ops(
     
     return result
 
+
+
+def rekey_ranked_list(
+    project_uuid: str,
+    from_list_key: str,
+    to_list_key: str,
+    max_facts: int,
+    source_id: Optional[str] = None
+) -> Optional[Dict[str, int]]:
+    """
+    Move the items of a ranked list to another list key (e.g. provisional topic -> teacher's canonical topic).
+    
+    Items are appended after the target list's last rank in their current order; items whose
+    normalized value is already in the target list are dropped. The source facts are marked
+    not current and superseded by the new ones, in a single transaction.
+    
+    Args:
+        project_uuid: Project UUID
+        from_list_key: List key the items are stored under (e.g., "user.favorites.board_game")
+        to_list_key: Canonical list key to move them to
+        max_facts: Lists with more items are not migrated (returns None)
+        source_id: Optional source ID (uses project-based source if not provided)
+        
+    Returns:
+        Dict with moved and duplicates_dropped counts, or None if the list exceeded max_facts
+    """
+    validate_project_uuid(project_uuid)
+    if source_id is None:
+        source_id = f"project-{project_uuid}"
+    
+    db.init_facts_db(source_id, project_id=project_uuid)
+    
+    def _rekey(conn):
+        cursor = conn.cursor()
+        facts_version = db.read_facts_version(conn)
+        cursor.execute("""
+            SELECT fact_id, value_text, value_type, confidence, source_message_uuid
+            FROM project_facts
+            WHERE project_id = ? AND list_key = ? AND is_current = 1
+            ORDER BY rank
+        """, (project_uuid, from_list_key))
+        items = cursor.fetchall()
+        if len(items) > max_facts:
+            return None, {}, None
+        
+        target_items = _get_ranked_list_items(conn, project_uuid, to_list_key)
+        existing_values = {normalize_rank_item(item["value_text"]) for item in target_items}
+        next_rank = max((item["rank"] for item in target_items), default=0)
+        counts = {"moved": 0, "duplicates_dropped": 0}
+        now = datetime.now()
+        
+        for fact_id, value_text, value_type, confidence, source_message_uuid in items:
+            cursor.execute("UPDATE project_facts SET is_current = 0 WHERE fact_id = ?", (fact_id,))
+            normalized_value = normalize_rank_item(value_text)
+            if normalized_value in existing_values:
+                counts["duplicates_dropped"] += 1
+                continue
+            existing_values.add(normalized_value)
+            next_rank += 1
+            cursor.execute("""
+                INSERT INTO project_facts (
+                    fact_id, project_id, fact_key, value_text, value_type,
+                    confidence, source_message_uuid, created_at, effective_at,
+                    supersedes_fact_id, is_current
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+            """, (
+                str(uuid.uuid4()), project_uuid, f"{to_list_key}.{next_rank}", value_text, value_type,
+                confidence, source_message_uuid, now, now, fact_id
+            ))
+            counts["moved"] += 1
+        
+        is_valid, error_msg = validate_ranked_list_invariants(
+            _get_ranked_list_items(conn, project_uuid, to_list_key), to_list_key
+        )
+        if not is_valid:
+            raise _RankedListInvariantError(error_msg)
+        
+        written_lists = _materialize_ranked_lists(conn, project_uuid, {from_list_key, to_list_key}, [])
+        return counts, written_lists, (facts_version, db.read_facts_version(conn))
+    
+    counts, written_lists, facts_versions = db.run_facts_write(source_id, _rekey, project_id=project_uuid, label="rekey_ranked_list")
+    if counts is None:
+        logger.warning(
+            f"[FACTS-APPLY] Not re-keying {from_list_key} -> {to_list_key} for project {project_uuid}: "
+            f"more than {max_facts} items"
+        )
+        return None
+    
+    if source_id == f"project-{project_uuid}":
+        get_ranked_list_cache().apply_write(project_uuid, written_lists, facts_versions)
+    get_routing_plan_cache().invalidate_project(project_uuid)
+    logger.info(
+        f"[FACTS-APPLY] ✅ Re-keyed {from_list_key} -> {to_list_key} for project {project_uuid}: "
+        f"moved={counts['moved']} duplicates_dropped={counts['duplicates_dropped']}"
+    )
+    return counts
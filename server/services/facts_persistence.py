@@ -247,8 +247,8 @@ def _convert_routing_candidate_to_ops(
             if project_id:
                 try:
                     source_id = f"project-{project_id}"
-                    db.init_db(source_id, project_id=project_id)
-                    conn = db.get_db_connection(source_id, project_id=project_id)
+                    db.init_facts_db(source_id, project_id=project_id)
+                    conn = db.get_facts_db_read_connection(source_id, project_id=project_id)
                     ranked_list_exists = _check_ranked_list_exists(conn, project_id, list_key)
                     conn.close()
                 except Exception as e:
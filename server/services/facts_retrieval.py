@@ -11,7 +11,8 @@ from server.contracts.facts_ops import FactsQueryPlan
 from server.services.projects.project_resolver import validate_project_uuid
 from server.services.facts_normalize import canonical_list_key
 from memory_service.memory_dashboard import db
-from server.services.librarian import search_facts_ranked_list
+from server.services.librarian import get_ranked_list_max_rank, search_facts_ranked_list
+from server.services.ranked_list_cache import get_ranked_list_cache
 
 logger = logging.getLogger(__name__)
 
@@ -70,55 +71,51 @@ def execute_facts_plan(
             # Query ranked list directly from DB
             # Extract topic from list_key if not provided, or build list_key from topic
             # Ensure topic is canonicalized using Canonicalizer subsystem (defensive check)
-            # DEDUPLICATION: Cache canonicalization result per request
+            # Results are memoized process-wide by the canonicalizer, so repeated topics are cheap
             from server.services.canonicalizer import canonicalize_topic as canonicalize_with_subsystem
-            canonicalization_cache = {}  # Cache per request to avoid duplicate calls
             
             if not plan.topic and plan.list_key:
                 # Extract topic from list_key (e.g., "user.favorites.crypto" -> "crypto")
                 from server.services.facts_normalize import extract_topic_from_list_key
                 raw_topic = extract_topic_from_list_key(plan.list_key)
                 if raw_topic:
-                    # Use cache if available
-                    if raw_topic not in canonicalization_cache:
-                        canonicalization_result = canonicalize_with_subsystem(raw_topic, invoke_teacher=False)
-                        canonicalization_cache[raw_topic] = canonicalization_result
-                    plan.topic = canonicalization_cache[raw_topic].canonical_topic
+                    plan.topic = canonicalize_with_subsystem(raw_topic, invoke_teacher=False).canonical_topic
             
             if not plan.list_key and plan.topic:
                 # Canonicalize topic and build list_key
-                if plan.topic not in canonicalization_cache:
-                    canonicalization_result = canonicalize_with_subsystem(plan.topic, invoke_teacher=False)
-                    canonicalization_cache[plan.topic] = canonicalization_result
-                plan.topic = canonicalization_cache[plan.topic].canonical_topic
+                plan.topic = canonicalize_with_subsystem(plan.topic, invoke_teacher=False).canonical_topic
                 plan.list_key = canonical_list_key(plan.topic)
             elif plan.topic:
                 # Ensure topic is canonicalized (defensive - should already be canonical)
-                if plan.topic not in canonicalization_cache:
-                    canonicalization_result = canonicalize_with_subsystem(plan.topic, invoke_teacher=False)
-                    canonicalization_cache[plan.topic] = canonicalization_result
-                plan.topic = canonicalization_cache[plan.topic].canonical_topic
+                plan.topic = canonicalize_with_subsystem(plan.topic, invoke_teacher=False).canonical_topic
             
             if plan.list_key and plan.topic:
                 try:
                     # STORAGE IS UNBOUNDED: Facts are stored without limits.
                     # RETRIEVAL IS PAGINATED: List queries use plan.limit for pagination (default 100, max 1000).
-                    # ORDINAL QUERIES USE UNBOUNDED RETRIEVAL: When plan.rank is set, we retrieve all facts
-                    # internally (limit=None) to find the specific rank, then filter to return only that rank.
-                    # This ensures ordinal queries work correctly even with >1000 facts.
+                    # ORDINAL QUERIES ARE INDEX LOOKUPS: When plan.rank is set, only the fact at that rank is
+                    # read (no limit applies), and the list length comes from MAX(rank) for bounds checking.
+                    # This ensures ordinal queries work correctly (and stay fast) even with >1000 facts.
                     retrieval_limit = None if plan.rank is not None else plan.limit  # None = unbounded retrieval
                     ranked_facts = search_facts_ranked_list(
                         project_id=project_uuid,
                         topic_key=plan.topic,
                         limit=retrieval_limit,  # None for ordinal queries (unbounded)
-                        exclude_message_uuid=exclude_message_uuid
+                        exclude_message_uuid=exclude_message_uuid,
+                        rank=plan.rank
                     )
+                    if plan.rank is not None:
+                        max_available_rank = get_ranked_list_max_rank(
+                            project_id=project_uuid,
+                            topic_key=plan.topic,
+                            exclude_message_uuid=exclude_message_uuid
+                        ) or None
                 except Exception as e:
                     logger.error(f"[FACTS-RETRIEVAL] Failed to search ranked list: {e}", exc_info=True)
                     ranked_facts = []
                 
                 # Calculate max_available_rank for bounds checking
-                if ranked_facts:
+                if ranked_facts and max_available_rank is None:
                     max_available_rank = max(f.get("rank", 0) for f in ranked_facts)
                 
                 # DEFENSIVE DEDUPLICATION: Remove duplicates by normalized value (safety net)
@@ -179,14 +176,19 @@ def execute_facts_plan(
                 if rank_applied and rank_result_found is None:
                     rank_result_found = False
                 
+                cache_stats = get_ranked_list_cache().get_stats()
                 if plan.rank is not None:
                     logger.info(
                         f"[FACTS-RETRIEVAL] Retrieved {len(facts)} ranked list facts for {plan.list_key} at rank {plan.rank} "
                         f"(rank_applied={rank_applied}, rank_result_found={rank_result_found}, "
-                        f"max_available_rank={max_available_rank}, ordinal_parse_source={ordinal_parse_source})"
+                        f"max_available_rank={max_available_rank}, ordinal_parse_source={ordinal_parse_source}, "
+                        f"list_cache_hit_rate={cache_stats['list_hit_rate']})"
                     )
                 else:
-                    logger.debug(f"[FACTS-RETRIEVAL] Retrieved {len(facts)} ranked list facts for {plan.list_key} (max_available_rank={max_available_rank})")
+                    logger.debug(
+                        f"[FACTS-RETRIEVAL] Retrieved {len(facts)} ranked list facts for {plan.list_key} "
+                        f"(max_available_rank={max_available_rank}, list_cache_hit_rate={cache_stats['list_hit_rate']})"
+                    )
             else:
                 logger.warning(f"[FACTS-RETRIEVAL] Missing list_key or topic for ranked list query: list_key={plan.list_key}, topic={plan.topic}")
         
@@ -7,6 +7,7 @@ Memory Service is now a tool only - GPT-5 always generates responses.
 NOTE: Response generation functions have been removed. This module now only
 provides ranking, deduplication, and formatting utilities.
 """
+import heapq
 import logging
 from dataclasses import dataclass
 from datetime import datetime
@@ -851,11 +852,112 @@ def _detect_multi_claim(response: str) -> bool:
     return False
 
 
+def _ranked_topics_match(fact_topic: str, normalized_topic_key: str) -> bool:
+    """Whether a stored list topic answers a query for normalized_topic_key."""
+    fact_topic = fact_topic.lower()
+    return (
+        fact_topic == normalized_topic_key or
+        # Handle plurals (crypto vs cryptos)
+        fact_topic.rstrip('s') == normalized_topic_key.rstrip('s') or
+        # Check if one contains the other (for multi-word topics)
+        (normalized_topic_key in fact_topic) or
+        (fact_topic in normalized_topic_key)
+    )
+
+
+def _matching_ranked_list_keys(all_list_keys: List[str], normalized_topic_key: str) -> List[str]:
+    """List keys (user.favorites.<topic>) among a project's ranked lists matching a canonical topic."""
+    return [
+        list_key
+        for list_key in all_list_keys
+        if _ranked_topics_match(list_key[len("user.favorites."):], normalized_topic_key)
+    ]
+
+
+def _load_ranked_lists(project_id: str, topic_key: str) -> tuple:
+    """
+    Resolve a topic to its ranked lists through the ranked list cache.
+    
+    The topic -> list keys resolution and each materialized list are cached per project;
+    misses are loaded from the (project_id, list_key, rank) index. apply_facts_ops writes
+    the lists it changes through to the cache when its transaction commits; the project's
+    facts_version is checked first, so writes from other processes (chat deletes) drop
+    the cached lists, and topic resolutions are dropped when the alias table changed.
+    
+    Returns:
+        (list_keys, ranked_lists) with one RankedList per list key
+    """
+    from memory_service.memory_dashboard import db
+    from server.services.canonicalizer import get_canonicalizer
+    from server.services.facts_topic import canonicalize_topic
+    from server.services.ranked_list_cache import get_ranked_list_cache, ranked_list_item
+    
+    cache = get_ranked_list_cache()
+    generation = cache.validate(
+        project_id,
+        db.get_facts_version(project_id, source_id=f"project-{project_id}"),
+        get_canonicalizer().alias_table.version
+    )
+    
+    list_keys = cache.get_topic_list_keys(project_id, topic_key)
+    if list_keys is None:
+        all_list_keys = cache.get_list_keys(project_id)
+        if all_list_keys is None:
+            all_list_keys = db.get_ranked_list_keys(project_id, source_id=f"project-{project_id}")
+            cache.put_list_keys(project_id, all_list_keys, generation)
+        list_keys = _matching_ranked_list_keys(all_list_keys, canonicalize_topic(topic_key))
+        cache.put_topic_list_keys(project_id, topic_key, list_keys, generation)
+    
+    ranked_lists = []
+    for list_key in list_keys:
+        ranked_list = cache.get_list(project_id, list_key)
+        if ranked_list is None:
+            facts = db.get_ranked_list_facts(project_id, [list_key], source_id=f"project-{project_id}")
+            ranked_list = cache.put_list(project_id, list_key, [
+                ranked_list_item(f["fact_key"], f["list_key"], f["rank"], f["value_text"], f["source_message_uuid"])
+                for f in facts
+            ], generation)
+        ranked_lists.append(ranked_list)
+    return list(list_keys), ranked_lists
+
+
+def get_ranked_list_max_rank(
+    project_id: str,
+    topic_key: str,
+    exclude_message_uuid: Optional[str] = None
+) -> int:
+    """
+    Get the highest rank stored for a topic's ranked list (0 if the list is empty).
+    
+    Uses the same topic matching as search_facts_ranked_list.
+    
+    Args:
+        project_id: Project UUID (must be UUID format, validated)
+        topic_key: Topic key (e.g., "crypto", "colors") - will be normalized
+        exclude_message_uuid: Optional message UUID whose facts are ignored
+    """
+    try:
+        from server.services.projects.project_resolver import validate_project_uuid
+        
+        validate_project_uuid(project_id)
+        _, ranked_lists = _load_ranked_lists(project_id, topic_key)
+        return max((
+            item["rank"]
+            for ranked_list in ranked_lists
+            for item in ranked_list.items
+            if not exclude_message_uuid or item["source_message_uuid"] != exclude_message_uuid
+        ), default=0)
+    except Exception as e:
+        logger.error(f"[LIBRARIAN] Failed to get max rank for topic_key={topic_key}: {e}", exc_info=True)
+        return 0
+
+
 def search_facts_ranked_list(
     project_id: str,
     topic_key: str,
     limit: Optional[int] = None,  # None = unbounded, only use for pagination
-    exclude_message_uuid: Optional[str] = None
+    exclude_message_uuid: Optional[str] = None,
+    rank: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Search for ranked facts (facts with rank in fact_key) for a given topic.
@@ -874,9 +976,10 @@ def search_facts_ranked_list(
         topic_key: Topic key (e.g., "crypto", "colors") - will be normalized
         limit: Optional maximum number of facts to return (None = unbounded, returns all)
         exclude_message_uuid: Optional message UUID to exclude from results
+        rank: Optional rank; only the fact at this rank is returned (ordinal queries)
         
     Returns:
-        List of fact dicts with:
+        List of fact dicts (sorted by rank) with:
         - fact_key: Full fact key (e.g., "user.favorites.crypto.1")
         - value_text: Fact value
         - source_message_uuid: UUID of the message that stored this fact (for deep linking)
@@ -884,84 +987,40 @@ def search_facts_ranked_list(
         - schema_hint: Schema hint metadata for topic resolution
     """
     try:
-        from memory_service.memory_dashboard import db
         from server.services.projects.project_resolver import validate_project_uuid
-        import re
         
         # Enforce Facts DB contract: project_id must be UUID
         validate_project_uuid(project_id)
         
-        # Canonicalize topic_key using Facts canonical normalization (single source of truth)
-        from server.services.facts_topic import canonicalize_topic
-        normalized_topic_key = canonicalize_topic(topic_key)
-        
-        # Search facts using the topic as query (searches fact_key and value_text)
-        # This will find facts like "user.favorites.crypto.1", "user.favorites.crypto.2", etc.
         # STORAGE IS UNBOUNDED: Facts are stored without limits.
-        # RETRIEVAL IS PAGINATED: Use limit for pagination (default 10000 for large lists, but storage has no cap).
-        # This high limit (10000) supports large ranked lists while still being paginated (not truly unbounded).
-        # CRITICAL: For slice requests ("top N"), we need to retrieve all matching facts, sort by rank,
-        # then apply the limit. If we apply limit before filtering/sorting, we might get the wrong items.
-        # So we use a high limit (or None) for the DB search, then filter, sort, and apply limit after.
-        search_limit = None if limit is not None else 10000  # Use None for slice requests to get all facts
-        if limit is None:
-            search_limit = 10000  # Default for unbounded queries
+        # Lists are served from the ranked list cache, already sorted by rank: ordinal lookups
+        # ("#N") bisect on rank and slice requests ("top N") stop after N items.
+        list_keys, ranked_lists = _load_ranked_lists(project_id, topic_key)
+        if rank is not None:
+            candidates = [item for ranked_list in ranked_lists for item in ranked_list.at_rank(rank)]
+            candidates.sort(key=lambda item: item["schema_hint"]["key_prefix"])
+        elif len(ranked_lists) == 1:
+            candidates = ranked_lists[0].items
         else:
-            # For slice requests, retrieve more facts than needed to ensure we get all matches
-            # Then filter, sort, and apply limit after sorting
-            search_limit = max(limit * 10, 100)  # Retrieve at least 10x the requested limit or 100, whichever is larger
-        
-        source_id = f"project-{project_id}"
-        facts = db.search_current_facts(
-            project_id=project_id,
-            query=normalized_topic_key,  # Search for the topic
-            limit=search_limit,
-            source_id=source_id,
-            exclude_message_uuid=exclude_message_uuid
-        )
+            # Each list is sorted by rank and the lists come in list_key order, so a lazy
+            # merge yields (rank, list_key) order and "top N" stops after N items
+            candidates = heapq.merge(
+                *(ranked_list.items for ranked_list in ranked_lists),
+                key=lambda item: item["rank"]
+            )
         
-        # Filter to only ranked facts matching schema convention: user.favorites.<topic>.<rank>
         ranked_facts = []
-        for fact in facts:
-            fact_key = fact.get("fact_key", "")
-            # Check if fact_key matches pattern user.favorites.<topic>.<rank>
-            if re.match(r'^user\.favorites\.(.+)\.\d+$', fact_key):
-                # Extract the topic part
-                topic_match = re.match(r'^user\.favorites\.(.+)\.(\d+)$', fact_key)
-                if topic_match:
-                    fact_topic = topic_match.group(1)
-                    rank = int(topic_match.group(2))
-                    fact_topic_base = fact_topic.lower()
-                    
-                    # Check if the normalized topic_key matches the fact topic
-                    topics_match = (
-                        fact_topic_base == normalized_topic_key or
-                        # Handle plurals (crypto vs cryptos)
-                        fact_topic_base.rstrip('s') == normalized_topic_key.rstrip('s') or
-                        # Check if one contains the other (for multi-word topics)
-                        (normalized_topic_key in fact_topic_base) or
-                        (fact_topic_base in normalized_topic_key)
-                    )
-                    
-                    if topics_match:
-                        ranked_facts.append({
-                            "fact_key": fact_key,
-                            "value_text": fact.get("value_text", ""),
-                            "source_message_uuid": fact.get("source_message_uuid"),
-                            "rank": rank,
-                            "schema_hint": fact.get("schema_hint")  # Include schema_hint
-                        })
-        
-        # Sort by rank (ascending: 1, 2, 3, ...)
-        ranked_facts.sort(key=lambda f: f.get("rank", 0))
-        
-        # Apply limit AFTER filtering and sorting (for slice requests)
-        if limit is not None:
-            ranked_facts = ranked_facts[:limit]
+        for item in candidates:
+            if limit is not None and len(ranked_facts) >= limit:
+                break
+            if exclude_message_uuid and item["source_message_uuid"] == exclude_message_uuid:
+                continue
+            # Copies: callers may annotate the returned dicts
+            ranked_facts.append({**item, "schema_hint": dict(item["schema_hint"])})
         
         logger.info(
             f"[LIBRARIAN] Found {len(ranked_facts)} ranked facts for topic_key={topic_key} "
-            f"(normalized={normalized_topic_key}, limit={limit})"
+            f"(list_keys={list_keys}, limit={limit}, rank={rank})"
         )
         
         return ranked_facts
@@ -1004,8 +1063,8 @@ def get_recent_ranked_list_keys(
         if source_id is None:
             source_id = f"project-{project_id}"
         
-        db.init_db(source_id, project_id=project_id)
-        conn = db.get_db_connection(source_id, project_id=project_id)
+        db.init_facts_db(source_id, project_id=project_id)
+        conn = db.get_facts_db_read_connection(source_id, project_id=project_id)
         cursor = conn.cursor()
         
         # Get recent facts matching user.favorites.* pattern
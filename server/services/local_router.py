@@ -0,0 +1,523 @@
+"""
+Local Router - fast-path tier in front of the Nano router.
+
+Many messages are trivial to classify: greetings and acknowledgements, facts
+read queries ("What is my second favorite crypto?"), and chat that looks like
+earlier chat. route_message() scores every message locally first:
+
+1. Deterministic rules: greetings/acknowledgements -> chat; facts read queries
+   -> facts/read with the candidate Nano would extract
+2. kNN over embeddings of past Nano decisions (message -> routing class). Only
+   candidate-free plans (chat) are decided this way, since candidates are
+   specific to the message.
+
+When the local decision is confident (LOCAL_ROUTER_MIN_CONFIDENCE), the Nano
+call is skipped. Otherwise nano_router.route_with_nano() decides, and its decision becomes
+a new kNN example. A sample of confident decisions (LOCAL_ROUTER_AUDIT_RATE)
+still goes to Nano, so disagreement is measured on bypassed messages too.
+"""
+import asyncio
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from server.contracts.routing_plan import FactsReadCandidate, RoutingPlan
+from server.services import nano_router
+from server.services.ordinal_detection import detect_ordinal_or_slice
+from server.services.routing_plan_cache import get_routing_plan_cache
+
+logger = logging.getLogger(__name__)
+
+# Past routing decisions (global, not project-specific)
+ROUTING_EXAMPLES_DB_PATH = Path(__file__).parent.parent.parent / "data" / "routing_examples.db"
+
+# Configuration
+LOCAL_ROUTER_ENABLED = os.getenv("LOCAL_ROUTER_ENABLED", "1") == "1"  # "0" sends every message to Nano
+LOCAL_ROUTER_MIN_CONFIDENCE = float(os.getenv("LOCAL_ROUTER_MIN_CONFIDENCE", "0.9"))  # Nano is skipped at or above this
+LOCAL_ROUTER_AUDIT_RATE = float(os.getenv("LOCAL_ROUTER_AUDIT_RATE", "0.05"))  # Confident decisions still checked by Nano
+LOCAL_ROUTER_KNN_K = int(os.getenv("LOCAL_ROUTER_KNN_K", "7"))  # Nearest past messages consulted
+LOCAL_ROUTER_KNN_MIN_SIMILARITY = float(os.getenv("LOCAL_ROUTER_KNN_MIN_SIMILARITY", "0.9"))  # Cosine; less similar neighbors don't vote
+LOCAL_ROUTER_KNN_MIN_VOTES = int(os.getenv("LOCAL_ROUTER_KNN_MIN_VOTES", "3"))  # Voting neighbors needed for a decision
+LOCAL_ROUTER_MAX_EXAMPLES = int(os.getenv("LOCAL_ROUTER_MAX_EXAMPLES", "5000"))  # Most recent Nano decisions kept
+LOCAL_ROUTER_STATS_LOG_EVERY = 100  # Messages between bypass/disagreement summaries in the log
+
+# Greetings and acknowledgements with nothing else in the message (Nano RULE 5: chat)
+_CHIT_CHAT_RE = re.compile(
+    r"^(?:hi|hello|hey|hiya|yo|good\s+(?:morning|afternoon|evening|night)|thanks|thank\s+you|thx|ty"
+    r"|ok|okay|k|cool|nice|great|awesome|perfect|got\s+it|sounds\s+good|bye|goodbye|see\s+you)"
+    r"(?:\s+(?:there|again|so\s+much|a\s+lot|everyone))?[\s!.,;:)(]*$"
+)
+
+# Facts read queries (Nano RULE 2): "What is my favorite X?", "List my favorite X",
+# "What is my #2 / second / 2nd / last favorite X?", "What are my top 3 favorite X?"
+_RANK_MODIFIER = (
+    r"(?:top\s+\w+|#\s*\d+|no\.?\s*\d+|number\s+\d+|\d+(?:st|nd|rd|th)|first|second|third|fourth|fifth"
+    r"|sixth|seventh|eighth|ninth|tenth|last|least|bottom)"
+)
+_FACTS_READ_RE = re.compile(
+    r"^(?:please\s+)?(?:what\s+(?:is|are)|what's|whats|list|show(?:\s+me)?)\s+(?:in\s+order\s+)?my\s+"
+    r"(?:" + _RANK_MODIFIER + r"\s+)?favorites?\s+"
+    r"(?P<topic>[a-z][a-z0-9'-]*(?:\s+[a-z][a-z0-9'-]*){0,2})\s*[?.!]*$"
+)
+# Words that make the "topic" a question about it rather than the topic ("my favorite color and why")
+_TOPIC_STOP_WORDS = {"and", "or", "but", "why", "how", "when", "where", "because", "if", "than", "vs"}
+
+# Messages with facts cues are never routed by kNN: a write looks like other writes but needs its own candidate
+_FACTS_CUE_RE = re.compile(r"favorite|remember|#\d|\b(?:my|i)\s+(?:am|'m|like|love|hate|prefer|have|own)\b")
+
+# Routing classes the kNN tier may decide: their plans need no candidate extracted from the message
+_KNN_ROUTABLE_CLASSES = {("chat", "none")}
+
+
+def _normalize_message(text: str) -> str:
+    """Lowercase, strip and collapse whitespace."""
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+def _default_embed_fn() -> Optional[Callable[[str], np.ndarray]]:
+    """The canonicalizer's embedding model (shared, loaded once), or None if unavailable."""
+    from server.services.canonicalizer import embed_query
+    return embed_query
+
+
+@dataclass
+class LocalDecision:
+    """A routing plan proposed by the local tier."""
+    plan: RoutingPlan
+    confidence: float  # 0.0 to 1.0
+    source: str  # "rule:chit_chat" | "rule:facts_read" | "knn"
+
+
+class RoutingExampleStore:
+    """
+    Past Nano decisions for kNN: unit-normalized message embeddings and routing classes.
+
+    The most recent max_examples are kept in memory as a ring buffer ([max_examples, D]
+    matrix) and persisted in routing_examples.db, so the tier is warm after a restart.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_examples: int = LOCAL_ROUTER_MAX_EXAMPLES,
+        model_name: str = ""
+    ):
+        """
+        Initialize the store and load the most recent examples.
+
+        Args:
+            db_path: Optional path to the examples database (defaults to the global path)
+            max_examples: Number of most recent examples kept
+            model_name: Embedding model; examples embedded by another model are ignored
+        """
+        self.db_path = db_path or ROUTING_EXAMPLES_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_examples = max_examples
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._buffer: Optional[np.ndarray] = None  # [max_examples, D], allocated by the first example
+        self._classes: List[Optional[Tuple[str, str, bool]]] = [None] * max_examples
+        self._count = 0
+        self._next = 0  # Ring position of the next example
+        self._init_db()
+        self._load()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _init_db(self):
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS routing_examples (
+                    example_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content_plane TEXT NOT NULL,
+                    operation TEXT NOT NULL,
+                    reasoning_required INTEGER NOT NULL,
+                    model_name TEXT NOT NULL,
+                    embedding_blob BLOB NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            # Earlier versions also stored the message text; only classes and embeddings are kept
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(routing_examples)")}
+            if "message" in columns:
+                conn.execute("ALTER TABLE routing_examples DROP COLUMN message")
+                conn.commit()
+                conn.execute("VACUUM")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _load(self):
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            rows = conn.execute("""
+                SELECT content_plane, operation, reasoning_required, embedding_blob
+                FROM routing_examples
+                WHERE model_name = ?
+                ORDER BY example_id DESC
+                LIMIT ?
+            """, (self.model_name, self.max_examples)).fetchall()
+        finally:
+            conn.close()
+        for content_plane, operation, reasoning_required, blob in reversed(rows):
+            self._append(np.frombuffer(blob, dtype=np.float32), (content_plane, operation, bool(reasoning_required)))
+        if rows:
+            logger.info(f"[LOCAL-ROUTER] Loaded {len(rows)} routing examples")
+
+    def _append(self, vector: np.ndarray, route_class: Tuple[str, str, bool]):
+        if self._buffer is None:
+            self._buffer = np.zeros((self.max_examples, vector.shape[0]), dtype=np.float32)
+        elif vector.shape[0] != self._buffer.shape[1]:
+            return  # Different embedding dimension
+        self._buffer[self._next] = vector
+        self._classes[self._next] = route_class
+        self._next = (self._next + 1) % self.max_examples
+        self._count = min(self._count + 1, self.max_examples)
+
+    def add(self, vector: np.ndarray, plan: RoutingPlan):
+        """
+        Record a Nano decision. The message text itself is not stored.
+
+        Args:
+            vector: Unit-normalized message embedding
+            plan: The routing plan Nano returned
+        """
+        route_class = (plan.content_plane, plan.operation, plan.reasoning_required)
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._append(vector, route_class)
+            conn = sqlite3.connect(str(self.db_path))
+            try:
+                cursor = conn.execute("""
+                    INSERT INTO routing_examples (content_plane, operation, reasoning_required,
+                                                  model_name, embedding_blob, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (plan.content_plane, plan.operation, int(plan.reasoning_required),
+                      self.model_name, vector.tobytes(), datetime.now(timezone.utc).isoformat()))
+                # Keep the table bounded like the in-memory buffer
+                conn.execute("DELETE FROM routing_examples WHERE example_id <= ?",
+                             (cursor.lastrowid - self.max_examples,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def nearest(self, vector: np.ndarray, k: int) -> List[Tuple[float, Tuple[str, str, bool]]]:
+        """
+        Find the k most similar past messages.
+
+        Args:
+            vector: Unit-normalized message embedding
+            k: Number of neighbors
+
+        Returns:
+            List of (cosine similarity, routing class), most similar first
+        """
+        with self._lock:
+            if self._buffer is None or self._count == 0 or vector.shape[0] != self._buffer.shape[1]:
+                return []
+            similarities = self._buffer[:self._count] @ vector
+            classes = self._classes[:self._count]
+        top = np.argsort(-similarities)[:k]
+        return [(float(similarities[i]), classes[i]) for i in top]
+
+
+class LocalRouter:
+    """Rules + kNN routing tier that decides confident messages without Nano."""
+
+    def __init__(
+        self,
+        examples: Optional[RoutingExampleStore] = None,
+        embed_fn: Optional[Callable[[str], np.ndarray]] = None,
+        min_confidence: float = LOCAL_ROUTER_MIN_CONFIDENCE,
+        audit_rate: float = LOCAL_ROUTER_AUDIT_RATE,
+        k: int = LOCAL_ROUTER_KNN_K,
+        min_similarity: float = LOCAL_ROUTER_KNN_MIN_SIMILARITY,
+        min_votes: int = LOCAL_ROUTER_KNN_MIN_VOTES
+    ):
+        """
+        Initialize the local router.
+
+        Args:
+            examples: Store of past Nano decisions (kNN is disabled without one)
+            embed_fn: Message -> embedding (kNN is disabled without one)
+            min_confidence: Local decisions at or above this skip Nano
+            audit_rate: Share of confident decisions still sent to Nano for comparison
+            k: Nearest past messages consulted
+            min_similarity: Minimum cosine similarity for a neighbor to vote
+            min_votes: Voting neighbors needed for a kNN decision
+        """
+        self.examples = examples
+        self.embed_fn = embed_fn
+        self.min_confidence = min_confidence
+        self.audit_rate = audit_rate
+        self.k = k
+        self.min_similarity = min_similarity
+        self.min_votes = min_votes
+
+        # Counters
+        self._stats_lock = threading.Lock()
+        self.messages = 0
+        self.bypassed: Dict[str, int] = {}  # Decision source -> messages routed without Nano
+        self.nano_calls = 0
+        self.audited = 0
+        self.compared = 0  # Nano decisions with a local decision to compare against
+        self.disagreements = 0
+
+    def decide_by_rules(self, message: str) -> Optional[LocalDecision]:
+        """
+        Route a message with the deterministic rules.
+
+        Args:
+            message: The user's message
+
+        Returns:
+            LocalDecision, or None if no rule applies
+        """
+        normalized = _normalize_message(message)
+
+        if _CHIT_CHAT_RE.match(normalized):
+            plan = RoutingPlan(
+                content_plane="chat",
+                operation="none",
+                reasoning_required=True,
+                confidence=1.0,
+                why="Local router: greeting/acknowledgement"
+            )
+            return LocalDecision(plan=plan, confidence=1.0, source="rule:chit_chat")
+
+        match = _FACTS_READ_RE.match(normalized)
+        if match and not _TOPIC_STOP_WORDS.intersection(match.group("topic").split()):
+            topic = match.group("topic")
+            ordinal_rank, top_n_slice = detect_ordinal_or_slice(message)
+            rank = ordinal_rank if top_n_slice is None else None
+            if rank is not None and rank > 10:
+                # FactsReadCandidate.rank is 1..10; the chat handler enforces out-of-range ranks
+                rank = None
+            plan = RoutingPlan(
+                content_plane="facts",
+                operation="read",
+                reasoning_required=False,
+                facts_read_candidate=FactsReadCandidate(
+                    topic=topic, query=message, rank=rank, top_n_slice=top_n_slice
+                ),
+                confidence=1.0,
+                why=f"Local router: facts read query for {topic}"
+            )
+            return LocalDecision(plan=plan, confidence=1.0, source="rule:facts_read")
+
+        return None
+
+    def decide_by_knn(self, message: str, vector: np.ndarray) -> Optional[LocalDecision]:
+        """
+        Route a message by a similarity-weighted vote of similar past Nano decisions.
+
+        Args:
+            message: The user's message
+            vector: Unit-normalized message embedding
+
+        Returns:
+            LocalDecision (confidence = vote share of the winning class), or None if there
+            are too few similar past messages or the winner needs Nano to extract a candidate
+        """
+        if self.examples is None or _FACTS_CUE_RE.search(message.lower()):
+            return None
+        neighbors = [(similarity, route_class) for similarity, route_class in self.examples.nearest(vector, self.k)
+                     if similarity >= self.min_similarity]
+        voters = len(neighbors)
+        if voters < self.min_votes:
+            return None
+        votes: Dict[Tuple[str, str, bool], float] = {}
+        for similarity, route_class in neighbors:
+            votes[route_class] = votes.get(route_class, 0.0) + similarity
+        route_class, weight = max(votes.items(), key=lambda item: item[1])
+        if route_class[:2] not in _KNN_ROUTABLE_CLASSES:
+            return None
+        confidence = weight / sum(votes.values())
+        content_plane, operation, reasoning_required = route_class
+        plan = RoutingPlan(
+            content_plane=content_plane,
+            operation=operation,
+            reasoning_required=reasoning_required,
+            confidence=round(confidence, 4),
+            why=f"Local router: {voters} similar past messages routed to {content_plane}/{operation}"
+        )
+        return LocalDecision(plan=plan, confidence=confidence, source="knn")
+
+    def _embed(self, message: str) -> Optional[np.ndarray]:
+        """Unit-normalized message embedding, or None if embedding fails."""
+        try:
+            vector = np.asarray(self.embed_fn(message), dtype=np.float32).ravel()
+        except Exception as e:
+            logger.warning(f"[LOCAL-ROUTER] Embedding failed, kNN skipped: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    @staticmethod
+    def _route_key(plan: RoutingPlan) -> Tuple[Any, ...]:
+        """What two plans must share to count as the same decision (topic wording may differ)."""
+        key: Tuple[Any, ...] = (plan.content_plane, plan.operation)
+        if plan.facts_read_candidate:
+            key += (plan.facts_read_candidate.rank, plan.facts_read_candidate.top_n_slice)
+        return key
+
+    def _compare(self, message: str, decision: LocalDecision, nano_plan: RoutingPlan, audit: bool):
+        agree = self._route_key(decision.plan) == self._route_key(nano_plan)
+        with self._stats_lock:
+            self.compared += 1
+            if not agree:
+                self.disagreements += 1
+        if not agree:
+            logger.warning(
+                f"[LOCAL-ROUTER] Disagreement ({'audit' if audit else 'below threshold'}): "
+                f"source={decision.source} confidence={decision.confidence:.2f} "
+                f"local={decision.plan.content_plane}/{decision.plan.operation} "
+                f"nano={nano_plan.content_plane}/{nano_plan.operation} message={message[:100]!r}"
+            )
+
+    async def route(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Tuple[RoutingPlan, str]:
+        """
+        Route a message locally if confident, otherwise with Nano.
+
+        Args:
+            user_message: The user's message
+            conversation_history: Optional conversation history (passed to Nano)
+
+        Returns:
+            (RoutingPlan, router_source) where router_source is "local" or "nano"
+
+        Raises:
+            NanoRouterError: If Nano is needed and fails
+        """
+        with self._stats_lock:
+            self.messages += 1
+            log_stats = self.messages % LOCAL_ROUTER_STATS_LOG_EVERY == 0
+        if log_stats:
+            logger.info(f"[LOCAL-ROUTER] Stats: {self.get_stats()}")
+
+        decision = self.decide_by_rules(user_message)
+        vector = None
+        if decision is None and self.examples is not None and self.embed_fn is not None:
+            loop = asyncio.get_running_loop()
+            vector = await loop.run_in_executor(None, self._embed, user_message)
+            if vector is not None:
+                decision = self.decide_by_knn(user_message, vector)
+
+        confident = decision is not None and decision.confidence >= self.min_confidence
+        audit = confident and random.random() < self.audit_rate
+        if confident and not audit:
+            with self._stats_lock:
+                self.bypassed[decision.source] = self.bypassed.get(decision.source, 0) + 1
+            logger.info(
+                f"[LOCAL-ROUTER] Bypassed Nano: source={decision.source} confidence={decision.confidence:.2f} "
+                f"content_plane={decision.plan.content_plane} operation={decision.plan.operation}"
+            )
+            return decision.plan, "local"
+
+        plan = await nano_router.route_with_nano(user_message, conversation_history)
+        with self._stats_lock:
+            self.nano_calls += 1
+            if audit:
+                self.audited += 1
+        if decision is not None:
+            self._compare(user_message, decision, plan, audit)
+        if vector is not None:
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.examples.add, vector, plan)
+            except Exception as e:
+                logger.warning(f"[LOCAL-ROUTER] Failed to record routing example: {e}")
+        return plan, "nano"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Bypass and disagreement counts of the local tier."""
+        with self._stats_lock:
+            bypassed = sum(self.bypassed.values())
+            return {
+                "messages": self.messages,
+                "bypassed": bypassed,
+                "bypass_rate": round(bypassed / self.messages, 4) if self.messages else 0.0,
+                "bypassed_by_source": dict(self.bypassed),
+                "nano_calls": self.nano_calls,
+                "audited": self.audited,
+                "compared": self.compared,
+                "disagreements": self.disagreements,
+                "disagreement_rate": round(self.disagreements / self.compared, 4) if self.compared else 0.0,
+                "examples": len(self.examples) if self.examples is not None else 0,
+            }
+
+
+# Global local router instance
+_local_router: Optional[LocalRouter] = None
+
+
+def get_local_router() -> LocalRouter:
+    """Get or create the global local router (kNN is enabled if the embedding model is available)."""
+    global _local_router
+    if _local_router is None:
+        embed_fn = _default_embed_fn()
+        examples = None
+        if embed_fn is not None:
+            from server.services.canonicalizer import EMBEDDING_MODEL
+            examples = RoutingExampleStore(model_name=EMBEDDING_MODEL or "")
+        else:
+            logger.info("[LOCAL-ROUTER] Embedding model unavailable, using rules only")
+        _local_router = LocalRouter(examples=examples, embed_fn=embed_fn)
+    return _local_router
+
+
+async def route_message(
+    user_message: str,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    project_id: Optional[str] = None
+) -> Tuple[RoutingPlan, str]:
+    """
+    Route a user message: a cached Nano plan for the same message and history if there
+    is one, the local tier if it is confident, GPT-5 Nano otherwise.
+
+    Args:
+        user_message: The user's message
+        conversation_history: Optional conversation history for context
+        project_id: Optional project UUID (cached plans are per project)
+
+    Returns:
+        (RoutingPlan, router_source) where router_source is "cache", "local" or "nano"
+
+    Raises:
+        NanoRouterError: If Nano is needed and fails
+    """
+    plan_cache = get_routing_plan_cache()
+    plan = plan_cache.get(project_id, user_message, conversation_history)
+    if plan is not None:
+        logger.info(
+            f"[ROUTING-CACHE] Hit: content_plane={plan.content_plane} operation={plan.operation} "
+            f"project_id={project_id}"
+        )
+        return plan, "cache"
+
+    if LOCAL_ROUTER_ENABLED:
+        plan, router_source = await get_local_router().route(user_message, conversation_history)
+    else:
+        plan, router_source = await nano_router.route_with_nano(user_message, conversation_history), "nano"
+    if router_source == "nano":
+        plan_cache.put(project_id, user_message, conversation_history, plan)
+    return plan, router_source
+
+
+def get_local_router_stats() -> Dict[str, Any]:
+    """Bypass rate and disagreement counts of the local router (for telemetry)."""
+    return get_local_router().get_stats()
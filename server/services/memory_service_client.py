@@ -205,6 +205,16 @@ class MemoryServiceClient:
             logger.warning(f"Memory Service trigger_reindex failed: {e}")
             return None
     
+    def notify_projects_changed(self) -> bool:
+        """Tell the Memory Service that projects.json changed so it drops cached project directories."""
+        try:
+            response = requests.post(f"{self.base_url}/projects/changed", timeout=2)
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.debug(f"Memory Service notify_projects_changed failed: {e}")
+            return False
+    
     def index_chat_message(
         self,
         project_id: str,
@@ -273,6 +283,51 @@ class MemoryServiceClient:
             logger.warning(f"[MEMORY] Memory Service index_chat_message failed: {e}")
             return False, None, None
     
+    def index_chat_messages(self, messages: List[Dict]) -> List[Tuple[bool, Optional[str], Optional[str]]]:
+        """
+        Enqueue several chat messages for async indexing with one request.
+        
+        The Memory Service indexes queued messages in grouped batches (one
+        transaction, one embedding batch), so sending a user/assistant pair
+        together is cheaper than two index_chat_message() calls.
+        
+        Args:
+            messages: List of dicts with the index_chat_message() arguments
+                      (project_id, chat_id, message_id, role, content, timestamp,
+                      message_index, optional message_uuid)
+            
+        Returns:
+            List (same order as messages) of (success, job_id, message_uuid)
+        """
+        if not messages:
+            return []
+        
+        if not self.is_available():
+            logger.warning("[MEMORY] Memory Service is not available, skipping chat message indexing")
+            return [(False, None, None)] * len(messages)
+        
+        try:
+            response = requests.post(
+                f"{self.base_url}/index-chat-messages",
+                json={"messages": messages},
+                timeout=5  # Enqueue only; a little more headroom than the single-message call
+            )
+            response.raise_for_status()
+            data = response.json()
+            results = []
+            for item in data.get("results", []):
+                queued = item.get("status") == "queued"
+                results.append((queued, item.get("job_id"), item.get("message_uuid")))
+            logger.info(f"[MEMORY] Enqueued {sum(1 for r in results if r[0])}/{len(messages)} indexing jobs (bulk)")
+            return results
+        
+        except requests.exceptions.Timeout:
+            logger.warning(f"[MEMORY] Memory Service bulk enqueue timed out after 5s")
+            return [(False, None, None)] * len(messages)
+        except Exception as e:
+            logger.warning(f"[MEMORY] Memory Service index_chat_messages failed: {e}")
+            return [(False, None, None)] * len(messages)
+    
     def get_index_job_status(self, job_id: str) -> Optional[Dict]:
         """
         Get the status of an indexing job.
@@ -1,8 +1,9 @@
 """
 Nano Router - Control plane that uses GPT-5 Nano to route messages.
 
-This is the mandatory first step for EVERY message. Nano acts as the router/control plane
-and determines the execution path with extracted candidates to avoid double Nano calls.
+This is the mandatory first step for every message the local router
+(server/services/local_router.py) is not confident about. Nano acts as the router/control
+plane and determines the execution path with extracted candidates to avoid double Nano calls.
 """
 import os
 import json
@@ -115,7 +116,8 @@ async def route_with_nano(
     """
     Route a user message using GPT-5 Nano to determine execution path.
     
-    This is the mandatory first step for EVERY message. Nano determines:
+    This is the mandatory first step for every message the local router does not
+    decide itself (see local_router.route_message). Nano determines:
     - content_plane: facts | index | files | chat
     - operation: write | read | search | none
     - reasoning_required: boolean
@@ -7,6 +7,28 @@ in user queries (second, third, #2, 2nd, etc.) and "top N" slice requests.
 import re
 from typing import Optional, Tuple
 
+# Ordinal words and numeric ordinals -> rank
+ORDINAL_RANKS = {
+    'first': 1, '1st': 1,
+    'second': 2, '2nd': 2,
+    'third': 3, '3rd': 3,
+    'fourth': 4, '4th': 4,
+    'fifth': 5, '5th': 5,
+    'sixth': 6, '6th': 6,
+    'seventh': 7, '7th': 7,
+    'eighth': 8, '8th': 8,
+    'ninth': 9, '9th': 9,
+    'tenth': 10, '10th': 10
+}
+_ORDINAL_RE = re.compile(r'\b(' + '|'.join(map(re.escape, ORDINAL_RANKS)) + r')\b')
+
+# Trigger-word prefilter for detect_ordinal_or_slice: every pattern below needs one of these
+# cues, so queries without them (most messages) return after one scan
+_ORDINAL_CUE_RE = re.compile(
+    r'\b(?:top\s|' + '|'.join(map(re.escape, ORDINAL_RANKS)) + r'\b)|#\d|number\s+\d|rank\s+\d',
+    re.IGNORECASE
+)
+
 
 def detect_ordinal_rank(text: str) -> Optional[int]:
     """
@@ -33,24 +55,10 @@ def detect_ordinal_rank(text: str) -> Optional[int]:
     text_lower = text.lower()
     
     # Pattern 1: Ordinal words (second, third, fourth, etc.)
-    ordinal_map = {
-        'first': 1, '1st': 1,
-        'second': 2, '2nd': 2,
-        'third': 3, '3rd': 3,
-        'fourth': 4, '4th': 4,
-        'fifth': 5, '5th': 5,
-        'sixth': 6, '6th': 6,
-        'seventh': 7, '7th': 7,
-        'eighth': 8, '8th': 8,
-        'ninth': 9, '9th': 9,
-        'tenth': 10, '10th': 10
-    }
-    
-    for ordinal, rank in ordinal_map.items():
-        # Match ordinal word as a whole word (not substring)
-        pattern = r'\b' + re.escape(ordinal) + r'\b'
-        if re.search(pattern, text_lower):
-            return rank
+    # Match ordinal words as whole words (not substrings); the lowest rank mentioned wins
+    ranks = [ORDINAL_RANKS[ordinal] for ordinal in _ORDINAL_RE.findall(text_lower)]
+    if ranks:
+        return min(ranks)
     
     # Pattern 2: Hash notation (#1, #2, #3, etc.)
     # CRITICAL: Match "#N favorite" pattern specifically to avoid false positives
@@ -162,6 +170,9 @@ def detect_ordinal_or_slice(text: str) -> Tuple[Optional[int], Optional[int]]:
         - "What is my third favorite activity?" -> (3, None)
         - "What are my top 3 favorite activities?" -> (None, 3)
     """
+    if not _ORDINAL_CUE_RE.search(text.lower()):  # The detectors match the lowercased text
+        return (None, None)
+    
     # Check for "top N" first (takes precedence)
     top_n = detect_top_n_slice(text)
     if top_n is not None:
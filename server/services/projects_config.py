@@ -4,6 +4,7 @@ Project configuration management.
 Handles loading, saving, and updating project data including memory source mappings.
 """
 import json
+import threading
 from pathlib import Path
 from typing import List, Dict, Optional
 
@@ -63,6 +64,16 @@ def save_projects(projects: List[Dict]) -> None:
     with open(temp_path, "w") as f:
         json.dump(projects, f, indent=2)
     temp_path.replace(projects_path)
+    _notify_projects_changed()
+
+
+def _notify_projects_changed() -> None:
+    """Invalidate cached project directory names here and in the Memory Service."""
+    from memory_service.config import invalidate_project_directory_cache
+    from server.services.memory_service_client import get_memory_client
+    invalidate_project_directory_cache()
+    # Fire-and-forget: the Memory Service also picks up the change via the projects.json mtime
+    threading.Thread(target=get_memory_client().notify_projects_changed, daemon=True).start()
 
 
 def get_project(project_id: str) -> Optional[Dict]:
@@ -0,0 +1,284 @@
+"""
+In-process cache of materialized ranked lists.
+
+Facts reads (execute_facts_plan -> search_facts_ranked_list) used to query
+SQLite, resolve the topic to its list keys and sort the list on every call,
+although ranked lists only change when apply_facts_ops commits. This cache
+keeps, per project:
+
+- the fully materialized lists: canonical list_key -> items sorted by rank
+- the project's list keys and the topic -> matching list keys resolution
+
+apply_facts_ops re-reads every list it touched inside its write transaction
+and hands the new lists to apply_write() once the transaction has committed
+(write-through). Reads that raced with a write don't overwrite the result:
+loaders pass the project generation they started from, and put_*() drops
+their data if a write happened in between.
+
+Facts are also written outside this process (the memory service deletes the
+facts of deleted chats), so write-through alone can't keep the cache fresh.
+Each facts database has a facts_version counter that triggers bump on every
+write (db.get_facts_version). Readers pass the current value to validate()
+before using the cache, which drops the project's entry when the counter has
+moved since the entry was filled. apply_write() gets the counter from before
+and after its transaction, so its own writes don't invalidate the entry.
+Readers also pass the alias table version (AliasTable.version): topic
+resolutions are dropped when teacher mappings changed the alias table.
+
+Ordinal, slice and full-list queries are served from the cached lists
+(see librarian.search_facts_ranked_list).
+"""
+import bisect
+import itertools
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RANKED_LIST_CACHE_MAX_PROJECTS = int(os.getenv("FACTS_RANKED_LIST_CACHE_PROJECTS", "64"))  # Projects kept (LRU)
+
+# Global write counter: a project's generation never repeats, even after its entry was evicted
+_generations = itertools.count(1)
+
+
+class RankedList:
+    """A materialized ranked list: items (dicts) sorted by rank, plus their ranks for bisecting."""
+    __slots__ = ("items", "ranks")
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.items = tuple(sorted(items, key=lambda item: item["rank"]))
+        self.ranks = tuple(item["rank"] for item in self.items)
+
+    def at_rank(self, rank: int) -> List[Dict[str, Any]]:
+        """Items stored at a rank (normally zero or one)."""
+        start = bisect.bisect_left(self.ranks, rank)
+        end = bisect.bisect_right(self.ranks, rank, lo=start)
+        return list(self.items[start:end])
+
+
+class _ProjectEntry:
+    __slots__ = ("generation", "facts_version", "alias_version", "list_keys", "topic_list_keys", "lists")
+
+    def __init__(self):
+        self.generation = next(_generations)
+        self.facts_version: Optional[int] = None  # facts_version the cached data matches (None = unknown)
+        self.alias_version: Optional[int] = None  # AliasTable.version the topic resolutions were made with
+        self.list_keys: Optional[Tuple[str, ...]] = None
+        self.topic_list_keys: Dict[str, Tuple[str, ...]] = {}
+        self.lists: Dict[str, RankedList] = {}
+
+
+class RankedListCache:
+    """Per-project cache of ranked lists and topic resolutions."""
+
+    def __init__(self, max_projects: int = RANKED_LIST_CACHE_MAX_PROJECTS):
+        self.max_projects = max(1, max_projects)
+        self._lock = threading.Lock()
+        self._projects: "OrderedDict[str, _ProjectEntry]" = OrderedDict()
+        self.list_hits = 0
+        self.list_misses = 0
+        self.topic_hits = 0
+        self.topic_misses = 0
+        self.write_throughs = 0
+        self.stale_fills = 0
+        self.external_invalidations = 0
+        self.alias_invalidations = 0
+
+    @staticmethod
+    def _reset(entry: _ProjectEntry, facts_version: Optional[int]):
+        """Drop an entry's cached data; caller holds the lock."""
+        entry.generation = next(_generations)
+        entry.facts_version = facts_version
+        entry.list_keys = None
+        entry.topic_list_keys.clear()
+        entry.lists.clear()
+
+    def _entry(self, project_uuid: str) -> _ProjectEntry:
+        """Project entry (created if missing); caller holds the lock."""
+        entry = self._projects.get(project_uuid)
+        if entry is None:
+            entry = _ProjectEntry()
+            self._projects[project_uuid] = entry
+            while len(self._projects) > self.max_projects:
+                self._projects.popitem(last=False)
+        else:
+            self._projects.move_to_end(project_uuid)
+        return entry
+
+    def generation(self, project_uuid: str) -> int:
+        """Current generation of a project; pass it to put_*() after loading from the database."""
+        with self._lock:
+            return self._entry(project_uuid).generation
+
+    def validate(self, project_uuid: str, facts_version: int, alias_version: Optional[int] = None) -> int:
+        """
+        Check a project's entry against the facts database before reading from the cache.
+
+        Drops the entry's data if the facts changed since it was filled (e.g. a chat
+        delete in the memory service), and its topic resolutions if the alias table
+        changed.
+
+        Args:
+            project_uuid: Project UUID
+            facts_version: Current facts_version of the project's facts database
+            alias_version: Current AliasTable.version
+
+        Returns:
+            Current generation of the project; pass it to put_*() after loading
+        """
+        with self._lock:
+            entry = self._entry(project_uuid)
+            if entry.facts_version != facts_version:
+                if entry.facts_version is not None:
+                    self.external_invalidations += 1
+                self._reset(entry, facts_version)
+            if entry.alias_version != alias_version:
+                if entry.topic_list_keys:
+                    self.alias_invalidations += 1
+                    entry.topic_list_keys.clear()
+                # Resolutions loaded with the previous alias table are not stored
+                entry.generation = next(_generations)
+                entry.alias_version = alias_version
+            return entry.generation
+
+    def get_topic_list_keys(self, project_uuid: str, topic_key: str) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            entry = self._entry(project_uuid)
+            list_keys = entry.topic_list_keys.get(topic_key)
+            if list_keys is None:
+                self.topic_misses += 1
+            else:
+                self.topic_hits += 1
+            return list_keys
+
+    def put_topic_list_keys(self, project_uuid: str, topic_key: str, list_keys: List[str], generation: int):
+        with self._lock:
+            entry = self._entry(project_uuid)
+            if entry.generation != generation:
+                self.stale_fills += 1
+                return
+            entry.topic_list_keys[topic_key] = tuple(list_keys)
+
+    def get_list_keys(self, project_uuid: str) -> Optional[Tuple[str, ...]]:
+        """All list keys of the project (None if not cached)."""
+        with self._lock:
+            return self._entry(project_uuid).list_keys
+
+    def put_list_keys(self, project_uuid: str, list_keys: List[str], generation: int):
+        with self._lock:
+            entry = self._entry(project_uuid)
+            if entry.generation != generation:
+                self.stale_fills += 1
+                return
+            entry.list_keys = tuple(list_keys)
+
+    def get_list(self, project_uuid: str, list_key: str) -> Optional[RankedList]:
+        with self._lock:
+            ranked_list = self._entry(project_uuid).lists.get(list_key)
+            if ranked_list is None:
+                self.list_misses += 1
+            else:
+                self.list_hits += 1
+            return ranked_list
+
+    def put_list(self, project_uuid: str, list_key: str, items: List[Dict[str, Any]], generation: int) -> RankedList:
+        """Cache a list loaded from the database. Returns the materialized list (cached or not)."""
+        ranked_list = RankedList(items)
+        with self._lock:
+            entry = self._entry(project_uuid)
+            if entry.generation != generation:
+                self.stale_fills += 1
+            else:
+                entry.lists[list_key] = ranked_list
+        return ranked_list
+
+    def apply_write(self, project_uuid: str, lists: Dict[str, List[Dict[str, Any]]],
+                    facts_versions: Optional[Tuple[int, int]] = None):
+        """
+        Install the lists written by a committed apply_facts_ops transaction.
+
+        Args:
+            project_uuid: Project UUID
+            lists: Every list_key the transaction touched -> its items after the commit
+                   (empty list if the list no longer has items)
+            facts_versions: facts_version at the start and at the end of the transaction
+                            (None: unknown, the next read reloads the project)
+        """
+        materialized = {list_key: RankedList(items) for list_key, items in lists.items()}
+        before, after = facts_versions if facts_versions is not None else (None, None)
+        with self._lock:
+            entry = self._entry(project_uuid)
+            if before is None or entry.facts_version != before:
+                # Facts changed outside this write since the entry was filled
+                self._reset(entry, after)
+            else:
+                entry.generation = next(_generations)
+                entry.facts_version = after
+            for list_key, ranked_list in materialized.items():
+                entry.lists[list_key] = ranked_list
+                # A list that appeared or became empty changes which lists a topic resolves to
+                known = entry.list_keys is not None and list_key in entry.list_keys
+                if known != bool(ranked_list.items):
+                    entry.list_keys = None
+                    entry.topic_list_keys.clear()
+            self.write_throughs += 1
+
+    def invalidate(self, project_uuid: Optional[str] = None):
+        """Drop a project's cached lists (all projects if project_uuid is None)."""
+        with self._lock:
+            if project_uuid is None:
+                self._projects.clear()
+            elif project_uuid in self._projects:
+                del self._projects[project_uuid]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            list_lookups = self.list_hits + self.list_misses
+            topic_lookups = self.topic_hits + self.topic_misses
+            return {
+                "projects": len(self._projects),
+                "lists": sum(len(entry.lists) for entry in self._projects.values()),
+                "list_hits": self.list_hits,
+                "list_misses": self.list_misses,
+                "list_hit_rate": round(self.list_hits / list_lookups, 4) if list_lookups else 0.0,
+                "topic_hits": self.topic_hits,
+                "topic_misses": self.topic_misses,
+                "topic_hit_rate": round(self.topic_hits / topic_lookups, 4) if topic_lookups else 0.0,
+                "write_throughs": self.write_throughs,
+                "stale_fills": self.stale_fills,
+                "external_invalidations": self.external_invalidations,
+                "alias_invalidations": self.alias_invalidations,
+            }
+
+
+def ranked_list_item(fact_key: str, list_key: str, rank: int, value_text: str,
+                     source_message_uuid: Optional[str]) -> Dict[str, Any]:
+    """A ranked-list fact in the shape search_facts_ranked_list returns."""
+    return {
+        "fact_key": fact_key,
+        "value_text": value_text,
+        "source_message_uuid": source_message_uuid,
+        "rank": rank,
+        "schema_hint": {
+            "domain": "ranked_list",
+            "topic": list_key[len("user.favorites."):],
+            "key": fact_key,
+            "key_prefix": list_key  # For aggregation queries
+        }
+    }
+
+
+# Global ranked list cache instance
+_ranked_list_cache: Optional[RankedListCache] = None
+
+
+def get_ranked_list_cache() -> RankedListCache:
+    """Get or create the global ranked list cache."""
+    global _ranked_list_cache
+    if _ranked_list_cache is None:
+        _ranked_list_cache = RankedListCache()
+    return _ranked_list_cache
@@ -14,6 +14,13 @@ from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
 
+# Trigger-word prefilter: a message can only contain a ranked list if it has one of these
+# cues ("1)"/"1.", "#1", "first:"/"first)"); all others skip the list patterns after one scan
+_RANKED_LIST_CUE_RE = re.compile(
+    r'\d[.)]|#\d|\b(?:first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth)\s*[:)]',
+    re.IGNORECASE
+)
+
 
 @dataclass
 class RankedItem:
@@ -50,6 +57,8 @@ def extract_ranked_lists(message: str) -> List[RankedList]:
         List of RankedList objects found in the message
     """
     ranked_lists = []
+    if not _RANKED_LIST_CUE_RE.search(message):
+        return ranked_lists
     message_lower = message.lower()
     
     # Pattern 1: Numbered lists with parentheses or periods
@@ -0,0 +1,173 @@
+"""
+In-process cache of validated Nano routing plans.
+
+Identical or near-identical messages (retries, regenerated turns, the same
+"what's my favorite crypto?" asked again) used to pay a full Nano round trip
+each time. route_message() looks plans up here first, keyed by:
+
+- the project
+- the normalized message (lowercased, whitespace collapsed, trailing
+  punctuation dropped)
+- a fingerprint of the last 5 history messages, exactly as route_with_nano
+  puts them in its prompt (role + first 200 characters)
+
+Entries expire after ROUTING_PLAN_CACHE_TTL_SECONDS and the cache is an LRU
+of ROUTING_PLAN_CACHE_SIZE plans. A project's plans are dropped when its facts
+change (apply_facts_ops calls invalidate_project() after committing). Plans
+with a facts write candidate are not cached: the values keep the user's
+casing, and the write invalidates the project anyway.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from server.contracts.routing_plan import RoutingPlan
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+ROUTING_PLAN_CACHE_SIZE = int(os.getenv("ROUTING_PLAN_CACHE_SIZE", "1024"))  # Plans kept (LRU)
+ROUTING_PLAN_CACHE_TTL_SECONDS = float(os.getenv("ROUTING_PLAN_CACHE_TTL_SECONDS", "600"))  # Plan lifetime
+ROUTING_PLAN_HISTORY_MESSAGES = 5  # History messages in the key (route_with_nano's prompt window)
+ROUTING_PLAN_HISTORY_CHARS = 200  # Characters per history message in the key (route_with_nano's truncation)
+
+_CacheKey = Tuple[str, str, str]  # (project_id, normalized message, history fingerprint)
+
+
+def normalize_message(text: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation ("What's  my X?" == "what's my x")."""
+    return re.sub(r"\s+", " ", text.lower()).strip().rstrip("?!.,;: ")
+
+
+def history_fingerprint(conversation_history: Optional[List[Dict[str, str]]]) -> str:
+    """Hash of the history messages route_with_nano shows Nano (last 5, 200 characters each)."""
+    digest = hashlib.sha1()
+    for msg in (conversation_history or [])[-ROUTING_PLAN_HISTORY_MESSAGES:]:
+        digest.update(msg.get("role", "user").encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(msg.get("content", "")[:ROUTING_PLAN_HISTORY_CHARS].encode("utf-8"))
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+class RoutingPlanCache:
+    """TTL + LRU cache of routing plans, invalidated per project."""
+
+    def __init__(self, max_size: int = ROUTING_PLAN_CACHE_SIZE, ttl_seconds: float = ROUTING_PLAN_CACHE_TTL_SECONDS):
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._plans: "OrderedDict[_CacheKey, Tuple[float, RoutingPlan]]" = OrderedDict()  # key -> (expires_at, plan)
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0
+
+    @staticmethod
+    def _key(project_id: Optional[str], user_message: str,
+             conversation_history: Optional[List[Dict[str, str]]]) -> _CacheKey:
+        return (project_id or "", normalize_message(user_message), history_fingerprint(conversation_history))
+
+    def get(
+        self,
+        project_id: Optional[str],
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Optional[RoutingPlan]:
+        """
+        Look up the plan for a message.
+
+        Args:
+            project_id: Project UUID (None outside projects)
+            user_message: The user's message
+            conversation_history: Conversation history passed to the router
+
+        Returns:
+            A copy of the cached plan (the caller may modify it), or None
+        """
+        key = self._key(project_id, user_message, conversation_history)
+        with self._lock:
+            entry = self._plans.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._plans[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(key)
+            self.hits += 1
+            plan = entry[1].model_copy(deep=True)
+        if plan.facts_read_candidate is not None:
+            # The query is the original message text
+            plan.facts_read_candidate.query = user_message
+        return plan
+
+    def put(
+        self,
+        project_id: Optional[str],
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        plan: RoutingPlan
+    ):
+        """
+        Cache the plan Nano returned for a message (plans with a facts write candidate are skipped).
+
+        Args:
+            project_id: Project UUID (None outside projects)
+            user_message: The user's message
+            conversation_history: Conversation history passed to the router
+            plan: Validated routing plan
+        """
+        if plan.facts_write_candidate is not None:
+            return
+        key = self._key(project_id, user_message, conversation_history)
+        entry = (time.monotonic() + self.ttl_seconds, plan.model_copy(deep=True))
+        with self._lock:
+            self._plans[key] = entry
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+
+    def invalidate_project(self, project_id: Optional[str]):
+        """Drop the cached plans of a project (called when its facts change)."""
+        project_key = project_id or ""
+        with self._lock:
+            stale = [key for key in self._plans if key[0] == project_key]
+            for key in stale:
+                del self._plans[key]
+            self.invalidated += len(stale)
+
+    def clear(self):
+        """Drop all cached plans."""
+        with self._lock:
+            self._plans.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._plans),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "invalidated": self.invalidated,
+            }
+
+
+# Global routing plan cache instance
+_routing_plan_cache: Optional[RoutingPlanCache] = None
+
+
+def get_routing_plan_cache() -> RoutingPlanCache:
+    """Get or create the global routing plan cache."""
+    global _routing_plan_cache
+    if _routing_plan_cache is None:
+        _routing_plan_cache = RoutingPlanCache()
+    return _routing_plan_cache
@@ -172,3 +172,27 @@ Output JSON only:"""
         logger.error(f"[TEACHER] Error invoking teacher: {e}", exc_info=True)
         return None
 
+
+
+def run_teacher_canonicalization(
+    raw_topic: str,
+    normalized_topic: str
+) -> Optional[TeacherCanonicalizationResult]:
+    """
+    Run invoke_teacher_for_canonicalization to completion from synchronous code.
+    
+    Uses a private event loop; when called from a thread that already runs one
+    (e.g. inside a request handler), the call is made on a helper thread.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(invoke_teacher_for_canonicalization(raw_topic, normalized_topic))
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(
+            asyncio.run, invoke_teacher_for_canonicalization(raw_topic, normalized_topic)
+        ).result()
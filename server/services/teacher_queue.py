@@ -0,0 +1,228 @@
+"""
+Background queue for deferred teacher canonicalization.
+
+In deferred mode (canonicalizer.TEACHER_MODE), a low-confidence topic does
+not block the fact write on a teacher round trip: the write goes ahead under
+the normalized (provisional) topic and the topic is submitted here. A single
+worker thread then:
+
+1. asks the teacher for the canonical topic and aliases, and stores them in
+   the alias table (mapping the provisional topic too, so later writes and
+   reads resolve to the canonical topic)
+2. re-keys ranked lists that were stored under a provisional topic which now
+   resolves to a different list key (facts_apply.rekey_ranked_list)
+
+apply_facts_ops reports provisional lists (fallback canonicalization) via
+note_provisional_list(), so the migration only touches projects that used
+them. Topics already queued or in flight are not submitted again, and the
+migration is bounded (TEACHER_MIGRATION_MAX_FACTS items per list).
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+TEACHER_QUEUE_MAX = int(os.getenv("TEACHER_QUEUE_MAX", "256"))  # Pending topics before submissions are dropped
+TEACHER_MIGRATION_MAX_FACTS = int(os.getenv("TEACHER_MIGRATION_MAX_FACTS", "1000"))  # Larger lists are not re-keyed
+TEACHER_PROVISIONAL_MAX_LISTS = int(os.getenv("TEACHER_PROVISIONAL_MAX_LISTS", "10000"))  # Tracked provisional lists (LRU)
+
+
+class TeacherCanonicalizationQueue:
+    """Deduplicating queue of topics waiting for the teacher, processed by one worker thread."""
+
+    def __init__(
+        self,
+        max_pending: int = TEACHER_QUEUE_MAX,
+        migration_max_facts: int = TEACHER_MIGRATION_MAX_FACTS,
+        max_provisional_lists: int = TEACHER_PROVISIONAL_MAX_LISTS,
+    ):
+        self.max_pending = max_pending
+        self.migration_max_facts = migration_max_facts
+        self.max_provisional_lists = max_provisional_lists
+
+        self.pending: "deque[Tuple[str, str]]" = deque()  # (raw_topic, normalized_topic)
+        self.in_flight: Set[str] = set()  # Normalized topics queued or being processed
+        # Provisional list_key -> projects that stored facts under it
+        self.provisional_lists: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self.cond = threading.Condition()
+        self.worker: Optional[threading.Thread] = None
+
+        # Counters
+        self.submitted = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+        self.lists_rekeyed = 0
+        self.facts_rekeyed = 0
+
+    def _ensure_worker(self):
+        """Start the worker thread if needed; caller holds the condition."""
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self._worker_loop, name="TeacherQueue", daemon=True)
+            self.worker.start()
+
+    def submit(self, raw_topic: str, normalized_topic: str) -> bool:
+        """
+        Queue a topic for teacher canonicalization.
+
+        Args:
+            raw_topic: Original raw topic
+            normalized_topic: Normalized topic (Canonicalizer.normalize_string), the dedup key
+
+        Returns:
+            True if the topic is queued or already in flight, False if the queue is full
+        """
+        with self.cond:
+            if normalized_topic in self.in_flight:
+                self.deduplicated += 1
+                return True
+            if len(self.pending) >= self.max_pending:
+                self.dropped += 1
+                logger.warning(
+                    f"[TEACHER-QUEUE] Queue full ({self.max_pending} topics), not queueing '{normalized_topic}'"
+                )
+                return False
+            self.in_flight.add(normalized_topic)
+            self.pending.append((raw_topic, normalized_topic))
+            self.submitted += 1
+            self._ensure_worker()
+            self.cond.notify()
+        logger.info(f"[TEACHER-QUEUE] Queued '{raw_topic}' (normalized='{normalized_topic}')")
+        return True
+
+    def note_provisional_list(self, project_uuid: str, list_key: str):
+        """Record that a project stored facts under a list key from a fallback (provisional) topic."""
+        with self.cond:
+            projects = self.provisional_lists.get(list_key)
+            if projects is None:
+                projects = set()
+                self.provisional_lists[list_key] = projects
+                while len(self.provisional_lists) > self.max_provisional_lists:
+                    self.provisional_lists.popitem(last=False)
+            else:
+                self.provisional_lists.move_to_end(list_key)
+            projects.add(project_uuid)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no topic is queued or in flight. Returns False on timeout."""
+        with self.cond:
+            return self.cond.wait_for(lambda: not self.in_flight, timeout=timeout)
+
+    def _worker_loop(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                raw_topic, normalized_topic = self.pending.popleft()
+            try:
+                self._process(raw_topic, normalized_topic)
+                with self.cond:
+                    self.completed += 1
+            except Exception as e:
+                with self.cond:
+                    self.failed += 1
+                logger.error(f"[TEACHER-QUEUE] Failed to canonicalize '{raw_topic}': {e}", exc_info=True)
+            finally:
+                with self.cond:
+                    self.in_flight.discard(normalized_topic)
+                    self.cond.notify_all()
+
+    def _process(self, raw_topic: str, normalized_topic: str):
+        """Run the teacher for one topic, store its aliases and re-key provisional lists."""
+        from server.services.canonicalizer import get_canonicalizer
+        from server.services.facts_normalize import canonical_list_key, extract_topic_from_list_key
+        from server.services.teacher_model import run_teacher_canonicalization
+
+        teacher_result = run_teacher_canonicalization(raw_topic, normalized_topic)
+        if not teacher_result:
+            raise RuntimeError("teacher returned no result")
+
+        # The topic as the write path stored it (list keys are built from the canonical_list_key form)
+        provisional_topic = extract_topic_from_list_key(canonical_list_key(normalized_topic))
+        canonicalizer = get_canonicalizer()
+        extra_aliases = tuple(t for t in (normalized_topic, provisional_topic) if t)
+        if not canonicalizer.learn_from_teacher(teacher_result, extra_aliases=extra_aliases):
+            raise RuntimeError("alias table update failed")
+        logger.info(
+            f"[TEACHER-QUEUE] '{raw_topic}' → '{teacher_result.canonical_topic}' "
+            f"with {len(teacher_result.aliases)} aliases"
+        )
+
+        self._rekey_provisional_lists(canonicalizer)
+
+    def _rekey_provisional_lists(self, canonicalizer):
+        """Re-key tracked provisional lists whose topic now resolves to another list key."""
+        from server.services.facts_apply import rekey_ranked_list
+        from server.services.facts_normalize import canonical_list_key, extract_topic_from_list_key
+
+        with self.cond:
+            provisional = [(list_key, set(projects)) for list_key, projects in self.provisional_lists.items()]
+
+        for list_key, projects in provisional:
+            topic = extract_topic_from_list_key(list_key)
+            if not topic:
+                continue
+            result = canonicalizer.canonicalize(topic, invoke_teacher=False)
+            if result.source == "fallback":
+                continue  # Still provisional
+            target_list_key = canonical_list_key(result.canonical_topic)
+
+            # Projects that are done with this list (re-keyed, over the size limit, or nothing to move);
+            # failed ones stay tracked and are retried after the next teacher result
+            done = set(projects)
+            if target_list_key != list_key:
+                for project_uuid in projects:
+                    try:
+                        counts = rekey_ranked_list(project_uuid, list_key, target_list_key, self.migration_max_facts)
+                    except Exception as e:
+                        logger.error(
+                            f"[TEACHER-QUEUE] Failed to re-key {list_key} -> {target_list_key} "
+                            f"for project {project_uuid}: {e}", exc_info=True
+                        )
+                        done.discard(project_uuid)
+                        continue
+                    if counts is not None:
+                        with self.cond:
+                            self.lists_rekeyed += 1
+                            self.facts_rekeyed += counts["moved"]
+            with self.cond:
+                remaining = self.provisional_lists.get(list_key)
+                if remaining is not None:
+                    remaining.difference_update(done)
+                    if not remaining:
+                        del self.provisional_lists[list_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.cond:
+            return {
+                "pending": len(self.pending),
+                "in_flight": len(self.in_flight),
+                "provisional_lists": len(self.provisional_lists),
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "dropped": self.dropped,
+                "completed": self.completed,
+                "failed": self.failed,
+                "lists_rekeyed": self.lists_rekeyed,
+                "facts_rekeyed": self.facts_rekeyed,
+            }
+
+
+# Global teacher queue instance
+_teacher_queue: Optional[TeacherCanonicalizationQueue] = None
+_teacher_queue_lock = threading.Lock()
+
+
+def get_teacher_queue() -> TeacherCanonicalizationQueue:
+    """Get or create the global teacher canonicalization queue."""
+    global _teacher_queue
+    if _teacher_queue is None:
+        with _teacher_queue_lock:
+            if _teacher_queue is None:
+                _teacher_queue = TeacherCanonicalizationQueue()
+    return _teacher_queue
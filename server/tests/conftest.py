@@ -5,6 +5,7 @@ Provides self-contained database setup with test isolation.
 Uses pytest's tmp_path to create isolated SQLite databases per test.
 """
 import pytest
+import shutil
 import uuid
 import os
 import warnings
@@ -82,6 +83,24 @@ def pytest_sessionfinish(session, exitstatus):
         # session.exitstatus = 1
 
 
+@pytest.fixture(scope="session", autouse=True)
+def alias_table_copy(tmp_path_factory):
+    """
+    Point the global alias table at a copy of data/alias_table.db.
+
+    Opening the alias table migrates it and teacher results add entries, so
+    tests must not touch the checked-in database.
+    """
+    from server.services import alias_table
+
+    db_path = tmp_path_factory.mktemp("alias_table") / "alias_table.db"
+    if alias_table.ALIAS_TABLE_DB_PATH.exists():
+        shutil.copyfile(alias_table.ALIAS_TABLE_DB_PATH, db_path)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(alias_table, "ALIAS_TABLE_DB_PATH", db_path)
+        yield db_path
+
+
 @pytest.fixture(scope="function")
 def test_project_id():
     """Generate a unique project ID for each test."""
@@ -133,6 +152,7 @@ def test_db_setup(test_project_id, tmp_path, monkeypatch):
     # Initialize the database
     source_id = f"project-{test_project_id}"
     db.init_db(source_id, project_id=test_project_id)
+    db.init_facts_db(source_id, project_id=test_project_id)
     
     # Get the DB path (will be used by all Facts operations)
     db_path = config.get_db_path_for_source(source_id, project_id=test_project_id)
@@ -0,0 +1,95 @@
+"""
+Tests for the Alias Table lookup index and embedding matrix (server/services/alias_table.py).
+"""
+import json
+import sqlite3
+
+import numpy as np
+
+from server.services.alias_table import AliasTable
+
+
+def test_find_canonical_uses_aliases_and_canonical_topic(tmp_path):
+    table = AliasTable(db_path=tmp_path / "alias_table.db")
+    assert table.add_entry("crypto", ["Cryptocurrency", "digital currency"])
+
+    result = table.find_canonical("  cryptocurrency ")
+    assert result.canonical_topic == "crypto"
+    assert result.matched_alias == "Cryptocurrency"
+    assert table.find_canonical("Crypto").matched_alias == "crypto"
+    assert table.find_canonical("bitcoin") is None
+
+
+def test_add_entry_bumps_version_and_replaces_mappings(tmp_path):
+    table = AliasTable(db_path=tmp_path / "alias_table.db")
+    table.add_entry("crypto", ["cryptocurrency", "coins"])
+    version = table.version
+
+    table.add_entry("crypto", ["cryptocurrency"])
+    assert table.version > version
+    assert table.find_canonical("coins") is None
+
+    # An alias claimed by another entry keeps its first mapping
+    table.add_entry("coin", ["cryptocurrency", "coins"])
+    assert table.find_canonical("cryptocurrency").canonical_topic == "crypto"
+    assert table.find_canonical("coins").canonical_topic == "coin"
+
+    # A new instance loads the same mappings from the database
+    reloaded = AliasTable(db_path=tmp_path / "alias_table.db")
+    assert reloaded.find_canonical("coins").canonical_topic == "coin"
+    assert reloaded.find_canonical("cryptocurrency").canonical_topic == "crypto"
+
+
+def test_existing_database_is_backfilled(tmp_path):
+    db_path = tmp_path / "alias_table.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("""
+        CREATE TABLE alias_entries (
+            canonical_topic TEXT PRIMARY KEY,
+            aliases_json TEXT NOT NULL,
+            embedding_blob BLOB,
+            created_by TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX idx_aliases_json ON alias_entries(aliases_json)")
+    conn.execute(
+        "INSERT INTO alias_entries VALUES (?, ?, NULL, 'teacher', 1.0, '2025-01-01T00:00:00')",
+        ("movie", json.dumps(["films", "movies"]))
+    )
+    conn.commit()
+    conn.close()
+
+    table = AliasTable(db_path=db_path)
+    assert table.find_canonical("films").canonical_topic == "movie"
+
+    conn = sqlite3.connect(str(db_path))
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+    assert "idx_aliases_json" not in indexes
+
+
+def test_embedding_matrix_tracks_add_entry(tmp_path):
+    table = AliasTable(db_path=tmp_path / "alias_table.db")
+    table.add_entry("crypto", [], embedding=np.array([3.0, 4.0], dtype=np.float32))
+    table.add_entry("color", [], embedding=None)
+
+    topics, matrix = table.get_embedding_matrix()
+    assert topics == ("crypto",)
+    np.testing.assert_allclose(matrix, [[0.6, 0.8]], rtol=1e-6)
+
+    # Appends and replacements after the first load update the cached matrix
+    table.add_entry("movie", [], embedding=np.array([0.0, 2.0], dtype=np.float32))
+    table.add_entry("crypto", [], embedding=np.array([1.0, 0.0], dtype=np.float32))
+    topics, matrix = table.get_embedding_matrix()
+    assert topics == ("crypto", "movie")
+    np.testing.assert_allclose(matrix, [[1.0, 0.0], [0.0, 1.0]])
+
+    # Removing an embedding drops the row; earlier snapshots are unchanged
+    table.add_entry("crypto", [], embedding=None)
+    assert table.get_embedding_matrix()[0] == ("movie",)
+    np.testing.assert_allclose(matrix, [[1.0, 0.0], [0.0, 1.0]])
+
+    reloaded = AliasTable(db_path=tmp_path / "alias_table.db")
+    assert reloaded.get_embedding_matrix()[0] == ("movie",)
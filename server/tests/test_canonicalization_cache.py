@@ -0,0 +1,47 @@
+"""
+Tests for the canonicalization memo cache (server/services/canonicalizer.py).
+"""
+from server.services.alias_table import AliasTable
+from server.services.canonicalizer import Canonicalizer
+
+
+def _canonicalizer(tmp_path):
+    canonicalizer = Canonicalizer()
+    canonicalizer.alias_table = AliasTable(db_path=tmp_path / "alias_table.db")
+    canonicalizer._embedding_model_available = False
+    return canonicalizer
+
+
+def test_repeated_topics_hit_cache(tmp_path):
+    canonicalizer = _canonicalizer(tmp_path)
+    canonicalizer.alias_table.add_entry("crypto", ["cryptocurrency"])
+
+    first = canonicalizer.canonicalize("Cryptocurrency", invoke_teacher=False)
+    second = canonicalizer.canonicalize("my favorite cryptocurrency", invoke_teacher=False)
+
+    assert first.canonical_topic == second.canonical_topic == "crypto"
+    assert second.raw_topic == "my favorite cryptocurrency"
+    stats = canonicalizer.get_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    # Callers get copies
+    second.aliases_used.append("changed")
+    assert canonicalizer.canonicalize("cryptocurrency", invoke_teacher=False).aliases_used == ["cryptocurrency"]
+
+
+def test_alias_table_changes_invalidate_cache(tmp_path):
+    canonicalizer = _canonicalizer(tmp_path)
+    assert canonicalizer.canonicalize("digital money", invoke_teacher=False).source == "fallback"
+
+    canonicalizer.alias_table.add_entry("crypto", ["digital money"])
+    result = canonicalizer.canonicalize("digital money", invoke_teacher=False)
+    assert result.canonical_topic == "crypto"
+    assert result.source == "alias_table"
+    assert canonicalizer.get_cache_stats()["hits"] == 0
+
+
+def test_teacher_fallbacks_are_not_cached(tmp_path):
+    canonicalizer = _canonicalizer(tmp_path)
+    canonicalizer.canonicalize("board games", invoke_teacher=True)
+    canonicalizer.canonicalize("board games", invoke_teacher=True)
+    assert canonicalizer.get_cache_stats()["size"] == 0
@@ -0,0 +1,118 @@
+"""
+Tests for the per-thread SQLite connection pool
+(memory_service/memory_dashboard/connection_pool.py) and the per-file schema
+registry of db.init_db.
+
+Each test uses its own ConnectionPool and databases in tmp_path.
+"""
+import os
+import sqlite3
+
+import pytest
+
+from memory_service.memory_dashboard import db
+from memory_service.memory_dashboard.connection_pool import ConnectionPool
+
+
+@pytest.fixture
+def pool():
+    pool = ConnectionPool()
+    yield pool
+    pool.close_thread_connections()
+
+
+def _remove_db(path):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(f"{path}{suffix}"):
+            os.remove(f"{path}{suffix}")
+
+
+def test_close_returns_connection_to_pool(pool, tmp_path):
+    path = tmp_path / "index.sqlite"
+    first = pool.acquire(path)
+    first.execute("CREATE TABLE items (name TEXT)")
+    first.execute("INSERT INTO items VALUES ('left open')")  # Implicit transaction, never committed
+    raw = first._conn
+    first.close()
+    first.close()  # Harmless
+
+    second = pool.acquire(path)
+
+    assert second._conn is raw
+    assert second.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0  # Rolled back on close
+    second.close()
+    assert pool.get_stats() == {"hits": 1, "opened": 1, "reopened": 0, "nested": 0}
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+
+
+def test_nested_checkout_gets_separate_connection(pool, tmp_path):
+    path = tmp_path / "index.sqlite"
+    outer = pool.acquire(path)
+    inner = pool.acquire(path)
+
+    assert inner._conn is not outer._conn
+    assert pool.get_stats()["nested"] == 1
+    inner_raw = inner._conn
+    inner.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        inner_raw.execute("SELECT 1")  # Unpooled: really closed
+
+    raw = outer._conn
+    outer.close()
+    again = pool.acquire(path)
+    assert again._conn is raw
+    again.close()
+
+
+def test_reopens_when_database_file_is_replaced(pool, tmp_path):
+    path = tmp_path / "project" / "index.sqlite"
+    conn = pool.acquire(path)
+    conn.execute("CREATE TABLE old_items (name TEXT)")
+    conn.commit()
+    raw = conn._conn
+    conn.close()
+
+    # Project directory removed and recreated with a new database (the idle pooled
+    # connection keeps the old inode alive, so the new file can't reuse it)
+    _remove_db(path)
+    os.rmdir(path.parent)
+    conn = pool.acquire(path)
+    assert conn._conn is not raw
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == []
+    conn.close()
+    assert pool.get_stats()["reopened"] == 1
+
+    # Deleted and recreated by another connection
+    _remove_db(path)
+    other = sqlite3.connect(path)
+    other.execute("CREATE TABLE new_items (name TEXT)")
+    other.close()
+    conn = pool.acquire(path)
+    assert [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")] == ["new_items"]
+    conn.close()
+    assert pool.get_stats()["reopened"] == 2
+
+
+def test_schema_is_created_once_per_database_file(tmp_path, monkeypatch):
+    db_path = tmp_path / "db" / "index.sqlite"
+    monkeypatch.setattr(db, "get_db_path_for_source", lambda source_id, project_id=None: db_path)
+    monkeypatch.setattr(db, "_initialized_schemas", {})
+    calls = []
+    create_schema = db._create_schema
+    monkeypatch.setattr(db, "_create_schema", lambda *args: calls.append(args) or create_schema(*args))
+
+    db.init_db("project-p1", project_id="p1")
+    db.init_db("project-p1", project_id="p1")
+    assert len(calls) == 1
+
+    # A recreated database file gets its schema again
+    db.connection_pool.close_thread_connections()
+    _remove_db(db_path)
+    db.init_db("project-p1", project_id="p1")
+    assert len(calls) == 2
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'chunks'").fetchone()
+    finally:
+        conn.close()
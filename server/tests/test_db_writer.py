@@ -0,0 +1,133 @@
+"""
+Tests for the single-writer actor (memory_service/memory_dashboard/db_writer.py).
+
+Each test uses its own WriterRegistry and a database in tmp_path. A first
+mutation that waits on an event holds the writer, so the mutations queued
+behind it are committed as one batch.
+"""
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from memory_service.memory_dashboard import db_writer
+from memory_service.memory_dashboard.db_writer import WriterRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = WriterRegistry()
+    yield registry
+    registry.stop()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "index.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (name TEXT PRIMARY KEY)")
+    conn.close()
+    return path
+
+
+def _insert(name):
+    return lambda conn: conn.execute("INSERT INTO items (name) VALUES (?)", (name,)).lastrowid
+
+
+def _names(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM items"))
+    finally:
+        conn.close()
+
+
+def _hold_writer(registry, db_path):
+    """Queue a mutation that blocks the writer until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def _wait(conn):
+        started.set()
+        release.wait(timeout=10)
+
+    future = registry.submit(db_path, _wait, label="hold")
+    assert started.wait(timeout=10)
+    return release, future
+
+
+def test_failing_mutation_does_not_poison_its_batch(registry, db_path):
+    release, held = _hold_writer(registry, db_path)
+
+    def _insert_then_fail(conn):
+        conn.execute("INSERT INTO items (name) VALUES ('partial')")
+        raise ValueError("bad row")
+
+    futures = [
+        registry.submit(db_path, _insert("a")),
+        registry.submit(db_path, _insert_then_fail),
+        registry.submit(db_path, _insert("a")),  # Constraint violation
+        registry.submit(db_path, _insert("b")),
+    ]
+    release.set()
+
+    held.result(timeout=10)
+    assert futures[0].result(timeout=10) and futures[3].result(timeout=10)
+    with pytest.raises(ValueError):
+        futures[1].result(timeout=10)
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[2].result(timeout=10)
+    # The failed mutations were rolled back to their savepoints, the rest committed together
+    assert _names(db_path) == ["a", "b"]
+    stats = registry.get_stats()[str(db_path)]
+    assert (stats["batches"], stats["mutations"], stats["failed_mutations"]) == (2, 5, 2)
+    assert stats["failed_batches"] == 0
+
+
+def test_nested_write_runs_inline(registry, db_path):
+    def _outer(conn):
+        conn.execute("INSERT INTO items (name) VALUES ('outer')")
+        # Same database from the writer thread: would deadlock if it were queued
+        inner = registry.run(db_path, _insert("inner"), label="inner")
+        with pytest.raises(sqlite3.IntegrityError):
+            registry.run(db_path, _insert("outer"), label="inner-dup")
+        return inner
+
+    future = registry.submit(db_path, _outer, label="outer")
+
+    assert future.result(timeout=10)
+    assert _names(db_path) == ["inner", "outer"]
+    assert registry.get_stats()[str(db_path)]["batches"] == 1
+
+
+def test_idle_writer_retires_and_keeps_its_totals(registry, db_path, monkeypatch):
+    monkeypatch.setattr(db_writer, "WRITER_IDLE_SECONDS", 0.05)
+    writer_thread = registry.run(db_path, lambda conn: _insert("a")(conn) and threading.current_thread())
+
+    writer_thread.join(timeout=10)
+
+    assert not writer_thread.is_alive() and str(db_path) not in registry.writers
+    assert registry.get_stats()[str(db_path)] == {
+        "active": False, "mutations": 1, "batches": 1, "failed_mutations": 0, "failed_batches": 0
+    }
+
+    # The next write starts a new writer; totals include the retired one
+    registry.run(db_path, _insert("b"))
+    stats = registry.get_stats()[str(db_path)]
+    assert stats["active"] and stats["mutations"] == 2
+    assert _names(db_path) == ["a", "b"]
+
+
+def test_queue_wait_is_measured(registry, db_path):
+    release, held = _hold_writer(registry, db_path)
+    queued = registry.submit(db_path, _insert("a"))
+    time.sleep(0.05)
+    assert registry.get_stats()[str(db_path)]["queue_depth"] == 1
+
+    release.set()
+    held.result(timeout=10)
+    queued.result(timeout=10)
+
+    stats = registry.get_stats()[str(db_path)]
+    assert stats["queue_depth"] == 0
+    assert stats["queue_wait_ms_max"] >= 40
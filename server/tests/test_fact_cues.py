@@ -0,0 +1,69 @@
+"""
+Tests for the fact-cue prefilter of the fact extractor (memory_service/fact_extractor.py).
+
+The prefiltered extraction must give the same facts and ranked-list candidates
+as running every extraction regex over the whole message, which is what
+extract_facts does when find_fact_cues reports every cue at position 0.
+"""
+import pytest
+
+from memory_service import fact_extractor
+from memory_service.fact_extractor import FactExtractor, find_fact_cues
+
+MESSAGES = [
+    # No cues
+    "Thanks, that fixed the build.",
+    "Can you refactor the parser so the tests run faster?",
+    "",
+    # Statements and ranked lists
+    "My favorite color is blue.",
+    "I'm Alice and I own a 3D printer.",
+    "Remember that the deploy window is Friday.",
+    "My favorite cryptos are XMR, BTC, and XLM",
+    "My favorite crypto in order is SHIB, BCH, PEPE",
+    "My favorite colors are 1) Blue, 2) Green, 3) Red",
+    "#1 XMR, #2 BTC, #3 XLM",
+    "XMR is actually my #1 favorite and make BTC my #2",
+    "My favorite #3 is LTC. my #4 favorite coin is DOGE and my #5 is ADA",
+    "first: Blue, second: Green",
+    "LTC is my 9th favorite",
+    "Reply [M1, M2] 2. Tea",
+    # Cues late in the message: the statement patterns scan from the first cue
+    "The tests pass now. By the way, my dog is Rex and I love hiking.",
+    "Ok. Also: remember that staging uses port 8443",
+    "Please remember that the release is Friday. My dog is Rex.",
+    "Works.\nI have a meeting at 3.\nMy editor is vim.",
+    "Great work, I love the new dashboard.",
+    "Ok then. i got a new laptop yesterday",
+    # Non-ASCII: the prefilter reports every cue and the patterns decide
+    "My favorite colorſ are blue, green",
+    "I'm Zoë. My favorite café is Le Procope.",
+    "Ich heiße Jürgen, danke!",
+    "MY FAVORITE ſNACK IS popcorn",
+]
+
+
+@pytest.fixture
+def extractor():
+    extractor = FactExtractor()
+    extractor.nlp = None  # Compare the regex paths only
+    return extractor
+
+
+def _all_cues(text):
+    return dict.fromkeys(fact_extractor._FACT_CUE_RES, 0)
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_prefilter_matches_full_regex_path(extractor, monkeypatch, message):
+    prefiltered = extractor.extract_facts(message)
+
+    monkeypatch.setattr(fact_extractor, "find_fact_cues", _all_cues)
+    assert extractor.extract_facts(message) == prefiltered
+
+
+def test_cues():
+    assert find_fact_cues("Thanks, that fixed the build.") == {}
+    assert find_fact_cues("ok. Then my dog is Rex") == {"statement": 9}
+    assert set(find_fact_cues("#1 XMR")) == {"hash"}
+    assert find_fact_cues("I'm Zoë") == _all_cues("")
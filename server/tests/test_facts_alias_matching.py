@@ -48,7 +48,7 @@ async def test_alias_move_star_wars_rogue_one(test_db_setup, test_thread_id):
     # Verify initial state - find the actual canonical topic used
     # The canonicalizer might normalize "sci-fi movies" to "scifi_movie" or "movie"
     # Let's search for all ranked lists and find the one with our items
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     cursor.execute("""
         SELECT DISTINCT fact_key 
@@ -135,7 +135,7 @@ async def test_alias_move_star_wars_rogue_one(test_db_setup, test_thread_id):
     
     # Step 4: Verify final list state
     # Use the same list_key as seed (should be the same topic)
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     final_items = _get_ranked_list_items(conn, project_id, list_key_seed)
     conn.close()
     final_items.sort(key=lambda x: x["rank"])
@@ -237,7 +237,7 @@ async def test_rank_override_from_user_text(test_db_setup, test_thread_id):
     # Step 4: Verify final list state
     canonical_topic = canonicalize_topic("test items", invoke_teacher=False).canonical_topic
     list_key = canonical_list_key(canonical_topic)
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     final_items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     final_items.sort(key=lambda x: x["rank"])
@@ -331,7 +331,7 @@ async def test_alias_move_breath_of_the_wild(test_db_setup, test_thread_id):
     # Step 4: Verify final list state
     canonical_topic = canonicalize_topic("games", invoke_teacher=False).canonical_topic
     list_key = canonical_list_key(canonical_topic)
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     final_items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     final_items.sort(key=lambda x: x["rank"])
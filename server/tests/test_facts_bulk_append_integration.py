@@ -152,7 +152,7 @@ async def test_bulk_append_to_existing_list(test_db_setup, test_thread_id):
     assert val_4 == "biography" or val_5 == "biography", "Biography not found at rank 4 or 5"
     
     # Verify final list state: query all facts for book_genre
-    conn = db.get_db_connection(test_db_setup["source_id"], project_id=project_id)
+    conn = db.get_facts_db_connection(test_db_setup["source_id"], project_id=project_id)
     cursor = conn.cursor()
     
     canonicalization_result = canonicalize_topic("book genres", invoke_teacher=False)
@@ -350,7 +350,7 @@ async def test_bulk_append_read_verification(test_db_setup, test_thread_id):
     )
     
     # Read list
-    conn = db.get_db_connection(test_db_setup["source_id"], project_id=project_id)
+    conn = db.get_facts_db_connection(test_db_setup["source_id"], project_id=project_id)
     cursor = conn.cursor()
     
     canonicalization_result = canonicalize_topic("book genres", invoke_teacher=False)
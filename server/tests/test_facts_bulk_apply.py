@@ -0,0 +1,74 @@
+"""
+Tests for planned ranked-list writes in apply_facts_ops (server/services/facts_apply.py).
+
+Ops on a ranked list are applied to an in-memory copy of the list and written
+once per transaction; these tests check the resulting lists and rows.
+"""
+import uuid
+
+from memory_service.memory_dashboard import db
+from server.contracts.facts_ops import FactsOp, FactsOpsResponse
+from server.services.facts_apply import apply_facts_ops
+from server.services.librarian import search_facts_ranked_list
+
+LIST_KEY = "user.favorites.board_game"
+
+
+def _apply(project_id, ops):
+    ops = [FactsOp(op="ranked_list_set", list_key=LIST_KEY, value=value, rank=rank) for value, rank in ops]
+    return apply_facts_ops(project_id, str(uuid.uuid4()), FactsOpsResponse(ops=ops))
+
+
+def _values(project_id):
+    return [fact["value_text"] for fact in search_facts_ranked_list(project_id, "board_game")]
+
+
+def _row_counts(test_db_setup):
+    conn = db.get_facts_db_read_connection(test_db_setup["source_id"], project_id=test_db_setup["project_id"])
+    try:
+        return conn.execute("""
+            SELECT (SELECT COUNT(*) FROM project_facts WHERE list_key = ?),
+                   (SELECT COUNT(*) FROM project_facts_history WHERE fact_key LIKE ? || '.%')
+        """, (LIST_KEY, LIST_KEY)).fetchone()
+    finally:
+        conn.close()
+
+
+def test_bulk_append_writes_each_rank_once(test_db_setup):
+    project_id = test_db_setup["project_id"]
+    values = [f"Game {i:03d}" for i in range(50)]
+    result = _apply(project_id, [(value, None) for value in values + ["game 007.", "Game 012"]])
+
+    assert not result.errors
+    assert result.store_count == 50
+    assert result.duplicate_blocked["game 007."]["existing_rank"] == 8
+    assert result.duplicate_blocked["Game 012"]["existing_rank"] == 13
+    assert _values(project_id) == values
+    assert tuple(_row_counts(test_db_setup)) == (50, 0)
+
+
+def test_explicit_ranks_and_appends_in_one_message(test_db_setup):
+    project_id = test_db_setup["project_id"]
+    _apply(project_id, [("Azul", None), ("Catan", None)])
+
+    # Appends after an explicit insert go after the inserted item
+    result = _apply(project_id, [("Chess", None), ("Go", 1), ("Dixit", None), ("catan", 1)])
+    assert not result.errors
+    assert _values(project_id) == ["Catan", "Go", "Azul", "Chess", "Dixit"]
+    assert result.rank_mutations[f"{LIST_KEY}.1"]["action"] == "move"
+
+    # Only rows whose rank or value changed were superseded (Azul and Catan), once each
+    assert tuple(_row_counts(test_db_setup)) == (5, 2)
+
+
+def test_move_beyond_end_goes_to_last_rank(test_db_setup):
+    project_id = test_db_setup["project_id"]
+    _apply(project_id, [("Azul", None), ("Catan", None), ("Chess", None)])
+
+    result = _apply(project_id, [("Azul", 9)])
+    assert not result.errors
+    assert result.rank_mutations[f"{LIST_KEY}.3"]["old_rank"] == 1
+    assert _values(project_id) == ["Catan", "Chess", "Azul"]
+
+    result = _apply(project_id, [("Azul", 9)])
+    assert result.rank_mutations[f"{LIST_KEY}.3"]["action"] == "noop"
@@ -0,0 +1,115 @@
+"""
+Tests for the per-project facts database (memory_service/memory_dashboard/db.py).
+
+Facts live in facts.sqlite next to the project's index.sqlite; init_facts_db()
+moves facts still stored in the index database (older layout) into it once.
+Superseded versions are kept in project_facts_history.
+"""
+import uuid
+
+import pytest
+
+from memory_service.memory_dashboard import db
+
+
+@pytest.fixture
+def project_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        db, "get_db_path_for_source",
+        lambda source_id, project_id=None: tmp_path / source_id / "index" / "index.sqlite"
+    )
+    project_id = str(uuid.uuid4())
+    source_id = f"project-{project_id}"
+    (tmp_path / source_id / "index").mkdir(parents=True)
+    return project_id, source_id
+
+
+def _seed_legacy_facts(source_id, project_id, rows):
+    """Create project_facts (and its FTS table) in the index database, as the older schema did."""
+    def _write(conn):
+        conn.execute("""
+            CREATE TABLE project_facts (
+                fact_id TEXT PRIMARY KEY,
+                project_id TEXT NOT NULL,
+                fact_key TEXT NOT NULL,
+                value_text TEXT NOT NULL,
+                value_type TEXT NOT NULL,
+                confidence REAL NOT NULL DEFAULT 1.0,
+                source_message_uuid TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                effective_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                supersedes_fact_id TEXT,
+                is_current INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        conn.execute("CREATE VIRTUAL TABLE project_facts_fts USING fts5(fact_key, value_text)")
+        conn.executemany("""
+            INSERT INTO project_facts (fact_id, project_id, fact_key, value_text, value_type,
+                                       source_message_uuid, supersedes_fact_id, is_current)
+            VALUES (?, ?, ?, ?, 'string', ?, ?, ?)
+        """, rows)
+    db.run_write(source_id, _write, project_id=project_id, label="seed_legacy_facts")
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_facts_are_stored_next_to_the_index_database(project_paths):
+    project_id, source_id = project_paths
+    db.init_db(source_id, project_id=project_id)
+    db.store_project_fact(project_id, "user.favorite_color", "blue", "string", str(uuid.uuid4()))
+
+    index_path = db.get_db_path_for_source(source_id, project_id=project_id)
+    assert db.get_facts_db_path(source_id, project_id=project_id) == index_path.with_name(db.FACTS_DB_FILENAME)
+    assert db.get_current_fact(project_id, "user.favorite_color")["value_text"] == "blue"
+
+    conn = db.get_db_read_connection(source_id, project_id=project_id)
+    try:
+        assert "project_facts" not in _tables(conn)
+    finally:
+        conn.close()
+
+
+def test_legacy_facts_are_moved_out_of_the_index_database(project_paths):
+    project_id, source_id = project_paths
+    db.init_db(source_id, project_id=project_id)
+    old_id, new_id, list_id = (str(uuid.uuid4()) for _ in range(3))
+    _seed_legacy_facts(source_id, project_id, [
+        (old_id, project_id, "user.favorite_color", "green", "m1", None, 0),
+        (new_id, project_id, "user.favorite_color", "blue", "m2", old_id, 1),
+        (list_id, project_id, "user.favorites.book.1", "Dune", "m3", None, 1),
+    ])
+
+    db.init_facts_db(source_id, project_id=project_id)
+
+    fact = db.get_current_fact(project_id, "user.favorite_color")
+    assert fact["fact_id"] == new_id and fact["supersedes_fact_id"] == old_id
+    assert [f["fact_id"] for f in db.get_fact_history(project_id, "user.favorite_color")] == [new_id, old_id]
+    assert [f["value_text"] for f in db.get_ranked_list_facts(project_id, ["user.favorites.book"])] == ["Dune"]
+    assert [f["fact_key"] for f in db.search_current_facts(project_id, "dune")] == ["user.favorites.book.1"]
+
+    conn = db.get_db_read_connection(source_id, project_id=project_id)
+    try:
+        assert not {"project_facts", "project_facts_fts"} & _tables(conn)
+    finally:
+        conn.close()
+
+
+def test_superseded_facts_move_to_history(project_paths):
+    project_id, source_id = project_paths
+    for value in ("green", "blue", "red"):
+        db.store_project_fact(project_id, "user.favorite_color", value, "string", str(uuid.uuid4()))
+
+    conn = db.get_facts_db_read_connection(source_id, project_id=project_id)
+    try:
+        assert [tuple(row) for row in conn.execute("SELECT value_text, is_current FROM project_facts")] == [("red", 1)]
+        assert conn.execute("SELECT COUNT(*) FROM project_facts_history").fetchone()[0] == 2
+    finally:
+        conn.close()
+
+    history = db.get_fact_history(project_id, "user.favorite_color")
+    assert [(f["value_text"], f["is_current"]) for f in history] == [("red", True), ("blue", False), ("green", False)]
+    assert history[0]["supersedes_fact_id"] == history[1]["fact_id"]
+    assert [f["value_text"] for f in db.search_current_facts(project_id, "color")] == ["red"]
+    assert [f["value_text"] for f in db.get_fact_history(project_id, "user.favorite_color", limit=2)] == ["red", "blue"]
@@ -62,7 +62,7 @@ async def test_move_existing_value_upward(test_db_setup, test_thread_id):
     canonical_topic = canonicalize_topic("vacation destination", invoke_teacher=False).canonical_topic
     list_key = canonical_list_key(canonical_topic)
     
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     
@@ -131,7 +131,7 @@ async def test_move_existing_value_downward(test_db_setup, test_thread_id):
     canonical_topic = canonicalize_topic("vacation destination", invoke_teacher=False).canonical_topic
     list_key = canonical_list_key(canonical_topic)
     
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     
@@ -183,7 +183,7 @@ async def test_already_at_rank_noop(test_db_setup, test_thread_id):
     canonical_topic = canonicalize_topic("vacation destination", invoke_teacher=False).canonical_topic
     list_key = canonical_list_key(canonical_topic)
     
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     initial_items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     initial_items.sort(key=lambda x: x["rank"])
@@ -207,7 +207,7 @@ async def test_already_at_rank_noop(test_db_setup, test_thread_id):
     # The key is that the list state is unchanged
     
     # Step 5: Verify list unchanged
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     final_items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     final_items.sort(key=lambda x: x["rank"])
@@ -268,7 +268,7 @@ async def test_insert_new_value_at_rank(test_db_setup, test_thread_id):
     canonical_topic = canonicalize_topic("vacation destination", invoke_teacher=False).canonical_topic
     list_key = canonical_list_key(canonical_topic)
     
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     
@@ -334,7 +334,7 @@ async def test_rank_beyond_length_append(test_db_setup, test_thread_id):
     canonical_topic = canonicalize_topic("vacation destination", invoke_teacher=False).canonical_topic
     list_key = canonical_list_key(canonical_topic)
     
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     
@@ -402,7 +402,7 @@ async def test_rank_mutation_e2e_integration(test_db_setup, test_thread_id):
     canonical_topic = canonicalize_topic("vacation destination", invoke_teacher=False).canonical_topic
     list_key = canonical_list_key(canonical_topic)
     
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     
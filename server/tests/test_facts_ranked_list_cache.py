@@ -0,0 +1,149 @@
+"""
+Tests for the ranked list cache (server/services/ranked_list_cache.py).
+
+Verifies that ranked-list reads are served from the cache after the first load,
+that apply_facts_ops writes committed changes through to the cache, and that
+facts written by another process or alias table changes are not served stale.
+"""
+import sqlite3
+import uuid
+
+from memory_service.memory_dashboard import db
+
+from server.contracts.facts_ops import FactsOp, FactsOpsResponse
+from server.services.canonicalizer import get_canonicalizer
+from server.services.facts_apply import apply_facts_ops
+from server.services.librarian import get_ranked_list_max_rank, search_facts_ranked_list
+from server.services.ranked_list_cache import RankedListCache, get_ranked_list_cache
+
+
+def _append(project_id, list_key, values, rank=None):
+    ops = [FactsOp(op="ranked_list_set", list_key=list_key, value=value, rank=rank) for value in values]
+    return apply_facts_ops(project_id, str(uuid.uuid4()), FactsOpsResponse(ops=ops))
+
+
+def _values(facts):
+    return [fact["value_text"] for fact in facts]
+
+
+def test_reads_hit_cache_after_first_load(test_db_setup):
+    project_id = test_db_setup["project_id"]
+    result = _append(project_id, "user.favorites.color", ["blue", "green", "red"])
+    assert not result.errors
+
+    cache = get_ranked_list_cache()
+    cache.invalidate(project_id)
+    first = search_facts_ranked_list(project_id, "colors")
+    hits_before = cache.list_hits
+    second = search_facts_ranked_list(project_id, "colors")
+
+    assert _values(first) == _values(second) == ["blue", "green", "red"]
+    assert cache.list_hits == hits_before + 1
+
+    # Ordinal and slice queries are answered from the same cached list
+    assert _values(search_facts_ranked_list(project_id, "colors", rank=2)) == ["green"]
+    assert _values(search_facts_ranked_list(project_id, "colors", limit=2)) == ["blue", "green"]
+    assert get_ranked_list_max_rank(project_id, "colors") == 3
+    assert cache.list_hits == hits_before + 4
+
+
+def test_apply_facts_ops_writes_through(test_db_setup):
+    project_id = test_db_setup["project_id"]
+    _append(project_id, "user.favorites.color", ["blue", "green", "red"])
+    assert _values(search_facts_ranked_list(project_id, "color")) == ["blue", "green", "red"]
+
+    # MOVE red to #1: the cached list reflects the shifted ranks without a reload
+    result = _append(project_id, "user.favorites.color", ["red"], rank=1)
+    assert not result.errors
+    misses_before = get_ranked_list_cache().list_misses
+    assert _values(search_facts_ranked_list(project_id, "color")) == ["red", "blue", "green"]
+    assert get_ranked_list_cache().list_misses == misses_before
+
+    # A new list changes the topic resolution
+    _append(project_id, "user.favorites.book", ["dune"])
+    assert _values(search_facts_ranked_list(project_id, "books")) == ["dune"]
+
+
+def test_writes_from_other_processes_invalidate_the_cache(test_db_setup):
+    project_id = test_db_setup["project_id"]
+    _append(project_id, "user.favorites.color", ["blue", "green"])
+    deleted_message_uuid = str(uuid.uuid4())
+    apply_facts_ops(project_id, deleted_message_uuid, FactsOpsResponse(ops=[
+        FactsOp(op="ranked_list_set", list_key="user.favorites.color", value="red")
+    ]))
+    assert _values(search_facts_ranked_list(project_id, "color")) == ["blue", "green", "red"]
+
+    # The memory service deletes a chat's facts on its own connection (db.delete_chat_messages_by_chat_id)
+    conn = sqlite3.connect(db.get_facts_db_path(f"project-{project_id}", project_id=project_id))
+    with conn:
+        conn.execute("DELETE FROM project_facts WHERE source_message_uuid = ?", (deleted_message_uuid,))
+    conn.close()
+
+    invalidations_before = get_ranked_list_cache().external_invalidations
+    assert _values(search_facts_ranked_list(project_id, "color")) == ["blue", "green"]
+    assert get_ranked_list_cache().external_invalidations == invalidations_before + 1
+
+    # The cache's own writes don't count as outside changes
+    _append(project_id, "user.favorites.color", ["yellow"])
+    misses_before = get_ranked_list_cache().list_misses
+    assert _values(search_facts_ranked_list(project_id, "color")) == ["blue", "green", "yellow"]
+    assert get_ranked_list_cache().list_misses == misses_before
+    assert get_ranked_list_cache().external_invalidations == invalidations_before + 1
+
+
+def test_alias_table_changes_drop_topic_resolutions(test_db_setup):
+    project_id = test_db_setup["project_id"]
+    _append(project_id, "user.favorites.color", ["blue"])
+    cache = get_ranked_list_cache()
+    assert _values(search_facts_ranked_list(project_id, "color")) == ["blue"]
+    topic_misses, list_misses = cache.topic_misses, cache.list_misses
+    assert _values(search_facts_ranked_list(project_id, "color")) == ["blue"]
+    assert cache.topic_misses == topic_misses
+
+    # A teacher mapping bumps AliasTable.version: the topic is resolved again, the list is still cached
+    assert get_canonicalizer().alias_table.add_entry("paint_color", ["paint colour"])
+    assert _values(search_facts_ranked_list(project_id, "color")) == ["blue"]
+    assert cache.topic_misses == topic_misses + 1
+    assert cache.list_misses == list_misses
+
+
+def test_resolution_loaded_with_previous_alias_table_is_dropped():
+    cache = RankedListCache()
+    generation = cache.validate("p1", facts_version=1, alias_version=1)
+    cache.put_topic_list_keys("p1", "color", ["user.favorites.color"], generation)
+    assert cache.get_topic_list_keys("p1", "color") == ("user.favorites.color",)
+
+    cache.validate("p1", facts_version=1, alias_version=2)
+    assert cache.get_topic_list_keys("p1", "color") is None
+    # A reader that resolved the topic before the alias change must not store its result
+    cache.put_topic_list_keys("p1", "color", ["user.favorites.color"], generation)
+    assert cache.get_topic_list_keys("p1", "color") is None
+    assert cache.get_stats()["alias_invalidations"] == 1
+
+
+def test_returned_facts_are_copies(test_db_setup):
+    project_id = test_db_setup["project_id"]
+    _append(project_id, "user.favorites.city", ["lisbon"])
+    facts = search_facts_ranked_list(project_id, "city")
+    facts[0]["value_text"] = "changed"
+    facts[0]["schema_hint"]["topic"] = "changed"
+    fact = search_facts_ranked_list(project_id, "city")[0]
+    assert fact["value_text"] == "lisbon"
+    assert fact["schema_hint"]["topic"] == "city"
+
+
+def test_stale_fill_is_dropped():
+    cache = RankedListCache(max_projects=2)
+    generation = cache.generation("p1")
+    cache.apply_write("p1", {"user.favorites.color": [
+        {"rank": 1, "value_text": "blue", "source_message_uuid": None}
+    ]})
+    # A reader that loaded before the write must not overwrite the newer list
+    cache.put_list("p1", "user.favorites.color", [], generation)
+    assert [item["value_text"] for item in cache.get_list("p1", "user.favorites.color").items] == ["blue"]
+    assert cache.get_stats()["stale_fills"] == 1
+
+    # LRU eviction by project
+    cache.generation("p2")
+    cache.generation("p3")
+    assert cache.get_stats()["projects"] == 2
@@ -52,7 +52,7 @@ async def test_breakfast_burritos_duplicate_prevention(test_db_setup, test_threa
     # This ensures "weekend breakfasts" and "weekend breakfast" map to the same list_key
     from server.services.facts_normalize import canonical_ranked_topic_key
     list_key = canonical_ranked_topic_key("weekend breakfasts")
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     initial_items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     initial_items.sort(key=lambda x: x["rank"])
@@ -93,7 +93,7 @@ async def test_breakfast_burritos_duplicate_prevention(test_db_setup, test_threa
     assert mutation_result.update_count >= 1, "Should have at least 1 update (Breakfast Burritos moved)"
     
     # Step 4: Verify final list state (use the same list_key as seed)
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     final_items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     final_items.sort(key=lambda x: x["rank"])
@@ -208,7 +208,7 @@ async def test_rank_directive_respects_user_request(test_db_setup, test_thread_i
     # Use canonical_ranked_topic_key (single source of truth) for consistency
     from server.services.facts_normalize import canonical_ranked_topic_key
     list_key = canonical_ranked_topic_key("weekend breakfasts")
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     final_items = _get_ranked_list_items(conn, project_id, list_key)
     conn.close()
     final_items.sort(key=lambda x: x["rank"])
@@ -277,7 +277,7 @@ async def test_case_insensitive_duplicate_prevention(test_db_setup, test_thread_
     
     # Step 3: Verify no duplicates created
     # Find the actual list that was created (canonicalizer might normalize topic differently)
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     cursor.execute("""
         SELECT DISTINCT fact_key 
@@ -90,7 +90,7 @@ async def test_duplicate_only_bulk_write_no_facts_f(test_db_setup, test_thread_i
     assert history_info["existing_rank"] == 3, f"History should be at rank 3, got {history_info['existing_rank']}"
     
     # Verify DB state unchanged (still Sci-Fi, Fantasy, History in same ranks)
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     
     canonicalization_result = canonicalize_topic("book genres", invoke_teacher=False)
@@ -199,7 +199,7 @@ async def test_oxford_comma_parsing_e2e(test_db_setup, test_thread_id):
             assert value.lower() in ["spain", "greece", "thailand"], f"Unexpected value: {value}"
     
     # Verify final list state
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     
     canonicalization_result = canonicalize_topic("vacation destinations", invoke_teacher=False)
@@ -298,7 +298,7 @@ async def test_non_oxford_comma_parsing_e2e(test_db_setup, test_thread_id):
             assert value.lower() in ["spain", "greece", "thailand"], f"Unexpected value: {value}"
     
     # Verify final list state
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     
     canonicalization_result = canonicalize_topic("vacation destinations", invoke_teacher=False)
@@ -374,7 +374,7 @@ async def test_ranked_list_invariants_after_bulk_append(test_db_setup, test_thre
     )
     
     # Verify invariants after first write
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     
     canonicalization_result = canonicalize_topic("book genres", invoke_teacher=False)
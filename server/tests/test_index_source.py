@@ -0,0 +1,77 @@
+"""
+Tests for full source indexing (memory_service/indexer.py index_source).
+
+Runs index_source over a temp directory with the source DB, tracking DB and
+source config redirected to tmp_path; text extraction reads the file, the
+tokenizer splits on words and embeddings are fixed vectors, so no model is
+loaded.
+"""
+import re
+import sqlite3
+
+import numpy as np
+import pytest
+
+from memory_service import config
+from memory_service.config import EMBEDDING_DIM, SourceConfig
+from memory_service.memory_dashboard import db
+
+SOURCE_ID = "test-docs"
+
+
+class WordTokenizer:
+    """Fast-tokenizer stub: one token per word or punctuation mark, with offsets."""
+
+    def __call__(self, texts, **kwargs):
+        return {"offset_mapping": [[m.span() for m in re.finditer(r"\w+|[^\w\s]", text)] for text in texts]}
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+
+@pytest.fixture
+def indexer(tmp_path, monkeypatch):
+    indexer = pytest.importorskip("memory_service.indexer")  # Needs sentence-transformers
+
+    def _db_path(source_id, project_id=None):
+        path = tmp_path / "db" / source_id / "index.sqlite"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    monkeypatch.setattr(db, "get_db_path_for_source", _db_path)
+    tracking_db_path = tmp_path / "db" / "tracking.sqlite"
+    tracking_db_path.parent.mkdir(parents=True, exist_ok=True)
+    # init_tracking_db still indexes the legacy facts table that existing tracking DBs have
+    conn = sqlite3.connect(tracking_db_path)
+    conn.execute("CREATE TABLE facts (project_id TEXT, chat_id TEXT, topic_key TEXT, rank INTEGER, created_at TEXT)")
+    conn.close()
+    monkeypatch.setattr(config, "TRACKING_DB_PATH", tracking_db_path)
+    monkeypatch.setattr(db, "TRACKING_DB_PATH", tracking_db_path)
+    monkeypatch.setattr(indexer, "extract_text", lambda path: path.read_text())
+    monkeypatch.setattr(indexer, "_get_chunk_tokenizer", lambda: (WordTokenizer(), 512))
+    monkeypatch.setattr(indexer, "embed_texts",
+                        lambda texts: np.ones((len(texts), EMBEDDING_DIM), dtype=np.float32))
+    return indexer
+
+
+def test_index_source_writes_chunks(indexer, tmp_path, monkeypatch):
+    root = tmp_path / "docs"
+    root.mkdir()
+    (root / "a.txt").write_text("Notes about the write-ahead log and checkpoints in SQLite.")
+    (root / "b.md").write_text("# Plan\n\nShip the near-duplicate suppression next week.")
+    source_config = SourceConfig({"id": SOURCE_ID, "project_id": "p1", "root_path": str(root),
+                                  "near_dup_threshold": 0.8})
+    monkeypatch.setattr(config, "load_sources", lambda: [source_config])
+    db.upsert_source(SOURCE_ID, "p1", str(root))
+
+    files_indexed, _, _ = indexer.index_source(SOURCE_ID)
+
+    assert files_indexed == 2
+    conn = db.get_db_connection(SOURCE_ID)
+    try:
+        chunk_texts = sorted(row[0] for row in conn.execute("SELECT text FROM chunks"))
+        embedded = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    finally:
+        conn.close()
+    assert len(chunk_texts) == 2 and chunk_texts[0].startswith("# Plan")
+    assert embedded == 2
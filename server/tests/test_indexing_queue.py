@@ -0,0 +1,117 @@
+"""
+Tests for per-job cancellation and timeouts in the chat indexing queue
+(memory_service/indexing_queue.py).
+
+Batches are run directly with _process_batch() and a fake indexer that plays
+the checkpoint protocol of index_chat_messages_batch (stop once the token is
+cancelled, report the remaining messages as not indexed).
+"""
+import time
+from datetime import datetime
+
+import pytest
+
+from memory_service.indexing_queue import IndexingQueue, JobState
+from memory_service.job_journal import JobJournal
+
+
+@pytest.fixture
+def queue(tmp_path):
+    journal = JobJournal(tmp_path / "index_queue.db")
+    yield IndexingQueue(journal=journal)
+    journal.close()
+
+
+def _enqueue(queue, count, chat_id="chat-1", timeout=15.0):
+    results = queue.enqueue_many([
+        {
+            "project_id": "p1", "chat_id": chat_id, "message_id": f"{chat_id}-m{i}", "role": "user",
+            "content": f"message {i}", "timestamp": datetime.now(), "message_index": i,
+        }
+        for i in range(count)
+    ])
+    jobs = [queue.jobs[job_id] for job_id, _ in results]
+    for job in jobs:
+        job.computed_timeout = timeout
+    return jobs
+
+
+def _take_pending(queue):
+    jobs = list(queue.pending.get("p1", ()))
+    queue.pending.pop("p1", None)
+    return jobs
+
+
+def _indexer(slow_message_ids=(), on_start=None, succeed=True):
+    """Fake batch indexer: slow messages take 0.2s, then the token is checked before writing."""
+    def index_batch(messages, cancel_token=None):
+        if on_start:
+            on_start()
+        if any(msg["message_id"] in slow_message_ids for msg in messages):
+            time.sleep(0.2)
+        if cancel_token.is_cancelled:
+            return [(False, None)] * len(messages)
+        return [(succeed, f"uuid-{msg['message_id']}") for msg in messages]
+    return index_batch
+
+
+def _journal_state(queue, job):
+    return queue.journal.get_job(job.job_id)["state"]
+
+
+def test_batch_timeout_requeues_jobs_to_run_alone(queue):
+    jobs = _enqueue(queue, 3, timeout=0.03)  # Batch deadline 0.09s
+    index_batch = _indexer(slow_message_ids={jobs[1].message_id})
+
+    queue._process_batch(_take_pending(queue), index_batch)
+
+    # No job is blamed for the shared deadline; all are requeued (and not acked)
+    assert [job.state for job in jobs] == [JobState.QUEUED] * 3
+    assert all(job.run_alone for job in jobs)
+    assert [_journal_state(queue, job) for job in jobs] == ["queued"] * 3
+
+    for job in _take_pending(queue):
+        queue._process_batch([job], index_batch)
+
+    assert [job.state for job in jobs] == [JobState.SUCCESS, JobState.TIMEOUT, JobState.SUCCESS]
+    assert [_journal_state(queue, job) for job in jobs] == ["success", "timeout", "success"]
+    assert queue.journal.load_pending() == []
+
+
+def test_cancelling_one_job_requeues_its_batch_mates(queue):
+    jobs = _enqueue(queue, 3)
+
+    queue._process_batch(_take_pending(queue), _indexer(on_start=lambda: queue.cancel_job(jobs[1].job_id)))
+
+    assert jobs[1].state == JobState.CANCELLED
+    assert [job.state for job in (jobs[0], jobs[2])] == [JobState.QUEUED] * 2
+    assert not jobs[0].run_alone
+    assert [_journal_state(queue, job) for job in jobs] == ["queued", "cancelled", "queued"]
+
+    queue._process_batch(_take_pending(queue), _indexer())
+
+    assert [job.state for job in jobs] == [JobState.SUCCESS, JobState.CANCELLED, JobState.SUCCESS]
+
+
+def test_failure_after_deadline_is_an_error_not_a_timeout(queue):
+    jobs = _enqueue(queue, 1, timeout=0.01)
+
+    def failing_batch(messages, cancel_token=None):
+        time.sleep(0.05)  # Past the deadline, but the token is never checked
+        raise RuntimeError("disk full")
+
+    queue._process_batch(_take_pending(queue), failing_batch)
+
+    assert jobs[0].state == JobState.ERROR
+    assert jobs[0].error_message == "disk full"
+
+
+def test_cancel_chat_jobs_only_cancels_that_chat(queue):
+    deleted = _enqueue(queue, 2, chat_id="deleted-chat")
+    kept = _enqueue(queue, 1, chat_id="other-chat")
+
+    assert queue.cancel_chat_jobs("p1", "deleted-chat") == 2
+    queue._process_batch(_take_pending(queue), _indexer())
+
+    assert [job.state for job in deleted] == [JobState.CANCELLED] * 2
+    assert kept[0].state == JobState.SUCCESS
@@ -0,0 +1,74 @@
+"""
+Tests for the durable job journal of the chat indexing queue (memory_service/job_journal.py).
+
+A restart is simulated by closing the journal while jobs are still leased and
+opening a new JobJournal (and IndexingQueue) on the same file.
+"""
+from datetime import datetime
+
+from memory_service.indexing_queue import IndexingJob, IndexingQueue, JobState
+from memory_service.job_journal import JOURNAL_MAX_ATTEMPTS, JobJournal
+
+
+def _jobs(count, project_id="p1"):
+    return [
+        IndexingJob(
+            job_id=f"job-{i}", project_id=project_id, chat_id="chat-1", message_id=f"m{i}", message_uuid=None,
+            role="user", content=f"message {i}", timestamp=datetime.now(), message_index=i,
+        )
+        for i in range(count)
+    ]
+
+
+def _lease(journal, jobs):
+    for job in jobs:
+        job.state = JobState.RUNNING
+        job.start_time = datetime.now()
+    journal.mark_leased(jobs, owner="1234:worker", lease_seconds=30.0)
+
+
+def test_running_jobs_are_replayed_after_restart(tmp_path):
+    journal = JobJournal(tmp_path / "index_queue.db")
+    jobs = _jobs(4)
+    journal.record_enqueued(jobs)
+    _lease(journal, jobs[:3])
+    jobs[1].state, jobs[1].end_time, jobs[1].message_uuid = JobState.SUCCESS, datetime.now(), "uuid-1"
+    journal.ack([jobs[1]])
+    journal.close()  # Crash with jobs 0 and 2 leased, job 3 queued
+
+    journal = JobJournal(tmp_path / "index_queue.db")
+    queue = IndexingQueue(journal=journal)
+    queue._replay_journal()
+
+    assert [job.job_id for job in queue.pending["p1"]] == ["job-0", "job-2", "job-3"]
+    assert all(queue.jobs[job_id].state == JobState.QUEUED for job_id in ("job-0", "job-2", "job-3"))
+    assert journal.get_counts() == {"queued": 3, "success": 1}
+    assert journal.get_job("job-0")["attempts"] == 1
+    assert journal.get_job("job-0")["lease_owner"] is None
+    # Finished jobs stay queryable after the restart
+    status = queue.get_job_status("job-1")
+    assert (status["state"], status["message_uuid"]) == ("success", "uuid-1")
+    journal.close()
+
+
+def test_job_is_abandoned_after_max_attempts(tmp_path):
+    journal = JobJournal(tmp_path / "index_queue.db")
+    job, other = _jobs(2)
+    journal.record_enqueued([job, other])
+    journal.close()
+
+    # The job crashes the service every time it runs; the other one is never picked up
+    for attempt in range(1, JOURNAL_MAX_ATTEMPTS + 1):
+        journal = JobJournal(tmp_path / "index_queue.db")
+        assert [row["job_id"] for row in journal.load_pending()] == ["job-0", "job-1"]
+        _lease(journal, [job])
+        assert journal.get_job("job-0")["attempts"] == attempt
+        journal.close()
+
+    journal = JobJournal(tmp_path / "index_queue.db")
+    assert [row["job_id"] for row in journal.load_pending()] == ["job-1"]
+    row = journal.get_job("job-0")
+    assert row["state"] == "error"
+    assert row["error_message"] == f"Abandoned after {JOURNAL_MAX_ATTEMPTS} attempts (interrupted by restart)"
+    assert row["end_time"] is not None and row["lease_owner"] is None
+    journal.close()
@@ -0,0 +1,154 @@
+"""
+Tests for the local routing tier (server/services/local_router.py).
+
+Nano is replaced by a stub that records calls; embeddings are fixed vectors
+per message, so kNN neighbors are chosen by the test.
+"""
+import sqlite3
+
+import numpy as np
+import pytest
+
+from server.contracts.routing_plan import RoutingPlan
+from server.services import nano_router
+from server.services.local_router import LocalRouter, RoutingExampleStore
+
+CHAT_PLAN = RoutingPlan(content_plane="chat", operation="none", reasoning_required=True, confidence=1.0)
+INDEX_PLAN = RoutingPlan(content_plane="index", operation="search", reasoning_required=True, confidence=1.0)
+
+
+@pytest.fixture
+def nano_calls(monkeypatch):
+    """Stub route_with_nano: returns the plan queued for the message (CHAT_PLAN by default)."""
+    calls = {"messages": [], "plans": {}}
+
+    async def _route_with_nano(user_message, conversation_history=None):
+        calls["messages"].append(user_message)
+        return calls["plans"].get(user_message, CHAT_PLAN)
+
+    monkeypatch.setattr(nano_router, "route_with_nano", _route_with_nano)
+    return calls
+
+
+def _vector(*components):
+    vector = np.zeros(8, dtype=np.float32)
+    vector[:len(components)] = components
+    return vector
+
+
+def _router(tmp_path, vectors, **kwargs):
+    examples = RoutingExampleStore(db_path=tmp_path / "routing_examples.db", max_examples=16, model_name="test")
+    return LocalRouter(examples=examples, embed_fn=vectors.__getitem__, audit_rate=0.0, k=5,
+                       min_similarity=0.9, min_votes=3, **kwargs)
+
+
+@pytest.mark.parametrize("message, rank, top_n_slice", [
+    ("What is my favorite crypto?", None, None),
+    ("please list my favorite board games", None, None),
+    ("What's my #2 favorite crypto?", 2, None),
+    ("What is my third favorite color?", 3, None),
+    ("What are my top 3 favorite activities?", None, 3),
+])
+def test_rules_route_facts_reads(message, rank, top_n_slice):
+    decision = LocalRouter().decide_by_rules(message)
+
+    assert decision.source == "rule:facts_read"
+    assert (decision.plan.content_plane, decision.plan.operation) == ("facts", "read")
+    assert decision.plan.facts_read_candidate.query == message
+    assert (decision.plan.facts_read_candidate.rank, decision.plan.facts_read_candidate.top_n_slice) == (rank, top_n_slice)
+
+
+@pytest.mark.parametrize("message", [
+    "My favorite crypto is XMR",
+    "What is my favorite color and why?",
+    "Thanks, now refactor the parser",
+    "What did we discuss about WAL mode?",
+])
+def test_rules_leave_other_messages_to_nano(message):
+    assert LocalRouter().decide_by_rules(message) is None
+
+
+async def test_confident_rule_bypasses_nano(nano_calls):
+    router = LocalRouter(audit_rate=0.0)
+
+    plan, router_source = await router.route("Thanks!")
+
+    assert router_source == "local" and plan.content_plane == "chat"
+    assert nano_calls["messages"] == []
+    assert router.get_stats()["bypassed_by_source"] == {"rule:chit_chat": 1}
+
+
+async def test_knn_learns_from_nano_decisions(tmp_path, nano_calls):
+    vectors = {f"chat {i}": _vector(1.0, 0.01 * i) for i in range(3)}
+    vectors["chat again"] = _vector(1.0, 0.015)
+    router = _router(tmp_path, vectors)
+
+    for message in ("chat 0", "chat 1", "chat 2"):
+        assert (await router.route(message))[1] == "nano"
+    plan, router_source = await router.route("chat again")
+
+    assert router_source == "local" and plan.content_plane == "chat"
+    assert nano_calls["messages"] == ["chat 0", "chat 1", "chat 2"]
+
+    # Examples are persisted: a new store starts warm
+    assert len(RoutingExampleStore(db_path=tmp_path / "routing_examples.db", max_examples=16, model_name="test")) == 3
+
+
+def test_examples_do_not_store_message_text(tmp_path):
+    db_path = tmp_path / "routing_examples.db"
+    conn = sqlite3.connect(db_path)
+    # Table as earlier versions created it, with the message text
+    conn.execute("""
+        CREATE TABLE routing_examples (
+            example_id INTEGER PRIMARY KEY AUTOINCREMENT, message TEXT NOT NULL, content_plane TEXT NOT NULL,
+            operation TEXT NOT NULL, reasoning_required INTEGER NOT NULL, model_name TEXT NOT NULL,
+            embedding_blob BLOB NOT NULL, created_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("INSERT INTO routing_examples VALUES (NULL, 'my address is 1 Main St', 'chat', 'none', 1, 'test', ?, '')",
+                 (_vector(1.0).tobytes(),))
+    conn.commit()
+    conn.close()
+
+    store = RoutingExampleStore(db_path=db_path, max_examples=16, model_name="test")
+    store.add(_vector(0.0, 1.0), INDEX_PLAN)
+
+    assert len(store) == 2
+    conn = sqlite3.connect(db_path)
+    try:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(routing_examples)")]
+        rows = conn.execute("SELECT content_plane, operation FROM routing_examples ORDER BY example_id").fetchall()
+    finally:
+        conn.close()
+    assert "message" not in columns
+    assert rows == [("chat", "none"), ("index", "search")]
+    assert b"1 Main St" not in db_path.read_bytes()
+
+
+async def test_knn_never_decides_plans_that_need_candidates(tmp_path, nano_calls):
+    vectors = {f"search {i}": _vector(0.0, 1.0, 0.01 * i) for i in range(3)}
+    vectors.update({f"chat {i}": _vector(1.0, 0.01 * i) for i in range(3)})
+    vectors["search again"] = _vector(0.0, 1.0, 0.015)
+    vectors["my favorite color is red"] = _vector(1.0, 0.015)
+    nano_calls["plans"] = {f"search {i}": INDEX_PLAN for i in range(3)}
+    router = _router(tmp_path, vectors)
+
+    for message in ("search 0", "search 1", "search 2", "chat 0", "chat 1", "chat 2"):
+        assert (await router.route(message))[1] == "nano"
+
+    # Index plans need a query candidate from Nano
+    assert (await router.route("search again"))[1] == "nano"
+    # Facts cues are never routed by kNN, even next to chat examples
+    assert (await router.route("my favorite color is red"))[1] == "nano"
+    assert router.get_stats()["bypassed"] == 0
+
+
+async def test_audited_decision_logs_disagreement(nano_calls):
+    nano_calls["plans"] = {"ok": INDEX_PLAN}
+    router = LocalRouter(audit_rate=1.0)
+
+    plan, router_source = await router.route("ok")
+
+    assert router_source == "nano" and plan is INDEX_PLAN
+    stats = router.get_stats()
+    assert (stats["audited"], stats["compared"], stats["disagreements"]) == (1, 1, 1)
@@ -0,0 +1,88 @@
+"""
+Tests for near-duplicate detection (memory_service/near_dup.py) and its use
+in indexer._suppress_near_duplicates and /search (per-source thresholds).
+
+The source DB calls of the indexer are replaced by an in-memory stub.
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from memory_service.near_dup import NearDuplicateCollapser, compute_minhash
+
+TEXT = "the quick brown fox jumps over the lazy dog near the river bank today"
+NEAR_COPY = TEXT + " again"  # 13 of 14 shingles shared: ~0.93 Jaccard
+
+
+def test_texts_without_words_have_no_signature():
+    assert compute_minhash("------ *** ------") is None
+    assert compute_minhash("") is None
+    assert compute_minhash("a word") is not None
+
+
+def test_collapser_never_merges_texts_without_words():
+    collapser = NearDuplicateCollapser(0.9)
+
+    assert collapser.find_duplicate(0, "==========") is None
+    assert collapser.find_duplicate(1, "----------") is None
+    assert collapser.find_duplicate(2, TEXT) is None
+    assert collapser.find_duplicate(3, TEXT) == 2
+
+
+def test_collapser_uses_per_source_thresholds():
+    collapser = NearDuplicateCollapser(0.9)
+    assert collapser.find_duplicate(0, TEXT, 0.0) is None
+    # Disabled source: kept, and not a collapse target either
+    assert collapser.find_duplicate(1, TEXT) is None
+    assert collapser.find_duplicate(2, TEXT, 0.0) is None
+    assert collapser.find_duplicate(3, NEAR_COPY, 0.8) == 1
+
+    # The stricter of the two thresholds applies, whichever text carries it
+    collapser = NearDuplicateCollapser(0.9)
+    assert collapser.find_duplicate(0, TEXT, 0.99) is None
+    assert collapser.find_duplicate(1, NEAR_COPY, 0.8) is None
+    assert collapser.find_duplicate(2, NEAR_COPY + " once more", 0.5) == 1
+
+
+def test_suppression_skips_chunks_without_words(monkeypatch):
+    indexer = pytest.importorskip("memory_service.indexer")  # Needs sentence-transformers
+    stored = {"links": [], "signatures": []}
+    monkeypatch.setattr(indexer.db, "find_near_duplicate_candidates", lambda *args, **kwargs: [])
+    monkeypatch.setattr(indexer.db, "link_near_duplicate_chunks", lambda links, source_id: stored["links"].extend(links))
+    monkeypatch.setattr(indexer.db, "insert_chunk_signatures",
+                        lambda signatures, source_id: stored["signatures"].extend(signatures))
+    records = [
+        SimpleNamespace(id=1, text="=============="),
+        SimpleNamespace(id=2, text="--------------"),
+        SimpleNamespace(id=3, text=TEXT),
+        SimpleNamespace(id=4, text=TEXT),
+    ]
+
+    canonical = indexer._suppress_near_duplicates(records, "src", 0.9)
+
+    assert [r.id for r in canonical] == [1, 2, 3]
+    assert stored["links"] == [(4, 3)]
+    assert [chunk_id for chunk_id, _, _ in stored["signatures"]] == [3]
+
+
+def test_source_thresholds_are_reloaded_only_when_config_changes(tmp_path, monkeypatch):
+    from memory_service import config
+
+    dynamic_path = tmp_path / "dynamic_sources.json"
+    dynamic_path.write_text('[{"id": "docs", "project_id": "p1", "root_path": "/tmp", "near_dup_threshold": 0.8}]')
+    monkeypatch.setattr(config, "MEMORY_SOURCES_YAML", tmp_path / "memory_sources.yaml")
+    monkeypatch.setattr(config, "DYNAMIC_SOURCES_PATH", dynamic_path)
+    monkeypatch.setattr(config, "_near_dup_thresholds", None)
+    loads = []
+    load_sources = config.load_sources
+    monkeypatch.setattr(config, "load_sources", lambda: loads.append(1) or load_sources())
+
+    assert config.get_near_dup_thresholds() == {"docs": 0.8}
+    assert config.get_near_dup_thresholds() == {"docs": 0.8}
+    assert len(loads) == 1
+
+    dynamic_path.write_text('[{"id": "docs", "project_id": "p1", "root_path": "/tmp", "near_dup_threshold": 0}]')
+    os.utime(dynamic_path, ns=(0, dynamic_path.stat().st_mtime_ns + 1))
+    assert config.get_near_dup_thresholds() == {"docs": 0.0}
+    assert len(loads) == 2
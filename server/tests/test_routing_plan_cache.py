@@ -0,0 +1,111 @@
+"""
+Tests for the routing plan cache (server/services/routing_plan_cache.py).
+
+Nano is replaced by a stub that counts calls; the cache and local router are
+fresh instances per test.
+"""
+import uuid
+
+import pytest
+
+from server.contracts.facts_ops import FactsOp, FactsOpsResponse
+from server.contracts.routing_plan import FactsReadCandidate, FactsWriteCandidate, RoutingPlan
+from server.services import local_router, nano_router, routing_plan_cache
+from server.services.facts_apply import apply_facts_ops
+from server.services.local_router import LocalRouter, route_message
+from server.services.routing_plan_cache import RoutingPlanCache
+
+HISTORY = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "Hello! How can I help?"}]
+
+
+@pytest.fixture
+def plan_cache(monkeypatch):
+    cache = RoutingPlanCache(max_size=8, ttl_seconds=60)
+    monkeypatch.setattr(routing_plan_cache, "_routing_plan_cache", cache)
+    monkeypatch.setattr(local_router, "_local_router", LocalRouter(audit_rate=0.0))
+    return cache
+
+
+@pytest.fixture
+def nano_calls(monkeypatch):
+    calls = []
+
+    async def _route_with_nano(user_message, conversation_history=None):
+        calls.append(user_message)
+        return RoutingPlan(
+            content_plane="facts", operation="read", reasoning_required=False,
+            facts_read_candidate=FactsReadCandidate(topic="crypto", query=user_message), confidence=1.0
+        )
+
+    monkeypatch.setattr(nano_router, "route_with_nano", _route_with_nano)
+    return calls
+
+
+async def test_repeated_message_is_served_from_cache(plan_cache, nano_calls):
+    project_id = str(uuid.uuid4())
+    plan, router_source = await route_message("Which crypto do I like best?", HISTORY, project_id=project_id)
+    assert router_source == "nano"
+
+    # Near-identical retry: same plan, but the candidate query is the new message
+    plan, router_source = await route_message("which crypto  do I like best", HISTORY, project_id=project_id)
+    assert router_source == "cache"
+    assert plan.facts_read_candidate.query == "which crypto  do I like best"
+    assert nano_calls == ["Which crypto do I like best?"]
+
+    # Callers may modify the plan they get without changing the cached one
+    plan.content_plane = "chat"
+    assert (await route_message("Which crypto do I like best?", HISTORY, project_id=project_id))[0].content_plane == "facts"
+
+
+async def test_key_includes_history_and_project(plan_cache, nano_calls):
+    project_id = str(uuid.uuid4())
+    await route_message("Which crypto do I like best?", HISTORY, project_id=project_id)
+
+    assert (await route_message("Which crypto do I like best?", HISTORY[:1], project_id=project_id))[1] == "nano"
+    assert (await route_message("Which crypto do I like best?", HISTORY, project_id=str(uuid.uuid4())))[1] == "nano"
+    # Only the last 5 history messages are part of the key, as in the Nano prompt
+    older = [{"role": "user", "content": "something else entirely"}] + HISTORY * 3
+    await route_message("Which crypto do I like best?", older, project_id=project_id)
+    assert (await route_message("Which crypto do I like best?", HISTORY * 3, project_id=project_id))[1] == "cache"
+
+
+def test_expired_and_write_plans_are_not_served():
+    cache = RoutingPlanCache(ttl_seconds=0)
+    read_plan = RoutingPlan(content_plane="chat", operation="none", reasoning_required=True)
+    cache.put("p", "hello there friend", None, read_plan)
+    assert cache.get("p", "hello there friend") is None
+    assert cache.get_stats()["expired"] == 1
+
+    cache = RoutingPlanCache(ttl_seconds=60)
+    write_plan = RoutingPlan(
+        content_plane="facts", operation="write", reasoning_required=False,
+        facts_write_candidate=FactsWriteCandidate(topic="color", value="Blue", rank_ordered=False)
+    )
+    cache.put("p", "My favorite color is Blue", None, write_plan)
+    assert cache.get("p", "my favorite color is blue") is None
+
+
+def test_cache_is_bounded():
+    cache = RoutingPlanCache(max_size=2, ttl_seconds=60)
+    plan = RoutingPlan(content_plane="chat", operation="none", reasoning_required=True)
+    for message in ("first message", "second message", "third message"):
+        cache.put("p", message, None, plan)
+
+    assert cache.get("p", "first message") is None
+    assert cache.get("p", "third message") is not None
+    assert cache.get_stats()["size"] == 2
+
+
+async def test_facts_write_invalidates_project_plans(test_db_setup, plan_cache, nano_calls):
+    project_id = test_db_setup["project_id"]
+    await route_message("Which crypto do I like best?", HISTORY, project_id=project_id)
+    other_project = str(uuid.uuid4())
+    await route_message("Which crypto do I like best?", HISTORY, project_id=other_project)
+
+    result = apply_facts_ops(project_id, str(uuid.uuid4()), FactsOpsResponse(ops=[
+        FactsOp(op="ranked_list_set", list_key="user.favorites.crypto", value="XMR")
+    ]))
+    assert not result.errors
+
+    assert (await route_message("Which crypto do I like best?", HISTORY, project_id=project_id))[1] == "nano"
+    assert (await route_message("Which crypto do I like best?", HISTORY, project_id=other_project))[1] == "cache"
@@ -0,0 +1,97 @@
+"""
+Tests for the indexing scheduler (memory_service/scheduler.py): lane priority,
+the caps that keep watcher and bulk work from taking the whole pool, and the
+per-source cap.
+
+Tasks block on events, so which tasks run at the same time is decided by the test.
+"""
+import threading
+import time
+
+import pytest
+
+from memory_service.scheduler import IndexingScheduler, Lane
+
+
+@pytest.fixture
+def make_scheduler():
+    schedulers = []
+
+    def _make(**kwargs):
+        scheduler = IndexingScheduler(**kwargs)
+        scheduler.start()
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield _make
+    for scheduler in schedulers:
+        scheduler.stop()
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def _running(scheduler, lane):
+    return scheduler.get_stats()["lanes"][lane.name.lower()]["running"]
+
+
+def test_free_worker_takes_highest_priority_lane(make_scheduler):
+    scheduler = make_scheduler(num_workers=1)
+    release = threading.Event()
+    blocker = scheduler.submit(Lane.CHAT, release.wait, 5)
+    _wait_until(lambda: _running(scheduler, Lane.CHAT) == 1)
+
+    order = []
+    futures = [
+        scheduler.submit(lane, order.append, name)
+        for lane, name in ((Lane.BULK, "bulk"), (Lane.WATCHER, "watcher-1"), (Lane.CHAT, "chat"),
+                           (Lane.WATCHER, "watcher-2"))
+    ]
+    release.set()
+
+    blocker.result(timeout=5)
+    for future in futures:
+        future.result(timeout=5)
+    assert order == ["chat", "watcher-1", "watcher-2", "bulk"]
+
+
+def test_watcher_and_bulk_caps_leave_a_worker_for_chat(make_scheduler):
+    scheduler = make_scheduler(num_workers=4, lane_limits={Lane.WATCHER: 2, Lane.BULK: 1})
+    release = threading.Event()
+    futures = [scheduler.submit(Lane.BULK, release.wait, 5, source_id=f"bulk-{i}") for i in range(3)]
+    futures += [scheduler.submit(Lane.WATCHER, release.wait, 5, source_id=f"watch-{i}") for i in range(4)]
+
+    _wait_until(lambda: _running(scheduler, Lane.WATCHER) == 2 and _running(scheduler, Lane.BULK) == 1)
+    time.sleep(0.05)  # The fourth worker stays idle instead of taking more watcher or bulk work
+    stats = scheduler.get_stats()["lanes"]
+    assert (stats["watcher"]["running"], stats["watcher"]["depth"]) == (2, 2)
+    assert (stats["bulk"]["running"], stats["bulk"]["depth"]) == (1, 2)
+
+    # Chat work runs right away on the worker the caps kept free
+    assert scheduler.submit(Lane.CHAT, lambda: "indexed").result(timeout=1) == "indexed"
+
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+
+
+def test_per_source_cap_applies_across_lanes(make_scheduler):
+    scheduler = make_scheduler(num_workers=4, max_per_source=2)
+    release = threading.Event()
+    futures = [scheduler.submit(Lane.CHAT, release.wait, 5, source_id="project-a") for _ in range(2)]
+    futures.append(scheduler.submit(Lane.WATCHER, release.wait, 5, source_id="project-a"))
+    futures.append(scheduler.submit(Lane.CHAT, release.wait, 5, source_id="project-b"))
+
+    _wait_until(lambda: _running(scheduler, Lane.CHAT) == 3)
+    time.sleep(0.05)
+    stats = scheduler.get_stats()
+    assert stats["running_per_source"] == {"project-a": 2, "project-b": 1}
+    assert stats["lanes"]["watcher"]["depth"] == 1
+
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
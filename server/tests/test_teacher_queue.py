@@ -0,0 +1,99 @@
+"""
+Tests for deferred teacher canonicalization (server/services/teacher_queue.py).
+
+The teacher call is replaced by a stub; the alias table is a temporary database.
+"""
+import threading
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from server.contracts.facts_ops import FactsOp, FactsOpsResponse
+from server.services import facts_apply, teacher_model
+from server.services.alias_table import AliasTable
+from server.services.canonicalizer import get_canonicalizer
+from server.services.facts_apply import apply_facts_ops
+from server.services.librarian import search_facts_ranked_list
+from server.services.teacher_model import TeacherCanonicalizationResult
+from server.services.teacher_queue import TeacherCanonicalizationQueue, get_teacher_queue
+
+
+@pytest.fixture
+def alias_table(tmp_path, monkeypatch):
+    table = AliasTable(db_path=tmp_path / "alias_table.db")
+    monkeypatch.setattr(get_canonicalizer(), "alias_table", table)
+    return table
+
+
+def _append(project_id, list_key, values):
+    ops = [FactsOp(op="ranked_list_set", list_key=list_key, value=value) for value in values]
+    result = apply_facts_ops(project_id, str(uuid.uuid4()), FactsOpsResponse(ops=ops))
+    assert not result.errors
+
+
+def test_teacher_result_rekeys_provisional_list(test_db_setup, alias_table, monkeypatch):
+    project_id = test_db_setup["project_id"]
+    monkeypatch.setattr(
+        teacher_model, "run_teacher_canonicalization",
+        lambda raw, normalized: TeacherCanonicalizationResult("board_game", ["board games"])
+    )
+    _append(project_id, "user.favorites.board_game", ["Chess", "Azul"])
+    # Stored under the provisional topic while the teacher has not answered yet
+    _append(project_id, "user.favorites.tabletop_game", ["Catan", "azul"])
+
+    queue = get_teacher_queue()
+    assert queue.submit("tabletop games", "tabletop games")
+    assert queue.wait_idle(timeout=10)
+
+    assert get_canonicalizer().canonicalize("tabletop games", invoke_teacher=False).canonical_topic == "board_game"
+    values = [fact["value_text"] for fact in search_facts_ranked_list(project_id, "board_game")]
+    assert values == ["Chess", "Azul", "Catan"]
+    assert search_facts_ranked_list(project_id, "tabletop_game") == []
+
+
+def test_topics_in_flight_are_deduplicated(alias_table, monkeypatch):
+    release = threading.Event()
+
+    def _slow_teacher(raw, normalized):
+        release.wait(timeout=10)
+        return None
+
+    monkeypatch.setattr(teacher_model, "run_teacher_canonicalization", _slow_teacher)
+    queue = get_teacher_queue()
+    deduplicated = queue.deduplicated
+    assert queue.submit("Space Operas", "space operas")
+    assert queue.submit("space operas", "space operas")
+    assert queue.deduplicated == deduplicated + 1
+
+    release.set()
+    assert queue.wait_idle(timeout=10)
+
+
+def test_failed_rekey_keeps_project_tracked(monkeypatch):
+    canonicalizer = SimpleNamespace(
+        canonicalize=lambda topic, invoke_teacher=False: SimpleNamespace(source="alias", canonical_topic="board_game")
+    )
+    failing = {"p2"}
+
+    def _rekey(project_uuid, from_list_key, to_list_key, max_facts):
+        if project_uuid in failing:
+            raise RuntimeError("database is locked")
+        return {"moved": 2, "duplicates_dropped": 0}
+
+    monkeypatch.setattr(facts_apply, "rekey_ranked_list", _rekey)
+    queue = TeacherCanonicalizationQueue()
+    for project_uuid in ("p1", "p2"):
+        queue.note_provisional_list(project_uuid, "user.favorites.tabletop_game")
+
+    queue._rekey_provisional_lists(canonicalizer)
+
+    assert queue.provisional_lists == {"user.favorites.tabletop_game": {"p2"}}
+    assert (queue.lists_rekeyed, queue.facts_rekeyed) == (1, 2)
+
+    # Retried after the next teacher result
+    failing.clear()
+    queue._rekey_provisional_lists(canonicalizer)
+
+    assert not queue.provisional_lists
+    assert (queue.lists_rekeyed, queue.facts_rekeyed) == (2, 4)
@@ -42,7 +42,7 @@ async def test_db_isolation_between_tests(test_db_setup, test_thread_id):
     
     # Verify the fact exists in this test's DB
     source_id_1 = test_db_setup["source_id"]
-    conn_1 = db.get_db_connection(source_id_1, project_id=project_id_1)
+    conn_1 = db.get_facts_db_connection(source_id_1, project_id=project_id_1)
     cursor_1 = conn_1.cursor()
     cursor_1.execute("""
         SELECT COUNT(*) as count
@@ -63,8 +63,8 @@ async def test_db_isolation_between_tests(test_db_setup, test_thread_id):
     # Verify the DB file actually exists
     assert db_path_1.exists(), f"DB file should exist at {db_path_1}"
     
-    # Verify schema exists (project_facts table)
-    conn_check = sqlite3.connect(str(db_path_1))
+    # Verify schema exists (project_facts table, in the facts DB next to the index DB)
+    conn_check = sqlite3.connect(str(db_path_1.with_name(db.FACTS_DB_FILENAME)))
     cursor_check = conn_check.cursor()
     cursor_check.execute("""
         SELECT name FROM sqlite_master 
@@ -115,8 +115,9 @@ async def test_patched_db_is_actually_used(test_db_setup, test_thread_id):
     
     assert result.store_count == 1, "Should have stored 1 fact"
     
-    # Verify the fact was written to the test DB (not production)
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    # Verify the fact was written to the test facts DB (not production)
+    facts_db_path = db_path.with_name(db.FACTS_DB_FILENAME)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     
     # Get the actual database file path from the connection
@@ -132,8 +133,8 @@ async def test_patched_db_is_actually_used(test_db_setup, test_thread_id):
     
     # Verify the actual DB path matches our test path
     assert actual_db_path is not None, "Could not determine actual DB path from connection"
-    assert actual_db_path == db_path, \
-        f"Actual DB path {actual_db_path} should match expected {db_path}"
+    assert actual_db_path == facts_db_path, \
+        f"Actual DB path {actual_db_path} should match expected {facts_db_path}"
     assert str(db_dir) in str(actual_db_path), \
         f"Actual DB path {actual_db_path} should be in test directory {db_dir}"
     
@@ -155,7 +156,7 @@ def test_schema_initialization_creates_required_tables(test_db_setup):
     """
     Verify that schema initialization creates all required tables.
     
-    Checks for key tables: project_facts, chat_messages, sources.
+    Checks for key tables: chat_messages, sources (index DB) and project_facts (facts DB).
     """
     project_id = test_db_setup["project_id"]
     source_id = test_db_setup["source_id"]
@@ -173,10 +174,17 @@ def test_schema_initialization_creates_required_tables(test_db_setup):
     tables = [row[0] for row in cursor.fetchall()]
     
     # Verify key tables exist
-    required_tables = ["project_facts", "chat_messages", "sources"]
+    required_tables = ["chat_messages", "sources"]
     for table in required_tables:
         assert table in tables, f"Required table '{table}' should exist. Found tables: {tables}"
     
+    db.init_facts_db(source_id, project_id=project_id)
+    facts_conn = db.get_facts_db_read_connection(source_id, project_id=project_id)
+    facts_tables = [row[0] for row in facts_conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+    facts_conn.close()
+    assert "project_facts" in facts_tables, f"project_facts should exist in the facts DB. Found tables: {facts_tables}"
+    assert "project_facts" not in tables, "project_facts should not exist in the index DB"
+    
     # Commit to ensure file is flushed to disk
     conn.commit()
     
@@ -257,7 +265,7 @@ async def test_different_project_ids_use_different_db_files(test_db_setup, tmp_p
     assert result_2.store_count == 1, "Should have stored 1 fact in second DB"
     
     # Verify first DB doesn't have the second fact
-    conn_1 = sqlite3.connect(str(db_path_1))
+    conn_1 = sqlite3.connect(str(db_path_1.with_name(db.FACTS_DB_FILENAME)))
     cursor_1 = conn_1.cursor()
     cursor_1.execute("""
         SELECT COUNT(*) as count
@@ -270,7 +278,7 @@ async def test_different_project_ids_use_different_db_files(test_db_setup, tmp_p
     assert count_1 == 0, "First DB should not contain facts from second project"
     
     # Verify second DB has its fact
-    conn_2 = sqlite3.connect(str(db_path_2))
+    conn_2 = sqlite3.connect(str(db_path_2.with_name(db.FACTS_DB_FILENAME)))
     cursor_2 = conn_2.cursor()
     cursor_2.execute("""
         SELECT COUNT(*) as count
@@ -0,0 +1,106 @@
+"""
+Tests for tokenizer-exact chunking (memory_service/chunking.py).
+
+The embedding tokenizer is replaced by a small fast-tokenizer stub: one token
+per word or punctuation mark, with character offsets, and [CLS]/[SEP] counted
+as two special tokens.
+"""
+import re
+
+import pytest
+
+from memory_service.chunking import MIN_CHUNK_CHARS, chunk_text_by_tokens, chunk_texts_by_tokens
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+class StubTokenizer:
+    """Word-level tokenizer with the offset-mapping interface of a HuggingFace fast tokenizer."""
+
+    def __call__(self, texts, **kwargs):
+        return {"offset_mapping": [[m.span() for m in TOKEN_RE.finditer(text)] for text in texts]}
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+
+def _tokens(text):
+    return TOKEN_RE.findall(text)
+
+
+def _words(n, prefix="w"):
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+@pytest.fixture
+def tokenizer():
+    return StubTokenizer()
+
+
+def test_budget_and_overlap_are_respected(tokenizer):
+    text = _words(100)  # No boundaries: every cut is a hard token cut
+
+    chunks = chunk_text_by_tokens(text, tokenizer, max_tokens=22, overlap_tokens=5)
+
+    assert [c[0] for c in chunks] == list(range(len(chunks)))
+    assert all(len(_tokens(c[1])) <= 20 for c in chunks)  # 22 minus [CLS]/[SEP]
+    for (_, prev, _, _), (_, nxt, _, _) in zip(chunks, chunks[1:]):
+        assert _tokens(prev)[-5:] == _tokens(nxt)[:5]
+    # Together the chunks cover every token
+    assert _tokens(chunks[0][1])[0] == "w0" and _tokens(chunks[-1][1])[-1] == "w99"
+
+
+def test_cuts_snap_to_paragraph_boundaries(tokenizer):
+    paragraphs = [_words(12, prefix=f"p{p}x") + "." for p in range(4)]
+    text = "\n\n".join(paragraphs)
+
+    chunks = chunk_text_by_tokens(text, tokenizer, max_tokens=32, overlap_tokens=0)
+
+    # 30-token budget holds two paragraphs (13 tokens each); cuts land between them
+    assert [c[1] for c in chunks] == ["\n\n".join(paragraphs[:2]), "\n\n".join(paragraphs[2:])]
+
+
+def test_offsets_point_at_chunk_text(tokenizer):
+    text = "  \n" + "\n\n".join(_words(12, prefix=f"p{p}x") + "." for p in range(5)) + "\n  "
+
+    for chunks in (chunk_text_by_tokens(text, tokenizer, max_tokens=32, overlap_tokens=4),
+                   chunk_text_by_tokens(text, tokenizer, max_tokens=512, overlap_tokens=4)):
+        for _, chunk, start_char, end_char in chunks:
+            assert text[start_char:end_char] == chunk
+            assert chunk == chunk.strip()
+
+
+def test_single_chunk_path_matches_multi_chunk_path(tokenizer):
+    text = "\n  A short note about WAL mode.  \n"
+
+    single = chunk_text_by_tokens(text, tokenizer, max_tokens=512, overlap_tokens=4)
+
+    assert single == [(0, "A short note about WAL mode.", 3, 31)]
+    # Whitespace-only and short texts are dropped on both paths
+    short = " " * 50 + "tiny" + " " * 50
+    assert len("tiny") <= MIN_CHUNK_CHARS
+    assert chunk_text_by_tokens(short, tokenizer, max_tokens=512, overlap_tokens=4) == []
+    assert chunk_text_by_tokens("   \n\n  ", tokenizer, max_tokens=512, overlap_tokens=4) == []
+
+
+def test_batched_chunking_matches_single_calls(tokenizer):
+    texts = [_words(60), "  one small message here  ", "ok", _words(15)]
+
+    batched = chunk_texts_by_tokens(texts, tokenizer, max_tokens=22, overlap_tokens=3)
+
+    assert batched == [chunk_text_by_tokens(t, tokenizer, max_tokens=22, overlap_tokens=3) for t in texts]
+    assert batched[2] == []
+    assert batched[1] == [(0, "one small message here", 2, 24)]
+
+
+def test_short_chat_messages_are_kept(tokenizer, monkeypatch):
+    # File chunks keep the minimum length; chat messages pass min_chars=0
+    assert chunk_text_by_tokens("Yes please", tokenizer, max_tokens=512, overlap_tokens=4) == []
+    assert chunk_text_by_tokens(" Yes please\n", tokenizer, max_tokens=512, overlap_tokens=4, min_chars=0) == [
+        (0, "Yes please", 1, 11)
+    ]
+
+    indexer = pytest.importorskip("memory_service.indexer")  # Needs sentence-transformers
+    monkeypatch.setattr(indexer, "_get_chunk_tokenizer", lambda: (tokenizer, 512))
+    assert indexer.chunk_chat_message("I'm Alice.") == [(0, "I'm Alice.", 0, 10)]
+    assert indexer.chunk_chat_messages(["Yes please", "", "  \n "]) == [[(0, "Yes please", 0, 10)], [], []]
@@ -0,0 +1,140 @@
+"""
+Tests for the debounced, coalescing watcher event queue (memory_service/watch_queue.py)
+and how watcher moves are fed into it (memory_service/watcher.py).
+
+Actions run on a small thread pool and are recorded instead of indexing; the
+debounce period is shortened to keep the tests fast.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from memory_service.watch_queue import CoalescingEventQueue, FileAction
+
+DEBOUNCE = 0.1
+
+
+class Recorder:
+    """process_func stub: records (path, action, time) and can block on an event."""
+
+    def __init__(self):
+        self.calls = []
+        self.block = None
+        self.lock = threading.Lock()
+
+    def __call__(self, path, action):
+        if self.block is not None:
+            self.block.wait(timeout=5)
+        with self.lock:
+            self.calls.append((path, action, time.monotonic()))
+
+    def actions(self):
+        with self.lock:
+            return [(path, action) for path, action, _ in self.calls]
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+@pytest.fixture
+def queue(recorder):
+    executor = ThreadPoolExecutor(max_workers=2)
+    queue = CoalescingEventQueue("src", recorder, executor, debounce_seconds=DEBOUNCE, max_in_flight=2)
+    queue.start()
+    yield queue
+    queue.stop()
+    executor.shutdown(wait=True)
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_path_is_dispatched_once_quiet(queue, recorder):
+    path = Path("/src/notes.md")
+    started = time.monotonic()
+    for _ in range(3):  # An editor save: several events in quick succession
+        queue.push(path, FileAction.INDEX)
+        time.sleep(DEBOUNCE / 2)
+    queue.push(path, FileAction.INDEX)
+    last_event = time.monotonic()
+
+    _wait_until(lambda: recorder.calls)
+
+    assert recorder.actions() == [(path, FileAction.INDEX)]
+    # The quiet period restarts with every event
+    assert recorder.calls[0][2] - last_event >= DEBOUNCE * 0.9
+    assert recorder.calls[0][2] - started >= DEBOUNCE * 1.5
+    time.sleep(DEBOUNCE * 2)
+    assert len(recorder.calls) == 1
+
+
+def test_events_for_a_path_collapse_into_the_last_action(queue, recorder):
+    created, removed = Path("/src/a.py"), Path("/src/b.py")
+    for action in (FileAction.INDEX, FileAction.INDEX, FileAction.DELETE):
+        queue.push(removed, action)
+    for action in (FileAction.DELETE, FileAction.INDEX):
+        queue.push(created, action)
+
+    _wait_until(lambda: queue.get_stats()["completed"] == 2)
+
+    assert sorted(recorder.actions()) == [(created, FileAction.INDEX), (removed, FileAction.DELETE)]
+    stats = queue.get_stats()
+    assert (stats["events_received"], stats["events_merged"], stats["dispatched"]) == (5, 3, 2)
+
+
+def test_events_during_a_running_action_are_dispatched_after_it(queue, recorder):
+    path = Path("/src/big.pdf")
+    recorder.block = threading.Event()
+    queue.push(path, FileAction.INDEX)
+    _wait_until(lambda: queue.get_stats()["in_flight"] == 1)
+
+    queue.push(path, FileAction.INDEX)
+    queue.push(path, FileAction.DELETE)
+    time.sleep(DEBOUNCE * 3)
+    # The same path never runs twice at once
+    assert queue.get_stats()["in_flight"] == 1 and queue.get_stats()["depth"] == 1
+
+    recorder.block.set()
+    _wait_until(lambda: queue.get_stats()["completed"] == 2)
+    assert recorder.actions() == [(path, FileAction.INDEX), (path, FileAction.DELETE)]
+
+
+def test_moves_delete_the_old_path_and_index_the_new_one(queue, recorder):
+    old, new, temp = Path("/src/draft.md"), Path("/src/final.md"), Path("/src/.final.md.swp")
+    # Rename, plus an atomic save (write a temp file, move it over the target)
+    queue.push(old, FileAction.DELETE)
+    queue.push(new, FileAction.INDEX)
+    queue.push(temp, FileAction.INDEX)
+    queue.push(temp, FileAction.DELETE)
+    queue.push(new, FileAction.INDEX)
+
+    _wait_until(lambda: queue.get_stats()["completed"] == 3)
+
+    assert sorted(recorder.actions()) == [
+        (temp, FileAction.DELETE), (old, FileAction.DELETE), (new, FileAction.INDEX)
+    ]
+
+
+def test_watcher_pushes_moves_as_delete_and_index(tmp_path):
+    watcher = pytest.importorskip("memory_service.watcher")  # Needs watchdog and sentence-transformers
+    pushed = []
+    handler = watcher.IndexingHandler(1, "src", tmp_path, None, None, executor=ThreadPoolExecutor(max_workers=1))
+    handler.event_queue = SimpleNamespace(push=lambda path, action: pushed.append((path, action)),
+                                          note_dropped=lambda: None)
+
+    handler.on_moved(SimpleNamespace(is_directory=False, src_path=str(tmp_path / "a.md"),
+                                     dest_path=str(tmp_path / "b.md")))
+    handler.on_moved(SimpleNamespace(is_directory=True, src_path=str(tmp_path / "dir"),
+                                     dest_path=str(tmp_path / "dir2")))
+
+    assert pushed == [(tmp_path / "a.md", FileAction.DELETE), (tmp_path / "b.md", FileAction.INDEX)]
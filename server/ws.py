@@ -878,37 +878,23 @@ Keep it concise, neutral, and factual."""
                 memory_client = get_memory_client()
                 now = datetime.now(timezone.utc).isoformat()
                 
-                # Index user message
-                if user_msg_idx is not None:
-                    user_msg = history[user_msg_idx]
-                    user_content = user_msg.get("content", "")
-                    if user_content:
-                        user_message_id = f"{conversation_id}-user-{user_msg_idx}"
-                        memory_client.index_chat_message(
-                            project_id=project_id,
-                            chat_id=conversation_id,
-                            message_id=user_message_id,
-                            role="user",
-                            content=user_content,
-                            timestamp=now,
-                            message_index=user_msg_idx
-                        )
-                
-                # Index assistant message
-                if assistant_msg_idx is not None:
-                    assistant_msg = history[assistant_msg_idx]
-                    assistant_content = assistant_msg.get("content", "")
-                    if assistant_content:
-                        assistant_message_id = f"{conversation_id}-assistant-{assistant_msg_idx}"
-                        memory_client.index_chat_message(
-                            project_id=project_id,
-                            chat_id=conversation_id,
-                            message_id=assistant_message_id,
-                            role="assistant",
-                            content=assistant_content,
-                            timestamp=now,
-                            message_index=assistant_msg_idx
-                        )
+                # Index user + assistant messages with one bulk request
+                messages_to_index = []
+                for msg_idx, msg_role in ((user_msg_idx, "user"), (assistant_msg_idx, "assistant")):
+                    if msg_idx is None:
+                        continue
+                    msg_content = history[msg_idx].get("content", "")
+                    if msg_content:
+                        messages_to_index.append({
+                            "project_id": project_id,
+                            "chat_id": conversation_id,
+                            "message_id": f"{conversation_id}-{msg_role}-{msg_idx}",
+                            "role": msg_role,
+                            "content": msg_content,
+                            "timestamp": now,
+                            "message_index": msg_idx
+                        })
+                memory_client.index_chat_messages(messages_to_index)
             except Exception as e:
                 print(f"[MEMORY] Warning: Failed to index messages for cross-chat search: {e}", exc_info=True)
         
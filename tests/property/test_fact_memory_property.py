@@ -345,10 +345,11 @@ def test_property_fact_memory():
             
             # Initialize database for this project
             db.init_db(source_id, project_id=scenario.project_id)
+            db.init_facts_db(source_id, project_id=scenario.project_id)
             
             # Clear any existing facts for this project/fact_key to ensure clean state
             # (This prevents state leakage between scenarios using the same project_id)
-            conn_cleanup = db.get_db_connection(source_id, project_id=scenario.project_id)
+            conn_cleanup = db.get_facts_db_connection(source_id, project_id=scenario.project_id)
             cursor_cleanup = conn_cleanup.cursor()
             cursor_cleanup.execute("""
                 DELETE FROM project_facts
@@ -410,7 +411,7 @@ def test_property_fact_memory():
                 elif fact["value_text"] != scenario.expected_value:
                     # Collect all candidate facts for detailed reporting
                     source_id_debug = f"project-{scenario.project_id}"
-                    conn_debug = db.get_db_connection(source_id_debug, project_id=scenario.project_id)
+                    conn_debug = db.get_facts_db_connection(source_id_debug, project_id=scenario.project_id)
                     cursor_debug = conn_debug.cursor()
                     cursor_debug.execute("""
                         SELECT fact_id, value_text, effective_at, created_at, 
@@ -453,7 +454,7 @@ def test_property_fact_memory():
                     
                     # Assertion 4: Only one current fact
                     source_id_check = f"project-{scenario.project_id}"
-                    conn = db.get_db_connection(source_id_check, project_id=scenario.project_id)
+                    conn = db.get_facts_db_connection(source_id_check, project_id=scenario.project_id)
                     cursor = conn.cursor()
                     cursor.execute("""
                         SELECT COUNT(*) FROM project_facts
@@ -564,7 +565,7 @@ def test_property_fact_memory():
         if scenarios:
             first_project = scenarios[0].project_id
             source_id = f"project-{first_project}"
-            conn = db.get_db_connection(source_id, project_id=first_project)
+            conn = db.get_facts_db_connection(source_id, project_id=first_project)
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT fact_id, project_id, fact_key, value_text, is_current, 
@@ -632,7 +633,7 @@ def test_concurrent_updates(test_db):
     assert current["source_message_uuid"] == uuid2, "Citation should point to winning fact"
     
     # Verify only one current fact exists
-    conn = db.get_db_connection(source_id, project_id=project_id)
+    conn = db.get_facts_db_connection(source_id, project_id=project_id)
     cursor = conn.cursor()
     cursor.execute("""
         SELECT COUNT(*) FROM project_facts
@@ -687,7 +688,7 @@ def test_cross_project_isolation(test_db):
     # Verify no cross-project access
     # Query project A with project B's value - should not find it
     source_id_b = f"project-{project_b}"
-    conn = db.get_db_connection(source_id_b, project_id=project_b)
+    conn = db.get_facts_db_connection(source_id_b, project_id=project_b)
     cursor = conn.cursor()
     cursor.execute("""
         SELECT COUNT(*) FROM project_facts
@@ -721,6 +722,8 @@ def test_smoke_cross_project_isolation():
     source_id_b = f"project-{project_b}"
     db.init_db(source_id_a, project_id=project_a)
     db.init_db(source_id_b, project_id=project_b)
+    db.init_facts_db(source_id_a, project_id=project_a)
+    db.init_facts_db(source_id_b, project_id=project_b)
     
     # Generate distinct UUIDs for citations
     uuid_a = str(uuid.uuid4())
@@ -762,7 +765,7 @@ def test_smoke_cross_project_isolation():
         
         # Verify no cross-project access
         # Query project A with project B's value - should not find it
-        conn_b = db.get_db_connection(source_id_b, project_id=project_b)
+        conn_b = db.get_facts_db_connection(source_id_b, project_id=project_b)
         cursor_b = conn_b.cursor()
         cursor_b.execute("""
             SELECT COUNT(*) FROM project_facts
@@ -774,7 +777,7 @@ def test_smoke_cross_project_isolation():
         assert count_b_has_blue == 0, f"Project B ({project_b}) should not have project A's value 'blue'. Found {count_b_has_blue} facts."
         
         # Query project B with project A's value - should not find it
-        conn_a = db.get_db_connection(source_id_a, project_id=project_a)
+        conn_a = db.get_facts_db_connection(source_id_a, project_id=project_a)
         cursor_a = conn_a.cursor()
         cursor_a.execute("""
             SELECT COUNT(*) FROM project_facts